@@ -97,6 +97,7 @@ from .setup import (
     # by integrations. It is only used for internal tracking of
     # which integrations are being set up.
     _setup_started,
+    async_get_import_timings,
     async_get_setup_timings,
     async_notify_setup_error,
     async_set_domains_to_be_loaded,
@@ -989,6 +990,11 @@ async def _async_set_up_integrations(
             "Integration setup times: %s",
             dict(sorted(setup_time.items(), key=itemgetter(1), reverse=True)),
         )
+        import_time = async_get_import_timings(hass)
+        _LOGGER.debug(
+            "Integration import times: %s",
+            dict(sorted(import_time.items(), key=itemgetter(1), reverse=True)),
+        )
 
 
 class _WatchPendingSetups:
@@ -0,0 +1,155 @@
+"""Columnar encoding of compressed history states."""
+
+from __future__ import annotations
+
+from array import array
+from base64 import b64encode
+import math
+import sys
+from typing import Any
+
+from homeassistant.components.recorder.history import (
+    DOWNSAMPLED_MAX_KEY,
+    DOWNSAMPLED_MEAN_KEY,
+    DOWNSAMPLED_MIN_KEY,
+)
+from homeassistant.const import (
+    COMPRESSED_STATE_ATTRIBUTES,
+    COMPRESSED_STATE_LAST_CHANGED,
+    COMPRESSED_STATE_LAST_UPDATED,
+    COMPRESSED_STATE_STATE,
+)
+
+COLUMNAR_JSON = "json"
+COLUMNAR_BASE64 = "base64"
+
+# Keys of the columns which are only present in the columnar format
+COLUMNAR_VALUES = "v"
+COLUMNAR_STATE_DICTIONARY = "sd"
+
+_BIG_ENDIAN = sys.byteorder == "big"
+_AGGREGATE_KEYS = (DOWNSAMPLED_MIN_KEY, DOWNSAMPLED_MAX_KEY, DOWNSAMPLED_MEAN_KEY)
+
+
+def _pack(typecode: str, values: list[Any]) -> str:
+    """Pack values as a base64 encoded little endian typed array."""
+    packed = array(typecode, values)
+    if _BIG_ENDIAN:
+        packed.byteswap()
+    return b64encode(packed.tobytes()).decode("ascii")
+
+
+def _pack_floats(values: list[float | None]) -> str:
+    """Pack floats as a base64 encoded float64 array with NaN for None."""
+    return _pack("d", [math.nan if value is None else value for value in values])
+
+
+def _state_to_float(state: str) -> float | None:
+    """Return the state as a float or None if it is not a number.
+
+    Only states which are the canonical form of the float are numbers, so
+    the state can be recovered from the value. float() also accepts states
+    like "1_000", " 5 ", "007", "1.10" and "1e3", which are kept as strings.
+    Integral values are read back in their integer form, so "21" is a
+    number and "21.0" is kept as a string.
+    """
+    try:
+        value = float(state)
+    except ValueError:
+        return None
+    if not math.isfinite(value):
+        return None
+    if value.is_integer():
+        canonical = str(int(value))
+    else:
+        canonical = repr(value)
+    return value if canonical == state else None
+
+
+def compressed_states_to_columns(
+    states: list[dict[str, Any]], packed: bool
+) -> dict[str, Any]:
+    """Convert the compressed states of an entity to columns.
+
+    - lu: last_updated in integer microseconds, the first one is
+      the absolute timestamp and the following ones are the deltas
+      to the previous one.
+    - v: the numeric states as floats, null for other states. States are
+      only numeric when the value converts back to the same string.
+    - s: the index of the state in sd, -1 for numeric states.
+    - sd: the distinct states which are not numeric.
+    - a: [row, attributes] pairs of the states with attributes.
+    - lc: [row, last_changed] pairs of the states with a last_changed.
+    - min, max, mean: the aggregates of downsampled states as floats,
+      null for the states which are not aggregated.
+
+    The v and s columns are left out when all states are strings or
+    all states are numeric. With packed, lu, v and s are sent as base64
+    encoded little endian int64, float64 and int32 arrays, the aggregates
+    as float64 arrays, and null values are NaN.
+    """
+    last_updated: list[int] = []
+    values: list[float | None] = []
+    state_indexes: list[int] = []
+    dictionary: dict[str, int] = {}
+    attributes: list[list[Any]] = []
+    last_changed: list[list[Any]] = []
+    aggregates: dict[str, list[float | None]] = {}
+    has_values = False
+    previous_us = 0
+    for row, state in enumerate(states):
+        last_updated_us = round(state[COMPRESSED_STATE_LAST_UPDATED] * 1_000_000)
+        last_updated.append(last_updated_us - previous_us)
+        previous_us = last_updated_us
+        state_str: str = state[COMPRESSED_STATE_STATE]
+        if (value := _state_to_float(state_str)) is None:
+            values.append(None)
+            if (index := dictionary.get(state_str)) is None:
+                index = dictionary[state_str] = len(dictionary)
+            state_indexes.append(index)
+        else:
+            has_values = True
+            values.append(value)
+            state_indexes.append(-1)
+        if COMPRESSED_STATE_ATTRIBUTES in state:
+            attributes.append([row, state[COMPRESSED_STATE_ATTRIBUTES]])
+        if COMPRESSED_STATE_LAST_CHANGED in state:
+            last_changed.append([row, state[COMPRESSED_STATE_LAST_CHANGED]])
+        if DOWNSAMPLED_MEAN_KEY in state and not aggregates:
+            aggregates = {key: [None] * row for key in _AGGREGATE_KEYS}
+        if aggregates:
+            for key in _AGGREGATE_KEYS:
+                aggregates[key].append(state.get(key))
+
+    columns: dict[str, Any] = {
+        COMPRESSED_STATE_LAST_UPDATED: _pack("q", last_updated)
+        if packed
+        else last_updated
+    }
+    if has_values:
+        columns[COLUMNAR_VALUES] = _pack_floats(values) if packed else values
+    if dictionary:
+        columns[COMPRESSED_STATE_STATE] = (
+            _pack("i", state_indexes) if packed else state_indexes
+        )
+        columns[COLUMNAR_STATE_DICTIONARY] = list(dictionary)
+    if attributes:
+        columns[COMPRESSED_STATE_ATTRIBUTES] = attributes
+    if last_changed:
+        columns[COMPRESSED_STATE_LAST_CHANGED] = last_changed
+    for key, aggregate in aggregates.items():
+        columns[key] = _pack_floats(aggregate) if packed else aggregate
+    return columns
+
+
+def encode_history(
+    states: dict[str, list[dict[str, Any]]], columnar: str | None
+) -> dict[str, Any]:
+    """Encode the compressed states of each entity with the requested format."""
+    if columnar is None:
+        return states
+    packed = columnar == COLUMNAR_BASE64
+    return {
+        entity_id: compressed_states_to_columns(entity_states, packed)
+        for entity_id, entity_states in states.items()
+    }
@@ -5,3 +5,10 @@ DOMAIN = "history"
 EVENT_COALESCE_TIME = 0.35
 
 MAX_PENDING_HISTORY_STATES = 2048
+
+# Number of states sent in each message of a chunked history response
+# and the number of messages which are prepared ahead of the client
+HISTORY_CHUNK_STATES = 5000
+HISTORY_CHUNKS_IN_FLIGHT = 2
+# Seconds the client has to read most of a chunk before the stream is stopped
+HISTORY_CHUNK_DRAIN_TIMEOUT = 60
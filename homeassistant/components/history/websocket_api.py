@@ -38,7 +38,14 @@ from homeassistant.helpers.json import json_bytes
 from homeassistant.util import dt as dt_util
 from homeassistant.util.async_ import create_eager_task
 
-from .const import EVENT_COALESCE_TIME, MAX_PENDING_HISTORY_STATES
+from .columnar import COLUMNAR_BASE64, COLUMNAR_JSON, encode_history
+from .const import (
+    EVENT_COALESCE_TIME,
+    HISTORY_CHUNK_DRAIN_TIMEOUT,
+    HISTORY_CHUNK_STATES,
+    HISTORY_CHUNKS_IN_FLIGHT,
+    MAX_PENDING_HISTORY_STATES,
+)
 from .helpers import entities_may_have_state_changes_after, has_states_before
 
 _LOGGER = logging.getLogger(__name__)
@@ -62,6 +69,47 @@ def async_setup(hass: HomeAssistant) -> None:
     websocket_api.async_register_command(hass, ws_stream)
 
 
+def _get_compressed_states(
+    hass: HomeAssistant,
+    start_time: dt,
+    end_time: dt | None,
+    entity_ids: list[str] | None,
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    minimal_response: bool,
+    no_attributes: bool,
+    max_points: int | None,
+) -> dict[str, list[dict[str, Any]]]:
+    """Fetch history significant_states in the compressed state format."""
+    if max_points and entity_ids:
+        return history.get_downsampled_states(
+            hass,
+            start_time,
+            end_time,
+            entity_ids,
+            max_points,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+        )
+    return cast(
+        dict[str, list[dict[str, Any]]],
+        history.get_significant_states(
+            hass,
+            start_time,
+            end_time,
+            entity_ids,
+            None,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+            True,
+        ),
+    )
+
+
 def _ws_get_significant_states(
     hass: HomeAssistant,
     msg_id: int,
@@ -72,27 +120,151 @@ def _ws_get_significant_states(
     significant_changes_only: bool,
     minimal_response: bool,
     no_attributes: bool,
+    columnar: str | None,
+    max_points: int | None,
 ) -> bytes:
     """Fetch history significant_states and convert them to json in the executor."""
     return json_bytes(
         messages.result_message(
             msg_id,
-            history.get_significant_states(
-                hass,
-                start_time,
-                end_time,
-                entity_ids,
-                None,
-                include_start_time_state,
-                significant_changes_only,
-                minimal_response,
-                no_attributes,
-                True,
+            encode_history(
+                _get_compressed_states(
+                    hass,
+                    start_time,
+                    end_time,
+                    entity_ids,
+                    include_start_time_state,
+                    significant_changes_only,
+                    minimal_response,
+                    no_attributes,
+                    max_points,
+                ),
+                columnar,
             ),
         )
     )
 
 
+def _ws_stream_significant_states(
+    hass: HomeAssistant,
+    msg_id: int,
+    send_chunk: Callable[[bytes | None], bool],
+    start_time: dt,
+    end_time: dt | None,
+    entity_ids: list[str],
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    minimal_response: bool,
+    no_attributes: bool,
+    columnar: str | None,
+) -> None:
+    """Fetch history significant_states and send them in chunks from the executor.
+
+    The states are sent in event messages of up to HISTORY_CHUNK_STATES
+    states, followed by the result message with the remaining states.
+    Merging the states of all the messages gives the same result as
+    _ws_get_significant_states. None is sent once done. Reading stops
+    when send_chunk returns False because the stream was cancelled.
+    """
+    try:
+        states: dict[str, list[dict[str, Any]]] = {}
+        count = 0
+        for entity_id, entity_states in history.stream_significant_states(
+            hass,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+            True,
+            HISTORY_CHUNK_STATES,
+        ):
+            # The states are always dicts in the compressed state format
+            compressed_states = cast(list[dict[str, Any]], entity_states)
+            if (chunk_states := states.get(entity_id)) is None:
+                states[entity_id] = compressed_states
+            else:
+                chunk_states.extend(compressed_states)
+            count += len(compressed_states)
+            if count >= HISTORY_CHUNK_STATES:
+                if not send_chunk(
+                    json_bytes(
+                        messages.event_message(msg_id, encode_history(states, columnar))
+                    )
+                ):
+                    return
+                states = {}
+                count = 0
+        send_chunk(
+            json_bytes(
+                messages.result_message(msg_id, encode_history(states, columnar))
+            )
+        )
+    finally:
+        send_chunk(None)
+
+
+async def _async_send_chunked_history(
+    hass: HomeAssistant,
+    connection: ActiveConnection,
+    msg_id: int,
+    *args: Any,
+) -> None:
+    """Send the history in chunks while it is read from the database.
+
+    The executor waits for the client to read the chunks so only
+    a few chunks are held in memory at once. The stream is stopped
+    when the connection is closed or the client does not read the
+    chunks within HISTORY_CHUNK_DRAIN_TIMEOUT.
+    """
+    loop = hass.loop
+    chunks: asyncio.Queue[bytes | None] = asyncio.Queue(HISTORY_CHUNKS_IN_FLIGHT)
+    cancelled = False
+    task = asyncio.current_task()
+    assert task is not None
+
+    async def _async_put_chunk(chunk: bytes | None) -> None:
+        if not cancelled:
+            await chunks.put(chunk)
+
+    def _send_chunk(chunk: bytes | None) -> bool:
+        """Queue a chunk, return False once the stream is cancelled."""
+        if not cancelled:
+            asyncio.run_coroutine_threadsafe(_async_put_chunk(chunk), loop).result()
+        return not cancelled
+
+    @callback
+    def _async_cancel() -> None:
+        """Cancel the stream when the connection is closed."""
+        task.cancel()
+
+    connection.subscriptions[msg_id] = _async_cancel
+    job = get_instance(hass).async_add_reader_job(
+        _ws_stream_significant_states, hass, msg_id, _send_chunk, *args
+    )
+    try:
+        while (chunk := await chunks.get()) is not None:
+            connection.send_message(chunk)
+            async with asyncio.timeout(HISTORY_CHUNK_DRAIN_TIMEOUT):
+                await connection.wait_drained()
+    except TimeoutError:
+        connection.send_error(
+            msg_id,
+            websocket_api.ERR_TIMEOUT,
+            "The client did not read the history in time",
+        )
+    finally:
+        connection.subscriptions.pop(msg_id, None)
+        # Stop the executor at the next chunk and unblock it if it is
+        # waiting to put a chunk
+        cancelled = True
+        while not chunks.empty():
+            chunks.get_nowait()
+        await job
+
+
 @websocket_api.websocket_command(
     {
         vol.Required("type"): "history/history_during_period",
@@ -103,6 +275,9 @@ def _ws_get_significant_states(
         vol.Optional("significant_changes_only", default=True): bool,
         vol.Optional("minimal_response", default=False): bool,
         vol.Optional("no_attributes", default=False): bool,
+        vol.Optional("chunked", default=False): bool,
+        vol.Optional("columnar"): vol.In((COLUMNAR_JSON, COLUMNAR_BASE64)),
+        vol.Optional("max_points"): vol.All(int, vol.Range(min=1)),
     }
 )
 @websocket_api.async_response
@@ -159,9 +334,28 @@ async def ws_get_history_during_period(
 
     significant_changes_only = msg["significant_changes_only"]
     minimal_response = msg["minimal_response"]
+    columnar = msg.get("columnar")
+    max_points = msg.get("max_points")
+
+    # Downsampled states are bounded by max_points so they are never chunked
+    if msg["chunked"] and not max_points:
+        await _async_send_chunked_history(
+            hass,
+            connection,
+            msg["id"],
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+            columnar,
+        )
+        return
 
     connection.send_message(
-        await get_instance(hass).async_add_executor_job(
+        await get_instance(hass).async_add_reader_job(
             _ws_get_significant_states,
             hass,
             msg["id"],
@@ -172,12 +366,14 @@ async def ws_get_history_during_period(
             significant_changes_only,
             minimal_response,
             no_attributes,
+            columnar,
+            max_points,
         )
     )
 
 
 def _generate_stream_message(
-    states: dict[str, list[dict[str, Any]]],
+    states: dict[str, Any],
     start_day: dt,
     end_day: dt,
 ) -> dict[str, Any]:
@@ -205,7 +401,7 @@ def _generate_websocket_response(
     msg_id: int,
     start_time: dt,
     end_time: dt,
-    states: dict[str, list[dict[str, Any]]],
+    states: dict[str, Any],
 ) -> bytes:
     """Generate a websocket response."""
     return json_bytes(
@@ -226,22 +422,20 @@ def _generate_historical_response(
     minimal_response: bool,
     no_attributes: bool,
     send_empty: bool,
+    columnar: str | None,
+    max_points: int | None,
 ) -> tuple[float, dt | None, bytes | None]:
     """Generate a historical response."""
-    states = cast(
-        dict[str, list[dict[str, Any]]],
-        history.get_significant_states(
-            hass,
-            start_time,
-            end_time,
-            entity_ids,
-            None,
-            include_start_time_state,
-            significant_changes_only,
-            minimal_response,
-            no_attributes,
-            True,
-        ),
+    states = _get_compressed_states(
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        no_attributes,
+        max_points,
     )
     last_time_ts = 0.0
     for state_list in states.values():
@@ -265,7 +459,9 @@ def _generate_historical_response(
     return (
         last_time_ts,
         last_time_dt,
-        _generate_websocket_response(msg_id, start_time, last_time_dt, states),
+        _generate_websocket_response(
+            msg_id, start_time, last_time_dt, encode_history(states, columnar)
+        ),
     )
 
 
@@ -281,10 +477,22 @@ async def _async_send_historical_states(
     minimal_response: bool,
     no_attributes: bool,
     send_empty: bool,
+    columnar: str | None,
+    max_points: int | None,
+    read_latest: bool = False,
 ) -> dt | None:
-    """Fetch history significant_states and send them to the client."""
+    """Fetch history significant_states and send them to the client.
+
+    If read_latest is set, the states are read from the recorder connections
+    instead of the readers, since a replica may not have the latest commit.
+    """
     instance = get_instance(hass)
-    last_time_ts, last_time_dt, payload = await instance.async_add_executor_job(
+    add_job = (
+        instance.async_add_executor_job
+        if read_latest
+        else instance.async_add_reader_job
+    )
+    last_time_ts, last_time_dt, payload = await add_job(
         _generate_historical_response,
         hass,
         msg_id,
@@ -296,6 +504,8 @@ async def _async_send_historical_states(
         minimal_response,
         no_attributes,
         send_empty,
+        columnar,
+        max_points,
     )
     if payload:
         connection.send_message(payload)
@@ -333,6 +543,7 @@ async def _async_events_consumer(
     msg_id: int,
     stream_queue: asyncio.Queue[Event],
     no_attributes: bool,
+    columnar: str | None,
 ) -> None:
     """Stream events from the queue."""
     subscriptions_setup_complete_timestamp = (
@@ -357,7 +568,7 @@ async def _async_events_consumer(
                 json_bytes(
                     messages.event_message(
                         msg_id,
-                        {"states": history_states},
+                        {"states": encode_history(history_states, columnar)},
                     )
                 )
             )
@@ -409,6 +620,8 @@ def _async_subscribe_events(
         vol.Optional("significant_changes_only", default=True): bool,
         vol.Optional("minimal_response", default=False): bool,
         vol.Optional("no_attributes", default=False): bool,
+        vol.Optional("columnar"): vol.In((COLUMNAR_JSON, COLUMNAR_BASE64)),
+        vol.Optional("max_points"): vol.All(int, vol.Range(min=1)),
     }
 )
 @websocket_api.async_response
@@ -448,6 +661,8 @@ async def ws_stream(
     significant_changes_only = msg["significant_changes_only"]
     no_attributes = msg["no_attributes"]
     minimal_response = msg["minimal_response"]
+    columnar = msg.get("columnar")
+    max_points = msg.get("max_points")
 
     if end_time and end_time <= utc_now:
         if (
@@ -474,6 +689,8 @@ async def ws_stream(
             minimal_response,
             no_attributes,
             True,
+            columnar,
+            max_points,
         )
         return
 
@@ -538,6 +755,8 @@ async def ws_stream(
         minimal_response,
         no_attributes,
         True,
+        columnar,
+        max_points,
     )
 
     if msg_id not in connection.subscriptions:
@@ -551,6 +770,7 @@ async def ws_stream(
             msg_id,
             stream_queue,
             no_attributes,
+            columnar,
         )
     )
 
@@ -582,4 +802,9 @@ async def ws_stream(
         minimal_response,
         no_attributes,
         send_empty=not last_event_time,
+        columnar=columnar,
+        max_points=max_points,
+        # The states committed before the switch to live may not
+        # have been replayed on a reader replica yet
+        read_latest=True,
     )
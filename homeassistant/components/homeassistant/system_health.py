@@ -7,6 +7,7 @@ from typing import Any
 from homeassistant.components import system_health
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import system_info
+from homeassistant.helpers.template import async_get_bytecode_cache
 
 
 @callback
@@ -20,6 +21,7 @@ def async_register(
 async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
     """Get info for the info page."""
     info = await system_info.async_get_system_info(hass)
+    hit_rate = async_get_bytecode_cache(hass).hit_rate
 
     return {
         "version": f"core-{info.get('version')}",
@@ -35,4 +37,7 @@ async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
         "arch": info.get("arch"),
         "timezone": info.get("timezone"),
         "config_dir": hass.config.config_dir,
+        "template_cache_hit_rate": (
+            f"{hit_rate:.0%}" if hit_rate is not None else None
+        ),
     }
@@ -26,11 +26,17 @@ from homeassistant.core import (
 )
 from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.singleton import singleton
 from homeassistant.util.event_type import EventType
+from homeassistant.util.hass_dict import HassKey
 
 from .const import ALWAYS_CONTINUOUS_DOMAINS, AUTOMATION_EVENTS, BUILT_IN_EVENTS, DOMAIN
 from .models import LogbookConfig
 
+DATA_STATE_CHANGED_FIREHOSE: HassKey[StateChangedFirehose] = HassKey(
+    f"{DOMAIN}_state_changed_firehose"
+)
+
 
 def async_filter_entities(hass: HomeAssistant, entity_ids: list[str]) -> list[str]:
     """Filter out any entities that logbook will not produce results for."""
@@ -207,13 +213,97 @@ def async_subscribe_events(
 
     # We want the firehose
     subscriptions.append(
-        hass.bus.async_listen(
-            EVENT_STATE_CHANGED,
-            _forward_state_events_filtered,
-        )
+        async_get_state_changed_firehose(hass).async_add_target(target, entities_filter)
     )
 
 
+class StateChangedFirehose:
+    """Forward state changed events to the live streams of all entities.
+
+    All the live streams which are not limited to entities or devices
+    share a single state_changed listener, so each event is checked once
+    and then forwarded to every stream instead of every stream checking
+    it again. The streams share the entities filter of the logbook
+    config, so the filter is also evaluated once per group of streams
+    using the same filter.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Init the firehose."""
+        self._hass = hass
+        self._targets: dict[
+            Callable[[str], bool] | None, list[Callable[[Event[Any]], None]]
+        ] = {}
+        # Immutable copy of the targets which is safe to iterate
+        # while a target unsubscribes
+        self._groups: tuple[
+            tuple[
+                Callable[[str], bool] | None, tuple[Callable[[Event[Any]], None], ...]
+            ],
+            ...,
+        ] = ()
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_add_target(
+        self,
+        target: Callable[[Event[Any]], None],
+        entities_filter: Callable[[str], bool] | None,
+    ) -> CALLBACK_TYPE:
+        """Forward the state changed events which pass the filter to target."""
+        self._targets.setdefault(entities_filter, []).append(target)
+        self._async_update_groups()
+        if self._unsub is None:
+            self._unsub = self._hass.bus.async_listen(
+                EVENT_STATE_CHANGED, self._async_forward_state_event
+            )
+
+        @callback
+        def _async_remove_target() -> None:
+            """Stop forwarding events to target."""
+            targets = self._targets[entities_filter]
+            targets.remove(target)
+            if not targets:
+                del self._targets[entities_filter]
+            self._async_update_groups()
+            if not self._targets and self._unsub is not None:
+                self._unsub()
+                self._unsub = None
+
+        return _async_remove_target
+
+    @callback
+    def _async_update_groups(self) -> None:
+        """Update the copy of the targets grouped by filter."""
+        self._groups = tuple(
+            (entities_filter, tuple(targets))
+            for entities_filter, targets in self._targets.items()
+        )
+
+    @callback
+    def _async_forward_state_event(self, event: Event[EventStateChangedData]) -> None:
+        """Filter a state event once and forward it to the targets."""
+        if (old_state := event.data["old_state"]) is None or (
+            new_state := event.data["new_state"]
+        ) is None:
+            return
+        if _is_state_filtered(new_state, old_state):
+            return
+        entity_id = new_state.entity_id
+        for entities_filter, targets in self._groups:
+            if entities_filter and not entities_filter(entity_id):
+                continue
+            for target in targets:
+                target(event)
+
+
+@callback
+@singleton(DATA_STATE_CHANGED_FIREHOSE)
+def async_get_state_changed_firehose(hass: HomeAssistant) -> StateChangedFirehose:
+    """Return the shared state changed firehose."""
+    return StateChangedFirehose(hass)
+
+
 def is_sensor_continuous(
     hass: HomeAssistant, ent_reg: er.EntityRegistry, entity_id: str
 ) -> bool:
@@ -7,6 +7,7 @@ from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import datetime as dt, timedelta
 import logging
+import threading
 from typing import Any
 
 import voluptuous as vol
@@ -35,6 +36,10 @@ EVENT_COALESCE_TIME = 0.35
 BIG_QUERY_HOURS = 25
 # how many hours to deliver in the first chunk when we split the query
 BIG_QUERY_RECENT_HOURS = 24
+# maximum number of events in a message when we deliver historical events
+STREAM_CHUNK_EVENTS = 1000
+# Seconds the client has to read most of a chunk before the stream is stopped
+STREAM_CHUNK_DRAIN_TIMEOUT = 60
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -69,7 +74,9 @@ def _async_send_empty_response(
     """
     connection.send_result(msg_id)
     stream_end_time = end_time or dt_util.utcnow()
-    empty_stream_message = _generate_stream_message([], start_time, stream_end_time)
+    empty_stream_message = _generate_stream_message(
+        [], start_time.timestamp(), stream_end_time.timestamp()
+    )
     empty_response = messages.event_message(msg_id, empty_stream_message)
     connection.send_message(json_bytes(empty_response))
 
@@ -82,7 +89,9 @@ async def _async_send_historical_events(
     end_time: dt,
     event_processor: EventProcessor,
     partial: bool,
+    stop: threading.Event,
     force_send: bool = False,
+    read_latest: bool = False,
 ) -> dt | None:
     """Select historical data from the database and deliver it to the websocket.
 
@@ -93,7 +102,10 @@ async def _async_send_historical_events(
     the data right away.
 
     This function returns the time of the most recent event we sent to the
-    websocket.
+    websocket. Nothing more is fetched or sent once stop is set.
+
+    If read_latest is set, the events are read from the recorder connections
+    instead of the readers, since a replica may not have the latest commit.
     """
     is_big_query = (
         not event_processor.entity_ids
@@ -104,12 +116,17 @@ async def _async_send_historical_events(
     if not is_big_query:
         message, last_event_time = await _async_get_ws_stream_events(
             hass,
+            connection,
             msg_id,
             start_time,
             end_time,
             event_processor,
             partial,
+            stop,
+            read_latest,
         )
+        if stop.is_set():
+            return None
         # If there is no last_event_time, there are no historical
         # results, but we still send an empty message
         # if its the last one (not partial) so
@@ -125,23 +142,33 @@ async def _async_send_historical_events(
     recent_query_start = end_time - timedelta(hours=BIG_QUERY_RECENT_HOURS)
     recent_message, recent_query_last_event_time = await _async_get_ws_stream_events(
         hass,
+        connection,
         msg_id,
         recent_query_start,
         end_time,
         event_processor,
         partial=True,
+        stop=stop,
+        read_latest=read_latest,
     )
+    if stop.is_set():
+        return None
     if recent_query_last_event_time:
         connection.send_message(recent_message)
 
     older_message, older_query_last_event_time = await _async_get_ws_stream_events(
         hass,
+        connection,
         msg_id,
         start_time,
         recent_query_start,
         event_processor,
         partial,
+        stop,
+        read_latest,
     )
+    if stop.is_set():
+        return None
     # If there is no last_event_time, there are no historical
     # results, but we still send an empty message
     # if its the last one (not partial) so
@@ -156,15 +183,58 @@ async def _async_send_historical_events(
 
 async def _async_get_ws_stream_events(
     hass: HomeAssistant,
+    connection: ActiveConnection,
     msg_id: int,
     start_time: dt,
     end_time: dt,
     event_processor: EventProcessor,
     partial: bool,
+    stop: threading.Event,
+    read_latest: bool,
 ) -> tuple[bytes, dt | None]:
-    """Async wrapper around _ws_formatted_get_events."""
-    return await get_instance(hass).async_add_executor_job(
+    """Async wrapper around _ws_stream_get_events."""
+    instance = get_instance(hass)
+
+    async def _async_send_message(message: bytes) -> None:
+        """Send a message unless the stream was stopped."""
+        if stop.is_set():
+            return
+        connection.send_message(message)
+        try:
+            async with asyncio.timeout(STREAM_CHUNK_DRAIN_TIMEOUT):
+                await connection.wait_drained()
+        except TimeoutError:
+            # Ends the subscription and sets stop
+            if unsubscribe := connection.subscriptions.pop(msg_id, None):
+                unsubscribe()
+            stop.set()
+            connection.send_error(
+                msg_id,
+                websocket_api.ERR_TIMEOUT,
+                "The client did not read the logbook in time",
+            )
+
+    def _send_message(message: bytes) -> None:
+        """Send a message from the reader thread.
+
+        The reader thread waits for the client to read most of the
+        pending messages so the chunks do not pile up on a slow client.
+        The stream is stopped when the client does not read them within
+        STREAM_CHUNK_DRAIN_TIMEOUT.
+        """
+        asyncio.run_coroutine_threadsafe(
+            _async_send_message(message), hass.loop
+        ).result()
+
+    add_job = (
+        instance.async_add_executor_job
+        if read_latest
+        else instance.async_add_reader_job
+    )
+    return await add_job(
         _ws_stream_get_events,
+        stop,
+        _send_message,
         msg_id,
         start_time,
         end_time,
@@ -174,29 +244,47 @@ async def _async_get_ws_stream_events(
 
 
 def _generate_stream_message(
-    events: list[dict[str, Any]], start_day: dt, end_day: dt
+    events: list[dict[str, Any]], start_time: float, end_time: float
 ) -> dict[str, Any]:
     """Generate a logbook stream message response."""
     return {
         "events": events,
-        "start_time": start_day.timestamp(),
-        "end_time": end_day.timestamp(),
+        "start_time": start_time,
+        "end_time": end_time,
     }
 
 
 def _ws_stream_get_events(
+    stop: threading.Event,
+    send_message: Callable[[bytes], None],
     msg_id: int,
     start_day: dt,
     end_day: dt,
     event_processor: EventProcessor,
     partial: bool,
 ) -> tuple[bytes, dt | None]:
-    """Fetch events and convert them to json in the executor."""
-    events = event_processor.get_events(start_day, end_day)
-    last_time = None
-    if events:
-        last_time = dt_util.utc_from_timestamp(events[-1]["when"])
-    message = _generate_stream_message(events, start_day, end_day)
+    """Fetch events and convert them to json in the executor.
+
+    Full chunks of STREAM_CHUNK_EVENTS events are sent as partial messages
+    while the rows are still being fetched, the message for the remaining
+    events is returned so the caller can decide if it needs to be sent.
+    The rows are no longer fetched once stop is set.
+    """
+    last_when: float | None = None
+    chunk_start = start_day.timestamp()
+    events: list[dict[str, Any]] = []
+    for events in event_processor.iter_events(start_day, end_day, STREAM_CHUNK_EVENTS):
+        last_when = events[-1]["when"]
+        if len(events) == STREAM_CHUNK_EVENTS:
+            chunk_message = _generate_stream_message(events, chunk_start, last_when)
+            chunk_message["partial"] = True
+            send_message(json_bytes(messages.event_message(msg_id, chunk_message)))
+            if stop.is_set():
+                break
+            chunk_start = last_when
+            events = []
+    last_time = None if last_when is None else dt_util.utc_from_timestamp(last_when)
+    message = _generate_stream_message(events, chunk_start, end_day.timestamp())
     if partial:
         # This is a hint to consumers of the api that
         # we are about to send a another block of historical
@@ -299,9 +387,17 @@ async def ws_event_stream(
         include_entity_name=False,
     )
 
+    # Set on unsubscribe or disconnect to stop fetching historical events
+    stop = threading.Event()
+
+    @callback
+    def _async_stop() -> None:
+        """Stop fetching and sending historical events."""
+        stop.set()
+
     if end_time and end_time <= utc_now:
         # Not live stream but we it might be a big query
-        connection.subscriptions[msg_id] = callback(lambda: None)
+        connection.subscriptions[msg_id] = _async_stop
         connection.send_result(msg_id)
         # Fetch everything from history
         await _async_send_historical_events(
@@ -312,6 +408,7 @@ async def ws_event_stream(
             end_time,
             event_processor,
             partial=False,
+            stop=stop,
         )
         return
 
@@ -366,8 +463,15 @@ async def ws_event_stream(
         entity_ids,
         device_ids,
     )
+
+    @callback
+    def _async_unsubscribe() -> None:
+        """Unsubscribe and stop the historical events on request or disconnect."""
+        _async_stop()
+        _unsub()
+
     subscriptions_setup_complete_time = dt_util.utcnow()
-    connection.subscriptions[msg_id] = _unsub
+    connection.subscriptions[msg_id] = _async_unsubscribe
     connection.send_result(msg_id)
     # Fetch everything from history
     last_event_time = await _async_send_historical_events(
@@ -378,6 +482,7 @@ async def ws_event_stream(
         subscriptions_setup_complete_time,
         event_processor,
         partial=True,
+        stop=stop,
         # Force a send since the wait for the sync task
         # can take a a while if the recorder is busy and
         # we want to make sure the client is not still spinning
@@ -423,6 +528,10 @@ async def ws_event_stream(
         subscriptions_setup_complete_time,
         event_processor,
         partial=False,
+        stop=stop,
+        # The events committed before the switch to live may not
+        # have been replayed on a reader replica yet
+        read_latest=True,
     )
     event_processor.switch_to_live()
 
@@ -501,7 +610,7 @@ async def ws_get_events(
     )
 
     connection.send_message(
-        await get_instance(hass).async_add_executor_job(
+        await get_instance(hass).async_add_reader_job(
             _ws_formatted_get_events,
             msg["id"],
             start_time,
@@ -412,9 +412,16 @@ async def _async_generate_profile(hass: HomeAssistant, call: ServiceCall):
         notification_id=f"profiler_{start_time}",
     )
     profiler = cProfile.Profile()
+    hass.bus.async_count_fan_out(True)
     profiler.enable()
     await asyncio.sleep(float(call.data[CONF_SECONDS]))
     profiler.disable()
+    fan_out = hass.bus.async_fan_out()
+    hass.bus.async_count_fan_out(False)
+    for event_type, dispatched in sorted(
+        fan_out.items(), key=lambda item: item[1], reverse=True
+    ):
+        _LOGGER.critical("Event %s dispatched %s jobs", event_type, dispatched)
 
     cprofile_path = hass.config.path(f"profile.{start_time}.cprof")
     callgrind_path = hass.config.path(f"callgrind.out.{start_time}")
@@ -24,6 +24,7 @@ from homeassistant.helpers.integration_platform import (
     async_process_integration_platforms,
 )
 from homeassistant.helpers.recorder import DATA_INSTANCE
+from homeassistant.helpers.storage import STORAGE_DIR
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.loader import bind_hass
 from homeassistant.util.event_type import EventType
@@ -37,10 +38,18 @@ from . import (
     websocket_api,
 )
 from .const import (  # noqa: F401
+    CONF_CONTINUOUS_PURGE,
+    CONF_DB_BULK_INSERT,
     CONF_DB_INTEGRITY_CHECK,
+    CONF_DB_PARTITION,
+    CONF_DB_READER_URL,
+    CONF_DB_READERS,
+    CONF_SPOOL,
     DOMAIN,
     INTEGRATION_PLATFORM_COMPILE_STATISTICS,
     INTEGRATION_PLATFORM_METHODS,
+    PARTITION_DAY,
+    PARTITION_WEEK,
     SQLITE_URL_PREFIX,
     SupportedDialect,
 )
@@ -58,6 +67,10 @@ DEFAULT_DB_INTEGRITY_CHECK = True
 DEFAULT_DB_MAX_RETRIES = 10
 DEFAULT_DB_RETRY_WAIT = 3
 DEFAULT_COMMIT_INTERVAL = 5
+DEFAULT_SPOOL_DIR = "recorder_spool"
+# Number of reader connections when only db_reader_url is configured
+DEFAULT_DB_READERS = 2
+MAX_DB_READERS = 8
 
 CONF_AUTO_PURGE = "auto_purge"
 CONF_AUTO_REPACK = "auto_repack"
@@ -67,11 +80,16 @@ CONF_DB_RETRY_WAIT = "db_retry_wait"
 CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
 CONF_EVENT_TYPES = "event_types"
+CONF_ATTRIBUTES = "attributes"
 CONF_COMMIT_INTERVAL = "commit_interval"
 
 
 EXCLUDE_SCHEMA = INCLUDE_EXCLUDE_FILTER_SCHEMA_INNER.extend(
-    {vol.Optional(CONF_EVENT_TYPES): vol.All(cv.ensure_list, [cv.string])}
+    {
+        vol.Optional(CONF_EVENT_TYPES): vol.All(cv.ensure_list, [cv.string]),
+        # Attributes which are not recorded for all entities of a domain
+        vol.Optional(CONF_ATTRIBUTES): {cv.slug: vol.All(cv.ensure_list, [cv.string])},
+    }
 )
 
 FILTER_SCHEMA = INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA.extend(
@@ -103,6 +121,7 @@ CONFIG_SCHEMA = vol.Schema(
                 {
                     vol.Optional(CONF_AUTO_PURGE, default=True): cv.boolean,
                     vol.Optional(CONF_AUTO_REPACK, default=True): cv.boolean,
+                    vol.Optional(CONF_CONTINUOUS_PURGE, default=False): cv.boolean,
                     vol.Optional(CONF_PURGE_KEEP_DAYS, default=10): vol.All(
                         vol.Coerce(int), vol.Range(min=1)
                     ),
@@ -120,6 +139,17 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(
                         CONF_DB_INTEGRITY_CHECK, default=DEFAULT_DB_INTEGRITY_CHECK
                     ): cv.boolean,
+                    vol.Optional(CONF_SPOOL, default=False): cv.boolean,
+                    vol.Optional(CONF_DB_BULK_INSERT, default=False): cv.boolean,
+                    vol.Optional(CONF_DB_READER_URL): vol.All(
+                        cv.string, validate_db_url
+                    ),
+                    vol.Optional(CONF_DB_READERS): vol.All(
+                        vol.Coerce(int), vol.Range(min=0, max=MAX_DB_READERS)
+                    ),
+                    vol.Optional(CONF_DB_PARTITION): vol.In(
+                        (PARTITION_DAY, PARTITION_WEEK)
+                    ),
                 }
             ),
         )
@@ -145,6 +175,7 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     entity_filter = None if _filter.empty_filter else _filter.get_filter()
     auto_purge = conf[CONF_AUTO_PURGE]
     auto_repack = conf[CONF_AUTO_REPACK]
+    continuous_purge = conf[CONF_CONTINUOUS_PURGE]
     keep_days = conf[CONF_PURGE_KEEP_DAYS]
     commit_interval = conf[CONF_COMMIT_INTERVAL]
     db_max_retries = conf[CONF_DB_MAX_RETRIES]
@@ -152,6 +183,13 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     db_url = conf.get(CONF_DB_URL) or DEFAULT_URL.format(
         hass_config_path=hass.config.path(DEFAULT_DB_FILE)
     )
+    spool_path = (
+        hass.config.path(STORAGE_DIR, DEFAULT_SPOOL_DIR) if conf[CONF_SPOOL] else None
+    )
+    db_reader_url = conf.get(CONF_DB_READER_URL)
+    db_readers = conf.get(CONF_DB_READERS, DEFAULT_DB_READERS if db_reader_url else 0)
+    db_partition = conf.get(CONF_DB_PARTITION)
+    db_bulk_insert = conf[CONF_DB_BULK_INSERT]
     exclude = conf[CONF_EXCLUDE]
     exclude_event_types: set[EventType[Any] | str] = set(
         exclude.get(CONF_EVENT_TYPES, [])
@@ -159,10 +197,15 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     if EVENT_STATE_CHANGED in exclude_event_types:
         _LOGGER.error("State change events cannot be excluded, use a filter instead")
         exclude_event_types.remove(EVENT_STATE_CHANGED)
+    exclude_attributes = {
+        domain: frozenset(attributes)
+        for domain, attributes in exclude.get(CONF_ATTRIBUTES, {}).items()
+    }
     instance = hass.data[DATA_INSTANCE] = Recorder(
         hass=hass,
         auto_purge=auto_purge,
         auto_repack=auto_repack,
+        continuous_purge=continuous_purge,
         keep_days=keep_days,
         commit_interval=commit_interval,
         uri=db_url,
@@ -170,6 +213,12 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         db_retry_wait=db_retry_wait,
         entity_filter=entity_filter,
         exclude_event_types=exclude_event_types,
+        exclude_attributes=exclude_attributes,
+        spool_path=spool_path,
+        db_reader_url=db_reader_url,
+        db_readers=db_readers,
+        db_partition=db_partition,
+        db_bulk_insert=db_bulk_insert,
     )
     get_instance.cache_clear()
     instance.async_initialize()
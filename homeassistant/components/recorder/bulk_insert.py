@@ -0,0 +1,251 @@
+"""Bulk insert States and Events rows outside of the ORM unit of work."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.orm.session import Session
+
+from homeassistant.core import Event, EventStateChangedData
+
+from .db_schema import (
+    EventData,
+    Events,
+    EventTypes,
+    StateAttributes,
+    States,
+    StatesMeta,
+)
+from .models import ulid_to_bytes_or_none, uuid_hex_to_bytes_or_none
+
+
+class PendingState:
+    """A States row waiting to be inserted in bulk.
+
+    The attributes mirror the ones of States which are set by the
+    recorder when processing a state_changed event, so the recorder
+    can treat both the same way.
+    """
+
+    __slots__ = (
+        "attributes_id",
+        "context_id_bin",
+        "context_parent_id_bin",
+        "context_user_id_bin",
+        "entity_id",
+        "generation",
+        "last_changed_ts",
+        "last_reported_ts",
+        "last_updated_ts",
+        "metadata_id",
+        "old_state",
+        "old_state_id",
+        "origin_idx",
+        "state",
+        "state_attributes",
+        "state_id",
+        "states_meta_rel",
+    )
+
+    def __init__(self, event: Event[EventStateChangedData]) -> None:
+        """Create a pending state from a state_changed event.
+
+        Must be kept in sync with States.from_event.
+        """
+        state = event.data["new_state"]
+        # None state means the state was removed from the state machine
+        if state is None:
+            self.state: str | None = ""
+            self.last_updated_ts: float | None = event.time_fired_timestamp
+            self.last_changed_ts: float | None = None
+            self.last_reported_ts: float | None = None
+        else:
+            self.state = state.state
+            self.last_updated_ts = state.last_updated_timestamp
+            if state.last_updated == state.last_changed:
+                self.last_changed_ts = None
+            else:
+                self.last_changed_ts = state.last_changed_timestamp
+            if state.last_updated == state.last_reported:
+                self.last_reported_ts = None
+            else:
+                self.last_reported_ts = state.last_reported_timestamp
+        context = event.context
+        self.entity_id: str | None = event.data["entity_id"]
+        self.context_id_bin = ulid_to_bytes_or_none(context.id)
+        self.context_user_id_bin = uuid_hex_to_bytes_or_none(context.user_id)
+        self.context_parent_id_bin = ulid_to_bytes_or_none(context.parent_id)
+        self.origin_idx = event.origin.idx
+        self.state_id: int | None = None
+        self.old_state: States | PendingState | None = None
+        self.old_state_id: int | None = None
+        self.state_attributes: StateAttributes | None = None
+        self.attributes_id: int | None = None
+        self.states_meta_rel: StatesMeta | None = None
+        self.metadata_id: int | None = None
+        # Number of earlier states of the entity in the same bulk insert
+        self.generation = 0
+
+    def as_row(self) -> dict[str, Any]:
+        """Return the values to insert once the referenced rows have ids."""
+        old_state = self.old_state
+        state_attributes = self.state_attributes
+        states_meta = self.states_meta_rel
+        return {
+            "entity_id": self.entity_id,
+            "state": self.state,
+            "last_changed_ts": self.last_changed_ts,
+            "last_reported_ts": self.last_reported_ts,
+            "last_updated_ts": self.last_updated_ts,
+            "old_state_id": self.old_state_id
+            if old_state is None
+            else old_state.state_id,
+            "attributes_id": self.attributes_id
+            if state_attributes is None
+            else state_attributes.attributes_id,
+            "origin_idx": self.origin_idx,
+            "context_id_bin": self.context_id_bin,
+            "context_user_id_bin": self.context_user_id_bin,
+            "context_parent_id_bin": self.context_parent_id_bin,
+            "metadata_id": self.metadata_id
+            if states_meta is None
+            else states_meta.metadata_id,
+        }
+
+
+class PendingEvent:
+    """An Events row waiting to be inserted in bulk.
+
+    The attributes mirror the ones of Events which are set by the
+    recorder when processing an event.
+    """
+
+    __slots__ = (
+        "context_id_bin",
+        "context_parent_id_bin",
+        "context_user_id_bin",
+        "data_id",
+        "event_data_rel",
+        "event_type_id",
+        "event_type_rel",
+        "origin_idx",
+        "time_fired_ts",
+    )
+
+    def __init__(self, event: Event) -> None:
+        """Create a pending event from an event.
+
+        Must be kept in sync with Events.from_event.
+        """
+        context = event.context
+        self.origin_idx = event.origin.idx
+        self.time_fired_ts = event.time_fired_timestamp
+        self.context_id_bin = ulid_to_bytes_or_none(context.id)
+        self.context_user_id_bin = uuid_hex_to_bytes_or_none(context.user_id)
+        self.context_parent_id_bin = ulid_to_bytes_or_none(context.parent_id)
+        self.event_type_rel: EventTypes | None = None
+        self.event_type_id: int | None = None
+        self.event_data_rel: EventData | None = None
+        self.data_id: int | None = None
+
+    def as_row(self) -> dict[str, Any]:
+        """Return the values to insert once the referenced rows have ids."""
+        event_type = self.event_type_rel
+        event_data = self.event_data_rel
+        return {
+            "origin_idx": self.origin_idx,
+            "time_fired_ts": self.time_fired_ts,
+            "context_id_bin": self.context_id_bin,
+            "context_user_id_bin": self.context_user_id_bin,
+            "context_parent_id_bin": self.context_parent_id_bin,
+            "event_type_id": self.event_type_id
+            if event_type is None
+            else event_type.event_type_id,
+            "data_id": self.data_id if event_data is None else event_data.data_id,
+        }
+
+
+class BulkInsert:
+    """Collect States and Events rows and insert them in bulk on commit.
+
+    Adding rows one by one to the session makes the ORM unit of work the
+    main cost of the recorder thread when many states change. The rows
+    which are referenced by many states or events, such as StatesMeta and
+    StateAttributes, are rare and still added to the session. The States
+    and Events rows are kept as plain objects and inserted with a few
+    executemany statements when the session is committed.
+
+    States reference the previous state of the entity by its state_id.
+    The state_ids are returned by the insert, so states which follow
+    another state of the same entity in the same commit are inserted in
+    a later statement. This requires INSERT .. RETURNING with executemany,
+    which is not supported by all dialects.
+    """
+
+    __slots__ = ("_events", "_states")
+
+    def __init__(self) -> None:
+        """Initialize the bulk insert."""
+        self._states: list[PendingState] = []
+        self._events: list[PendingEvent] = []
+
+    def add_state(self, state: PendingState) -> None:
+        """Add a state to insert on the next flush.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if type(old_state := state.old_state) is PendingState:
+            state.generation = old_state.generation + 1
+        self._states.append(state)
+
+    def add_event(self, event: PendingEvent) -> None:
+        """Add an event to insert on the next flush.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._events.append(event)
+
+    def flush(self, session: Session) -> None:
+        """Insert the pending rows.
+
+        The rows referenced by the pending rows are flushed first so
+        they have their ids.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if not self._states and not self._events:
+            return
+        states, self._states = self._states, []
+        events, self._events = self._events, []
+        session.flush()
+        if events:
+            session.execute(insert(Events), [event.as_row() for event in events])
+        if not states:
+            return
+        generations: list[list[PendingState]] = [[]]
+        for state in states:
+            while len(generations) <= state.generation:
+                generations.append([])
+            generations[state.generation].append(state)
+        stmt = insert(States).returning(States.state_id, sort_by_parameter_order=True)
+        for generation_states in generations:
+            result = session.execute(
+                stmt, [state.as_row() for state in generation_states]
+            )
+            for state, state_id in zip(
+                generation_states, result.scalars(), strict=True
+            ):
+                state.state_id = state_id
+
+    def reset(self) -> None:
+        """Drop the pending rows after the session was rolled back.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._states.clear()
+        self._events.clear()
@@ -25,16 +25,28 @@ MYSQLDB_URL_PREFIX = "mysql://"
 MYSQLDB_PYMYSQL_URL_PREFIX = "mysql+pymysql://"
 DOMAIN = "recorder"
 
+CONF_CONTINUOUS_PURGE = "continuous_purge"
+CONF_DB_BULK_INSERT = "db_bulk_insert"
 CONF_DB_INTEGRITY_CHECK = "db_integrity_check"
+CONF_DB_PARTITION = "db_partition"
+CONF_DB_READER_URL = "db_reader_url"
+CONF_DB_READERS = "db_readers"
+CONF_SPOOL = "spool"
 
 MAX_QUEUE_BACKLOG_MIN_VALUE = 65000
 MIN_AVAILABLE_MEMORY_FOR_QUEUE_BACKLOG = 256 * 1024**2
+# Spool events to disk instead of queueing them once the queue is this long
+SPOOL_QUEUE_BACKLOG = 20000
+
+PARTITION_DAY = "day"
+PARTITION_WEEK = "week"
 
 # The maximum number of rows (events) we purge in one delete statement
 
 DEFAULT_MAX_BIND_VARS = 4000
 
 DB_WORKER_PREFIX = "DbWorker"
+DB_READER_PREFIX = "DbReader"
 
 ALL_DOMAIN_EXCLUDE_ATTRS = {ATTR_ATTRIBUTION, ATTR_RESTORED, ATTR_SUPPORTED_FEATURES}
 
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import asyncio
 from collections.abc import Callable, Iterable
-from concurrent.futures import CancelledError
+from concurrent.futures import CancelledError, Future
 import contextlib
 from datetime import datetime, timedelta
 import logging
@@ -49,8 +49,10 @@ from homeassistant.util import dt as dt_util
 from homeassistant.util.enum import try_parse_enum
 from homeassistant.util.event_type import EventType
 
-from . import migration, statistics
+from . import migration, partition, statistics
+from .bulk_insert import BulkInsert, PendingEvent, PendingState
 from .const import (
+    DB_READER_PREFIX,
     DB_WORKER_PREFIX,
     DEFAULT_MAX_BIND_VARS,
     DOMAIN,
@@ -62,6 +64,7 @@ from .const import (
     MIN_AVAILABLE_MEMORY_FOR_QUEUE_BACKLOG,
     MYSQLDB_PYMYSQL_URL_PREFIX,
     MYSQLDB_URL_PREFIX,
+    SPOOL_QUEUE_BACKLOG,
     SQLITE_URL_PREFIX,
     SupportedDialect,
 )
@@ -80,6 +83,8 @@ from .db_schema import (
 from .executor import DBInterruptibleThreadPoolExecutor
 from .models import DatabaseEngine, StatisticData, StatisticMetaData, UnsupportedDialect
 from .pool import POOL_SIZE, MutexPool, RecorderPool
+from .purge import PurgeProgress
+from .spool import RecorderSpool
 from .table_managers.event_data import EventDataManager
 from .table_managers.event_types import EventTypeManager
 from .table_managers.recorder_runs import RecorderRunsManager
@@ -97,9 +102,11 @@ from .tasks import (
     DatabaseLockTask,
     ImportStatisticsTask,
     KeepAliveTask,
+    PartitionTask,
     PerodicCleanupTask,
     PurgeTask,
     RecorderTask,
+    SpoolDrainTask,
     StatisticsTask,
     StopTask,
     SynchronizeTask,
@@ -112,6 +119,7 @@ from .util import (
     build_mysqldb_conv,
     dburl_to_path,
     end_incomplete_runs,
+    execute_on_connection,
     is_second_sunday,
     move_away_broken_database,
     session_scope,
@@ -139,6 +147,7 @@ DB_LOCK_TIMEOUT = 30
 DB_LOCK_QUEUE_CHECK_TIMEOUT = 10  # check every 10 seconds
 
 QUEUE_CHECK_INTERVAL = timedelta(minutes=5)
+SPOOL_QUEUE_CHECK_INTERVAL = timedelta(seconds=30)
 
 INVALIDATED_ERR = "Database connection invalidated"
 CONNECTIVITY_ERR = "Error in database connectivity during commit"
@@ -157,6 +166,7 @@ class Recorder(threading.Thread):
         hass: HomeAssistant,
         auto_purge: bool,
         auto_repack: bool,
+        continuous_purge: bool,
         keep_days: int,
         commit_interval: int,
         uri: str,
@@ -164,6 +174,12 @@ class Recorder(threading.Thread):
         db_retry_wait: int,
         entity_filter: Callable[[str], bool] | None,
         exclude_event_types: set[EventType[Any] | str],
+        exclude_attributes: dict[str, frozenset[str]],
+        spool_path: str | None,
+        db_reader_url: str | None,
+        db_readers: int,
+        db_partition: str | None,
+        db_bulk_insert: bool,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -173,6 +189,7 @@ class Recorder(threading.Thread):
         self.recorder_and_worker_thread_ids: set[int] = set()
         self.auto_purge = auto_purge
         self.auto_repack = auto_repack
+        self.continuous_purge = continuous_purge
         self.keep_days = keep_days
         self.is_running: bool = False
         self._hass_started: asyncio.Future[object] = hass.loop.create_future()
@@ -181,6 +198,13 @@ class Recorder(threading.Thread):
         self.db_url = uri
         self.db_max_retries = db_max_retries
         self.db_retry_wait = db_retry_wait
+        self.db_reader_url = db_reader_url
+        self.db_readers = db_readers
+        self.reader_thread_ids: set[int] = set()
+        self.db_partition = db_partition
+        self.db_bulk_insert = db_bulk_insert
+        # Set once the tables are partitioned and the partitions are created
+        self.partitioned = False
         self.database_engine: DatabaseEngine | None = None
         # Database connection is ready, but non-live migration may be in progress
         db_connected: asyncio.Future[bool] = hass.data[DOMAIN].db_connected
@@ -191,6 +215,7 @@ class Recorder(threading.Thread):
         self.async_recorder_ready = asyncio.Event()
         self._queue_watch = threading.Event()
         self.engine: Engine | None = None
+        self.reader_engine: Engine | None = None
         self.max_backlog: int = MAX_QUEUE_BACKLOG_MIN_VALUE
         self._psutil: ha_psutil.PsutilWrapper | None = None
 
@@ -199,11 +224,16 @@ class Recorder(threading.Thread):
         # by is_entity_recorder and the sensor recorder.
         self.entity_filter = entity_filter
         self.exclude_event_types = exclude_event_types
+        # Attributes which are not recorded for the entities of a domain
+        # in addition to the unrecorded attributes of the entities
+        self.exclude_attributes = exclude_attributes
+        self._spool = RecorderSpool(spool_path) if spool_path else None
 
         self.schema_version = 0
         self._commits_without_expire = 0
         self._event_session_has_pending_writes = False
 
+        self.purge_progress = PurgeProgress()
         self.recorder_runs_manager = RecorderRunsManager()
         self.states_manager = StatesManager()
         self.event_data_manager = EventDataManager(self)
@@ -213,13 +243,17 @@ class Recorder(threading.Thread):
         self.statistics_meta_manager = StatisticsMetaManager(self)
 
         self.event_session: Session | None = None
+        # Set when the database supports inserting States and Events in bulk
+        self._bulk_insert: BulkInsert | None = None
         self._get_session: Callable[[], Session] | None = None
+        self._get_read_session: Callable[[], Session] | None = None
         self._completed_first_database_setup: bool | None = None
         self.migration_in_progress = False
         self.migration_is_live = False
         self.use_legacy_events_index = False
         self._database_lock_task: DatabaseLockTask | None = None
         self._db_executor: DBInterruptibleThreadPoolExecutor | None = None
+        self._reader_executor: DBInterruptibleThreadPoolExecutor | None = None
 
         self._event_listener: CALLBACK_TYPE | None = None
         self._queue_watcher: CALLBACK_TYPE | None = None
@@ -262,6 +296,20 @@ class Recorder(threading.Thread):
             raise RuntimeError("The database connection has not been established")
         return self._get_session()
 
+    def get_read_session(self) -> Session:
+        """Get a new sqlalchemy session for reading.
+
+        Jobs running in the reader executor read from the reader
+        connections, everything else uses the same connections as
+        get_session.
+        """
+        if (
+            self._get_read_session is not None
+            and threading.get_ident() in self.reader_thread_ids
+        ):
+            return self._get_read_session()
+        return self.get_session()
+
     def queue_task(self, task: RecorderTask | Event) -> None:
         """Add a task to the recorder queue."""
         self._queue.put(task)
@@ -279,18 +327,45 @@ class Recorder(threading.Thread):
             max_workers=MAX_DB_EXECUTOR_WORKERS,
             shutdown_hook=self._shutdown_pool,
         )
+        if self.db_readers:
+            self._reader_executor = DBInterruptibleThreadPoolExecutor(
+                self.reader_thread_ids,
+                thread_name_prefix=DB_READER_PREFIX,
+                max_workers=self.db_readers,
+                shutdown_hook=self._shutdown_reader_pool,
+            )
 
     def _shutdown_pool(self) -> None:
         """Close the dbpool connections in the current thread."""
         if self.engine and hasattr(self.engine.pool, "shutdown"):
             self.engine.pool.shutdown()
 
+    def _shutdown_reader_pool(self) -> None:
+        """Close the reader dbpool connections in the current thread."""
+        if self.reader_engine and hasattr(self.reader_engine.pool, "shutdown"):
+            self.reader_engine.pool.shutdown()
+
     @callback
     def async_initialize(self) -> None:
         """Initialize the recorder."""
+        self._async_listen_events(self._queue.put_nowait)
+        self._queue_watcher = async_track_time_interval(
+            self.hass,
+            self._async_check_queue,
+            SPOOL_QUEUE_CHECK_INTERVAL if self._spool else QUEUE_CHECK_INTERVAL,
+            name="Recorder queue watcher",
+        )
+        if self._spool is not None:
+            # Insert the events left in the spool by a previous run first
+            self.queue_task(SpoolDrainTask(self._spool.async_seal()))
+
+    @callback
+    def _async_listen_events(self, queue_put: Callable[[Event], None]) -> None:
+        """Listen for new events and pass them to queue_put."""
         entity_filter = self.entity_filter
         exclude_event_types = self.exclude_event_types
-        queue_put = self._queue.put_nowait
+        if self._event_listener:
+            self._event_listener()
 
         @callback
         def _event_listener(event: Event) -> None:
@@ -323,12 +398,6 @@ class Recorder(threading.Thread):
             MATCH_ALL,
             _event_listener,
         )
-        self._queue_watcher = async_track_time_interval(
-            self.hass,
-            self._async_check_queue,
-            QUEUE_CHECK_INTERVAL,
-            name="Recorder queue watcher",
-        )
 
     @callback
     def _async_keep_alive(self, now: datetime) -> None:
@@ -353,6 +422,22 @@ class Recorder(threading.Thread):
         """Add an executor job from within the event loop."""
         return self.hass.loop.run_in_executor(self._db_executor, target, *args)
 
+    @callback
+    def async_add_reader_job[_T](
+        self, target: Callable[..., _T], *args: Any
+    ) -> asyncio.Future[_T]:
+        """Add a job which only reads from the database from within the event loop.
+
+        The job runs in the reader executor when readers are configured
+        so long running queries do not hold the workers of the database
+        executor, and sessions from get_read_session use the reader
+        connections. A replica may lag behind the recorder, queries which
+        must see the latest commit have to use async_add_executor_job.
+        """
+        return self.hass.loop.run_in_executor(
+            self._reader_executor or self._db_executor, target, *args
+        )
+
     @callback
     def _async_check_queue(self, *_: Any) -> None:
         """Periodic check of the queue size to ensure we do not exhaust memory.
@@ -360,6 +445,19 @@ class Recorder(threading.Thread):
         The queue grows during migration or if something really goes wrong.
         """
         _LOGGER.debug("Recorder queue size is: %s", self.backlog)
+        if (spool := self._spool) is not None:
+            if spool.active:
+                spool.async_flush()
+            elif self._event_listener and self.backlog >= SPOOL_QUEUE_BACKLOG:
+                _LOGGER.warning(
+                    "The recorder backlog queue reached %s events; the recorder "
+                    "will spool events to disk until the database catches up",
+                    self.backlog,
+                )
+                spool.active = True
+                self._async_listen_events(spool.async_append)
+                self.queue_task(SpoolDrainTask(spool.async_seal()))
+                return
         if not self._reached_max_backlog():
             return
         _LOGGER.error(
@@ -440,8 +538,30 @@ class Recorder(threading.Thread):
             self._hass_started.set_result(SHUTDOWN_TASK)
         self.queue_task(StopTask())
         self._async_stop_listeners()
+        if (spool := self._spool) is not None:
+            if spool.active:
+                # The spooled events are inserted on the next start
+                spool.async_seal()
+            await self.hass.async_add_executor_job(spool.shutdown)
         await self.hass.async_add_executor_job(self.join)
 
+    @callback
+    def _async_spool_drained(self) -> None:
+        """Queue events again once the spooled events are inserted.
+
+        The events spooled while the spool was drained are inserted
+        by another drain task, which is queued before the events which
+        are queued from now on.
+        """
+        if (spool := self._spool) is None or not spool.active:
+            return
+        if not self._event_listener:
+            # Shutting down, the spooled events are inserted on the next start
+            return
+        spool.active = False
+        self._async_listen_events(self._queue.put_nowait)
+        self.queue_task(SpoolDrainTask(spool.async_seal()))
+
     @callback
     def _async_hass_started(self, hass: HomeAssistant) -> None:
         """Notify that hass has started."""
@@ -501,11 +621,15 @@ class Recorder(threading.Thread):
         Called after all migration steps are finished.
         """
         self._async_setup_periodic_tasks()
+        if self.db_partition:
+            self.queue_task(PartitionTask())
         self.async_recorder_ready.set()
 
     @callback
     def async_nightly_tasks(self, now: datetime) -> None:
         """Trigger the purge."""
+        if self.partitioned:
+            self.queue_task(PartitionTask())
         if self.auto_purge:
             # Purge will schedule the periodic cleanups
             # after it completes to ensure it does not happen
@@ -521,6 +645,47 @@ class Recorder(threading.Thread):
         """Run tasks every five minutes."""
         self.queue_task(ADJUST_LRU_SIZE_TASK)
         self.async_periodic_statistics()
+        if self.auto_purge and self.continuous_purge:
+            self.async_continuous_purge()
+
+    @callback
+    def async_continuous_purge(self) -> None:
+        """Trigger a low priority purge unless a purge is running.
+
+        The nightly purge still runs to repack the database
+        and do the periodic cleanups.
+        """
+        if self.purge_progress.running:
+            return
+        purge_before = dt_util.utcnow() - timedelta(days=self.keep_days)
+        self.queue_task(
+            PurgeTask(purge_before, repack=False, apply_filter=False, low_priority=True)
+        )
+
+    def _maintain_partitions(self) -> None:
+        """Create the upcoming partitions."""
+        assert self.db_partition is not None
+        if self.dialect_name is not SupportedDialect.POSTGRESQL:
+            _LOGGER.warning(
+                "Partitioned tables are only supported with PostgreSQL,"
+                " the db_partition option is ignored"
+            )
+            return
+        now = dt_util.utcnow()
+        with session_scope(session=self.get_session()) as session:
+            # The tables are converted by the partitioned tables migration
+            if not all(
+                partition.is_partitioned(session, table)
+                for table in partition.PARTITIONED_TABLES
+            ):
+                _LOGGER.error(
+                    "The tables were not converted to partitioned tables,"
+                    " no partitions are created"
+                )
+                return
+            for table in partition.PARTITIONED_TABLES:
+                partition.create_partitions(session, table, self.db_partition, now)
+        self.partitioned = True
 
     def _adjust_lru_size(self) -> None:
         """Trigger the LRU adjustment.
@@ -1023,22 +1188,68 @@ class Recorder(threading.Thread):
             self.backlog,
         )
 
+    def _drain_spool(self, sealed: Future[list[str]]) -> None:
+        """Insert the events spooled to disk.
+
+        Only the segments which were sealed when the drain was queued are
+        inserted, the segments sealed later are inserted by the next drain.
+        """
+        spool = self._spool
+        assert spool is not None
+        try:
+            for segment in sealed.result():
+                _LOGGER.debug("Inserting spooled events from %s", segment)
+                if self.enabled:
+                    for event in spool.read_segment(segment):
+                        self._process_event_into_session(event)
+                # The segment is only removed once its events are committed,
+                # if the commit fails they are rolled back and the segment is
+                # inserted again by the next drain
+                self._commit_event_session_or_retry()
+                spool.remove_segment(segment)
+        finally:
+            self.hass.add_job(self._async_spool_drained)
+
     def _process_one_event(self, event: Event[Any]) -> None:
         if not self.enabled:
             return
+        self._process_event_into_session(event)
+        # Commit if the commit interval is zero
+        if not self.commit_interval:
+            self._commit_event_session_or_retry()
+
+    def _process_event_into_session(self, event: Event[Any]) -> None:
+        """Process an event into the session."""
         if event.event_type == EVENT_STATE_CHANGED:
             self._process_state_changed_event_into_session(event)
         else:
             self._process_non_state_changed_event_into_session(event)
-        # Commit if the commit interval is zero
-        if not self.commit_interval:
-            self._commit_event_session_or_retry()
+
+    def _add_event_to_session(self, session: Session, dbevent: Events) -> None:
+        """Add an Events row to the session or the bulk insert."""
+        if (bulk_insert := self._bulk_insert) is None:
+            self._add_to_session(session, dbevent)
+            return
+        self._event_session_has_pending_writes = True
+        bulk_insert.add_event(cast(PendingEvent, dbevent))
+
+    def _add_state_to_session(self, session: Session, dbstate: States) -> None:
+        """Add a States row to the session or the bulk insert."""
+        if (bulk_insert := self._bulk_insert) is None:
+            self._add_to_session(session, dbstate)
+            return
+        self._event_session_has_pending_writes = True
+        bulk_insert.add_state(cast(PendingState, dbstate))
 
     def _process_non_state_changed_event_into_session(self, event: Event) -> None:
         """Process any event into the session except state changed."""
         session = self.event_session
         assert session is not None
-        dbevent = Events.from_event(event)
+        if self._bulk_insert is None:
+            dbevent = Events.from_event(event)
+        else:
+            # PendingEvent has the attributes of Events which are set below
+            dbevent = cast(Events, PendingEvent(event))
 
         # Map the event_type to the EventTypes table
         event_type_manager = self.event_type_manager
@@ -1053,7 +1264,7 @@ class Recorder(threading.Thread):
             dbevent.event_type_rel = event_types
 
         if not event.data:
-            self._add_to_session(session, dbevent)
+            self._add_event_to_session(session, dbevent)
             return
 
         event_data_manager = self.event_data_manager
@@ -1078,7 +1289,7 @@ class Recorder(threading.Thread):
             self._add_to_session(session, dbevent_data)
             dbevent.event_data_rel = dbevent_data
 
-        self._add_to_session(session, dbevent)
+        self._add_event_to_session(session, dbevent)
 
     def _process_state_changed_event_into_session(
         self, event: Event[EventStateChangedData]
@@ -1089,7 +1300,11 @@ class Recorder(threading.Thread):
         entity_removed = not event.data.get("new_state")
         entity_id = event.data["entity_id"]
 
-        dbstate = States.from_event(event)
+        if self._bulk_insert is None:
+            dbstate = States.from_event(event)
+        else:
+            # PendingState has the attributes of States which are set below
+            dbstate = cast(States, PendingState(event))
         old_state = event.data["old_state"]
 
         assert self.event_session is not None
@@ -1108,8 +1323,6 @@ class Recorder(threading.Thread):
                 )
         if entity_removed:
             dbstate.state = None
-        else:
-            states_manager.add_pending(entity_id, dbstate)
 
         if states_meta_manager.active:
             dbstate.entity_id = None
@@ -1160,7 +1373,12 @@ class Recorder(threading.Thread):
             self._add_to_session(session, dbstate_attributes)
             dbstate.state_attributes = dbstate_attributes
 
-        self._add_to_session(session, dbstate)
+        # The state is only registered as pending once it is part of the
+        # commit, so the next state of the entity never refers to a row
+        # which is not inserted
+        if not entity_removed:
+            states_manager.add_pending(entity_id, dbstate)
+        self._add_state_to_session(session, dbstate)
 
     def _handle_database_error(self, err: Exception, *, setup_run: bool) -> bool:
         """Handle a database error that may result in moving away the corrupt db."""
@@ -1208,6 +1426,9 @@ class Recorder(threading.Thread):
         session = self.event_session
         self._commits_without_expire += 1
 
+        if self._bulk_insert is not None:
+            self._bulk_insert.flush(session)
+
         if (
             pending_last_reported
             := self.states_manager.get_pending_last_reported_timestamp()
@@ -1263,6 +1484,8 @@ class Recorder(threading.Thread):
         self.event_type_manager.reset()
         self.states_meta_manager.reset()
         self.statistics_meta_manager.reset()
+        if self._bulk_insert is not None:
+            self._bulk_insert.reset()
 
         if not self.event_session:
             return
@@ -1375,24 +1598,40 @@ class Recorder(threading.Thread):
         ):
             self.database_engine = database_engine
             self.max_bind_vars = database_engine.max_bind_vars
+            self._bulk_insert = (
+                BulkInsert()
+                if self.db_bulk_insert and database_engine.bulk_insert
+                else None
+            )
         self._completed_first_database_setup = True
 
-    def _setup_connection(self) -> None:
-        """Ensure database is ready to fly."""
+    def _setup_reader_connection(
+        self, dbapi_connection: DBAPIConnection, connection_record: Any
+    ) -> None:
+        """Dbapi specific connection settings for the reader connections."""
+        assert self.reader_engine is not None
+        dialect_name = self.reader_engine.dialect.name
+        setup_connection_for_dialect(self, dialect_name, dbapi_connection, False)
+        if dialect_name == SupportedDialect.SQLITE:
+            # Readers must never take the write lock of the database
+            execute_on_connection(dbapi_connection, "PRAGMA query_only=ON")
+
+    def _engine_kwargs(self, db_url: str, thread_ids: set[int]) -> dict[str, Any]:
+        """Return the arguments to create an engine for a database url.
+
+        thread_ids are the threads which keep their connection open
+        to a SQLite database.
+        """
         kwargs: dict[str, Any] = {}
-        self._completed_first_database_setup = False
-
-        if self.db_url == SQLITE_URL_PREFIX or ":memory:" in self.db_url:
+        if db_url == SQLITE_URL_PREFIX or ":memory:" in db_url:
             kwargs["connect_args"] = {"check_same_thread": False}
             kwargs["poolclass"] = MutexPool
             MutexPool.pool_lock = threading.RLock()
             kwargs["pool_reset_on_return"] = None
-        elif self.db_url.startswith(SQLITE_URL_PREFIX):
+        elif db_url.startswith(SQLITE_URL_PREFIX):
             kwargs["poolclass"] = RecorderPool
-            kwargs["recorder_and_worker_thread_ids"] = (
-                self.recorder_and_worker_thread_ids
-            )
-        elif self.db_url.startswith(
+            kwargs["recorder_and_worker_thread_ids"] = thread_ids
+        elif db_url.startswith(
             (
                 MARIADB_URL_PREFIX,
                 MARIADB_PYMYSQL_URL_PREFIX,
@@ -1401,7 +1640,7 @@ class Recorder(threading.Thread):
             )
         ):
             kwargs["connect_args"] = {"charset": "utf8mb4"}
-            if self.db_url.startswith((MARIADB_URL_PREFIX, MYSQLDB_URL_PREFIX)):
+            if db_url.startswith((MARIADB_URL_PREFIX, MYSQLDB_URL_PREFIX)):
                 # If they have configured MySQLDB but don't have
                 # the MySQLDB module installed this will throw
                 # an ImportError which we suppress here since
@@ -1411,8 +1650,14 @@ class Recorder(threading.Thread):
                     kwargs["connect_args"]["conv"] = build_mysqldb_conv()
 
         # Disable extended logging for non SQLite databases
-        if not self.db_url.startswith(SQLITE_URL_PREFIX):
+        if not db_url.startswith(SQLITE_URL_PREFIX):
             kwargs["echo"] = False
+        return kwargs
+
+    def _setup_connection(self) -> None:
+        """Ensure database is ready to fly."""
+        self._completed_first_database_setup = False
+        kwargs = self._engine_kwargs(self.db_url, self.recorder_and_worker_thread_ids)
 
         if self._using_file_sqlite:
             validate_or_move_away_sqlite_database(self.db_url)
@@ -1427,6 +1672,39 @@ class Recorder(threading.Thread):
         Base.metadata.create_all(self.engine)
         self._get_session = scoped_session(sessionmaker(bind=self.engine, future=True))
         _LOGGER.debug("Connected to recorder database")
+        if self.db_readers:
+            self._setup_reader_engine()
+
+    def _setup_reader_engine(self) -> None:
+        """Create the engine of the reader connections.
+
+        The readers connect to the replica at db_reader_url, or open
+        their own connections to the recorder database. An in-memory
+        SQLite database can not be shared, so the readers use the
+        recorder connections instead.
+        """
+        assert self.engine is not None
+        reader_url = self.db_reader_url or self.db_url
+        if reader_url == SQLITE_URL_PREFIX or ":memory:" in reader_url:
+            return
+        reader_engine = create_engine(
+            reader_url,
+            **self._engine_kwargs(reader_url, self.reader_thread_ids),
+            future=True,
+        )
+        if reader_engine.dialect.name != self.engine.dialect.name:
+            _LOGGER.error(
+                "The reader database must use the same database engine as the "
+                "recorder database (%s), reading from the recorder database instead",
+                self.engine.dialect.name,
+            )
+            reader_engine.dispose()
+            return
+        self.reader_engine = reader_engine
+        sqlalchemy_event.listen(reader_engine, "connect", self._setup_reader_connection)
+        self._get_read_session = scoped_session(
+            sessionmaker(bind=reader_engine, future=True)
+        )
 
     def _close_connection(self) -> None:
         """Close the connection."""
@@ -1434,6 +1712,10 @@ class Recorder(threading.Thread):
             self.engine.dispose()
             self.engine = None
         self._get_session = None
+        if self.reader_engine:
+            self.reader_engine.dispose()
+            self.reader_engine = None
+        self._get_read_session = None
 
     def _setup_run(self) -> None:
         """Log the start of the current run and schedule any needed jobs."""
@@ -1480,13 +1762,18 @@ class Recorder(threading.Thread):
         try:
             self._end_session()
         finally:
-            if self._db_executor:
+            executors = [
+                executor
+                for executor in (self._db_executor, self._reader_executor)
+                if executor
+            ]
+            for executor in executors:
                 # We shutdown the executor without forcefully
                 # joining the threads until after we have tried
                 # to cleanly close the connection.
-                self._db_executor.shutdown(join_threads_or_timeout=False)
+                executor.shutdown(join_threads_or_timeout=False)
             self._close_connection()
-            if self._db_executor:
+            for executor in executors:
                 # After the connection is closed, we can join the threads
                 # or forcefully shutdown the threads if they take too long.
-                self._db_executor.join_threads_or_timeout()
+                executor.join_threads_or_timeout()
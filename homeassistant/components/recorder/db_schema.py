@@ -621,6 +621,8 @@ class StateAttributes(Base):
     attributes_id: Mapped[int] = mapped_column(ID_TYPE, Identity(), primary_key=True)
     hash: Mapped[int | None] = mapped_column(UINT_32_TYPE, index=True)
     # Note that this is not named attributes to avoid confusion with the states table
+    # The JSON is stored uncompressed, most rows are too small for zlib to save
+    # space and it would no longer be JSON for queries on the database
     shared_attrs: Mapped[str | None] = mapped_column(
         Text().with_variant(mysql.LONGTEXT, "mysql", "mariadb")
     )
@@ -636,11 +638,17 @@ class StateAttributes(Base):
     def shared_attrs_bytes_from_event(
         event: Event[EventStateChangedData],
         dialect: SupportedDialect | None,
+        domain_exclude_attrs: frozenset[str] | None = None,
     ) -> bytes:
-        """Create shared_attrs from a state_changed event."""
+        """Create shared_attrs from a state_changed event.
+
+        domain_exclude_attrs are the attributes which are configured
+        to not be recorded for the domain of the entity.
+        """
         # None state means the state was removed from the state machine
         if (state := event.data["new_state"]) is None:
             return b"{}"
+        exclude_attrs: set[str] | frozenset[str]
         if state_info := state.state_info:
             unrecorded_attributes = state_info["unrecorded_attributes"]
             exclude_attrs = {
@@ -652,6 +660,10 @@ class StateAttributes(Base):
                 # or friendly name when using the MATCH_ALL exclude constant
                 exclude_attrs.update(state.attributes)
                 exclude_attrs -= _MATCH_ALL_KEEP
+            if domain_exclude_attrs:
+                exclude_attrs.update(domain_exclude_attrs)
+        elif domain_exclude_attrs:
+            exclude_attrs = ALL_DOMAIN_EXCLUDE_ATTRS | domain_exclude_attrs
         else:
             exclude_attrs = ALL_DOMAIN_EXCLUDE_ATTRS
         encoder = json_bytes_strip_null if dialect == PSQL_DIALECT else json_bytes
@@ -19,3 +19,8 @@ NEED_ATTRIBUTE_DOMAINS = {
     "thermostat",
     "water_heater",
 }
+
+# Keys of the aggregates of the numeric states in a bucket of downsampled states
+DOWNSAMPLED_MIN_KEY = "min"
+DOWNSAMPLED_MAX_KEY = "max"
+DOWNSAMPLED_MEAN_KEY = "mean"
@@ -4,12 +4,16 @@ from __future__ import annotations
 
 from collections.abc import Callable, Iterable, Iterator
 from datetime import datetime
-from itertools import groupby
+import heapq
+from itertools import batched, groupby
 from operator import itemgetter
 from typing import Any, cast
 
 from sqlalchemy import (
+    ColumnElement,
     CompoundSelect,
+    Float,
+    Integer,
     Select,
     Subquery,
     and_,
@@ -17,6 +21,7 @@ from sqlalchemy import (
     lambda_stmt,
     literal,
     select,
+    type_coerce,
     union_all,
 )
 from sqlalchemy.engine.row import Row
@@ -27,7 +32,7 @@ from homeassistant.core import HomeAssistant, State, split_entity_id
 from homeassistant.helpers.recorder import get_instance
 from homeassistant.util import dt as dt_util
 
-from ..const import LAST_REPORTED_SCHEMA_VERSION
+from ..const import LAST_REPORTED_SCHEMA_VERSION, SupportedDialect
 from ..db_schema import (
     SHARED_ATTR_OR_LEGACY_ATTRIBUTES,
     StateAttributes,
@@ -43,6 +48,9 @@ from ..models import (
 )
 from ..util import execute_stmt_lambda_element, session_scope
 from .const import (
+    DOWNSAMPLED_MAX_KEY,
+    DOWNSAMPLED_MEAN_KEY,
+    DOWNSAMPLED_MIN_KEY,
     LAST_CHANGED_KEY,
     NEED_ATTRIBUTE_DOMAINS,
     SIGNIFICANT_DOMAINS,
@@ -55,6 +63,14 @@ _FIELD_MAP = {
     "last_updated_ts": 2,
 }
 
+# States which can be converted to a float on all the supported databases.
+# The digits and the exponent are limited so the value is always in the
+# range of a double, PostgreSQL fails the whole query when a CAST overflows.
+# SQLAlchemy registers a REGEXP function for SQLite.
+_NUMERIC_STATE_PATTERN = (
+    r"^[-+]?([0-9]{1,200}[.]?[0-9]{0,200}|[.][0-9]{1,200})([eE][-+]?[0-9]{1,2})?$"
+)
+
 
 def _stmt_and_join_attributes(
     no_attributes: bool,
@@ -232,6 +248,97 @@ def get_significant_states_with_session(
         raise NotImplementedError("Filters are no longer supported")
     if not entity_ids:
         raise ValueError("entity_ids must be provided")
+    if not (
+        query := _significant_states_query(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            no_attributes,
+        )
+    ):
+        return {}
+    rows, start_time_ts, entity_id_to_metadata_id = query
+    return _sorted_states_to_dict(
+        rows,
+        start_time_ts,
+        entity_ids,
+        entity_id_to_metadata_id,
+        minimal_response,
+        compressed_state_format,
+        no_attributes=no_attributes,
+    )
+
+
+def stream_significant_states(
+    hass: HomeAssistant,
+    start_time: datetime,
+    end_time: datetime | None,
+    entity_ids: list[str],
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+    minimal_response: bool = False,
+    no_attributes: bool = False,
+    compressed_state_format: bool = False,
+    chunk_size: int | None = None,
+) -> Iterator[tuple[str, list[State | dict[str, Any]]]]:
+    """Yield the significant states of each entity while reading the rows.
+
+    The states of an entity are yielded in lists of up to chunk_size
+    states. Joining the lists of each entity gives the same result as
+    get_significant_states_with_session, without holding all the states
+    in memory.
+    """
+    if not entity_ids:
+        raise ValueError("entity_ids must be provided")
+    with session_scope(hass=hass, read_only=True) as session:
+        if not (
+            query := _significant_states_query(
+                hass,
+                session,
+                start_time,
+                end_time,
+                entity_ids,
+                include_start_time_state,
+                significant_changes_only,
+                no_attributes,
+                stream=True,
+            )
+        ):
+            return
+        rows, start_time_ts, entity_id_to_metadata_id = query
+        yield from _sorted_states_to_entity_states(
+            rows,
+            start_time_ts,
+            entity_ids,
+            entity_id_to_metadata_id,
+            minimal_response,
+            compressed_state_format,
+            no_attributes,
+            chunk_size,
+        )
+
+
+def _significant_states_query(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None,
+    entity_ids: list[str],
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    no_attributes: bool,
+    stream: bool = False,
+) -> tuple[Iterable[Row], float | None, dict[str, int | None]] | None:
+    """Execute the significant states query.
+
+    Returns the rows, the start time for the start time states
+    and the metadata ids of the entities. When stream is set the
+    rows of periods longer than a day are fetched in batches.
+    """
     entity_id_to_metadata_id: dict[str, int | None] | None = None
     metadata_ids_in_significant_domains: list[int] = []
     instance = get_instance(hass)
@@ -240,7 +347,7 @@ def get_significant_states_with_session(
             entity_ids, session, False
         )
     ) or not (possible_metadata_ids := extract_metadata_ids(entity_id_to_metadata_id)):
-        return {}
+        return None
     metadata_ids = possible_metadata_ids
     if significant_changes_only:
         metadata_ids_in_significant_domains = [
@@ -278,17 +385,310 @@ def get_significant_states_with_session(
             include_start_time_state,
         ],
     )
-    return _sorted_states_to_dict(
-        execute_stmt_lambda_element(session, stmt, None, end_time, orm_rows=False),
+    return (
+        execute_stmt_lambda_element(
+            session, stmt, start_time if stream else None, end_time, orm_rows=False
+        ),
         start_time_ts if include_start_time_state else None,
-        entity_ids,
         entity_id_to_metadata_id,
-        minimal_response,
-        compressed_state_format,
-        no_attributes=no_attributes,
     )
 
 
+def _numeric_state_value(
+    dialect_name: SupportedDialect | None,
+) -> ColumnElement[float]:
+    """Return the numeric value of the state."""
+    if dialect_name == SupportedDialect.MYSQL:
+        # SQLAlchemy leaves out CAST AS FLOAT before MySQL 8.0.17 and
+        # MariaDB 10.4.5, which would compare the states as strings,
+        # adding zero converts the state to a double on all versions
+        value: ColumnElement[float] = type_coerce(States.state, Float) + 0.0
+    else:
+        value = States.state.cast(Float)
+    return value
+
+
+def _significant_changes_clause(
+    metadata_ids_in_significant_domains: list[int],
+) -> ColumnElement[bool]:
+    """Return the clause matching the significant state changes."""
+    clause = (States.last_changed_ts == States.last_updated_ts) | (
+        States.last_changed_ts.is_(None)
+    )
+    if metadata_ids_in_significant_domains:
+        clause = clause | States.metadata_id.in_(metadata_ids_in_significant_domains)
+    return clause
+
+
+def _states_count_stmt(
+    start_time_ts: float, end_time_ts: float, metadata_ids: list[int]
+) -> Select:
+    """Return the statement counting the states of each entity in a period."""
+    return (
+        select(States.metadata_id, func.count())
+        .filter(States.metadata_id.in_(metadata_ids))
+        .filter(States.last_updated_ts > start_time_ts)
+        .filter(States.last_updated_ts < end_time_ts)
+        .group_by(States.metadata_id)
+    )
+
+
+def _downsampled_states_stmt(
+    dialect_name: SupportedDialect | None,
+    start_time_ts: float,
+    end_time_ts: float,
+    max_points: int,
+    metadata_ids: list[int],
+    metadata_ids_in_significant_domains: list[int],
+    significant_changes_only: bool,
+) -> Select:
+    """Return the statement aggregating the numeric states in buckets.
+
+    The period is split in max_points buckets of the same duration. Each
+    bucket returns the last state in the bucket along with the minimum,
+    maximum and mean of the states in the bucket.
+    """
+    bucket_offset = (States.last_updated_ts - start_time_ts) * (
+        max_points / (end_time_ts - start_time_ts)
+    )
+    if dialect_name == SupportedDialect.SQLITE:
+        # The offset is never negative, so truncating is the same as floor
+        bucket: ColumnElement[Any] = bucket_offset.cast(Integer)
+    else:
+        bucket = func.floor(bucket_offset)
+    value = _numeric_state_value(dialect_name)
+    stmt = (
+        select(
+            States.metadata_id,
+            func.min(value).label("min"),
+            func.max(value).label("max"),
+            func.avg(value).label("mean"),
+            func.max(States.last_updated_ts).label("last_updated_ts"),
+        )
+        .filter(States.metadata_id.in_(metadata_ids))
+        .filter(States.last_updated_ts > start_time_ts)
+        .filter(States.last_updated_ts < end_time_ts)
+        .filter(States.state.regexp_match(_NUMERIC_STATE_PATTERN))
+    )
+    if significant_changes_only:
+        stmt = stmt.filter(
+            _significant_changes_clause(metadata_ids_in_significant_domains)
+        )
+    buckets = stmt.group_by(States.metadata_id, bucket).subquery()
+    return (
+        select(
+            buckets.c.metadata_id,
+            States.state,
+            buckets.c.last_updated_ts,
+            buckets.c.min,
+            buckets.c.max,
+            buckets.c.mean,
+        )
+        .join(
+            States,
+            and_(
+                States.metadata_id == buckets.c.metadata_id,
+                States.last_updated_ts == buckets.c.last_updated_ts,
+            ),
+        )
+        .order_by(buckets.c.metadata_id, buckets.c.last_updated_ts)
+    )
+
+
+def _not_numeric_states_stmt(
+    start_time_ts: float,
+    end_time_ts: float,
+    metadata_ids: list[int],
+    metadata_ids_in_significant_domains: list[int],
+    significant_changes_only: bool,
+) -> Select:
+    """Return the statement selecting the states which are not numbers.
+
+    These are the states left out of the buckets, like unavailable, so
+    the gaps they leave in the numeric states are kept.
+    """
+    stmt = (
+        select(States.metadata_id, States.state, States.last_updated_ts)
+        .filter(States.metadata_id.in_(metadata_ids))
+        .filter(States.last_updated_ts > start_time_ts)
+        .filter(States.last_updated_ts < end_time_ts)
+        .filter(~States.state.regexp_match(_NUMERIC_STATE_PATTERN))
+    )
+    if significant_changes_only:
+        stmt = stmt.filter(
+            _significant_changes_clause(metadata_ids_in_significant_domains)
+        )
+    return stmt.order_by(States.metadata_id, States.last_updated_ts)
+
+
+def get_downsampled_states(
+    hass: HomeAssistant,
+    start_time: datetime,
+    end_time: datetime | None,
+    entity_ids: list[str],
+    max_points: int,
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+    minimal_response: bool = False,
+    no_attributes: bool = False,
+) -> dict[str, list[dict[str, Any]]]:
+    """Return the significant states with at most max_points states per entity.
+
+    The states are returned in the compressed state format. Entities with
+    more than max_points states in the period have their numeric states
+    aggregated in the database in max_points buckets. Each bucket is
+    returned as the last state in the bucket with the minimum, maximum
+    and mean of the states in the bucket, which keeps the peaks a graph
+    would show. States which are not numbers are returned as they are
+    for these entities so gaps like an unavailable sensor are kept,
+    while the other entities return all their states.
+    """
+    if not entity_ids:
+        raise ValueError("entity_ids must be provided")
+    instance = get_instance(hass)
+    start_time_ts = start_time.timestamp()
+    end_time_ts = (end_time or dt_util.utcnow()).timestamp()
+    result: dict[str, list[dict[str, Any]]] = {
+        entity_id: [] for entity_id in entity_ids
+    }
+    with session_scope(hass=hass, read_only=True) as session:
+        entity_id_to_metadata_id = instance.states_meta_manager.get_many(
+            entity_ids, session, False
+        )
+        metadata_id_to_entity_id = {
+            metadata_id: entity_id
+            for entity_id, metadata_id in entity_id_to_metadata_id.items()
+            if metadata_id is not None
+        }
+        dense_metadata_ids: list[int] = []
+        if metadata_id_to_entity_id and end_time_ts > start_time_ts:
+            dense_metadata_ids = [
+                metadata_id
+                for metadata_id, count in session.execute(
+                    _states_count_stmt(
+                        start_time_ts, end_time_ts, list(metadata_id_to_entity_id)
+                    )
+                )
+                if count > max_points
+            ]
+        if dense_metadata_ids:
+            metadata_ids_in_significant_domains = [
+                metadata_id
+                for metadata_id in dense_metadata_ids
+                if split_entity_id(metadata_id_to_entity_id[metadata_id])[0]
+                in SIGNIFICANT_DOMAINS
+            ]
+            for (
+                metadata_id,
+                state,
+                last_updated_ts,
+                min_value,
+                max_value,
+                mean_value,
+            ) in session.execute(
+                _downsampled_states_stmt(
+                    instance.dialect_name,
+                    start_time_ts,
+                    end_time_ts,
+                    max_points,
+                    dense_metadata_ids,
+                    metadata_ids_in_significant_domains,
+                    significant_changes_only,
+                )
+            ):
+                entity_states = result[metadata_id_to_entity_id[metadata_id]]
+                if (
+                    entity_states
+                    and entity_states[-1][COMPRESSED_STATE_LAST_UPDATED]
+                    == last_updated_ts
+                ):
+                    # Another state of the entity has the same timestamp
+                    continue
+                entity_states.append(
+                    {
+                        COMPRESSED_STATE_STATE: state,
+                        COMPRESSED_STATE_LAST_UPDATED: last_updated_ts,
+                        DOWNSAMPLED_MIN_KEY: min_value,
+                        DOWNSAMPLED_MAX_KEY: max_value,
+                        DOWNSAMPLED_MEAN_KEY: mean_value,
+                    }
+                )
+            if downsampled_metadata_ids := [
+                metadata_id
+                for metadata_id in dense_metadata_ids
+                if result[metadata_id_to_entity_id[metadata_id]]
+            ]:
+                for metadata_id, rows in groupby(
+                    session.execute(
+                        _not_numeric_states_stmt(
+                            start_time_ts,
+                            end_time_ts,
+                            downsampled_metadata_ids,
+                            metadata_ids_in_significant_domains,
+                            significant_changes_only,
+                        )
+                    ),
+                    itemgetter(0),
+                ):
+                    entity_id = metadata_id_to_entity_id[metadata_id]
+                    result[entity_id] = list(
+                        heapq.merge(
+                            result[entity_id],
+                            (
+                                {
+                                    COMPRESSED_STATE_STATE: state,
+                                    COMPRESSED_STATE_LAST_UPDATED: last_updated_ts,
+                                }
+                                for _, state, last_updated_ts in rows
+                            ),
+                            key=itemgetter(COMPRESSED_STATE_LAST_UPDATED),
+                        )
+                    )
+        # Entities without numeric states are not downsampled
+        downsampled_entity_ids = [
+            entity_id for entity_id, entity_states in result.items() if entity_states
+        ]
+        if other_entity_ids := [
+            entity_id for entity_id in entity_ids if not result[entity_id]
+        ]:
+            for entity_id, states in get_significant_states_with_session(
+                hass,
+                session,
+                start_time,
+                end_time,
+                other_entity_ids,
+                None,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+                no_attributes,
+                True,
+            ).items():
+                result[entity_id] = cast(list[dict[str, Any]], states)
+        if downsampled_entity_ids and include_start_time_state:
+            # The period ends at the start time so only
+            # the states at the start time are returned
+            for entity_id, states in get_significant_states_with_session(
+                hass,
+                session,
+                start_time,
+                start_time,
+                downsampled_entity_ids,
+                None,
+                True,
+                significant_changes_only,
+                minimal_response,
+                no_attributes,
+                True,
+            ).items():
+                result[entity_id][:0] = cast(list[dict[str, Any]], states)
+    return {
+        entity_id: entity_states
+        for entity_id, entity_states in result.items()
+        if entity_states
+    }
+
+
 def get_full_significant_states_with_session(
     hass: HomeAssistant,
     session: Session,
@@ -685,6 +1085,45 @@ def _sorted_states_to_dict(
     structure {'entity_id': [list of states], 'entity_id2': [list of states]}
 
     States must be sorted by entity_id and last_updated
+    """
+    # Set all entity IDs to empty lists in result set to maintain the order
+    result: dict[str, list[State | dict[str, Any]]] = {
+        entity_id: [] for entity_id in entity_ids
+    }
+    for entity_id, entity_states in _sorted_states_to_entity_states(
+        states,
+        start_time_ts,
+        entity_ids,
+        entity_id_to_metadata_id,
+        minimal_response,
+        compressed_state_format,
+        no_attributes,
+    ):
+        result[entity_id].extend(entity_states)
+
+    if descending:
+        for ent_results in result.values():
+            ent_results.reverse()
+
+    # Filter out the empty lists if some states had 0 results.
+    return {key: val for key, val in result.items() if val}
+
+
+def _sorted_states_to_entity_states(
+    states: Iterable[Row],
+    start_time_ts: float | None,
+    entity_ids: list[str],
+    entity_id_to_metadata_id: dict[str, int | None],
+    minimal_response: bool,
+    compressed_state_format: bool,
+    no_attributes: bool,
+    chunk_size: int | None = None,
+) -> Iterator[tuple[str, list[State | dict[str, Any]]]]:
+    """Convert SQL results into lists of JSON friendly states per entity.
+
+    States must be sorted by entity_id and last_updated. The states of
+    an entity are yielded in lists of up to chunk_size states, or in a
+    single list if chunk_size is None.
 
     We also need to go back and create a synthetic zero data point for
     each list of states, otherwise our graphs won't start on the Y
@@ -704,10 +1143,6 @@ def _sorted_states_to_dict(
         attr_time = LAST_CHANGED_KEY
         attr_state = STATE_KEY
 
-    # Set all entity IDs to empty lists in result set to maintain the order
-    result: dict[str, list[State | dict[str, Any]]] = {
-        entity_id: [] for entity_id in entity_ids
-    }
     metadata_id_to_entity_id: dict[int, str] = {}
     metadata_id_to_entity_id = {
         v: k for k, v in entity_id_to_metadata_id.items() if v is not None
@@ -725,52 +1160,56 @@ def _sorted_states_to_dict(
 
     state_idx = field_map["state"]
     last_updated_ts_idx = field_map["last_updated_ts"]
+    _utc_from_timestamp = dt_util.utc_from_timestamp
 
     # Append all changes to it
     for metadata_id, group in states_iter:
         entity_id = metadata_id_to_entity_id[metadata_id]
         attr_cache: dict[str, dict[str, Any]] = {}
-        ent_results = result[entity_id]
+        chunks: Iterable[Iterable[Row]] = (
+            (group,) if chunk_size is None else batched(group, chunk_size)
+        )
         if (
             not minimal_response
             or split_entity_id(entity_id)[0] in NEED_ATTRIBUTE_DOMAINS
         ):
-            ent_results.extend(
-                [
-                    state_class(
-                        db_state,
-                        attr_cache,
-                        start_time_ts,
-                        entity_id,
-                        db_state[state_idx],
-                        db_state[last_updated_ts_idx],
-                        False,
-                    )
-                    for db_state in group
-                ]
-            )
+            for chunk in chunks:
+                yield (
+                    entity_id,
+                    [
+                        state_class(
+                            db_state,
+                            attr_cache,
+                            start_time_ts,
+                            entity_id,
+                            db_state[state_idx],
+                            db_state[last_updated_ts_idx],
+                            False,
+                        )
+                        for db_state in chunk
+                    ],
+                )
             continue
 
-        prev_state: str | None = None
         # With minimal response we only provide a native
         # State for the first and last response. All the states
         # in-between only provide the "state" and the
         # "last_changed".
-        if not ent_results:
-            if (first_state := next(group, None)) is None:
-                continue
-            prev_state = first_state[state_idx]
-            ent_results.append(
-                state_class(
-                    first_state,
-                    attr_cache,
-                    start_time_ts,
-                    entity_id,
-                    prev_state,
-                    first_state[last_updated_ts_idx],
-                    no_attributes,
-                )
+        if (first_state := next(group, None)) is None:
+            continue
+        prev_state: str | None = None
+        prev_state = first_state[state_idx]
+        ent_results: list[State | dict[str, Any]] = [
+            state_class(
+                first_state,
+                attr_cache,
+                start_time_ts,
+                entity_id,
+                prev_state,
+                first_state[last_updated_ts_idx],
+                no_attributes,
             )
+        ]
 
         #
         # minimal_response only makes sense with last_updated == last_updated
@@ -779,38 +1218,36 @@ def _sorted_states_to_dict(
         #
         # With minimal response we do not care about attribute
         # changes so we can filter out duplicate states
-        if compressed_state_format:
-            # Compressed state format uses the timestamp directly
-            ent_results.extend(
-                [
-                    {
-                        attr_state: (prev_state := state),
-                        attr_time: row[last_updated_ts_idx],
-                    }
-                    for row in group
-                    if (state := row[state_idx]) != prev_state
-                ]
-            )
-            continue
-
-        # Non-compressed state format returns an ISO formatted string
-        _utc_from_timestamp = dt_util.utc_from_timestamp
-        ent_results.extend(
-            [
-                {
-                    attr_state: (prev_state := state),
-                    attr_time: _utc_from_timestamp(
-                        row[last_updated_ts_idx]
-                    ).isoformat(),
-                }
-                for row in group
-                if (state := row[state_idx]) != prev_state
-            ]
-        )
-
-    if descending:
-        for ent_results in result.values():
-            ent_results.reverse()
-
-    # Filter out the empty lists if some states had 0 results.
-    return {key: val for key, val in result.items() if val}
+        for chunk in chunks:
+            if compressed_state_format:
+                # Compressed state format uses the timestamp directly
+                ent_results.extend(
+                    [
+                        {
+                            attr_state: (prev_state := state),
+                            attr_time: row[last_updated_ts_idx],
+                        }
+                        for row in chunk
+                        if (state := row[state_idx]) != prev_state
+                    ]
+                )
+            else:
+                # Non-compressed state format returns an ISO formatted string
+                ent_results.extend(
+                    [
+                        {
+                            attr_state: (prev_state := state),
+                            attr_time: _utc_from_timestamp(
+                                row[last_updated_ts_idx]
+                            ).isoformat(),
+                        }
+                        for row in chunk
+                        if (state := row[state_idx]) != prev_state
+                    ]
+                )
+            if ent_results:
+                yield entity_id, ent_results
+                ent_results = []
+        if ent_results:
+            # The entity only has the first state
+            yield entity_id, ent_results
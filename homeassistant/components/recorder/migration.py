@@ -6,8 +6,9 @@ from abc import ABC, abstractmethod
 from collections.abc import Callable, Iterable
 import contextlib
 from dataclasses import dataclass, replace as dataclass_replace
-from datetime import timedelta
+from datetime import datetime, timedelta
 import logging
+import re
 from time import time
 from typing import TYPE_CHECKING, Any, cast, final
 from uuid import UUID
@@ -30,9 +31,11 @@ from sqlalchemy.sql.expression import true
 from sqlalchemy.sql.lambdas import StatementLambdaElement
 
 from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
 from homeassistant.util.enum import try_parse_enum
 from homeassistant.util.ulid import ulid_at_time, ulid_to_bytes
 
+from . import partition
 from .auto_repairs.events.schema import (
     correct_db_schema as events_correct_db_schema,
     validate_db_schema as events_validate_db_schema,
@@ -2353,6 +2356,307 @@ def post_migrate_entity_ids(instance: Recorder) -> bool:
     return is_done
 
 
+_INDEX_DEFINITION = re.compile(r"^CREATE (UNIQUE )?INDEX \S+ ON \S+ (USING .*)$")
+
+
+def _migrate_to_partitioned_table(
+    session_maker: Callable[[], Session], table: str, interval: str, now: datetime
+) -> None:
+    """Convert a table which can be partitioned to a partitioned table.
+
+    The existing table is attached as the legacy partition of a new range
+    partitioned table, so its rows are not copied. The rows of the legacy
+    partition are checked against its bound with a constraint which is
+    validated before the table is locked, attaching the table then does
+    not need to scan it. The indexes needed by the partitioned table are
+    built in the same way.
+
+    The table is replaced in a single transaction, so it is left unchanged
+    if the conversion fails.
+
+    This is only supported by PostgreSQL.
+    """
+    column, id_column = partition.PARTITIONED_TABLES[table]
+    with session_scope(session=session_maker(), read_only=True) as session:
+        # Rows without a timestamp do not fit in a range partition, they
+        # are not removed or changed without the user knowing about it
+        if missing := session.execute(
+            text(f"SELECT count(*) FROM {table} WHERE {column} IS NULL")  # noqa: S608
+        ).scalar():
+            raise RuntimeError(
+                f"The {table} table can not be partitioned since {missing} of its"
+                f" rows have no {column}, remove these rows or the db_partition"
+                " option"
+            )
+        latest = max(
+            now.timestamp(),
+            session.execute(
+                text(f"SELECT max({column}) FROM {table}")  # noqa: S608
+            ).scalar()
+            or 0,
+        )
+    # The legacy partition ends with the partition of the latest row
+    boundary = partition.partition_start(
+        dt_util.utc_from_timestamp(latest), interval
+    ) + partition.partition_interval(interval)
+    _prepare_legacy_partition(session_maker, table, column, id_column, boundary)
+    with session_scope(session=session_maker()) as session:
+        _convert_table_to_partitioned(session, table, column, id_column, boundary)
+
+
+def _prepare_legacy_partition(
+    session_maker: Callable[[], Session],
+    table: str,
+    column: str,
+    id_column: str,
+    boundary: datetime,
+) -> None:
+    """Prepare the constraints and indexes the legacy partition needs.
+
+    A constraint matching the bound of the legacy partition is added and
+    validated, and a unique index is built for the primary key of the
+    partitioned table, which has to include the partition key. Foreign keys
+    of the table referencing itself need a unique index on the ids only,
+    which is built as well since the primary key of the table is replaced.
+    """
+    constraint = f"{table}_partition_bound"
+    with session_scope(session=session_maker()) as session:
+        session.execute(
+            text(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {constraint}")
+        )
+        session.execute(
+            text(
+                f"ALTER TABLE {table} ADD CONSTRAINT {constraint} CHECK"
+                f" ({column} IS NOT NULL AND {column} < {boundary.timestamp()})"
+                " NOT VALID"
+            )
+        )
+    with session_scope(session=session_maker()) as session:
+        session.execute(text(f"ALTER TABLE {table} VALIDATE CONSTRAINT {constraint}"))
+    with session_scope(session=session_maker()) as session:
+        session.execute(
+            text(
+                f"CREATE UNIQUE INDEX IF NOT EXISTS {table}_partition_pkey"
+                f" ON {table} ({id_column}, {column})"
+            )
+        )
+        if session.execute(
+            text(
+                "SELECT count(*) FROM pg_constraint WHERE contype = 'f'"
+                " AND conrelid = to_regclass(:table) AND confrelid = conrelid"
+            ),
+            {"table": table},
+        ).scalar():
+            session.execute(
+                text(
+                    f"CREATE UNIQUE INDEX IF NOT EXISTS {table}_{id_column}_key"
+                    f" ON {table} ({id_column})"
+                )
+            )
+
+
+def _convert_table_to_partitioned(
+    session: Session, table: str, column: str, id_column: str, boundary: datetime
+) -> None:
+    """Replace a table with a partitioned table which has it as legacy partition.
+
+    Partitioned tables can not have identity columns or unique indexes which
+    do not include the partition key, so the ids are generated by a sequence
+    and the primary key on the ids is replaced by one on the ids and the
+    partition key. Unique indexes which do not include the partition key are
+    only kept on the legacy partition.
+
+    Foreign keys referencing the table are dropped since they require such
+    a unique index, except a foreign key of the table referencing itself,
+    which is restored on the legacy partition only. A warning is logged
+    for each of them.
+    """
+    legacy = f"{table}{partition.LEGACY_PARTITION_SUFFIX}"
+    sequence = f"{table}_{id_column}_partitioned_seq"
+    partition_primary_key = f"{table}_partition_pkey"
+    next_id = 1 + max(
+        session.execute(
+            text(f"SELECT max({id_column}) FROM {table}")  # noqa: S608
+        ).scalar()
+        or 0,
+        _get_sequence_last_value(session, table, id_column),
+    )
+    indexes = session.execute(
+        text(
+            "SELECT indexname, indexdef FROM pg_indexes"
+            " WHERE schemaname = current_schema() AND tablename = :table"
+        ),
+        {"table": table},
+    ).all()
+    primary_key = session.execute(
+        text(
+            "SELECT conname FROM pg_constraint"
+            " WHERE contype = 'p' AND conrelid = to_regclass(:table)"
+        ),
+        {"table": table},
+    ).scalar()
+    foreign_keys = session.execute(
+        text(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint"
+            " WHERE contype = 'f' AND conrelid = to_regclass(:table)"
+            " AND confrelid != conrelid"
+        ),
+        {"table": table},
+    ).all()
+    self_references: list[tuple[str, str]] = []
+    for referencing_table, name, definition, self_reference in session.execute(
+        text(
+            "SELECT conrelid::regclass::text, conname, pg_get_constraintdef(oid),"
+            " conrelid = confrelid FROM pg_constraint"
+            " WHERE contype = 'f' AND confrelid = to_regclass(:table)"
+        ),
+        {"table": table},
+    ).all():
+        session.execute(text(f"ALTER TABLE {referencing_table} DROP CONSTRAINT {name}"))
+        if self_reference:
+            _LOGGER.warning(
+                "Foreign key %s of the %s table is only kept on its legacy"
+                " partition: %s",
+                name,
+                table,
+                definition,
+            )
+            self_references.append(
+                (
+                    name,
+                    definition.replace(f"REFERENCES {table}(", f"REFERENCES {legacy}("),
+                )
+            )
+        else:
+            _LOGGER.warning(
+                "Dropped foreign key %s of the %s table referencing the %s table: %s",
+                name,
+                referencing_table,
+                table,
+                definition,
+            )
+
+    session.execute(text(f"ALTER TABLE {table} RENAME TO {legacy}"))
+    for name, _ in indexes:
+        session.execute(
+            text(
+                f"ALTER INDEX {name} RENAME TO {name}{partition.LEGACY_PARTITION_SUFFIX}"
+            )
+        )
+    session.execute(
+        text(f"ALTER TABLE {legacy} ALTER COLUMN {id_column} DROP IDENTITY IF EXISTS")
+    )
+    session.execute(text(f"ALTER TABLE {legacy} ALTER COLUMN {id_column} DROP DEFAULT"))
+    # The primary key of the legacy partition has to match the one of the
+    # partitioned table, the index was built beforehand and the validated
+    # bound constraint proves the column has no nulls without a scan
+    if primary_key:
+        session.execute(
+            text(
+                f"ALTER TABLE {legacy} DROP CONSTRAINT"
+                f" {primary_key}{partition.LEGACY_PARTITION_SUFFIX}"
+            )
+        )
+    session.execute(text(f"ALTER TABLE {legacy} ALTER COLUMN {column} SET NOT NULL"))
+    session.execute(
+        text(
+            f"ALTER TABLE {legacy} ADD CONSTRAINT {table}_pkey"
+            f"{partition.LEGACY_PARTITION_SUFFIX} PRIMARY KEY USING INDEX"
+            f" {partition_primary_key}{partition.LEGACY_PARTITION_SUFFIX}"
+        )
+    )
+
+    session.execute(
+        text(
+            f"CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS INCLUDING STORAGE)"
+            f" PARTITION BY RANGE ({column})"
+        )
+    )
+    session.execute(
+        text(
+            f"CREATE SEQUENCE {sequence} START WITH {next_id}"
+            f" OWNED BY {table}.{id_column}"
+        )
+    )
+    session.execute(
+        text(
+            f"ALTER TABLE {table} ALTER COLUMN {id_column}"
+            f" SET DEFAULT nextval('{sequence}')"
+        )
+    )
+    session.execute(
+        text(
+            f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey"
+            f" PRIMARY KEY ({id_column}, {column})"
+        )
+    )
+    # The foreign keys of the legacy partition are reused when it is attached
+    for name, definition in foreign_keys:
+        session.execute(text(f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}"))
+    attached_indexes: list[str] = []
+    for name, definition in indexes:
+        if name in (primary_key, partition_primary_key):
+            continue
+        if not (match := _INDEX_DEFINITION.match(definition)):
+            _LOGGER.warning("Could not recreate index %s: %s", name, definition)
+            continue
+        unique, using = match.groups()
+        if unique and column not in using:
+            # Only kept on the legacy partition, the primary key of the
+            # partitioned table starts with the ids
+            continue
+        session.execute(
+            text(f"CREATE {unique or ''}INDEX {name} ON ONLY {table} {using}")
+        )
+        attached_indexes.append(name)
+
+    session.execute(
+        text(
+            f"ALTER TABLE {table} ATTACH PARTITION {legacy}"
+            f" FOR VALUES FROM (MINVALUE) TO ({boundary.timestamp()})"
+        )
+    )
+    for name in attached_indexes:
+        session.execute(
+            text(
+                f"ALTER INDEX {name} ATTACH PARTITION"
+                f" {name}{partition.LEGACY_PARTITION_SUFFIX}"
+            )
+        )
+    session.execute(
+        text(f"ALTER TABLE {legacy} DROP CONSTRAINT {table}_partition_bound")
+    )
+    # The rows were checked by the constraint which was dropped above, the
+    # rows of the other partitions can not reference the legacy partition
+    for name, definition in self_references:
+        session.execute(
+            text(f"ALTER TABLE {legacy} ADD CONSTRAINT {name} {definition} NOT VALID")
+        )
+    session.execute(
+        text(
+            f"CREATE TABLE {table}{partition.DEFAULT_PARTITION_SUFFIX}"
+            f" PARTITION OF {table} DEFAULT"
+        )
+    )
+
+
+def _get_sequence_last_value(session: Session, table: str, column: str) -> int:
+    """Return the last value of the sequence generating the ids of a column."""
+    if not (
+        sequence := session.execute(
+            text("SELECT pg_get_serial_sequence(:table, :column)"),
+            {"table": table, "column": column},
+        ).scalar()
+    ):
+        return 0
+    return (
+        session.execute(
+            text(f"SELECT last_value FROM {sequence}")  # noqa: S608
+        ).scalar()
+        or 0
+    )
+
+
 def _initialize_database(session: Session) -> bool:
     """Initialize a new database.
 
@@ -2971,12 +3275,90 @@ class EntityIDPostMigration(BaseMigrationWithQuery, BaseOffLineMigration):
         return has_used_states_entity_ids()
 
 
+class PartitionedTablesMigration(BaseOffLineMigration):
+    """Migration to convert the tables to time partitioned tables.
+
+    Only needed on PostgreSQL when the db_partition option is set. Each step
+    converts one table, so an interrupted migration resumes with the tables
+    which were not converted yet. The tables are not converted back if the
+    option is removed.
+    """
+
+    migration_id = "partitioned_tables"
+
+    def needs_migrate(self, instance: Recorder, session: Session) -> bool:
+        """Return if the migration needs to run.
+
+        The tables are checked instead of the migration changes table since
+        the option can be set at any time.
+        """
+        if (
+            not instance.db_partition
+            or instance.dialect_name is not SupportedDialect.POSTGRESQL
+        ):
+            return False
+        needs_migrate = self.needs_migrate_impl(instance, session)
+        if (
+            needs_migrate.migration_done
+            and self.migration_changes.get(self.migration_id, -1)
+            < self.migration_version
+        ):
+            _mark_migration_done(session, self.__class__)
+        _LOGGER.debug(
+            "Data migration '%s' needed: %s",
+            self.migration_id,
+            needs_migrate.needs_migrate,
+        )
+        return needs_migrate.needs_migrate
+
+    def needs_migrate_impl(
+        self, instance: Recorder, session: Session
+    ) -> DataMigrationStatus:
+        """Return if any table is not partitioned yet."""
+        needs_migrate = bool(self._tables_to_convert(session))
+        return DataMigrationStatus(
+            needs_migrate=needs_migrate, migration_done=not needs_migrate
+        )
+
+    def migrate_data_impl(self, instance: Recorder) -> DataMigrationStatus:
+        """Convert the next table, returns True if all tables are converted."""
+        assert instance.db_partition is not None
+        with session_scope(session=instance.get_session(), read_only=True) as session:
+            tables = self._tables_to_convert(session)
+        if not tables:
+            return DataMigrationStatus(needs_migrate=False, migration_done=True)
+        table = tables[0]
+        _LOGGER.warning(
+            "Converting the %s table to a partitioned table (%s of %s),"
+            " this may take a while",
+            table,
+            len(partition.PARTITIONED_TABLES) - len(tables) + 1,
+            len(partition.PARTITIONED_TABLES),
+        )
+        _migrate_to_partitioned_table(
+            instance.get_session, table, instance.db_partition, dt_util.utcnow()
+        )
+        _LOGGER.warning("Converted the %s table to a partitioned table", table)
+        done = len(tables) == 1
+        return DataMigrationStatus(needs_migrate=not done, migration_done=done)
+
+    @staticmethod
+    def _tables_to_convert(session: Session) -> list[str]:
+        """Return the tables which are not partitioned in conversion order."""
+        return [
+            table
+            for table in partition.PARTITIONED_TABLES
+            if not partition.is_partitioned(session, table)
+        ]
+
+
 NON_LIVE_DATA_MIGRATORS: tuple[type[BaseOffLineMigration], ...] = (
     StatesContextIDMigration,  # Introduced in HA Core 2023.4 by PR #88942
     EventsContextIDMigration,  # Introduced in HA Core 2023.4 by PR #88942
     EventTypeIDMigration,  # Introduced in HA Core 2023.4 by PR #89465
     EntityIDMigration,  # Introduced in HA Core 2023.4 by PR #89557
     EntityIDPostMigration,  # Introduced in HA Core 2023.4 by PR #89557
+    PartitionedTablesMigration,
 )
 
 LIVE_DATA_MIGRATORS: tuple[type[BaseRunTimeMigration], ...] = (
@@ -21,6 +21,10 @@ class DatabaseEngine:
     optimizer: DatabaseOptimizer
     max_bind_vars: int
     version: AwesomeVersion | None
+    # States and Events can be inserted in bulk with executemany when the
+    # db_bulk_insert option is set, which needs INSERT .. RETURNING to link
+    # each state to the previous one
+    bulk_insert: bool
 
 
 @dataclass
@@ -0,0 +1,258 @@
+"""Time partitioned tables on PostgreSQL.
+
+The states, events and short term statistics tables can be range
+partitioned on their timestamp column by day or by week. Old rows are
+then purged by dropping whole partitions instead of deleting them one
+by one, which keeps the indexes of the partitions which are written
+small.
+
+When the tables are converted, the existing rows are kept in a legacy
+partition which covers everything before the first partition and is
+dropped once all of its rows are older than the purge cutoff. A default
+partition catches rows which do not fit in any other partition.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import logging
+import re
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm.session import Session
+
+from homeassistant.util import dt as dt_util
+
+from .const import PARTITION_WEEK
+from .db_schema import TABLE_EVENTS, TABLE_STATES, TABLE_STATISTICS_SHORT_TERM
+
+_LOGGER = logging.getLogger(__name__)
+
+# The partitioned tables with their timestamp and id columns, ordered so the
+# tables referencing another partitioned table are converted after it
+PARTITIONED_TABLES = {
+    TABLE_STATISTICS_SHORT_TERM: ("start_ts", "id"),
+    TABLE_EVENTS: ("time_fired_ts", "event_id"),
+    TABLE_STATES: ("last_updated_ts", "state_id"),
+}
+# Number of partitions created ahead of the current one
+PARTITIONS_AHEAD = 7
+
+LEGACY_PARTITION_SUFFIX = "_legacy"
+DEFAULT_PARTITION_SUFFIX = "_default"
+
+_PARTITION_BOUNDS = re.compile(r"FROM \('?([^')]+)'?\) TO \('?([^')]+)'?\)")
+
+
+@dataclass(slots=True, frozen=True)
+class Partition:
+    """A partition of a table.
+
+    The bounds are None for MINVALUE and for the default partition.
+    """
+
+    name: str
+    lower_bound: float | None
+    upper_bound: float | None
+
+    @property
+    def is_default(self) -> bool:
+        """Return if this is the default partition."""
+        return self.name.endswith(DEFAULT_PARTITION_SUFFIX)
+
+    @property
+    def is_legacy(self) -> bool:
+        """Return if this partition holds the rows of the unpartitioned table."""
+        return self.name.endswith(LEGACY_PARTITION_SUFFIX)
+
+
+def partition_interval(interval: str) -> timedelta:
+    """Return the length of the partitions."""
+    return timedelta(weeks=1) if interval == PARTITION_WEEK else timedelta(days=1)
+
+
+def partition_start(when: datetime, interval: str) -> datetime:
+    """Return the start of the partition for a point in time.
+
+    Daily partitions start at midnight UTC and weekly ones on Monday.
+    """
+    start = dt_util.as_utc(when).replace(hour=0, minute=0, second=0, microsecond=0)
+    if interval == PARTITION_WEEK:
+        start -= timedelta(days=start.weekday())
+    return start
+
+
+def partition_name(table: str, start: datetime) -> str:
+    """Return the name of the partition starting at start."""
+    return f"{table}_p{start:%Y%m%d}"
+
+
+def _parse_bound(bound: str) -> float | None:
+    """Parse a bound of a range partition."""
+    return None if bound == "MINVALUE" else float(bound)
+
+
+def is_partitioned(session: Session, table: str) -> bool:
+    """Return if a table is partitioned."""
+    return bool(
+        session.execute(
+            text(
+                "SELECT 1 FROM pg_partitioned_table"
+                " WHERE partrelid = to_regclass(:table)"
+            ),
+            {"table": table},
+        ).scalar()
+    )
+
+
+def get_partitions(session: Session, table: str) -> list[Partition]:
+    """Return the partitions of a table ordered by their bounds.
+
+    The default partition comes last.
+    """
+    partitions: list[Partition] = []
+    default: list[Partition] = []
+    for name, bound in session.execute(
+        text(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)"
+            " FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid"
+            " WHERE i.inhparent = to_regclass(:table)"
+        ),
+        {"table": table},
+    ):
+        if match := _PARTITION_BOUNDS.search(bound):
+            partitions.append(
+                Partition(
+                    name, _parse_bound(match.group(1)), _parse_bound(match.group(2))
+                )
+            )
+        else:
+            default.append(Partition(name, None, None))
+    partitions.sort(key=lambda partition: partition.lower_bound or 0)
+    return partitions + default
+
+
+def expired_partitions(
+    partitions: list[Partition], purge_before: float
+) -> list[Partition]:
+    """Return the partitions which only hold rows older than purge_before."""
+    return [
+        partition
+        for partition in partitions
+        if partition.upper_bound is not None and partition.upper_bound <= purge_before
+    ]
+
+
+def rows_purge_before(partitions: list[Partition], purge_before: float) -> float:
+    """Return the time before which rows are still deleted one by one.
+
+    Rows are only deleted from the legacy and the default partitions, the
+    rows of the partition holding purge_before are kept until the whole
+    partition is dropped.
+    """
+    for partition in partitions:
+        if partition.upper_bound is None or partition.upper_bound <= purge_before:
+            continue
+        if partition.is_legacy or partition.lower_bound is None:
+            return purge_before
+        return partition.lower_bound
+    return purge_before
+
+
+def create_partitions(
+    session: Session, table: str, interval: str, now: datetime
+) -> None:
+    """Create the partitions from the last partition to PARTITIONS_AHEAD from now.
+
+    The partitions are contiguous, so changing the interval only changes
+    the length of the partitions created after the existing ones.
+    """
+    column = PARTITIONED_TABLES[table][0]
+    delta = partition_interval(interval)
+    current = partition_start(now, interval)
+    partitions = get_partitions(session, table)
+    upper_bounds = [
+        partition.upper_bound
+        for partition in partitions
+        if partition.upper_bound is not None
+    ]
+    default = next(
+        (partition.name for partition in partitions if partition.is_default), None
+    )
+    start = dt_util.utc_from_timestamp(max(upper_bounds)) if upper_bounds else current
+    end = current + delta * (PARTITIONS_AHEAD + 1)
+    while start < end:
+        name = partition_name(table, start)
+        bounds = {"start": start.timestamp(), "end": (start + delta).timestamp()}
+        try:
+            with session.begin_nested():
+                if (
+                    default is not None
+                    and session.execute(
+                        text(
+                            f"SELECT 1 FROM {default}"  # noqa: S608
+                            f" WHERE {column} >= :start AND {column} < :end LIMIT 1"
+                        ),
+                        bounds,
+                    ).scalar()
+                ):
+                    _create_partition_from_default(
+                        session, table, column, default, name, start, start + delta
+                    )
+                else:
+                    session.execute(
+                        text(
+                            f"CREATE TABLE {name} PARTITION OF {table}"
+                            f" FOR VALUES FROM ({start.timestamp()})"
+                            f" TO ({(start + delta).timestamp()})"
+                        )
+                    )
+        except SQLAlchemyError as err:
+            _LOGGER.error("Could not create partition %s: %s", name, err)
+            return
+        _LOGGER.debug("Created partition %s", name)
+        start += delta
+
+
+def _create_partition_from_default(
+    session: Session,
+    table: str,
+    column: str,
+    default: str,
+    name: str,
+    start: datetime,
+    end: datetime,
+) -> None:
+    """Create a partition with the rows of the default partition in its range.
+
+    A partition can not be created while the default partition has rows
+    which belong to it, so they are moved to the new table before it is
+    attached. Attaching it creates the indexes and the foreign keys of the
+    partitioned table.
+    """
+    session.execute(
+        text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING STORAGE)")
+    )
+    moved = session.connection().execute(
+        text(
+            f"WITH moved AS (DELETE FROM {default}"  # noqa: S608
+            f" WHERE {column} >= :start AND {column} < :end RETURNING *)"
+            f" INSERT INTO {name} SELECT * FROM moved"
+        ),
+        {"start": start.timestamp(), "end": end.timestamp()},
+    )
+    session.execute(
+        text(
+            f"ALTER TABLE {table} ATTACH PARTITION {name}"
+            f" FOR VALUES FROM ({start.timestamp()}) TO ({end.timestamp()})"
+        )
+    )
+    _LOGGER.info("Moved %s rows from %s to partition %s", moved.rowcount, default, name)
+
+
+def drop_partition(session: Session, partition: Partition) -> None:
+    """Drop a partition with its rows."""
+    session.execute(text(f"DROP TABLE {partition.name}"))
+    _LOGGER.info("Dropped partition %s", partition.name)
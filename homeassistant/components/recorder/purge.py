@@ -6,13 +6,17 @@ from collections.abc import Callable
 from datetime import datetime
 import logging
 import time
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
+from sqlalchemy import text, update
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm.session import Session
 
+from homeassistant.util import dt as dt_util
 from homeassistant.util.collection import chunked_or_all
 
-from .db_schema import Events, States, StatesMeta
+from . import partition
+from .db_schema import TABLE_EVENTS, TABLE_STATES, Events, States, StatesMeta
 from .models import DatabaseEngine
 from .queries import (
     attributes_ids_exist_in_states,
@@ -30,6 +34,7 @@ from .queries import (
     delete_statistics_short_term_rows,
     disconnect_states_rows,
     find_entity_ids_to_purge,
+    find_event_id_range_to_purge,
     find_event_types_to_purge,
     find_events_to_purge,
     find_latest_statistics_runs_run_id,
@@ -37,11 +42,12 @@ from .queries import (
     find_legacy_event_state_and_attributes_and_data_ids_to_purge,
     find_legacy_row,
     find_short_term_statistics_to_purge,
+    find_state_id_range_to_purge,
     find_states_to_purge,
     find_statistics_runs_to_purge,
 )
 from .repack import repack_database
-from .util import retryable_database_job, session_scope
+from .util import database_job_retry_wrapper, retryable_database_job, session_scope
 
 if TYPE_CHECKING:
     from . import Recorder
@@ -51,6 +57,183 @@ _LOGGER = logging.getLogger(__name__)
 
 DEFAULT_STATES_BATCHES_PER_PURGE = 20  # We expect ~95% de-dupe rate
 DEFAULT_EVENTS_BATCHES_PER_PURGE = 15  # We expect ~92% de-dupe rate
+# Limits of the number of batches per slice when slices finish fast
+MAX_STATES_BATCHES_PER_PURGE = 100
+MAX_EVENTS_BATCHES_PER_PURGE = 75
+
+# Wall time a purge slice should take, the number of batches per
+# slice is adjusted after each slice to stay close to it
+PURGE_SLICE_TARGET_SECONDS = 1.0
+# Continuous purges run while recording and use shorter slices
+CONTINUOUS_PURGE_SLICE_TARGET_SECONDS = 0.25
+# Limits of the change of the number of batches after a slice
+MIN_BATCH_SIZE_FACTOR = 0.25
+MAX_BATCH_SIZE_FACTOR = 2.0
+
+
+class PurgeProgress:
+    """Track the progress of a purge and size its slices.
+
+    A purge runs as a chain of slices, each one deleting a number of batches
+    of max_bind_vars rows in a single transaction which holds its locks until
+    it is committed. The recorder processes the queued events between the
+    slices, so the number of batches per slice is adjusted to the measured
+    latency of the previous slice to keep the slices close to a target wall
+    time instead of a fixed number of rows, which is too much for large
+    databases on slow disks.
+
+    Only one purge is tracked at a time, each one has a purge_id which its
+    slices pass on to the next slice.
+
+    The progress is written by the recorder thread and read by the event loop.
+    """
+
+    __slots__ = (
+        "events_batch_size",
+        "last_completed",
+        "last_slice_seconds",
+        "low_priority",
+        "purge_before",
+        "purge_id",
+        "purge_seconds",
+        "rows_purged",
+        "rows_to_purge",
+        "running",
+        "slices",
+        "states_batch_size",
+    )
+
+    def __init__(self) -> None:
+        """Initialize the purge progress."""
+        self.states_batch_size = DEFAULT_STATES_BATCHES_PER_PURGE
+        self.events_batch_size = DEFAULT_EVENTS_BATCHES_PER_PURGE
+        self.running = False
+        self.low_priority = False
+        self.purge_id = 0
+        self.purge_before: datetime | None = None
+        self.rows_to_purge: int | None = None
+        self.rows_purged = 0
+        self.purge_seconds = 0.0
+        self.slices = 0
+        self.last_slice_seconds: float | None = None
+        self.last_completed: datetime | None = None
+
+    def start(
+        self,
+        purge_before: datetime,
+        rows_to_purge: int | None,
+        low_priority: bool = False,
+    ) -> int:
+        """Start tracking a new purge and return its purge_id.
+
+        The batch sizes are kept from the previous purge.
+        """
+        self.purge_id += 1
+        self.running = True
+        self.low_priority = low_priority
+        self.purge_before = purge_before
+        self.rows_to_purge = rows_to_purge
+        self.rows_purged = 0
+        self.purge_seconds = 0.0
+        self.slices = 0
+        return self.purge_id
+
+    def add_rows_purged(self, rows: int) -> None:
+        """Add the number of states or events rows deleted by a batch."""
+        self.rows_purged += rows
+
+    def finish_slice(self, seconds: float, target_seconds: float) -> None:
+        """Record the duration of a slice and size the next one."""
+        self.slices += 1
+        self.purge_seconds += seconds
+        self.last_slice_seconds = seconds
+        factor = min(
+            max(target_seconds / max(seconds, 0.001), MIN_BATCH_SIZE_FACTOR),
+            MAX_BATCH_SIZE_FACTOR,
+        )
+        self.states_batch_size = min(
+            max(int(self.states_batch_size * factor), 1),
+            MAX_STATES_BATCHES_PER_PURGE,
+        )
+        self.events_batch_size = min(
+            max(int(self.events_batch_size * factor), 1),
+            MAX_EVENTS_BATCHES_PER_PURGE,
+        )
+
+    def stop(self, completed: bool) -> None:
+        """Stop tracking the purge."""
+        self.running = False
+        if completed:
+            self.last_completed = dt_util.utcnow()
+            # The rows to purge are estimated, all of them are purged now
+            self.rows_to_purge = self.rows_purged
+
+    @property
+    def rows_remaining(self) -> int | None:
+        """Return the estimated number of states and events rows to purge."""
+        if self.rows_to_purge is None:
+            return None
+        return max(self.rows_to_purge - self.rows_purged, 0)
+
+    @property
+    def rows_per_second(self) -> float | None:
+        """Return the number of rows purged per second spent purging."""
+        if not self.purge_seconds:
+            return None
+        return self.rows_purged / self.purge_seconds
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the progress as a dict."""
+        purge_before = self.purge_before
+        last_completed = self.last_completed
+        rows_per_second = self.rows_per_second
+        return {
+            "running": self.running,
+            "purge_before": purge_before and purge_before.isoformat(),
+            "rows_purged": self.rows_purged,
+            "rows_remaining": self.rows_remaining,
+            "rows_per_second": rows_per_second and round(rows_per_second, 1),
+            "slices": self.slices,
+            "last_slice_seconds": self.last_slice_seconds
+            and round(self.last_slice_seconds, 3),
+            "states_batch_size": self.states_batch_size,
+            "events_batch_size": self.events_batch_size,
+            "last_completed": last_completed and last_completed.isoformat(),
+        }
+
+
+def estimate_rows_to_purge(instance: Recorder, purge_before: datetime) -> int | None:
+    """Estimate the number of states and events rows older than purge_before.
+
+    Counting the rows would scan all of them, so the rows are estimated from
+    the range of ids between the oldest row and the newest row to purge,
+    which only needs index lookups. Ids of rows which were deleted out of
+    order, or rows which are newer but were written with a lower id, are
+    included in the estimate.
+
+    Returns None if the estimate failed.
+    """
+    try:
+        return _estimate_rows_to_purge(instance, purge_before)
+    except SQLAlchemyError as err:
+        _LOGGER.warning("Unable to estimate the rows to purge: %s", err)
+        return None
+
+
+@database_job_retry_wrapper("Estimate rows to purge", 3)
+def _estimate_rows_to_purge(instance: Recorder, purge_before: datetime) -> int:
+    """Estimate the number of rows to purge from their id ranges."""
+    purge_before_ts = purge_before.timestamp()
+    rows = 0
+    with session_scope(session=instance.get_session(), read_only=True) as session:
+        for stmt in (
+            find_state_id_range_to_purge(purge_before_ts),
+            find_event_id_range_to_purge(purge_before_ts),
+        ):
+            first_id, last_id = session.execute(stmt).one()
+            if first_id is not None and last_id is not None:
+                rows += max(last_id - first_id + 1, 0)
+    return rows
 
 
 @retryable_database_job("purge")
@@ -71,6 +254,8 @@ def purge_old_data(
         purge_before.isoformat(sep=" ", timespec="seconds"),
     )
     with session_scope(session=instance.get_session()) as session:
+        if instance.partitioned:
+            purge_before = _purge_expired_partitions(instance, session, purge_before)
         # Purge a max of max_bind_vars, based on the oldest states or events record
         has_more_to_purge = False
         if instance.use_legacy_events_index and _purging_legacy_format(session):
@@ -129,6 +314,83 @@ def purge_old_data(
     return True
 
 
+def _purge_expired_partitions(
+    instance: Recorder, session: Session, purge_before: datetime
+) -> datetime:
+    """Drop the partitions which only hold rows older than purge_before.
+
+    Returns the time before which the remaining rows are deleted one by one.
+    """
+    purge_before_ts = purge_before.timestamp()
+    rows_purge_before = purge_before_ts
+    for table in partition.PARTITIONED_TABLES:
+        partitions = partition.get_partitions(session, table)
+        for expired in partition.expired_partitions(partitions, purge_before_ts):
+            if table == TABLE_STATES:
+                _purge_states_partition(instance, session, expired)
+            elif table == TABLE_EVENTS:
+                _purge_events_partition(instance, session, expired)
+            else:
+                partition.drop_partition(session, expired)
+        if table == TABLE_STATES:
+            rows_purge_before = partition.rows_purge_before(partitions, purge_before_ts)
+    return dt_util.utc_from_timestamp(rows_purge_before)
+
+
+def _purge_states_partition(
+    instance: Recorder, session: Session, expired: partition.Partition
+) -> None:
+    """Drop a partition of the states table and the attributes only it used."""
+    name = expired.name
+    first_state_id, last_state_id, rows = session.execute(
+        text(f"SELECT min(state_id), max(state_id), count(*) FROM {name}")  # noqa: S608
+    ).one()
+    attributes_ids = set(
+        session.execute(
+            text(
+                f"SELECT DISTINCT attributes_id FROM {name}"  # noqa: S608
+                " WHERE attributes_id IS NOT NULL"
+            )
+        ).scalars()
+    )
+    if first_state_id is not None:
+        # Disconnect the states following a state of the partition
+        session.execute(
+            update(States)
+            .where(
+                States.old_state_id.between(first_state_id, last_state_id),
+                States.last_updated_ts >= expired.upper_bound,
+            )
+            .values(old_state_id=None)
+        )
+    partition.drop_partition(session, expired)
+    instance.purge_progress.add_rows_purged(rows)
+    if first_state_id is not None:
+        instance.states_manager.evict_purged_state_id_range(
+            first_state_id, last_state_id
+        )
+    _purge_unused_attributes_ids(instance, session, attributes_ids)
+
+
+def _purge_events_partition(
+    instance: Recorder, session: Session, expired: partition.Partition
+) -> None:
+    """Drop a partition of the events table and the data only it used."""
+    name = expired.name
+    rows = session.execute(text(f"SELECT count(*) FROM {name}")).scalar()  # noqa: S608
+    data_ids = set(
+        session.execute(
+            text(
+                f"SELECT DISTINCT data_id FROM {name}"  # noqa: S608
+                " WHERE data_id IS NOT NULL"
+            )
+        ).scalars()
+    )
+    partition.drop_partition(session, expired)
+    instance.purge_progress.add_rows_purged(rows or 0)
+    _purge_unused_data_ids(instance, session, data_ids)
+
+
 def _purging_legacy_format(session: Session) -> bool:
     """Check if there are any legacy event_id linked states rows remaining."""
     return bool(session.execute(find_legacy_row()).scalar())
@@ -164,6 +426,9 @@ def _purge_legacy_format(
     )
     _purge_state_ids(instance, session, detached_state_ids)
     _purge_unused_attributes_ids(instance, session, detached_attributes_ids)
+    instance.purge_progress.add_rows_purged(
+        len(event_ids) + len(state_ids) + len(detached_state_ids)
+    )
     return bool(
         event_ids
         or state_ids
@@ -201,6 +466,7 @@ def _purge_states_and_attributes_ids(
             has_remaining_state_ids_to_purge = False
             break
         _purge_state_ids(instance, session, state_ids)
+        instance.purge_progress.add_rows_purged(len(state_ids))
         attributes_ids_batch = attributes_ids_batch | attributes_ids
 
     _purge_unused_attributes_ids(instance, session, attributes_ids_batch)
@@ -236,6 +502,7 @@ def _purge_events_and_data_ids(
             has_remaining_event_ids_to_purge = False
             break
         _purge_event_ids(session, event_ids)
+        instance.purge_progress.add_rows_purged(len(event_ids))
         data_ids_batch = data_ids_batch | data_ids
 
     _purge_unused_data_ids(instance, session, data_ids_batch)
@@ -258,6 +258,34 @@ def find_events_to_purge(
     )
 
 
+def find_event_id_range_to_purge(purge_before: float) -> StatementLambdaElement:
+    """Find the event_id of the oldest event and of the newest event to purge."""
+    return lambda_stmt(
+        lambda: select(
+            select(func.min(Events.event_id)).scalar_subquery(),
+            select(Events.event_id)
+            .filter(Events.time_fired_ts < purge_before)
+            .order_by(Events.time_fired_ts.desc())
+            .limit(1)
+            .scalar_subquery(),
+        )
+    )
+
+
+def find_state_id_range_to_purge(purge_before: float) -> StatementLambdaElement:
+    """Find the state_id of the oldest state and of the newest state to purge."""
+    return lambda_stmt(
+        lambda: select(
+            select(func.min(States.state_id)).scalar_subquery(),
+            select(States.state_id)
+            .filter(States.last_updated_ts < purge_before)
+            .order_by(States.last_updated_ts.desc())
+            .limit(1)
+            .scalar_subquery(),
+        )
+    )
+
+
 def find_states_to_purge(
     purge_before: float, max_bind_vars: int
 ) -> StatementLambdaElement:
@@ -0,0 +1,290 @@
+"""Spool events to disk while the database can not keep up."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable, Generator
+from concurrent.futures import Future, ThreadPoolExecutor
+import logging
+import os
+import threading
+from typing import IO, Any
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import (
+    Context,
+    Event,
+    EventOrigin,
+    EventStateChangedData,
+    State,
+    callback,
+)
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util.json import (
+    JSON_DECODE_EXCEPTIONS,
+    JSON_ENCODE_EXCEPTIONS,
+    json_loads,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Records written to a segment before a new one is started
+SPOOL_SEGMENT_MAX_RECORDS = 10000
+# Records kept in memory before they are written
+SPOOL_WRITE_BATCH = 500
+
+_OPEN_SEGMENT_SUFFIX = ".open"
+_SEALED_SEGMENT_SUFFIX = ".seg"
+_ORIGINS = {origin.idx: origin for origin in EventOrigin}
+
+
+def _event_to_record(event: Event[Any]) -> bytes:
+    """Encode an event as a line of the spool."""
+    context = event.context
+    header = [
+        event.event_type,
+        event.origin.idx,
+        event.time_fired_timestamp,
+        context.id,
+        context.user_id,
+        context.parent_id,
+    ]
+    if event.event_type == EVENT_STATE_CHANGED:
+        data = event.data
+        old_state: State | None = data["old_state"]
+        new_state: State | None = data["new_state"]
+        record = [
+            *header,
+            data["entity_id"],
+            old_state and old_state.json_fragment,
+            new_state and new_state.json_fragment,
+        ]
+    else:
+        record = [*header, event.data]
+    return json_bytes(record) + b"\n"
+
+
+def _record_to_event(record: list[Any]) -> Event[Any]:
+    """Decode a line of the spool to an event."""
+    event_type, origin_idx, time_fired_timestamp, context_id, user_id, parent_id = (
+        record[:6]
+    )
+    context = Context(user_id=user_id, parent_id=parent_id, id=context_id)
+    data: dict[str, Any] | EventStateChangedData
+    if event_type == EVENT_STATE_CHANGED:
+        entity_id, old_state_dict, new_state_dict = record[6:]
+        new_state = State.from_dict(new_state_dict)
+        if new_state is not None and new_state.context.id == context_id:
+            # The state dict does not have the parent_id of the context, it
+            # is only replaced when the state was set with the event context
+            new_state.context = context
+        data = {
+            "entity_id": entity_id,
+            "old_state": State.from_dict(old_state_dict),
+            "new_state": new_state,
+        }
+    else:
+        data = record[6]
+    return Event(event_type, data, _ORIGINS[origin_idx], time_fired_timestamp, context)
+
+
+class RecorderSpool:
+    """Append only spool of events on disk.
+
+    When the recorder queue grows because the database can not keep up,
+    events are appended to the spool instead of the queue to keep the
+    memory bounded. The spool is split in segments, which are read back
+    by the recorder thread once the database has caught up and deleted
+    when the events are committed.
+
+    Segments which are left behind when Home Assistant stops are read
+    back on the next start.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize the spool."""
+        self.path = path
+        # Set when new events are appended to the spool instead of the queue
+        self.active = False
+        self._buffer: list[bytes] = []
+        self._executor: ThreadPoolExecutor | None = None
+        # Protects the segment numbers and the sealed segments
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._next_segment = 0
+        self._sealed: deque[str] = deque()
+        # Only used from the writer thread
+        self._segment: IO[bytes] | None = None
+        self._segment_path: str | None = None
+        self._segment_records = 0
+
+    @callback
+    def async_append(self, event: Event[Any]) -> None:
+        """Append an event to the spool."""
+        try:
+            record = _event_to_record(event)
+        except JSON_ENCODE_EXCEPTIONS as err:
+            _LOGGER.warning("Event is not JSON serializable: %s: %s", event, err)
+            return
+        self._buffer.append(record)
+        if len(self._buffer) >= SPOOL_WRITE_BATCH:
+            self.async_flush()
+
+    @callback
+    def async_flush(self) -> Future[None] | None:
+        """Write the buffered events."""
+        if not self._buffer:
+            return None
+        return self._async_write(self._write)
+
+    @callback
+    def async_seal(self) -> Future[list[str]]:
+        """Write the buffered events and seal the segment.
+
+        The returned future is done once the segment can be read back,
+        its result are the sealed segments with all events spooled so far.
+        """
+        return self._async_write(self._seal)
+
+    @callback
+    def _async_write[_R](self, write: Callable[[list[bytes]], _R]) -> Future[_R]:
+        """Write the buffered events in the writer thread.
+
+        The writer thread is kept until shutdown, so the writes of the open
+        segment never run in two threads at once.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="RecorderSpool"
+            )
+        records, self._buffer = self._buffer, []
+        return self._executor.submit(write, records)
+
+    def _load(self) -> None:
+        """Find the segments left behind by a previous run.
+
+        Must be called with the lock held.
+        """
+        if self._loaded:
+            return
+        self._loaded = True
+        os.makedirs(self.path, exist_ok=True)
+        segments: list[tuple[int, str]] = []
+        for name in os.listdir(self.path):
+            number, suffix = os.path.splitext(name)
+            if not number.isdigit() or suffix not in (
+                _OPEN_SEGMENT_SUFFIX,
+                _SEALED_SEGMENT_SUFFIX,
+            ):
+                continue
+            segments.append((int(number), os.path.join(self.path, name)))
+        segments.sort()
+        self._sealed.extend(segment_path for _, segment_path in segments)
+        if segments:
+            self._next_segment = segments[-1][0] + 1
+
+    def _write(self, records: list[bytes], seal: bool = False) -> None:
+        """Write records to the open segment."""
+        try:
+            if records:
+                if self._segment is None:
+                    self._open_segment()
+                    assert self._segment is not None
+                self._segment.write(b"".join(records))
+                self._segment.flush()
+                self._segment_records += len(records)
+            if self._segment is not None and (
+                seal or self._segment_records >= SPOOL_SEGMENT_MAX_RECORDS
+            ):
+                self._seal_segment()
+        except OSError:
+            _LOGGER.exception("Error writing %s events to the spool", len(records))
+
+    def _seal(self, records: list[bytes]) -> list[str]:
+        """Write records, seal the open segment and return the sealed segments."""
+        self._write(records, True)
+        return self.sealed_segments()
+
+    def _open_segment(self) -> None:
+        """Open a new segment."""
+        with self._lock:
+            self._load()
+            number = self._next_segment
+            self._next_segment += 1
+        self._segment_path = os.path.join(
+            self.path, f"{number:08d}{_OPEN_SEGMENT_SUFFIX}"
+        )
+        self._segment = open(self._segment_path, "ab")
+        self._segment_records = 0
+
+    def _seal_segment(self) -> None:
+        """Close the open segment so it can be read back."""
+        assert self._segment is not None and self._segment_path is not None
+        self._segment.close()
+        self._segment = None
+        sealed_path = (
+            self._segment_path.removesuffix(_OPEN_SEGMENT_SUFFIX)
+            + _SEALED_SEGMENT_SUFFIX
+        )
+        os.replace(self._segment_path, sealed_path)
+        with self._lock:
+            self._sealed.append(sealed_path)
+
+    def sealed_segments(self) -> list[str]:
+        """Return the sealed segments, oldest first.
+
+        This call is blocking and must not be called from the event loop.
+        """
+        with self._lock:
+            self._load()
+            return list(self._sealed)
+
+    def read_segment(self, segment_path: str) -> Generator[Event[Any]]:
+        """Read the events of a segment.
+
+        This call is blocking and must be called from the recorder thread.
+        """
+        with open(segment_path, "rb") as segment:
+            for line in segment:
+                try:
+                    record = json_loads(line)
+                    event = _record_to_event(record)  # type: ignore[arg-type]
+                except (*JSON_DECODE_EXCEPTIONS, KeyError, TypeError, ValueError):
+                    # The last line can be incomplete after a crash
+                    _LOGGER.warning("Skipping malformed record in %s", segment_path)
+                    continue
+                yield event
+
+    def remove_segment(self, segment_path: str) -> None:
+        """Remove a segment once its events are committed.
+
+        This call is blocking and must be called from the recorder thread.
+        """
+        with self._lock:
+            if segment_path not in self._sealed:
+                # Already inserted by an earlier drain
+                return
+            self._sealed.remove(segment_path)
+        os.unlink(segment_path)
+
+    def shutdown(self) -> None:
+        """Write the buffered events and stop the writer thread.
+
+        The events which are still in the spool are read back on
+        the next start.
+
+        Events must no longer be appended when this is called.
+
+        This call is blocking and must be called from an executor.
+        """
+        records, self._buffer = self._buffer, []
+        executor = self._executor
+        if executor is None:
+            # No writer thread was started, nothing else writes the segment
+            if records:
+                self._write(records)
+            return
+        self._executor = None
+        if records:
+            executor.submit(self._write, records)
+        executor.shutdown(wait=True)
@@ -9,11 +9,14 @@ from datetime import datetime, timedelta
 from functools import lru_cache, partial
 from itertools import chain, groupby
 import logging
+import math
 from operator import itemgetter
 import re
+import threading
 from time import time as time_time
 from typing import TYPE_CHECKING, Any, Literal, TypedDict, cast
 
+from lru import LRU
 from sqlalchemy import Select, and_, bindparam, func, lambda_stmt, select, text
 from sqlalchemy.engine.row import Row
 from sqlalchemy.exc import SQLAlchemyError
@@ -167,6 +170,11 @@ UNIT_CLASSES = {
 }
 
 DATA_SHORT_TERM_STATISTICS_RUN_CACHE = "recorder_short_term_statistics_run_cache"
+DATA_STATISTICS_ROLLUP_CACHE = "recorder_statistics_rollup_cache"
+
+# Number of reduced statistics kept in the rollup cache, each of them holds
+# the rows of one statistic for one combination of period, units and types
+STATISTICS_ROLLUP_CACHE_SIZE = 256
 
 
 def mean(values: list[float]) -> float | None:
@@ -210,6 +218,75 @@ class ShortTermStatisticsRunCache:
         self._latest_id_by_metadata_id.update(metadata_id_to_id)
 
 
+type StatisticsRollupKey = tuple[
+    str, int, str, frozenset[str], str | None, str | None, str | None, str
+]
+
+
+@dataclasses.dataclass(slots=True)
+class StatisticsRollup:
+    """Reduced statistics of sealed periods between start and end."""
+
+    start: float
+    end: float
+    rows: list[StatisticsRow]
+
+
+@dataclasses.dataclass(slots=True)
+class StatisticsRollupCache:
+    """Cache for daily, weekly and monthly statistics of sealed periods.
+
+    A period is sealed once the hourly statistics of all its hours have been
+    compiled. The reduced statistics of a sealed period only change when
+    statistics are imported, adjusted or cleared, or their unit is changed,
+    which invalidates the cached statistics of the statistic_id.
+    """
+
+    # The end of the last compiled hour
+    sealed_before: float | None = None
+    # Incremented on every invalidation so statistics which were read
+    # before an invalidation are not cached
+    generation: int = 0
+    _rollups: LRU[StatisticsRollupKey, StatisticsRollup] = dataclasses.field(
+        default_factory=lambda: LRU(STATISTICS_ROLLUP_CACHE_SIZE)
+    )
+    _lock: threading.Lock = dataclasses.field(default_factory=threading.Lock)
+
+    def hours_compiled(self, start: datetime, end: datetime) -> None:
+        """Seal the periods which end before the end of the compiled hours."""
+        with self._lock:
+            if (
+                self.sealed_before is not None
+                and start.timestamp() < self.sealed_before
+            ):
+                # Statistics were compiled out of order for an hour of a
+                # period which may already be cached
+                self.generation += 1
+                self._rollups.clear()
+            self.sealed_before = max(self.sealed_before or 0, end.timestamp())
+
+    def get(self, key: StatisticsRollupKey) -> StatisticsRollup | None:
+        """Return the cached statistics for a key."""
+        return self._rollups.get(key)
+
+    def set(
+        self, key: StatisticsRollupKey, rollup: StatisticsRollup, generation: int
+    ) -> None:
+        """Cache the statistics if they were read at the current generation."""
+        with self._lock:
+            if generation == self.generation:
+                self._rollups[key] = rollup
+
+    def invalidate(self, statistic_id: str) -> None:
+        """Drop the cached statistics of a statistic_id."""
+        with self._lock:
+            self.generation += 1
+            # LRU is not iterable, keys returns a list
+            for key in self._rollups.keys():  # noqa: SIM118
+                if key[0] == statistic_id:
+                    del self._rollups[key]
+
+
 class BaseStatisticsRow(TypedDict, total=False):
     """A processed row of statistic data."""
 
@@ -480,6 +557,7 @@ def compile_missing_statistics(instance: Recorder) -> bool:
             start = max(
                 start, process_timestamp(last_run) + StatisticsShortTerm.duration
             )
+        first_start = start
 
         periods_without_commit = 0
         while start < last_period:
@@ -495,6 +573,9 @@ def compile_missing_statistics(instance: Recorder) -> bool:
                 periods_without_commit = 0
             start = end
 
+    get_statistics_rollup_cache(instance.hass).hours_compiled(
+        first_start.replace(minute=0), last_period.replace(minute=0)
+    )
     return True
 
 
@@ -521,6 +602,11 @@ def compile_statistics(instance: Recorder, start: datetime, fire_events: bool) -
             instance, session, start, fire_events
         )
 
+    if start.minute == 55:
+        get_statistics_rollup_cache(instance.hass).hours_compiled(
+            start.replace(minute=0), start + StatisticsShortTerm.duration
+        )
+
     if modified_statistic_ids:
         # In the rare case that we have modified statistic_ids, we reload the modified
         # statistics meta data into the cache in a fresh session to ensure that the
@@ -758,6 +844,9 @@ def clear_statistics(instance: Recorder, statistic_ids: list[str]) -> None:
     """Clear statistics for a list of statistic_ids."""
     with session_scope(session=instance.get_session()) as session:
         instance.statistics_meta_manager.delete(session, statistic_ids)
+    rollup_cache = get_statistics_rollup_cache(instance.hass)
+    for statistic_id in statistic_ids:
+        rollup_cache.invalidate(statistic_id)
 
 
 def update_statistics_metadata(
@@ -1703,6 +1792,166 @@ def _augment_result_with_change(
             prev_sum = _sum
 
 
+_REDUCED_PERIODS: dict[
+    str,
+    tuple[
+        Callable[
+            [],
+            tuple[
+                Callable[[float, float], bool], Callable[[float], tuple[float, float]]
+            ],
+        ],
+        Callable[
+            [
+                dict[str, list[StatisticsRow]],
+                set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
+            ],
+            dict[str, list[StatisticsRow]],
+        ],
+    ],
+] = {
+    "day": (reduce_day_ts_factory, _reduce_statistics_per_day),
+    "week": (reduce_week_ts_factory, _reduce_statistics_per_week),
+    "month": (reduce_month_ts_factory, _reduce_statistics_per_month),
+}
+
+
+def _statistics_rollup_key(
+    hass: HomeAssistant,
+    statistic_id: str,
+    metadata_id: int,
+    statistic_unit: str | None,
+    period: str,
+    units: dict[str, str] | None,
+    types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
+) -> StatisticsRollupKey:
+    """Return the key of the reduced statistics in the rollup cache.
+
+    The key has everything the reduced statistics depend on besides the
+    hourly statistics: the units they are converted to and the time zone
+    which the periods are aligned to.
+    """
+    state_unit = statistic_unit
+    if state := hass.states.get(statistic_id):
+        state_unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+    requested_unit: str | None = None
+    if units and (converter := STATISTIC_UNIT_TO_UNIT_CONVERTER.get(statistic_unit)):
+        requested_unit = units.get(converter.UNIT_CLASS)
+    return (
+        statistic_id,
+        metadata_id,
+        period,
+        frozenset(types),
+        statistic_unit,
+        state_unit,
+        requested_unit,
+        str(dt_util.get_default_time_zone()),
+    )
+
+
+def _reduced_statistics_during_period(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None,
+    statistic_ids: set[str],
+    metadata: dict[str, tuple[int, StatisticMetaData]],
+    period: str,
+    units: dict[str, str] | None,
+    types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
+) -> dict[str, list[StatisticsRow]]:
+    """Return daily, weekly or monthly statistics during start_time - end_time.
+
+    start_time and end_time must be aligned with the period. The statistics of
+    sealed periods are read from the rollup cache, only the hourly statistics
+    after the cached periods are queried and reduced.
+    """
+    rollup_cache = get_statistics_rollup_cache(hass)
+    generation = rollup_cache.generation
+    ts_factory, reduce_statistics = _REDUCED_PERIODS[period]
+    _, period_start_end = ts_factory()
+    start_ts = start_time.timestamp()
+    end_ts = end_time.timestamp() if end_time is not None else math.inf
+    # The statistics of the periods which end before sealed_end are final
+    sealed_end = (
+        min(period_start_end(sealed_before)[0], end_ts)
+        if (sealed_before := rollup_cache.sealed_before) is not None
+        else start_ts
+    )
+
+    keys: dict[str, StatisticsRollupKey] = {}
+    rollups: dict[str, StatisticsRollup] = {}
+    query_start_ts = end_ts
+    for statistic_id, (metadata_id, stats_metadata) in metadata.items():
+        keys[statistic_id] = key = _statistics_rollup_key(
+            hass,
+            statistic_id,
+            metadata_id,
+            stats_metadata["unit_of_measurement"],
+            period,
+            units,
+            types,
+        )
+        if (
+            rollup := rollup_cache.get(key)
+        ) is not None and rollup.start <= start_ts <= rollup.end:
+            rollups[statistic_id] = rollup
+            query_start_ts = min(query_start_ts, rollup.end)
+        else:
+            query_start_ts = start_ts
+
+    reduced: dict[str, list[StatisticsRow]] = {}
+    if query_start_ts < end_ts:
+        stmt = _generate_statistics_during_period_stmt(
+            dt_util.utc_from_timestamp(query_start_ts),
+            end_time,
+            [metadata_id for metadata_id, _ in metadata.values()],
+            Statistics,
+            types,
+        )
+        if stats := cast(
+            Sequence[Row], execute_stmt_lambda_element(session, stmt, orm_rows=False)
+        ):
+            reduced = reduce_statistics(
+                _sorted_statistics_to_dict(
+                    hass, stats, statistic_ids, metadata, True, Statistics, units, types
+                ),
+                types,
+            )
+
+    result: dict[str, list[StatisticsRow]] = {}
+    for statistic_id in statistic_ids:
+        if statistic_id not in metadata:
+            continue
+        cached_rows: list[StatisticsRow] = []
+        rollup_start = start_ts
+        if rollup := rollups.get(statistic_id):
+            rollup_start = rollup.start
+            cached_rows = [row for row in rollup.rows if row["start"] < query_start_ts]
+        new_rows = reduced.get(statistic_id, [])
+        # Rows are copied as the change is added to the returned rows
+        if (
+            rows := [
+                row.copy() for row in cached_rows if start_ts <= row["start"] < end_ts
+            ]
+            + new_rows
+        ):
+            result[statistic_id] = rows
+        if sealed_end > (rollup.end if rollup else start_ts):
+            rollup_cache.set(
+                keys[statistic_id],
+                StatisticsRollup(
+                    rollup_start,
+                    sealed_end,
+                    cached_rows
+                    + [row.copy() for row in new_rows if row["end"] <= sealed_end],
+                ),
+                generation,
+            )
+
+    return result
+
+
 def _statistics_during_period_with_session(
     hass: HomeAssistant,
     session: Session,
@@ -1773,35 +2022,44 @@ def _statistics_during_period_with_session(
     table: type[Statistics | StatisticsShortTerm] = (
         Statistics if period != "5minute" else StatisticsShortTerm
     )
-    stmt = _generate_statistics_during_period_stmt(
-        start_time, end_time, metadata_ids, table, types
-    )
-    stats = cast(
-        Sequence[Row], execute_stmt_lambda_element(session, stmt, orm_rows=False)
-    )
-
-    if not stats:
-        return {}
-
-    result = _sorted_statistics_to_dict(
-        hass,
-        stats,
-        statistic_ids,
-        metadata,
-        True,
-        table,
-        units,
-        types,
-    )
+    if period in _REDUCED_PERIODS and statistic_ids is not None:
+        result = _reduced_statistics_during_period(
+            hass,
+            session,
+            start_time,
+            end_time,
+            statistic_ids,
+            metadata,
+            period,
+            units,
+            types,
+        )
+        if not result:
+            return {}
+    else:
+        stmt = _generate_statistics_during_period_stmt(
+            start_time, end_time, metadata_ids, table, types
+        )
+        stats = cast(
+            Sequence[Row], execute_stmt_lambda_element(session, stmt, orm_rows=False)
+        )
 
-    if period == "day":
-        result = _reduce_statistics_per_day(result, types)
+        if not stats:
+            return {}
 
-    if period == "week":
-        result = _reduce_statistics_per_week(result, types)
+        result = _sorted_statistics_to_dict(
+            hass,
+            stats,
+            statistic_ids,
+            metadata,
+            True,
+            table,
+            units,
+            types,
+        )
 
-    if period == "month":
-        result = _reduce_statistics_per_month(result, types)
+        if period in _REDUCED_PERIODS:
+            result = _REDUCED_PERIODS[period][1](result, types)
 
     if "change" in _types:
         _augment_result_with_change(
@@ -2384,6 +2642,12 @@ def get_short_term_statistics_run_cache(
     return ShortTermStatisticsRunCache()
 
 
+@singleton(DATA_STATISTICS_ROLLUP_CACHE)
+def get_statistics_rollup_cache(hass: HomeAssistant) -> StatisticsRollupCache:
+    """Get the statistics rollup cache."""
+    return StatisticsRollupCache()
+
+
 def cache_latest_short_term_statistic_id_for_metadata_id(
     run_cache: ShortTermStatisticsRunCache,
     session: Session,
@@ -2449,9 +2713,12 @@ def import_statistics(
             instance, "statistic"
         ),
     ) as session:
-        return _import_statistics_with_session(
+        imported = _import_statistics_with_session(
             instance, session, metadata, statistics, table
         )
+    if table != StatisticsShortTerm:
+        get_statistics_rollup_cache(instance.hass).invalidate(metadata["statistic_id"])
+    return imported
 
 
 @retryable_database_job("adjust_statistics")
@@ -2493,6 +2760,7 @@ def adjust_statistics(
             sum_adjustment,
         )
 
+    get_statistics_rollup_cache(instance.hass).invalidate(statistic_id)
     return True
 
 
@@ -2561,6 +2829,8 @@ def change_statistics_unit(
             session, statistic_id, new_unit
         )
 
+    get_statistics_rollup_cache(instance.hass).invalidate(statistic_id)
+
 
 @callback
 def async_change_statistics_unit(
@@ -44,6 +44,31 @@ def _get_db_stats(instance: Recorder, database_name: str) -> dict[str, Any]:
     return db_stats
 
 
+def _format_lru_stats(stats: dict[str, int]) -> str:
+    """Format the size and the lookup counters of a table manager LRU."""
+    lookups = stats["hits"] + stats["misses"]
+    hit_rate = stats["hits"] / lookups * 100 if lookups else 100.0
+    return (
+        f"{hit_rate:.1f}% hits, {stats['database_hits']} of"
+        f" {stats['database_lookups']} database lookups found,"
+        f" {stats['size']} of {stats['max_size']} entries"
+    )
+
+
+@callback
+def _async_get_cache_info(instance: Recorder) -> dict[str, str]:
+    """Get the hit rates of the table manager caches."""
+    return {
+        key: _format_lru_stats(stats)
+        for key, stats in (
+            ("state_attributes_cache", instance.state_attributes_manager.lru_stats()),
+            ("event_data_cache", instance.event_data_manager.lru_stats()),
+            ("states_meta_cache", instance.states_meta_manager.lru_stats()),
+            ("statistics_meta_cache", instance.statistics_meta_manager.lru_stats()),
+        )
+    }
+
+
 @callback
 def _async_get_db_engine_info(instance: Recorder) -> dict[str, Any]:
     """Get database engine info."""
@@ -63,6 +88,7 @@ async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
     database_name = urlparse(instance.db_url).path.lstrip("/")
     db_engine_info = _async_get_db_engine_info(instance)
     db_stats: dict[str, Any] = {}
+    cache_info: dict[str, str] = {}
 
     if instance.async_db_ready.done():
         db_stats = await instance.async_add_executor_job(
@@ -72,4 +98,5 @@ async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
             "oldest_recorder_run": recorder_runs_manager.first.start,
             "current_recorder_run": recorder_runs_manager.current.start,
         }
-    return db_runs | db_stats | db_engine_info
+        cache_info = _async_get_cache_info(instance)
+    return db_runs | db_stats | db_engine_info | cache_info
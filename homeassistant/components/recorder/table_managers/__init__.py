@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
 from lru import LRU
@@ -12,6 +13,53 @@ if TYPE_CHECKING:
     from ..core import Recorder
 
 
+@dataclass(slots=True)
+class LRUStats:
+    """Lookup counters of a table manager LRU.
+
+    The counters are not thread-safe, lookups outside of the
+    recorder thread may not all be counted.
+    """
+
+    # Lookups resolved from the LRU
+    hits: int = 0
+    # Lookups which were not in the LRU
+    misses: int = 0
+    # Keys looked up in the database
+    database_lookups: int = 0
+    # Keys found in the database which were evicted from the LRU or not loaded yet
+    database_hits: int = 0
+    # The database hits at the last adjustment of the LRU size
+    _adjusted_database_hits: int = 0
+
+    def adjust_lru_size(self, lru: LRU, new_size: int, max_size: int) -> None:
+        """Adjust the LRU size to the working set.
+
+        The LRU grows to new_size. If it is full and entries were read
+        back from the database since the last adjustment, the working set
+        does not fit and the LRU grows by the number of entries read back,
+        up to max_size to bound the memory used.
+        """
+        reloaded = self.database_hits - self._adjusted_database_hits
+        self._adjusted_database_hits = self.database_hits
+        size = lru.get_size()
+        if reloaded and len(lru) >= size:
+            new_size = max(new_size, min(size + reloaded, max_size))
+        if new_size > size:
+            lru.set_size(new_size)
+
+    def as_dict(self, lru: LRU) -> dict[str, int]:
+        """Return the LRU size and the counters as a dict."""
+        return {
+            "size": len(lru),
+            "max_size": lru.get_size(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "database_lookups": self.database_lookups,
+            "database_hits": self.database_hits,
+        }
+
+
 class BaseTableManager[_DataT]:
     """Base class for table managers."""
 
@@ -26,14 +74,20 @@ class BaseTableManager[_DataT]:
         """
         self.recorder = recorder
         self._pending: dict[EventType[Any] | str, _DataT] = {}
+        self.stats = LRUStats()
 
     def get_from_cache(self, data: str) -> int | None:
         """Resolve data to the id without accessing the underlying database.
 
+        Only hits are counted since a miss is followed by a lookup
+        which counts it.
+
         This call is not thread-safe and must be called from the
         recorder thread.
         """
-        return self._id_map.get(data)
+        if (id_ := self._id_map.get(data)) is not None:
+            self.stats.hits += 1
+        return id_
 
     def get_pending(self, shared_data: EventType[Any] | str) -> _DataT | None:
         """Get pending data that have not be assigned ids yet.
@@ -56,14 +110,18 @@ class BaseTableManager[_DataT]:
 class BaseLRUTableManager[_DataT](BaseTableManager[_DataT]):
     """Base class for LRU table managers."""
 
-    def __init__(self, recorder: Recorder, lru_size: int) -> None:
+    def __init__(
+        self, recorder: Recorder, lru_size: int, max_lru_size: int | None = None
+    ) -> None:
         """Initialize the LRU table manager.
 
         We keep track of the most recently used items
         and evict the least recently used items when the cache is full.
+        The cache grows up to max_lru_size when the working set does not fit.
         """
         super().__init__(recorder)
         self._id_map = LRU(lru_size)
+        self.max_lru_size = max_lru_size or lru_size
 
     def adjust_lru_size(self, new_size: int) -> None:
         """Adjust the LRU cache size.
@@ -71,6 +129,8 @@ class BaseLRUTableManager[_DataT](BaseTableManager[_DataT]):
         This call is not thread-safe and must be called from the
         recorder thread.
         """
-        lru = self._id_map
-        if new_size > lru.get_size():
-            lru.set_size(new_size)
+        self.stats.adjust_lru_size(self._id_map, new_size, self.max_lru_size)
+
+    def lru_stats(self) -> dict[str, int]:
+        """Return the LRU size and lookup counters."""
+        return self.stats.as_dict(self._id_map)
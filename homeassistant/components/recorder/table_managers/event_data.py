@@ -22,6 +22,7 @@ if TYPE_CHECKING:
 
 
 CACHE_SIZE = 2048
+MAX_CACHE_SIZE = 16384
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,7 +32,7 @@ class EventDataManager(BaseLRUTableManager[EventData]):
 
     def __init__(self, recorder: Recorder) -> None:
         """Initialize the event type manager."""
-        super().__init__(recorder, CACHE_SIZE)
+        super().__init__(recorder, CACHE_SIZE, MAX_CACHE_SIZE)
 
     def serialize_from_event(self, event: Event) -> bytes | None:
         """Serialize event data."""
@@ -46,15 +47,28 @@ class EventDataManager(BaseLRUTableManager[EventData]):
     def load(self, events: list[Event], session: Session) -> None:
         """Load the shared_datas to data_ids mapping into memory from events.
 
+        Only the shared_datas which are not in the LRU are looked up,
+        they are counted as misses.
+
         This call is not thread-safe and must be called from the
         recorder thread.
         """
-        if hashes := {
-            EventData.hash_shared_data_bytes(shared_event_bytes)
-            for event in events
-            if (shared_event_bytes := self.serialize_from_event(event))
-        }:
-            self._load_from_hashes(hashes, session)
+        id_map = self._id_map
+        missing: dict[str, int] = {}
+        for event in events:
+            if (shared_event_bytes := self.serialize_from_event(event)) and (
+                shared_data := shared_event_bytes.decode("utf-8")
+            ) not in id_map:
+                missing[shared_data] = EventData.hash_shared_data_bytes(
+                    shared_event_bytes
+                )
+        if not missing:
+            return
+        loaded = self._load_from_hashes(set(missing.values()), session)
+        stats = self.stats
+        stats.misses += len(missing)
+        stats.database_lookups += len(missing)
+        stats.database_hits += sum(shared_data in loaded for shared_data in missing)
 
     def get(self, shared_data: str, data_hash: int, session: Session) -> int | None:
         """Resolve shared_datas to the data_id.
@@ -74,16 +88,30 @@ class EventDataManager(BaseLRUTableManager[EventData]):
         """
         results: dict[str, int | None] = {}
         missing_hashes: set[int] = set()
+        misses = 0
         for shared_data, data_hash in shared_data_data_hashs:
             if (data_id := self._id_map.get(shared_data)) is None:
                 missing_hashes.add(data_hash)
+                misses += 1
 
             results[shared_data] = data_id
 
+        self.stats.misses += misses
+        self.stats.hits += len(results) - misses
         if not missing_hashes:
             return results
 
-        return results | self._load_from_hashes(missing_hashes, session)
+        # Only count the keys that missed, the hashes of other keys
+        # may collide with them or may have been loaded by load()
+        loaded = self._load_from_hashes(missing_hashes, session)
+        database_hits = 0
+        for shared_data, data_id in results.items():
+            if data_id is None and (data_id := loaded.get(shared_data)) is not None:
+                results[shared_data] = data_id
+                database_hits += 1
+        self.stats.database_lookups += misses
+        self.stats.database_hits += database_hits
+        return results
 
     def _load_from_hashes(
         self, hashes: Collection[int], session: Session
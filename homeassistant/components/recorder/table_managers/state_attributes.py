@@ -27,6 +27,9 @@ if TYPE_CHECKING:
 # - How frequently states with overlapping attributes will change
 # - How much memory our low end hardware has
 CACHE_SIZE = 2048
+# The number of attribute ids the cache can grow to when the attributes
+# in use do not fit, which bounds the memory used by the cache
+MAX_CACHE_SIZE = 16384
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -36,13 +39,19 @@ class StateAttributesManager(BaseLRUTableManager[StateAttributes]):
 
     def __init__(self, recorder: Recorder) -> None:
         """Initialize the event type manager."""
-        super().__init__(recorder, CACHE_SIZE)
+        super().__init__(recorder, CACHE_SIZE, MAX_CACHE_SIZE)
 
     def serialize_from_event(self, event: Event[EventStateChangedData]) -> bytes | None:
         """Serialize event data."""
+        exclude_attributes = self.recorder.exclude_attributes
+        domain_exclude_attrs = (
+            exclude_attributes.get(new_state.domain)
+            if exclude_attributes and (new_state := event.data["new_state"])
+            else None
+        )
         try:
             return StateAttributes.shared_attrs_bytes_from_event(
-                event, self.recorder.dialect_name
+                event, self.recorder.dialect_name, domain_exclude_attrs
             )
         except JSON_ENCODE_EXCEPTIONS as ex:
             _LOGGER.warning(
@@ -57,15 +66,28 @@ class StateAttributesManager(BaseLRUTableManager[StateAttributes]):
     ) -> None:
         """Load the shared_attrs to attributes_ids mapping into memory from events.
 
+        Only the shared_attrs which are not in the LRU are looked up,
+        they are counted as misses.
+
         This call is not thread-safe and must be called from the
         recorder thread.
         """
-        if hashes := {
-            StateAttributes.hash_shared_attrs_bytes(shared_attrs_bytes)
-            for event in events
-            if (shared_attrs_bytes := self.serialize_from_event(event))
-        }:
-            self._load_from_hashes(hashes, session)
+        id_map = self._id_map
+        missing: dict[str, int] = {}
+        for event in events:
+            if (shared_attrs_bytes := self.serialize_from_event(event)) and (
+                shared_attrs := shared_attrs_bytes.decode("utf-8")
+            ) not in id_map:
+                missing[shared_attrs] = StateAttributes.hash_shared_attrs_bytes(
+                    shared_attrs_bytes
+                )
+        if not missing:
+            return
+        loaded = self._load_from_hashes(set(missing.values()), session)
+        stats = self.stats
+        stats.misses += len(missing)
+        stats.database_lookups += len(missing)
+        stats.database_hits += sum(shared_attrs in loaded for shared_attrs in missing)
 
     def get(self, shared_attr: str, data_hash: int, session: Session) -> int | None:
         """Resolve shared_attrs to the attributes_id.
@@ -85,16 +107,33 @@ class StateAttributesManager(BaseLRUTableManager[StateAttributes]):
         """
         results: dict[str, int | None] = {}
         missing_hashes: set[int] = set()
+        misses = 0
         for shared_attrs, data_hash in shared_attrs_data_hashes:
             if (attributes_id := self._id_map.get(shared_attrs)) is None:
                 missing_hashes.add(data_hash)
+                misses += 1
 
             results[shared_attrs] = attributes_id
 
+        self.stats.misses += misses
+        self.stats.hits += len(results) - misses
         if not missing_hashes:
             return results
 
-        return results | self._load_from_hashes(missing_hashes, session)
+        # Only count the keys that missed, the hashes of other keys
+        # may collide with them or may have been loaded by load()
+        loaded = self._load_from_hashes(missing_hashes, session)
+        database_hits = 0
+        for shared_attrs, attributes_id in results.items():
+            if (
+                attributes_id is None
+                and (attributes_id := loaded.get(shared_attrs)) is not None
+            ):
+                results[shared_attrs] = attributes_id
+                database_hits += 1
+        self.stats.database_lookups += misses
+        self.stats.database_hits += database_hits
+        return results
 
     def _load_from_hashes(
         self, hashes: Collection[int], session: Session
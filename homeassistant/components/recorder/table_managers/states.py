@@ -125,6 +125,19 @@ class StatesManager:
         ):
             last_committed_ids.pop(last_committed_ids_reversed[purged_state_id], None)
 
+    def evict_purged_state_id_range(
+        self, first_state_id: int, last_state_id: int
+    ) -> None:
+        """Evict the states purged with a partition from the committed states.
+
+        The state_ids of a partition are only known by their range
+        since the partition is dropped without reading its rows.
+        """
+        last_committed_ids = self._last_committed_id
+        for entity_id, state_id in list(last_committed_ids.items()):
+            if first_state_id <= state_id <= last_state_id:
+                del last_committed_ids[entity_id]
+
     def evict_purged_entity_ids(self, purged_entity_ids: set[str]) -> None:
         """Evict purged entity_ids from the committed states.
 
@@ -19,6 +19,7 @@ if TYPE_CHECKING:
     from ..core import Recorder
 
 CACHE_SIZE = 8192
+MAX_CACHE_SIZE = 65536
 
 
 class StatesMetaManager(BaseLRUTableManager[StatesMeta]):
@@ -29,7 +30,7 @@ class StatesMetaManager(BaseLRUTableManager[StatesMeta]):
     def __init__(self, recorder: Recorder) -> None:
         """Initialize the states meta manager."""
         self._did_first_load = False
-        super().__init__(recorder, CACHE_SIZE)
+        super().__init__(recorder, CACHE_SIZE, MAX_CACHE_SIZE)
 
     def load(
         self, events: list[Event[EventStateChangedData]], session: Session
@@ -97,6 +98,9 @@ class StatesMetaManager(BaseLRUTableManager[StatesMeta]):
 
             results[entity_id] = metadata_id
 
+        stats = self.stats
+        stats.misses += len(missing)
+        stats.hits += len(results) - len(missing)
         if not missing:
             return results
 
@@ -108,6 +112,7 @@ class StatesMetaManager(BaseLRUTableManager[StatesMeta]):
         # thread (history query).
         update_cache = from_recorder or not self._did_first_load
 
+        stats.database_lookups += len(missing)
         with session.no_autoflush:
             for missing_chunk in chunked_or_all(missing, self.recorder.max_bind_vars):
                 for metadata_id, entity_id in execute_stmt_lambda_element(
@@ -115,6 +120,7 @@ class StatesMetaManager(BaseLRUTableManager[StatesMeta]):
                 ):
                     metadata_id = cast(int, metadata_id)
                     results[entity_id] = metadata_id
+                    stats.database_hits += 1
 
                     if update_cache:
                         self._id_map[entity_id] = metadata_id
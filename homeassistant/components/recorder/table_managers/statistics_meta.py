@@ -15,11 +15,13 @@ from sqlalchemy.sql.lambdas import StatementLambdaElement
 from ..db_schema import StatisticsMeta
 from ..models import StatisticMetaData
 from ..util import execute_stmt_lambda_element
+from . import LRUStats
 
 if TYPE_CHECKING:
     from ..core import Recorder
 
 CACHE_SIZE = 8192
+MAX_CACHE_SIZE = 65536
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -69,6 +71,7 @@ class StatisticsMetaManager:
         self._stat_id_to_id_meta: LRU[str, tuple[int, StatisticMetaData]] = LRU(
             CACHE_SIZE
         )
+        self.stats = LRUStats()
 
     def _clear_cache(self, statistic_ids: list[str]) -> None:
         """Clear the cache."""
@@ -231,13 +234,19 @@ class StatisticsMetaManager:
             )
 
         results = self.get_from_cache_threadsafe(statistic_ids)
+        stats = self.stats
+        stats.hits += len(results)
         if not (missing_statistic_id := statistic_ids.difference(results)):
             return results
 
         # Fetch metadata from the database
-        return results | self._get_from_database(
+        stats.misses += len(missing_statistic_id)
+        stats.database_lookups += len(missing_statistic_id)
+        from_database = self._get_from_database(
             session, statistic_ids=missing_statistic_id
         )
+        stats.database_hits += len(from_database)
+        return results | from_database
 
     def get_from_cache_threadsafe(
         self, statistic_ids: set[str]
@@ -345,6 +354,8 @@ class StatisticsMetaManager:
         This call is not thread-safe and must be called from the
         recorder thread.
         """
-        lru: LRU = self._stat_id_to_id_meta
-        if new_size > lru.get_size():
-            lru.set_size(new_size)
+        self.stats.adjust_lru_size(self._stat_id_to_id_meta, new_size, MAX_CACHE_SIZE)
+
+    def lru_stats(self) -> dict[str, int]:
+        """Return the LRU size and lookup counters."""
+        return self.stats.as_dict(self._stat_id_to_id_meta)
@@ -5,10 +5,12 @@ from __future__ import annotations
 import abc
 import asyncio
 from collections.abc import Callable, Iterable
+from concurrent.futures import Future
 from dataclasses import dataclass
 from datetime import datetime
 import logging
 import threading
+import time
 from typing import TYPE_CHECKING, Any
 
 from homeassistant.helpers.typing import UndefinedType
@@ -22,6 +24,9 @@ from .util import periodic_db_cleanups, session_scope
 
 _LOGGER = logging.getLogger(__name__)
 
+# Low priority purges pause when more events are waiting
+LOW_PRIORITY_PURGE_MAX_BACKLOG = 1000
+
 
 if TYPE_CHECKING:
     from .core import Recorder
@@ -109,25 +114,88 @@ class UpdateStatesMetadataTask(RecorderTask):
 
 @dataclass(slots=True)
 class PurgeTask(RecorderTask):
-    """Object to store information about purge task."""
+    """Object to store information about purge task.
+
+    Each run purges a slice sized to the target wall time and queues
+    the next slice behind the pending events. Low priority purges
+    stop when the recorder is backlogged and are resumed by the
+    next continuous purge.
+
+    Only one purge runs at a time. A purge waits for the running
+    purge to finish, unless the running purge is a low priority
+    one, which stops at its next slice.
+    """
 
     purge_before: datetime
     repack: bool
     apply_filter: bool
+    low_priority: bool = False
+    # The purge_id of the purge this slice belongs to, None to start a purge
+    purge_id: int | None = None
 
     def run(self, instance: Recorder) -> None:
         """Purge the database."""
-        if purge.purge_old_data(
-            instance, self.purge_before, self.repack, self.apply_filter
-        ):
+        progress = instance.purge_progress
+        if self.purge_id is None:
+            if progress.running:
+                if self.low_priority:
+                    return
+                if not progress.low_priority:
+                    # Wait for the running purge to finish
+                    instance.queue_task(self)
+                    return
+            self.purge_id = progress.start(
+                self.purge_before,
+                purge.estimate_rows_to_purge(instance, self.purge_before),
+                self.low_priority,
+            )
+        elif self.purge_id != progress.purge_id:
+            # Another purge took over
+            return
+        start = time.monotonic()
+        try:
+            finished = purge.purge_old_data(
+                instance,
+                self.purge_before,
+                self.repack,
+                self.apply_filter,
+                events_batch_size=progress.events_batch_size,
+                states_batch_size=progress.states_batch_size,
+            )
+        except Exception:
+            # Errors which are not retried end the purge
+            progress.stop(completed=False)
+            raise
+        progress.finish_slice(
+            time.monotonic() - start,
+            purge.CONTINUOUS_PURGE_SLICE_TARGET_SECONDS
+            if self.low_priority
+            else purge.PURGE_SLICE_TARGET_SECONDS,
+        )
+        if finished:
+            progress.stop(completed=True)
+            if self.low_priority:
+                return
             # We always need to do the db cleanups after a purge
             # is finished to ensure the WAL checkpoint and other
             # tasks happen after a vacuum.
             periodic_db_cleanups(instance)
             return
+        if self.low_priority and instance.backlog >= LOW_PRIORITY_PURGE_MAX_BACKLOG:
+            _LOGGER.debug(
+                "Pausing continuous purge, %s events are waiting", instance.backlog
+            )
+            progress.stop(completed=False)
+            return
         # Schedule a new purge task if this one didn't finish
         instance.queue_task(
-            PurgeTask(self.purge_before, self.repack, self.apply_filter)
+            PurgeTask(
+                self.purge_before,
+                self.repack,
+                self.apply_filter,
+                self.low_priority,
+                self.purge_id,
+            )
         )
 
 
@@ -337,6 +405,15 @@ class AdjustLRUSizeTask(RecorderTask):
         instance._adjust_lru_size()  # noqa: SLF001
 
 
+@dataclass(slots=True)
+class PartitionTask(RecorderTask):
+    """An object to insert into the recorder queue to maintain the partitions."""
+
+    def run(self, instance: Recorder) -> None:
+        """Create the upcoming partitions."""
+        instance._maintain_partitions()  # noqa: SLF001
+
+
 @dataclass(slots=True)
 class RefreshEventTypesTask(RecorderTask):
     """An object to insert into the recorder queue to refresh event types."""
@@ -349,3 +426,15 @@ class RefreshEventTypesTask(RecorderTask):
             instance.event_type_manager.get_many(
                 self.event_types, session, from_recorder=True
             )
+
+
+@dataclass(slots=True)
+class SpoolDrainTask(RecorderTask):
+    """An object to insert the events spooled to disk."""
+
+    # The segments sealed when the task was queued, once they can be read
+    sealed: Future[list[str]]
+
+    def run(self, instance: Recorder) -> None:
+        """Handle the task."""
+        instance._drain_spool(self.sealed)  # noqa: SLF001
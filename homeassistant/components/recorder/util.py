@@ -75,6 +75,8 @@ def _simple_version(version: str) -> AwesomeVersion:
 
 
 MIN_VERSION_MARIA_DB = _simple_version("10.3.0")
+# INSERT .. RETURNING was added in MariaDB 10.5
+MARIA_DB_WITH_INSERT_RETURNING = _simple_version("10.5.0")
 RECOMMENDED_MIN_VERSION_MARIA_DB = _simple_version("10.5.17")
 MARIADB_WITH_FIXED_IN_QUERIES_105 = _simple_version("10.5.17")
 MARIA_DB_106 = _simple_version("10.6.0")
@@ -464,6 +466,7 @@ def setup_connection_for_dialect(
     """Execute statements needed for dialect connection."""
     version: AwesomeVersion | None = None
     slow_range_in_select = False
+    bulk_insert = False
     if dialect_name == SupportedDialect.SQLITE:
         if first_connection:
             old_isolation = dbapi_connection.isolation_level  # type: ignore[attr-defined]
@@ -529,6 +532,9 @@ def setup_connection_for_dialect(
                     version or version_string, "MySQL", MIN_VERSION_MYSQL
                 )
 
+            bulk_insert = bool(
+                is_maria_db and version and version >= MARIA_DB_WITH_INSERT_RETURNING
+            )
             slow_range_in_select = bool(
                 not version
                 or version < MARIADB_WITH_FIXED_IN_QUERIES_105
@@ -546,6 +552,7 @@ def setup_connection_for_dialect(
         # https://github.com/home-assistant/core/issues/126084
         # so we set slow_range_in_select to True
         slow_range_in_select = True
+        bulk_insert = True
         if first_connection:
             # server_version_num was added in 2006
             result = query_on_connection(dbapi_connection, "SHOW server_version")
@@ -567,6 +574,7 @@ def setup_connection_for_dialect(
         version=version,
         optimizer=DatabaseOptimizer(slow_range_in_select=slow_range_in_select),
         max_bind_vars=DEFAULT_MAX_BIND_VARS,
+        bulk_insert=bulk_insert,
     )
 
 
@@ -35,7 +35,6 @@ from homeassistant.core import HomeAssistant, State, callback, split_entity_id
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import issue_registry as ir
 from homeassistant.helpers.entity import entity_sources
-from homeassistant.helpers.typing import UNDEFINED, UndefinedType
 from homeassistant.loader import async_suggest_report_issue
 from homeassistant.util import dt as dt_util
 from homeassistant.util.async_ import run_callback_threadsafe
@@ -79,6 +78,9 @@ WARN_UNSTABLE_UNIT: HassKey[set[str]] = HassKey(f"{DOMAIN}_warn_unstable_unit")
 # Link to dev statistics where issues around LTS can be fixed
 LINK_DEV_STATISTICS = "https://my.home-assistant.io/redirect/developer_statistics"
 
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.UTC)
+_ONE_MICROSECOND = datetime.timedelta(microseconds=1)
+
 
 def _get_sensor_states(hass: HomeAssistant) -> list[State]:
     """Get the current state of all sensors for which to compile statistics."""
@@ -99,42 +101,48 @@ def _get_sensor_states(hass: HomeAssistant) -> list[State]:
     ]
 
 
+def _timestamp_to_microseconds(timestamp: float) -> int:
+    """Return a timestamp as integer microseconds.
+
+    The timestamp is rounded like datetime.fromtimestamp, the result is the
+    same as the microseconds of the datetime of the timestamp.
+    """
+    seconds = math.floor(timestamp)
+    return seconds * 1_000_000 + round((timestamp - seconds) * 1_000_000)
+
+
+def _datetime_to_microseconds(value: datetime.datetime) -> int:
+    """Return a datetime as integer microseconds since the epoch."""
+    return (value - _EPOCH) // _ONE_MICROSECOND
+
+
 def _time_weighted_average(
-    fstates: list[tuple[float, State]], start: datetime.datetime, end: datetime.datetime
+    fvalues: list[float], timestamps: list[int], start: int, end: int
 ) -> float:
     """Calculate a time weighted average.
 
     The average is calculated by weighting the states by duration in seconds between
-    state changes.
+    state changes. The timestamps of the states and the start and end of the period
+    are integer microseconds, the durations are converted to seconds like
+    timedelta.total_seconds.
     Note: there's no interpolation of values between state changes.
     """
-    old_fstate: float | None = None
-    old_start_time: datetime.datetime | None = None
+    # The recorder will give us the last known state, which may be well
+    # before the requested start time for the statistics
+    start_times = [max(start, timestamp) for timestamp in timestamps]
+    if start_times:
+        # Adjust start time, if there was no last known state
+        start = start_times[0]
+    # Each value is weighted by the duration until the next state change,
+    # the last one until the end of the period. The values are accumulated
+    # in order, the compensated summation of sum() would change the result.
     accumulated = 0.0
+    for fvalue, start_time, end_time in zip(
+        fvalues, start_times, [*start_times[1:], end], strict=True
+    ):
+        accumulated += fvalue * ((end_time - start_time) / 1_000_000)
 
-    for fstate, state in fstates:
-        # The recorder will give us the last known state, which may be well
-        # before the requested start time for the statistics
-        start_time = max(state.last_updated, start)
-        if old_start_time is None:
-            # Adjust start time, if there was no last known state
-            start = start_time
-        else:
-            duration = start_time - old_start_time
-            # Accumulate the value, weighted by duration until next state change
-            assert old_fstate is not None
-            accumulated += old_fstate * duration.total_seconds()
-
-        old_fstate = fstate
-        old_start_time = start_time
-
-    if old_fstate is not None:
-        # Accumulate the value, weighted by duration until end of the period
-        assert old_start_time is not None
-        duration = end - old_start_time
-        accumulated += old_fstate * duration.total_seconds()
-
-    period_seconds = (end - start).total_seconds()
+    period_seconds = (end - start) / 1_000_000
     if period_seconds == 0:
         # If the only state changed that happened was at the exact moment
         # at the end of the period, we can't calculate a meaningful average
@@ -146,9 +154,9 @@ def _time_weighted_average(
     return accumulated / period_seconds
 
 
-def _get_units(fstates: list[tuple[float, State]]) -> set[str | None]:
-    """Return a set of all units."""
-    return {item[1].attributes.get(ATTR_UNIT_OF_MEASUREMENT) for item in fstates}
+def _get_units(states: list[State]) -> list[str | None]:
+    """Return the unit of each state."""
+    return [state.attributes.get(ATTR_UNIT_OF_MEASUREMENT) for state in states]
 
 
 def _equivalent_units(units: set[str | None]) -> bool:
@@ -164,20 +172,23 @@ def _equivalent_units(units: set[str | None]) -> bool:
 
 def _entity_history_to_float_and_state(
     entity_history: Iterable[State],
-) -> list[tuple[float, State]]:
-    """Return a list of (float, state) tuples for the given entity."""
-    float_states: list[tuple[float, State]] = []
-    append = float_states.append
+) -> tuple[list[float], list[State]]:
+    """Return the float values and the states with a numeric state."""
+    fvalues: list[float] = []
+    states: list[State] = []
+    append_value = fvalues.append
+    append_state = states.append
     isfinite = math.isfinite
     for state in entity_history:
         try:
             if (float_state := float(state.state)) is not None and isfinite(
                 float_state
             ):
-                append((float_state, state))
+                append_value(float_state)
+                append_state(state)
         except (ValueError, TypeError):
             pass
-    return float_states
+    return fvalues, states
 
 
 def _is_numeric(state: State) -> bool:
@@ -191,13 +202,18 @@ def _is_numeric(state: State) -> bool:
 def _normalize_states(
     hass: HomeAssistant,
     old_metadatas: dict[str, tuple[int, StatisticMetaData]],
-    fstates: list[tuple[float, State]],
+    fvalues: list[float],
+    states: list[State],
     entity_id: str,
-) -> tuple[str | None, list[tuple[float, State]]]:
-    """Normalize units."""
+) -> tuple[str | None, list[float], list[State]]:
+    """Normalize units.
+
+    The values are converted in runs of states with the same unit.
+    """
     state_unit: str | None = None
     statistics_unit: str | None
-    state_unit = fstates[0][1].attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+    units = _get_units(states)
+    state_unit = units[0]
     old_metadata = old_metadatas[entity_id][1] if entity_id in old_metadatas else None
     if not old_metadata:
         # We've not seen this sensor before, the first valid state determines the unit
@@ -210,7 +226,7 @@ def _normalize_states(
     if statistics_unit not in statistics.STATISTIC_UNIT_TO_UNIT_CONVERTER:
         # The unit used by this sensor doesn't support unit conversion
 
-        all_units = _get_units(fstates)
+        all_units = set(units)
         if not _equivalent_units(all_units):
             if WARN_UNSTABLE_UNIT not in hass.data:
                 hass.data[WARN_UNSTABLE_UNIT] = set()
@@ -233,18 +249,22 @@ def _normalize_states(
                     extra,
                     LINK_DEV_STATISTICS,
                 )
-            return None, []
+            return None, [], []
 
-        return state_unit, fstates
+        return state_unit, fvalues, states
 
     converter = statistics.STATISTIC_UNIT_TO_UNIT_CONVERTER[statistics_unit]
-    valid_fstates: list[tuple[float, State]] = []
-    convert: Callable[[float], float] | None = None
-    last_unit: str | None | UndefinedType = UNDEFINED
     valid_units = converter.VALID_UNITS
-
-    for fstate, state in fstates:
-        state_unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+    if len(set(units)) == 1 and state_unit == statistics_unit:
+        # The unit of measurement did not change, nothing to convert
+        return statistics_unit, fvalues, states
+
+    valid_fvalues: list[float] = []
+    valid_states: list[State] = []
+    position = 0
+    for state_unit, run in itertools.groupby(units):
+        run_start = position
+        position += sum(1 for _ in run)
         # Exclude states with unsupported unit from statistics
         if state_unit not in valid_units:
             if WARN_UNSUPPORTED_UNIT not in hass.data:
@@ -266,21 +286,14 @@ def _normalize_states(
                 )
             continue
 
-        if state_unit != last_unit:
-            # The unit of measurement has changed since the last state change
-            # recreate the converter factory
-            if state_unit == statistics_unit:
-                convert = None
-            else:
-                convert = converter.converter_factory(state_unit, statistics_unit)
-            last_unit = state_unit
-
-        if convert is not None:
-            fstate = convert(fstate)
-
-        valid_fstates.append((fstate, state))
+        run_fvalues = fvalues[run_start:position]
+        if state_unit != statistics_unit:
+            convert = converter.converter_factory(state_unit, statistics_unit)
+            run_fvalues = [convert(fvalue) for fvalue in run_fvalues]
+        valid_fvalues.extend(run_fvalues)
+        valid_states.extend(states[run_start:position])
 
-    return statistics_unit, valid_fstates
+    return statistics_unit, valid_fvalues, valid_states
 
 
 def _suggest_report_issue(hass: HomeAssistant, entity_id: str) -> str:
@@ -442,14 +455,15 @@ def compile_statistics(  # noqa: C901
         )
         history_list = {**history_list, **_history_list}
 
-    entities_with_float_states: dict[str, list[tuple[float, State]]] = {}
+    entities_with_float_states: dict[str, tuple[list[float], list[State]]] = {}
     for _state in sensor_states:
         entity_id = _state.entity_id
         # If there are no recent state changes, the sensor's state may already be pruned
         # from the recorder. Get the state from the state machine instead.
         if not (entity_history := history_list.get(entity_id, [_state])):
             continue
-        if not (float_states := _entity_history_to_float_and_state(entity_history)):
+        float_states = _entity_history_to_float_and_state(entity_history)
+        if not float_states[0]:
             continue
         entities_with_float_states[entity_id] = float_states
 
@@ -460,33 +474,38 @@ def compile_statistics(  # noqa: C901
     old_metadatas = statistics.get_metadata_with_session(
         get_instance(hass), session, statistic_ids=set(entities_with_float_states)
     )
-    to_process: list[tuple[str, str | None, str, list[tuple[float, State]]]] = []
+    to_process: list[tuple[str, str | None, str, list[float], list[State]]] = []
     to_query: set[str] = set()
     for _state in sensor_states:
         entity_id = _state.entity_id
         if not (maybe_float_states := entities_with_float_states.get(entity_id)):
             continue
-        statistics_unit, valid_float_states = _normalize_states(
+        statistics_unit, valid_fvalues, valid_states = _normalize_states(
             hass,
             old_metadatas,
-            maybe_float_states,
+            *maybe_float_states,
             entity_id,
         )
-        if not valid_float_states:
+        if not valid_fvalues:
             continue
         state_class: str = _state.attributes[ATTR_STATE_CLASS]
-        to_process.append((entity_id, statistics_unit, state_class, valid_float_states))
+        to_process.append(
+            (entity_id, statistics_unit, state_class, valid_fvalues, valid_states)
+        )
         if "sum" in wanted_statistics[entity_id]:
             to_query.add(entity_id)
 
     last_stats = statistics.get_latest_short_term_statistics_with_session(
         hass, session, to_query, {"last_reset", "state", "sum"}, metadata=old_metadatas
     )
+    start_us = _datetime_to_microseconds(start)
+    end_us = _datetime_to_microseconds(end)
     for (  # pylint: disable=too-many-nested-blocks
         entity_id,
         statistics_unit,
         state_class,
-        valid_float_states,
+        valid_fvalues,
+        valid_states,
     ) in to_process:
         # Check metadata
         if old_metadata := old_metadatas.get(entity_id):
@@ -526,16 +545,20 @@ def compile_statistics(  # noqa: C901
         # Make calculations
         stat: StatisticData = {"start": start}
         if "max" in wanted_statistics[entity_id]:
-            stat["max"] = max(
-                *itertools.islice(zip(*valid_float_states, strict=False), 1)
-            )
+            stat["max"] = max(valid_fvalues)
         if "min" in wanted_statistics[entity_id]:
-            stat["min"] = min(
-                *itertools.islice(zip(*valid_float_states, strict=False), 1)
-            )
+            stat["min"] = min(valid_fvalues)
 
         if "mean" in wanted_statistics[entity_id]:
-            stat["mean"] = _time_weighted_average(valid_float_states, start, end)
+            stat["mean"] = _time_weighted_average(
+                valid_fvalues,
+                [
+                    _timestamp_to_microseconds(state.last_updated_timestamp)
+                    for state in valid_states
+                ],
+                start_us,
+                end_us,
+            )
 
         if "sum" in wanted_statistics[entity_id]:
             last_reset = old_last_reset = None
@@ -553,7 +576,7 @@ def compile_statistics(  # noqa: C901
                 new_state = old_state = last_stat.get("state")
                 _sum = last_stat.get("sum") or 0.0
 
-            for fstate, state in valid_float_states:
+            for fstate, state in zip(valid_fvalues, valid_states, strict=True):
                 reset = False
                 if (
                     state_class != SensorStateClass.TOTAL_INCREASING
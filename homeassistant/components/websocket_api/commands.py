@@ -43,6 +43,7 @@ from homeassistant.helpers.entityfilter import (
 from homeassistant.helpers.event import (
     TrackTemplate,
     TrackTemplateResult,
+    async_get_template_render_stats,
     async_track_template_result,
 )
 from homeassistant.helpers.json import (
@@ -64,6 +65,7 @@ from homeassistant.util.json import format_unserializable_data
 
 from . import const, decorators, messages
 from .connection import ActiveConnection
+from .entity_changes import async_get_entity_changes_hub, subscription_filter_key
 from .messages import construct_result_message
 
 ALL_SERVICE_DESCRIPTIONS_JSON_CACHE = "websocket_api_all_service_descriptions_json"
@@ -89,6 +91,7 @@ def async_register_commands(
     async_reg(hass, handle_manifest_list)
     async_reg(hass, handle_ping)
     async_reg(hass, handle_render_template)
+    async_reg(hass, handle_template_render_stats)
     async_reg(hass, handle_subscribe_bootstrap_integrations)
     async_reg(hass, handle_subscribe_events)
     async_reg(hass, handle_subscribe_trigger)
@@ -367,33 +370,6 @@ def _send_handle_get_states_response(
     )
 
 
-@callback
-def _forward_entity_changes(
-    send_message: Callable[[str | bytes | dict[str, Any]], None],
-    entity_ids: set[str] | None,
-    entity_filter: Callable[[str], bool] | None,
-    user: User,
-    message_id_as_bytes: bytes,
-    event: Event[EventStateChangedData],
-) -> None:
-    """Forward entity state changed events to websocket."""
-    entity_id = event.data["entity_id"]
-    if (entity_ids and entity_id not in entity_ids) or (
-        entity_filter and not entity_filter(entity_id)
-    ):
-        return
-    # We have to lookup the permissions again because the user might have
-    # changed since the subscription was created.
-    permissions = user.permissions
-    if (
-        not user.is_admin
-        and not permissions.access_all_entities(POLICY_READ)
-        and not permissions.check_entity(entity_id, POLICY_READ)
-    ):
-        return
-    send_message(messages.cached_state_diff_message(message_id_as_bytes, event))
-
-
 @callback
 @decorators.websocket_command(
     {
@@ -415,16 +391,15 @@ def handle_subscribe_entities(
     states = _async_get_allowed_states(hass, connection)
     msg_id = msg["id"]
     message_id_as_bytes = str(msg_id).encode()
-    connection.subscriptions[msg_id] = hass.bus.async_listen(
-        EVENT_STATE_CHANGED,
-        partial(
-            _forward_entity_changes,
-            connection.send_message,
-            entity_ids,
-            entity_filter,
-            connection.user,
-            message_id_as_bytes,
-        ),
+    connection.subscriptions[msg_id] = async_get_entity_changes_hub(
+        hass
+    ).async_subscribe(
+        connection.send_state_diff_message,
+        connection.user,
+        message_id_as_bytes,
+        entity_ids,
+        entity_filter,
+        subscription_filter_key(entity_ids, msg),
     )
     connection.send_result(msg_id)
 
@@ -683,6 +658,30 @@ async def handle_render_template(
     hass.loop.call_soon_threadsafe(info.async_refresh)
 
 
+@callback
+@decorators.websocket_command({vol.Required("type"): "template/render_stats"})
+@decorators.require_admin
+def handle_template_render_stats(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Handle template render stats command."""
+    connection.send_result(
+        msg["id"],
+        [
+            {
+                "template": template_obj.template,
+                "renders": stats.renders,
+                "total_time": stats.total_time,
+                "max_time": stats.max_time,
+                "recent_time": stats.recent_time,
+                "coalesced": stats.coalesced,
+                "adaptive_rate_limit": stats.adaptive_rate_limit,
+            }
+            for template_obj, stats in async_get_template_render_stats(hass)
+        ],
+    )
+
+
 def _serialize_entity_sources(
     entity_infos: dict[str, entity.EntityInfo],
 ) -> dict[str, Any]:
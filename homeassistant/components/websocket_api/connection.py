@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable, Hashable
+from collections.abc import Callable, Coroutine, Hashable
 from contextvars import ContextVar
 from typing import TYPE_CHECKING, Any, Literal
 
@@ -10,7 +10,13 @@ from aiohttp import web
 import voluptuous as vol
 
 from homeassistant.auth.models import RefreshToken, User
-from homeassistant.core import Context, HomeAssistant, callback
+from homeassistant.core import (
+    Context,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    callback,
+)
 from homeassistant.exceptions import HomeAssistantError, Unauthorized
 from homeassistant.helpers.http import current_request
 from homeassistant.util.json import JsonValueType
@@ -34,12 +40,14 @@ current_connection = ContextVar["ActiveConnection | None"](
 
 type MessageHandler = Callable[[HomeAssistant, ActiveConnection, dict[str, Any]], None]
 type BinaryHandler = Callable[[HomeAssistant, ActiveConnection, bytes], None]
+type SendStateDiffMessage = Callable[[bytes, bytes, Event[EventStateChangedData]], None]
 
 
 class ActiveConnection:
     """Handle an active websocket client connection."""
 
     __slots__ = (
+        "batch_window",
         "binary_handlers",
         "can_coalesce",
         "handlers",
@@ -48,9 +56,11 @@ class ActiveConnection:
         "logger",
         "refresh_token_id",
         "send_message",
+        "send_state_diff_message",
         "subscriptions",
         "supported_features",
         "user",
+        "wait_drained",
     )
 
     def __init__(
@@ -65,11 +75,22 @@ class ActiveConnection:
         self.logger = logger
         self.hass = hass
         self.send_message = send_message
+        # Replaced by the websocket handler with a version which can
+        # merge state diffs of the same entity while the client is behind
+        self.send_state_diff_message: SendStateDiffMessage = (
+            self._send_state_diff_message
+        )
+        # Replaced by the websocket handler with a version which waits
+        # until the client has read most of the pending messages
+        self.wait_drained: Callable[[], Coroutine[Any, Any, None]] = (
+            self._async_wait_drained
+        )
         self.user = user
         self.refresh_token_id = refresh_token.id
         self.subscriptions: dict[Hashable, Callable[[], Any]] = {}
         self.last_id = 0
         self.can_coalesce = False
+        self.batch_window: float = 0
         self.supported_features: dict[str, float] = {}
         self.handlers: dict[str, tuple[MessageHandler, vol.Schema | Literal[False]]] = (
             self.hass.data[const.DOMAIN]
@@ -85,6 +106,19 @@ class ActiveConnection:
         """Set supported features."""
         self.supported_features = features
         self.can_coalesce = const.FEATURE_COALESCE_MESSAGES in features
+        # Batching only makes sense if the client accepts coalesced messages
+        self.batch_window = (
+            max(
+                0,
+                min(
+                    features.get(const.FEATURE_BATCH_WINDOW, 0),
+                    const.MAX_BATCH_WINDOW_MS,
+                ),
+            )
+            / 1000
+            if self.can_coalesce
+            else 0
+        )
 
     def get_description(self, request: web.Request | None) -> str:
         """Return a description of the connection."""
@@ -129,6 +163,19 @@ class ActiveConnection:
 
         return index + 1, unsub
 
+    @callback
+    def _send_state_diff_message(
+        self,
+        message: bytes,
+        message_id_as_bytes: bytes,
+        event: Event[EventStateChangedData],
+    ) -> None:
+        """Send a state diff message to the client."""
+        self.send_message(message)
+
+    async def _async_wait_drained(self) -> None:
+        """Wait until the client has read most of the pending messages."""
+
     @callback
     def send_result(self, msg_id: int, result: Any | None = None) -> None:
         """Send a result message."""
@@ -34,6 +34,26 @@ MAX_PENDING_MSG: Final = 4096
 # resolve the ready future.
 PENDING_MSG_MAX_FORCE_READY: Final = 256
 
+# Maximum number of bytes that can be pending at any given time,
+# not counting the largest pending message so a single large
+# response is always sent.
+MAX_PENDING_BYTES: Final = 32 * 2**20
+
+# Number of pending messages or bytes after which queued state diffs
+# of the same entity are merged instead of sending each intermediate
+# change to the client.
+PENDING_MSG_MERGE_STATE_DIFFS: Final = 256
+PENDING_BYTES_MERGE_STATE_DIFFS: Final = 2**20
+
+# Number of pending bytes below which the connection is considered
+# drained by producers of large responses which wait for the client.
+PENDING_BYTES_DRAINED: Final = 2**20
+
+# Upper limit in milliseconds of the batch window a client can request
+# and the number of pending bytes which releases a batch early.
+MAX_BATCH_WINDOW_MS: Final = 1000
+BATCH_MAX_BYTES: Final = 64 * 2**10
+
 ERR_ID_REUSE: Final = "id_reuse"
 ERR_INVALID_FORMAT: Final = "invalid_format"
 ERR_NOT_ALLOWED: Final = "not_allowed"
@@ -58,3 +78,4 @@ SIGNAL_WEBSOCKET_DISCONNECTED: Final = "websocket_disconnected"
 DATA_CONNECTIONS: Final = f"{DOMAIN}.connections"
 
 FEATURE_COALESCE_MESSAGES = "coalesce_messages"
+FEATURE_BATCH_WINDOW = "batch_window"
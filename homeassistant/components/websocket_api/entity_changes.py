@@ -0,0 +1,153 @@
+"""Shared state change stream for subscribe_entities subscriptions."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from homeassistant.auth.models import User
+from homeassistant.auth.permissions.const import POLICY_READ
+from homeassistant.const import CONF_EXCLUDE, CONF_INCLUDE, EVENT_STATE_CHANGED
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    callback,
+)
+from homeassistant.util.hass_dict import HassKey
+
+from . import messages
+from .connection import SendStateDiffMessage
+
+DATA_ENTITY_CHANGES_HUB: HassKey[EntityChangesHub] = HassKey(
+    "websocket_api_entity_changes_hub"
+)
+
+
+def subscription_filter_key(
+    entity_ids: set[str] | None, filter_conf: dict[str, Any]
+) -> Hashable:
+    """Return a key which is equal for subscriptions with the same filter."""
+    return (
+        frozenset(entity_ids) if entity_ids else None,
+        *(
+            tuple(
+                (filter_type, tuple(sorted(values)))
+                for filter_type, values in sorted(filter_conf[key].items())
+            )
+            for key in (CONF_INCLUDE, CONF_EXCLUDE)
+        ),
+    )
+
+
+class _SubscriptionGroup:
+    """Subscriptions sharing an entity filter."""
+
+    __slots__ = ("entity_filter", "entity_ids", "subscribers")
+
+    def __init__(
+        self,
+        entity_ids: set[str] | None,
+        entity_filter: Callable[[str], bool] | None,
+    ) -> None:
+        """Initialize the group."""
+        self.entity_ids = entity_ids
+        self.entity_filter = entity_filter
+        self.subscribers: dict[object, tuple[SendStateDiffMessage, User, bytes]] = {}
+
+
+class EntityChangesHub:
+    """Forward state changes to subscribe_entities subscriptions.
+
+    Subscriptions with the same entity filter are grouped so the filter is
+    evaluated once per group. The state diff is serialized once per state
+    change, and a message with the message id appended to it is built once
+    per distinct message id in a group. Subscriptions in the group with the
+    same message id are sent the same bytes.
+    """
+
+    __slots__ = ("_groups", "_hass", "_unsub")
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the hub."""
+        self._hass = hass
+        self._groups: dict[Hashable, _SubscriptionGroup] = {}
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @property
+    def group_count(self) -> int:
+        """Return the number of subscription groups."""
+        return len(self._groups)
+
+    @callback
+    def async_subscribe(
+        self,
+        send_state_diff_message: SendStateDiffMessage,
+        user: User,
+        message_id_as_bytes: bytes,
+        entity_ids: set[str] | None,
+        entity_filter: Callable[[str], bool] | None,
+        filter_key: Hashable,
+    ) -> CALLBACK_TYPE:
+        """Subscribe a connection to state changes."""
+        if (group := self._groups.get(filter_key)) is None:
+            group = self._groups[filter_key] = _SubscriptionGroup(
+                entity_ids, entity_filter
+            )
+        subscriber = object()
+        group.subscribers[subscriber] = (
+            send_state_diff_message,
+            user,
+            message_id_as_bytes,
+        )
+        if self._unsub is None:
+            self._unsub = self._hass.bus.async_listen(
+                EVENT_STATE_CHANGED, self._async_state_changed
+            )
+
+        @callback
+        def _async_unsubscribe() -> None:
+            del group.subscribers[subscriber]
+            if not group.subscribers:
+                del self._groups[filter_key]
+            if not self._groups and self._unsub is not None:
+                self._unsub()
+                self._unsub = None
+
+        return _async_unsubscribe
+
+    @callback
+    def _async_state_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Forward a state change to the subscribed connections."""
+        entity_id = event.data["entity_id"]
+        for group in tuple(self._groups.values()):
+            if (group.entity_ids and entity_id not in group.entity_ids) or (
+                group.entity_filter and not group.entity_filter(entity_id)
+            ):
+                continue
+            group_messages: dict[bytes, bytes] = {}
+            for send_state_diff_message, user, message_id_as_bytes in tuple(
+                group.subscribers.values()
+            ):
+                # We have to lookup the permissions again because the user
+                # might have changed since the subscription was created.
+                if not user.is_admin:
+                    permissions = user.permissions
+                    if not permissions.access_all_entities(
+                        POLICY_READ
+                    ) and not permissions.check_entity(entity_id, POLICY_READ):
+                        continue
+                if (message := group_messages.get(message_id_as_bytes)) is None:
+                    message = group_messages[message_id_as_bytes] = (
+                        messages.cached_state_diff_message(message_id_as_bytes, event)
+                    )
+                send_state_diff_message(message, message_id_as_bytes, event)
+
+
+@callback
+def async_get_entity_changes_hub(hass: HomeAssistant) -> EntityChangesHub:
+    """Return the entity changes hub."""
+    if (hub := hass.data.get(DATA_ENTITY_CHANGES_HUB)) is None:
+        hub = hass.data[DATA_ENTITY_CHANGES_HUB] = EntityChangesHub(hass)
+    return hub
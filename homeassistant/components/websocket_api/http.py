@@ -4,18 +4,24 @@ from __future__ import annotations
 
 import asyncio
 from collections import deque
-from collections.abc import Callable, Coroutine
+from collections.abc import Callable, Coroutine, Iterable
 import datetime as dt
 from functools import partial
 import logging
-from typing import TYPE_CHECKING, Any, Final
+from typing import TYPE_CHECKING, Any, Final, cast
 
 from aiohttp import WSMsgType, web
 from aiohttp.http_websocket import WebSocketWriter
 
 from homeassistant.components.http import KEY_HASS, HomeAssistantView
 from homeassistant.const import EVENT_HOMEASSISTANT_STOP
-from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.core import (
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    State,
+    callback,
+)
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.event import async_call_later
 from homeassistant.util.async_ import create_eager_task
@@ -23,9 +29,14 @@ from homeassistant.util.json import json_loads
 
 from .auth import AUTH_REQUIRED_MESSAGE, AuthPhase
 from .const import (
+    BATCH_MAX_BYTES,
     DATA_CONNECTIONS,
+    MAX_PENDING_BYTES,
     MAX_PENDING_MSG,
+    PENDING_BYTES_DRAINED,
+    PENDING_BYTES_MERGE_STATE_DIFFS,
     PENDING_MSG_MAX_FORCE_READY,
+    PENDING_MSG_MERGE_STATE_DIFFS,
     PENDING_MSG_PEAK,
     PENDING_MSG_PEAK_TIME,
     SIGNAL_WEBSOCKET_CONNECTED,
@@ -33,7 +44,7 @@ from .const import (
     URL,
 )
 from .error import Disconnect
-from .messages import message_to_json_bytes
+from .messages import message_to_json_bytes, state_diff_message
 from .util import describe_request
 
 CLOSE_MSG_TYPES = {WSMsgType.CLOSE, WSMsgType.CLOSED, WSMsgType.CLOSING}
@@ -66,19 +77,69 @@ class WebSocketAdapter(logging.LoggerAdapter):
         return f"[{self.extra['connid']}] {msg}", kwargs
 
 
+class _PendingStateDiff:
+    """A queued state diff which later changes of the entity are merged into."""
+
+    __slots__ = (
+        "_message",
+        "entity_id",
+        "message_id_as_bytes",
+        "new_state",
+        "old_state",
+        "size",
+    )
+
+    def __init__(
+        self,
+        message: bytes,
+        message_id_as_bytes: bytes,
+        entity_id: str,
+        old_state: State | None,
+        new_state: State | None,
+    ) -> None:
+        """Initialize the pending state diff."""
+        self._message: bytes | None = message
+        # The size the diff was queued with, merged diffs are only
+        # serialized again when they are sent
+        self.size = len(message)
+        self.message_id_as_bytes = message_id_as_bytes
+        self.entity_id = entity_id
+        self.old_state = old_state
+        self.new_state = new_state
+
+    def merge(self, new_state: State | None) -> None:
+        """Merge a later state of the entity into the diff."""
+        self.new_state = new_state
+        self._message = None
+
+    @property
+    def message(self) -> bytes:
+        """Return the message to send to the client."""
+        if self._message is None:
+            self._message = state_diff_message(
+                self.message_id_as_bytes, self.entity_id, self.old_state, self.new_state
+            )
+        return self._message
+
+
 class WebSocketHandler:
     """Handle an active websocket client connection."""
 
     __slots__ = (
         "_authenticated",
+        "_batch_release_handle",
         "_closing",
         "_connection",
+        "_drained_future",
         "_handle_task",
         "_hass",
+        "_largest_pending_message",
         "_logger",
         "_loop",
         "_message_queue",
         "_peak_checker_unsub",
+        "_pending_bytes",
+        "_pending_state_diffs",
         "_ready_future",
         "_release_ready_queue_size",
         "_request",
@@ -104,9 +165,20 @@ class WebSocketHandler:
         # to where messages are queued. This allows the implementation
         # to use a deque and an asyncio.Future to avoid the overhead of
         # an asyncio.Queue.
-        self._message_queue: deque[bytes] = deque()
+        self._message_queue: deque[bytes | _PendingStateDiff] = deque()
         self._ready_future: asyncio.Future[int] | None = None
         self._release_ready_queue_size: int = 0
+        self._batch_release_handle: asyncio.TimerHandle | None = None
+        # Bytes of the messages in the queue, used to enforce the
+        # per-connection byte budget and to release batches early
+        self._pending_bytes: int = 0
+        # Size of the largest message queued since the queue was last empty
+        self._largest_pending_message: int = 0
+        # Queued state diffs keyed by subscription id and entity id
+        # which are merged with later changes while the client is behind
+        self._pending_state_diffs: dict[tuple[bytes, str], _PendingStateDiff] = {}
+        # Resolved once the pending bytes fall below PENDING_BYTES_DRAINED
+        self._drained_future: asyncio.Future[None] | None = None
 
     def __repr__(self) -> str:
         """Return the representation."""
@@ -140,6 +212,7 @@ class WebSocketHandler:
         is_debug_log_enabled = partial(logger.isEnabledFor, logging.DEBUG)
         debug = logger.debug
         can_coalesce = connection.can_coalesce
+        pending_state_diffs = self._pending_state_diffs
         ready_message_count = len(message_queue)
         # Exceptions if Socket disconnected or cancelled by connection handler
         try:
@@ -156,14 +229,42 @@ class WebSocketHandler:
                     can_coalesce = connection.can_coalesce
 
                 if not can_coalesce or ready_message_count == 1:
-                    message = message_queue.popleft()
+                    queued = message_queue.popleft()
+                    if isinstance(queued, bytes):
+                        message = queued
+                        size = len(message)
+                    else:
+                        pending_state_diffs.pop(
+                            (queued.message_id_as_bytes, queued.entity_id), None
+                        )
+                        message = queued.message
+                        size = queued.size
+                    if message_queue:
+                        self._pending_bytes -= size
+                    else:
+                        self._pending_bytes = 0
+                        self._largest_pending_message = 0
+                    if self._drained_future is not None:
+                        self._release_drained_future()
                     if is_debug_log_enabled():
                         debug("%s: Sending %s", self.description, message)
                     await send_bytes_text(message)
                     continue
 
-                coalesced_messages = b"".join((b"[", b",".join(message_queue), b"]"))
+                if pending_state_diffs:
+                    pending_state_diffs.clear()
+                    messages: Iterable[bytes] = [
+                        queued if isinstance(queued, bytes) else queued.message
+                        for queued in message_queue
+                    ]
+                else:
+                    messages = cast("deque[bytes]", message_queue)
+                coalesced_messages = b"".join((b"[", b",".join(messages), b"]"))
                 message_queue.clear()
+                self._pending_bytes = 0
+                self._largest_pending_message = 0
+                if self._drained_future is not None:
+                    self._release_drained_future()
                 if is_debug_log_enabled():
                     debug("%s: Sending %s", self.description, coalesced_messages)
                 await send_bytes_text(coalesced_messages)
@@ -184,6 +285,31 @@ class WebSocketHandler:
             self._peak_checker_unsub()
             self._peak_checker_unsub = None
 
+    @callback
+    def _release_drained_future(self) -> None:
+        """Release the drained future if the pending bytes are low enough."""
+        if (
+            drained_future := self._drained_future
+        ) is not None and self._pending_bytes < PENDING_BYTES_DRAINED:
+            self._drained_future = None
+            if not drained_future.done():
+                drained_future.set_result(None)
+
+    async def _async_wait_drained(self) -> None:
+        """Wait until the client has read most of the pending messages."""
+        if self._closing or self._pending_bytes < PENDING_BYTES_DRAINED:
+            return
+        if self._drained_future is None:
+            self._drained_future = self._loop.create_future()
+        await self._drained_future
+
+    @callback
+    def _cancel_batch_release(self) -> None:
+        """Cancel the pending release of a batch."""
+        if self._batch_release_handle is not None:
+            self._batch_release_handle.cancel()
+            self._batch_release_handle = None
+
     @callback
     def _send_message(self, message: str | bytes | dict[str, Any]) -> None:
         """Queue sending a message to the client.
@@ -203,8 +329,74 @@ class WebSocketHandler:
             elif isinstance(message, str):
                 message = message.encode("utf-8")
 
+        self._queue_message(message, len(message))
+
+    @callback
+    def _send_state_diff_message(
+        self,
+        message: bytes,
+        message_id_as_bytes: bytes,
+        event: Event[EventStateChangedData],
+    ) -> None:
+        """Queue sending a state diff message to the client.
+
+        While the client is behind or batching is enabled, a queued state
+        diff of an entity absorbs later changes of the same entity so only
+        the latest state is sent instead of every intermediate change.
+        """
+        if self._closing:
+            return
+
+        data = event.data
+        key = (message_id_as_bytes, entity_id := data["entity_id"])
+        pending_state_diffs = self._pending_state_diffs
+        if (pending := pending_state_diffs.get(key)) is not None:
+            pending.merge(data["new_state"])
+            return
+
+        if (
+            len(self._message_queue) < PENDING_MSG_MERGE_STATE_DIFFS
+            and self._pending_bytes < PENDING_BYTES_MERGE_STATE_DIFFS
+            and not (self._connection and self._connection.batch_window)
+        ):
+            self._queue_message(message, len(message))
+            return
+
+        pending_state_diffs[key] = pending = _PendingStateDiff(
+            message,
+            message_id_as_bytes,
+            entity_id,
+            data["old_state"],
+            data["new_state"],
+        )
+        self._queue_message(pending, len(message))
+
+    @callback
+    def _queue_message(self, message: bytes | _PendingStateDiff, size: int) -> None:
+        """Add a message to the queue and wake up the writer.
+
+        Closes connection if the client is not reading the messages.
+        """
         message_queue = self._message_queue
         message_queue.append(message)
+        self._pending_bytes += size
+        self._largest_pending_message = max(size, self._largest_pending_message)
+        # The budget applies to the messages queued next to the largest one,
+        # so a single large response does not count as the client falling
+        # behind
+        if self._pending_bytes - self._largest_pending_message >= MAX_PENDING_BYTES:
+            self._logger.error(
+                (
+                    "%s: Client unable to keep up with pending messages. Reached %s"
+                    " pending bytes. The system's load is too high or an integration"
+                    " is misbehaving"
+                ),
+                self.description,
+                MAX_PENDING_BYTES,
+            )
+            self._cancel()
+            return
+
         if (queue_size_after_add := len(message_queue)) >= MAX_PENDING_MSG:
             self._logger.error(
                 (
@@ -222,7 +414,19 @@ class WebSocketHandler:
         if self._release_ready_queue_size == 0:
             # Try to coalesce more messages to reduce the number of writes
             self._release_ready_queue_size = queue_size_after_add
-            self._loop.call_soon(self._release_ready_future_or_reschedule)
+            if (connection := self._connection) and connection.batch_window:
+                self._batch_release_handle = self._loop.call_later(
+                    connection.batch_window, self._release_batch
+                )
+            else:
+                self._loop.call_soon(self._release_ready_future_or_reschedule)
+
+        if (
+            self._batch_release_handle is not None
+            and self._pending_bytes >= BATCH_MAX_BYTES
+        ):
+            self._cancel_batch_release()
+            self._release_batch()
 
         peak_checker_active = self._peak_checker_unsub is not None
 
@@ -262,6 +466,18 @@ class WebSocketHandler:
         if not ready_future.done():
             ready_future.set_result(queue_size)
 
+    @callback
+    def _release_batch(self) -> None:
+        """Release the ready future at the end of the batch window."""
+        self._batch_release_handle = None
+        self._release_ready_queue_size = 0
+        if (
+            (ready_future := self._ready_future)
+            and not ready_future.done()
+            and (queue_size := len(self._message_queue))
+        ):
+            ready_future.set_result(queue_size)
+
     @callback
     def _check_write_peak(self, _utc_time: dt.datetime) -> None:
         """Check that we are no longer above the write peak."""
@@ -288,6 +504,7 @@ class WebSocketHandler:
         """Cancel the connection."""
         self._closing = True
         self._cancel_peak_checker()
+        self._cancel_batch_release()
         if self._handle_task is not None:
             self._handle_task.cancel()
         if self._writer_task is not None:
@@ -357,6 +574,7 @@ class WebSocketHandler:
             unsub_stop()
 
             self._cancel_peak_checker()
+            self._cancel_batch_release()
 
             if connection is not None:
                 connection.async_handle_close()
@@ -364,6 +582,8 @@ class WebSocketHandler:
             self._closing = True
             if self._ready_future and not self._ready_future.done():
                 self._ready_future.set_result(len(self._message_queue))
+            if self._drained_future and not self._drained_future.done():
+                self._drained_future.set_result(None)
 
             await self._async_cleanup_writer_and_close(disconnect_warn, connection)
 
@@ -410,6 +630,8 @@ class WebSocketHandler:
         # We only start the writer queue after the auth phase is completed
         # since there is no need to queue messages before the auth phase
         self._connection = connection
+        connection.send_state_diff_message = self._send_state_diff_message
+        connection.wait_drained = self._async_wait_drained
         self._writer_task = create_eager_task(self._writer(connection, send_bytes_text))
         self._hass.data[DATA_CONNECTIONS] = self._hass.data.get(DATA_CONNECTIONS, 0) + 1
         async_dispatcher_send(self._hass, SIGNAL_WEBSOCKET_CONNECTED)
@@ -24,6 +24,7 @@ import enum
 import functools
 import inspect
 import logging
+import math
 import re
 import threading
 import time
@@ -40,6 +41,7 @@ from typing import (
     cast,
     overload,
 )
+import weakref
 
 from propcache.api import cached_property, under_cached_property
 import voluptuous as vol
@@ -198,6 +200,12 @@ EVENTS_EXCLUDED_FROM_MATCH_ALL = {
     EVENT_STATE_REPORTED,
 }
 
+# Events which carry an entity_id and support indexed listeners
+INDEXED_STATE_EVENTS = {
+    EVENT_STATE_CHANGED,
+    EVENT_STATE_REPORTED,
+}
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -1449,6 +1457,50 @@ class _OneTimeListener(Generic[_DataT]):
 EMPTY_LIST: list[Any] = []
 
 
+class _StateEventIndex:
+    """Listeners for a state event type indexed by entity_id and domain.
+
+    Entity ids always contain a dot and domains never do, but the two
+    are kept in separate dicts so the domain does not have to be split
+    from the entity_id when no listener is indexed by domain.
+    """
+
+    __slots__ = ("domains", "entity_ids")
+
+    def __init__(self) -> None:
+        """Initialize the index."""
+        self.entity_ids: dict[str, list[_FilterableJobType[Any]]] = {}
+        self.domains: dict[str, list[_FilterableJobType[Any]]] = {}
+
+    @callback
+    def async_match(self, entity_id: str) -> tuple[list[_FilterableJobType[Any]], ...]:
+        """Return the lists of listeners that can match an entity_id.
+
+        A malformed entity_id without a domain only matches the listeners
+        of all domains.
+        """
+        if domains := self.domains:
+            domain = entity_id.partition(".")[0]
+            return (
+                self.entity_ids.get(entity_id, EMPTY_LIST),
+                domains.get(domain, EMPTY_LIST) if domain else EMPTY_LIST,
+                domains.get(MATCH_ALL, EMPTY_LIST),
+            )
+        return (self.entity_ids.get(entity_id, EMPTY_LIST),)
+
+    @callback
+    def async_unique_listeners(self) -> int:
+        """Return the number of unique listeners in the index."""
+        return len(
+            {
+                id(filterable_job)
+                for index in (self.entity_ids, self.domains)
+                for filterable_jobs in index.values()
+                for filterable_job in filterable_jobs
+            }
+        )
+
+
 @functools.lru_cache
 def _verify_event_type_length_or_raise(event_type: EventType[_DataT] | str) -> None:
     """Verify the length of the event type and raise if too long."""
@@ -1459,13 +1511,23 @@ def _verify_event_type_length_or_raise(event_type: EventType[_DataT] | str) -> N
 class EventBus:
     """Allow the firing of and listening for events."""
 
-    __slots__ = ("_debug", "_hass", "_listeners", "_match_all_listeners")
+    __slots__ = (
+        "_debug",
+        "_fan_out",
+        "_hass",
+        "_indexed_listeners",
+        "_listeners",
+        "_match_all_listeners",
+    )
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
         self._listeners: defaultdict[
             EventType[Any] | str, list[_FilterableJobType[Any]]
         ] = defaultdict(list)
+        self._indexed_listeners: dict[EventType[Any] | str, _StateEventIndex] = {}
+        # Jobs dispatched per event type, only counted while profiling
+        self._fan_out: defaultdict[EventType[Any] | str, int] | None = None
         self._match_all_listeners: list[_FilterableJobType[Any]] = []
         self._listeners[MATCH_ALL] = self._match_all_listeners
         self._hass = hass
@@ -1483,7 +1545,33 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        return {key: len(listeners) for key, listeners in self._listeners.items()}
+        listeners = {key: len(listeners) for key, listeners in self._listeners.items()}
+        for key, index in self._indexed_listeners.items():
+            if count := index.async_unique_listeners():
+                listeners[key] = listeners.get(key, 0) + count
+        return listeners
+
+    @callback
+    def async_count_fan_out(self, enabled: bool) -> None:
+        """Start or stop counting the jobs dispatched per event type.
+
+        The profiler integration counts them while profiling to find event
+        types that fan out to many listeners. Starting again resets the
+        counters.
+
+        This method must be run in the event loop.
+        """
+        self._fan_out = defaultdict(int) if enabled else None
+
+    @callback
+    def async_fan_out(self) -> dict[EventType[Any] | str, int]:
+        """Return dictionary with events and the number of jobs they dispatched.
+
+        The dictionary is empty if the jobs are not counted.
+
+        This method must be run in the event loop.
+        """
+        return dict(self._fan_out or {})
 
     @property
     def listeners(self) -> dict[EventType[Any] | str, int]:
@@ -1553,30 +1641,51 @@ class EventBus:
             match_all_listeners = self._match_all_listeners
         else:
             match_all_listeners = EMPTY_LIST
+        if (
+            event_data is not None
+            and (index := self._indexed_listeners.get(event_type))
+            and type(entity_id := event_data.get("entity_id")) is str
+        ):
+            # Indexed listeners only see events for the entity_ids
+            # and domains they are indexed by, and run after the
+            # listeners of the event type
+            listener_lists = (
+                listeners,
+                *index.async_match(entity_id),
+                match_all_listeners,
+            )
+        else:
+            listener_lists = (listeners, match_all_listeners)
 
         event: Event[_DataT] | None = None
-        for job, event_filter in listeners + match_all_listeners:
-            if event_filter is not None:
-                try:
-                    if event_data is None or not event_filter(event_data):
+        dispatched = 0
+        for filterable_jobs in listener_lists:
+            for job, event_filter in filterable_jobs:
+                if event_filter is not None:
+                    try:
+                        if event_data is None or not event_filter(event_data):
+                            continue
+                    except Exception:
+                        _LOGGER.exception("Error in event filter")
                         continue
+
+                if not event:
+                    event = Event(
+                        event_type,
+                        event_data,
+                        origin,
+                        time_fired,
+                        context,
+                    )
+
+                dispatched += 1
+                try:
+                    self._hass.async_run_hass_job(job, event)
                 except Exception:
-                    _LOGGER.exception("Error in event filter")
-                    continue
-
-            if not event:
-                event = Event(
-                    event_type,
-                    event_data,
-                    origin,
-                    time_fired,
-                    context,
-                )
+                    _LOGGER.exception("Error running job: %s", job)
 
-            try:
-                self._hass.async_run_hass_job(job, event)
-            except Exception:
-                _LOGGER.exception("Error running job: %s", job)
+        if dispatched and (fan_out := self._fan_out) is not None:
+            fan_out[event_type] += dispatched
 
     def listen(
         self,
@@ -1648,11 +1757,72 @@ class EventBus:
         filterable_job: _FilterableJobType[_DataT],
     ) -> CALLBACK_TYPE:
         """Listen for all events or events of a specific type."""
-        self._listeners[event_type].append(filterable_job)
+        # Listener lists are replaced rather than changed in place so
+        # async_fire_internal can iterate them without taking a copy
+        listeners = [*self._listeners.get(event_type, EMPTY_LIST), filterable_job]
+        self._listeners[event_type] = listeners
+        if event_type == MATCH_ALL:
+            self._match_all_listeners = listeners
         return functools.partial(
             self._async_remove_listener, event_type, filterable_job
         )
 
+    @callback
+    def _async_listen_indexed(
+        self,
+        event_type: EventType[_DataT] | str,
+        filterable_job: _FilterableJobType[_DataT],
+        entity_id: str | None = None,
+        domain: str | None = None,
+    ) -> CALLBACK_TYPE:
+        """Listen for state events of a single entity_id or domain.
+
+        Only events in INDEXED_STATE_EVENTS can be indexed. Pass MATCH_ALL
+        as the domain to receive the event for every domain.
+
+        The same filterable job may be indexed under multiple keys; it will
+        be dispatched once for each key that matches the event.
+
+        This method is intended for internal use only.
+        """
+        if event_type not in INDEXED_STATE_EVENTS:
+            raise HomeAssistantError(f"Event {event_type} can not be indexed")
+        if (index := self._indexed_listeners.get(event_type)) is None:
+            index = self._indexed_listeners[event_type] = _StateEventIndex()
+        if entity_id is not None:
+            key, keyed_listeners = entity_id, index.entity_ids
+        elif domain is not None:
+            key, keyed_listeners = domain, index.domains
+        else:
+            raise HomeAssistantError("An entity_id or domain is required")
+        keyed_listeners[key] = [*keyed_listeners.get(key, EMPTY_LIST), filterable_job]
+        return functools.partial(
+            self._async_remove_indexed_listener, keyed_listeners, key, filterable_job
+        )
+
+    @callback
+    def _async_remove_indexed_listener(
+        self,
+        keyed_listeners: dict[str, list[_FilterableJobType[Any]]],
+        key: str,
+        filterable_job: _FilterableJobType[Any],
+    ) -> None:
+        """Remove an indexed listener.
+
+        This method must be run in the event loop.
+        """
+        try:
+            listeners = keyed_listeners[key].copy()
+            listeners.remove(filterable_job)
+            if listeners:
+                keyed_listeners[key] = listeners
+            else:
+                del keyed_listeners[key]
+        except (KeyError, ValueError):
+            _LOGGER.exception(
+                "Unable to remove unknown indexed job listener %s", filterable_job
+            )
+
     def listen_once(
         self,
         event_type: EventType[_DataT] | str,
@@ -1729,11 +1899,16 @@ class EventBus:
         This method must be run in the event loop.
         """
         try:
-            self._listeners[event_type].remove(filterable_job)
+            listeners = self._listeners[event_type].copy()
+            listeners.remove(filterable_job)
 
             # delete event_type list if empty
-            if not self._listeners[event_type] and event_type != MATCH_ALL:
+            if not listeners and event_type != MATCH_ALL:
                 self._listeners.pop(event_type)
+            else:
+                self._listeners[event_type] = listeners
+                if event_type == MATCH_ALL:
+                    self._match_all_listeners = listeners
         except (KeyError, ValueError):
             # KeyError is key event_type listener did not exist
             # ValueError if listener did not exist within event_type
@@ -1752,6 +1927,14 @@ class CompressedState(TypedDict):
     lu: NotRequired[float]  # COMPRESSED_STATE_LAST_UPDATED
 
 
+# Cached properties of a State that are not used once the state is expired
+_EXPIRED_STATE_CACHE_KEYS = (
+    "_as_read_only_dict",
+    "as_compressed_state",
+    "as_compressed_state_json",
+)
+
+
 class State:
     """Object to represent a state within the state machine.
 
@@ -2006,10 +2189,17 @@ class State:
         sure we don't end up holding a reference to the original context
         since it can never be garbage collected as each event would
         reference the previous one.
+
+        The compressed state and read only dict caches are only used to
+        send the current states so they are dropped to free the memory
+        held by old states until they are garbage collected.
         """
         self.context = Context(
             self.context.user_id, self.context.parent_id, self.context.id
         )
+        cache = self._cache
+        for key in _EXPIRED_STATE_CACHE_KEYS:
+            cache.pop(key, None)
 
     def __repr__(self) -> str:
         """Return the representation of the states."""
@@ -2063,10 +2253,59 @@ class States(UserDict[str, State]):
         return self._domain_index[key].values()
 
 
+_INTERNABLE_ATTRIBUTE_TYPES = frozenset({str, int, float, bool, type(None)})
+# Covers the attributes of typical sensors, building the intern key for larger
+# attributes costs more than a state write and they are rarely identical anyway
+_MAX_INTERNED_ATTRIBUTES = 8
+
+
+def _has_negative_zero(values: Iterable[Any]) -> bool:
+    """Return if any of the values is a negative zero float."""
+    return any(
+        type(value) is float and value == 0 and math.copysign(1.0, value) < 0
+        for value in values
+    )
+
+
+def _attributes_intern_key(attributes: Mapping[str, Any]) -> tuple[Any, ...] | None:
+    """Return the key to intern attributes by or None if they can't be interned.
+
+    The types of the values are part of the key since values like 1, 1.0
+    and True are equal but serialize differently. For the same reason
+    attributes with a negative zero are not interned since it equals 0.0.
+    """
+    value_types = tuple(map(type, attributes.values()))
+    if float in value_types and _has_negative_zero(attributes.values()):
+        return None
+    if _INTERNABLE_ATTRIBUTE_TYPES.issuperset(value_types):
+        return (*attributes.items(), *value_types)
+    key: list[Any] = [*attributes.items()]
+    for value, value_type in zip(attributes.values(), value_types, strict=True):
+        if value_type is tuple:
+            item_types = tuple(map(type, value))
+            if not _INTERNABLE_ATTRIBUTE_TYPES.issuperset(item_types) or (
+                float in item_types and _has_negative_zero(value)
+            ):
+                return None
+            key.append(item_types)
+        elif value_type in _INTERNABLE_ATTRIBUTE_TYPES:
+            key.append(value_type)
+        else:
+            return None
+    return tuple(key)
+
+
 class StateMachine:
     """Helper class that tracks the state of different entities."""
 
-    __slots__ = ("_bus", "_loop", "_reservations", "_states", "_states_data")
+    __slots__ = (
+        "_attributes",
+        "_bus",
+        "_loop",
+        "_reservations",
+        "_states",
+        "_states_data",
+    )
 
     def __init__(self, bus: EventBus, loop: asyncio.events.AbstractEventLoop) -> None:
         """Initialize state machine."""
@@ -2074,6 +2313,11 @@ class StateMachine:
         # _states_data is used to access the States backing dict directly to speed
         # up read operations
         self._states_data = self._states.data
+        # Interned attributes shared by all states with identical attributes,
+        # entries are dropped once no state references them anymore
+        self._attributes: weakref.WeakValueDictionary[
+            tuple[Any, ...], ReadOnlyDict[str, Any]
+        ] = weakref.WeakValueDictionary()
         self._reservations: set[str] = set()
         self._bus = bus
         self._loop = loop
@@ -2282,6 +2526,30 @@ class StateMachine:
             timestamp or time.time(),
         )
 
+    @callback
+    def _async_intern_attributes(
+        self, attributes: Mapping[str, Any] | None
+    ) -> ReadOnlyDict[str, Any]:
+        """Return a shared ReadOnlyDict for the attributes.
+
+        Only attributes with at most _MAX_INTERNED_ATTRIBUTES scalar values
+        or tuples of scalar values are interned.
+        """
+        if attributes is None:
+            attributes = {}
+        if (
+            len(attributes) > _MAX_INTERNED_ATTRIBUTES
+            or (key := _attributes_intern_key(attributes)) is None
+        ):
+            if type(attributes) is not ReadOnlyDict:
+                return ReadOnlyDict(attributes)
+            return attributes
+        if (interned := self._attributes.get(key)) is None:
+            if type(attributes) is not ReadOnlyDict:
+                attributes = ReadOnlyDict(attributes)
+            interned = self._attributes[key] = attributes
+        return interned
+
     @callback
     def async_set_internal(
         self,
@@ -2357,6 +2625,8 @@ class StateMachine:
             if TYPE_CHECKING:
                 assert old_state is not None
             attributes = old_state.attributes
+        else:
+            attributes = self._async_intern_attributes(attributes)
 
         # This is intentionally called with positional only arguments for performance
         # reasons
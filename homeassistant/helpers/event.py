@@ -3,16 +3,16 @@
 from __future__ import annotations
 
 import asyncio
-from collections import defaultdict
+from collections import defaultdict, deque
 from collections.abc import Callable, Coroutine, Iterable, Mapping, Sequence
 import copy
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from functools import partial, wraps
 import logging
 from random import randint
 import time
-from typing import TYPE_CHECKING, Any, Concatenate, Generic, TypeVar
+from typing import TYPE_CHECKING, Any, Concatenate, Generic, Literal, TypeVar
 
 from homeassistant.const import (
     EVENT_CORE_CONFIG_UPDATE,
@@ -54,7 +54,7 @@ from .entity_registry import (
 )
 from .ratelimit import KeyedRateLimit
 from .sun import get_astral_event_next
-from .template import RenderInfo, Template, result_as_boolean
+from .template import ALL_STATES_RATE_LIMIT, RenderInfo, Template, result_as_boolean
 from .typing import TemplateVarsType
 
 _TRACK_STATE_CHANGE_DATA: HassKey[_KeyedEventData[EventStateChangedData]] = HassKey(
@@ -75,6 +75,12 @@ _TRACK_ENTITY_REGISTRY_UPDATED_DATA: HassKey[
 _TRACK_DEVICE_REGISTRY_UPDATED_DATA: HassKey[
     _KeyedEventData[EventDeviceRegistryUpdatedData]
 ] = HassKey("track_device_registry_updated_data")
+_TRACK_TEMPLATE_RESULT_INFOS: HassKey[set[TrackTemplateResultInfo]] = HassKey(
+    "track_template_result_infos"
+)
+_TRACK_TEMPLATE_PENDING_REFRESH: HassKey[dict[TrackTemplateResultInfo, None]] = HassKey(
+    "track_template_pending_refresh"
+)
 
 _ALL_LISTENER = "all"
 _DOMAINS_LISTENER = "domains"
@@ -89,12 +95,29 @@ _LOGGER = logging.getLogger(__name__)
 RANDOM_MICROSECOND_MIN = 50000
 RANDOM_MICROSECOND_MAX = 500000
 
+# Templates re-rendered because of a domain or all states change are rate
+# limited in proportion to their render time once rendering them takes
+# longer than ADAPTIVE_RATE_LIMIT_MIN_RENDER_TIME. With a factor of 100 such
+# a template can use at most ~1% of the event loop time.
+ADAPTIVE_RATE_LIMIT_MIN_RENDER_TIME = 0.01  # seconds
+ADAPTIVE_RATE_LIMIT_MIN_RENDERS = 10
+ADAPTIVE_RATE_LIMIT_FACTOR = 100
+# Weight of the latest render in the moving average of the render time
+_RENDER_TIME_SMOOTHING = 0.2
+
 _TypedDictT = TypeVar("_TypedDictT", bound=Mapping[str, Any])
 
 
 @dataclass(slots=True, frozen=True)
 class _KeyedEventTracker(Generic[_TypedDictT]):
-    """Class to track events by key."""
+    """Class to track events by key.
+
+    Trackers with an index are registered with the event bus for each of
+    their keys, so the bus only dispatches events to them that can match.
+    The entity_id index shares a single job between all keys since an
+    event can only match one entity_id. The domain index registers a job
+    per key since an event can match both its domain and MATCH_ALL.
+    """
 
     key: HassKey[_KeyedEventData[_TypedDictT]]
     event_type: EventType[_TypedDictT] | str
@@ -106,14 +129,18 @@ class _KeyedEventTracker(Generic[_TypedDictT]):
         ],
         None,
     ]
-    filter_callable: Callable[
-        [
-            HomeAssistant,
-            dict[str, list[HassJob[[Event[_TypedDictT]], Any]]],
-            _TypedDictT,
-        ],
-        bool,
-    ]
+    filter_callable: (
+        Callable[
+            [
+                HomeAssistant,
+                dict[str, list[HassJob[[Event[_TypedDictT]], Any]]],
+                _TypedDictT,
+            ],
+            bool,
+        ]
+        | None
+    )
+    index: Literal["entity_id", "domain"] | None = None
 
 
 @dataclass(slots=True, frozen=True)
@@ -122,6 +149,8 @@ class _KeyedEventData(Generic[_TypedDictT]):
 
     listener: CALLBACK_TYPE
     callbacks: defaultdict[str, list[HassJob[[Event[_TypedDictT]], Any]]]
+    indexed_job: tuple[HassJob[[Event[_TypedDictT]], None], None] | None = None
+    indexed_listeners: dict[str, CALLBACK_TYPE] = field(default_factory=dict)
 
 
 @dataclass(slots=True)
@@ -152,6 +181,55 @@ class TrackTemplate:
     rate_limit: float | None = None
 
 
+@dataclass(slots=True)
+class TemplateRenderStats:
+    """Class for keeping track of the render cost of a tracked template.
+
+    renders
+        The number of times the template was rendered.
+    total_time
+        The total time spent rendering the template in seconds.
+    max_time
+        The longest time a single render took in seconds.
+    recent_time
+        A moving average of the render time in seconds, weighted towards
+        the most recent renders. The first render is excluded since it
+        includes compiling the template.
+    coalesced
+        The number of state changes which were handled by a single render
+        together with another state change.
+    """
+
+    renders: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    recent_time: float = 0.0
+    coalesced: int = 0
+
+    @callback
+    def async_record(self, render_time: float) -> None:
+        """Record the time a render took."""
+        if self.renders > 1:
+            self.recent_time += _RENDER_TIME_SMOOTHING * (
+                render_time - self.recent_time
+            )
+        elif self.renders == 1:
+            self.recent_time = render_time
+        self.renders += 1
+        self.total_time += render_time
+        self.max_time = max(self.max_time, render_time)
+
+    @property
+    def adaptive_rate_limit(self) -> float | None:
+        """Return the rate limit the render cost calls for."""
+        if (
+            self.renders < ADAPTIVE_RATE_LIMIT_MIN_RENDERS
+            or self.recent_time < ADAPTIVE_RATE_LIMIT_MIN_RENDER_TIME
+        ):
+            return None
+        return min(self.recent_time * ADAPTIVE_RATE_LIMIT_FACTOR, ALL_STATES_RATE_LIMIT)
+
+
 @dataclass(slots=True)
 class TrackTemplateResult:
     """Class for result of template tracking.
@@ -361,21 +439,12 @@ def _async_dispatch_entity_id_event[_StateEventDataT: EventStateEventData](
             )
 
 
-@callback
-def _async_state_filter[_StateEventDataT: EventStateEventData](
-    hass: HomeAssistant,
-    callbacks: dict[str, list[HassJob[[Event[_StateEventDataT]], Any]]],
-    event_data: _StateEventDataT,
-) -> bool:
-    """Filter state changes by entity_id."""
-    return event_data["entity_id"] in callbacks
-
-
 _KEYED_TRACK_STATE_CHANGE = _KeyedEventTracker(
     key=_TRACK_STATE_CHANGE_DATA,
     event_type=EVENT_STATE_CHANGED,
     dispatcher_callable=_async_dispatch_entity_id_event_soon,
-    filter_callable=_async_state_filter,
+    filter_callable=None,
+    index="entity_id",
 )
 
 
@@ -399,7 +468,8 @@ _KEYED_TRACK_STATE_REPORT = _KeyedEventTracker(
     key=_TRACK_STATE_REPORT_DATA,
     event_type=EVENT_STATE_REPORTED,
     dispatcher_callable=_async_dispatch_entity_id_event,
-    filter_callable=_async_state_filter,
+    filter_callable=None,
+    index="entity_id",
 )
 
 
@@ -433,15 +503,50 @@ def _remove_listener(
     callbacks: dict[str, list[HassJob[[Event[_TypedDictT]], Any]]],
 ) -> None:
     """Remove listener."""
+    indexed_listeners = hass.data[tracker.key].indexed_listeners
     for key in keys:
         callbacks[key].remove(job)
         if not callbacks[key]:
             del callbacks[key]
+            if key in indexed_listeners:
+                indexed_listeners.pop(key)()
 
     if not callbacks:
         hass.data.pop(tracker.key).listener()
 
 
+@callback
+def _async_index_key(
+    hass: HomeAssistant,
+    tracker: _KeyedEventTracker[_TypedDictT],
+    event_data: _KeyedEventData[_TypedDictT],
+    key: str,
+) -> None:
+    """Register a new key of an indexed tracker with the event bus."""
+    if tracker.index == "entity_id":
+        assert event_data.indexed_job is not None
+        event_data.indexed_listeners[key] = hass.bus._async_listen_indexed(  # noqa: SLF001
+            tracker.event_type, event_data.indexed_job, entity_id=key
+        )
+        return
+    # Only expose this key to the dispatcher and filter so an event
+    # that matches both its domain and MATCH_ALL is not dispatched twice
+    key_callbacks = {key: event_data.callbacks[key]}
+    filter_callable = tracker.filter_callable
+    event_data.indexed_listeners[key] = hass.bus._async_listen_indexed(  # noqa: SLF001
+        tracker.event_type,
+        (
+            HassJob(
+                partial(tracker.dispatcher_callable, hass, key_callbacks),
+                f"track {tracker.event_type} {key}",
+                job_type=HassJobType.Callback,
+            ),
+            filter_callable and partial(filter_callable, hass, key_callbacks),
+        ),
+        domain=key,
+    )
+
+
 # tracker, not hass is intentionally the first argument here since its
 # constant and may be used in a partial in the future
 def _async_track_event(
@@ -463,8 +568,9 @@ def _async_track_event(
     if tracker_key in hass_data:
         event_data = hass_data[tracker_key]
         callbacks = event_data.callbacks
-    else:
+    elif tracker.index is None:
         callbacks = defaultdict(list)
+        assert tracker.filter_callable is not None
         listener = hass.bus.async_listen(
             tracker.event_type,
             partial(tracker.dispatcher_callable, hass, callbacks),
@@ -472,8 +578,25 @@ def _async_track_event(
         )
         event_data = _KeyedEventData(listener, callbacks)
         hass_data[tracker_key] = event_data
+    else:
+        callbacks = defaultdict(list)
+        indexed_job = None
+        if tracker.index == "entity_id":
+            indexed_job = (
+                HassJob(
+                    partial(tracker.dispatcher_callable, hass, callbacks),
+                    f"track {tracker.event_type}",
+                    job_type=HassJobType.Callback,
+                ),
+                None,
+            )
+        # The event bus dispatches indexed trackers by key so there
+        # is no listener to remove once all keys are gone
+        event_data = _KeyedEventData(_remove_empty_listener, callbacks, indexed_job)
+        hass_data[tracker_key] = event_data
 
     job = HassJob(action, f"track {tracker.event_type} event {keys}", job_type=job_type)
+    indexed = tracker.index is not None
 
     if isinstance(keys, str):
         # Almost all calls to this function use a single key
@@ -481,11 +604,19 @@ def _async_track_event(
         # here because this function gets called ~20000 times
         # during startup, and we want to avoid the overhead of
         # creating empty lists and throwing them away.
-        callbacks[keys].append(job)
+        if indexed and keys not in callbacks:
+            callbacks[keys].append(job)
+            _async_index_key(hass, tracker, event_data, keys)
+        else:
+            callbacks[keys].append(job)
         keys = (keys,)
     else:
         for key in keys:
-            callbacks[key].append(job)
+            if indexed and key not in callbacks:
+                callbacks[key].append(job)
+                _async_index_key(hass, tracker, event_data, key)
+            else:
+                callbacks[key].append(job)
 
     return partial(_remove_listener, hass, tracker, keys, job, callbacks)
 
@@ -656,6 +787,7 @@ _KEYED_TRACK_STATE_ADDED_DOMAIN = _KeyedEventTracker(
     event_type=EVENT_STATE_CHANGED,
     dispatcher_callable=_async_dispatch_domain_event,
     filter_callable=_async_domain_added_filter,
+    index="domain",
 )
 
 
@@ -693,6 +825,7 @@ _KEYED_TRACK_STATE_REMOVED_DOMAIN = _KeyedEventTracker(
     event_type=EVENT_STATE_CHANGED,
     dispatcher_callable=_async_dispatch_domain_event,
     filter_callable=_async_domain_removed_filter,
+    index="domain",
 )
 
 
@@ -1003,8 +1136,13 @@ class TrackTemplateResultInfo:
 
         self._rate_limit = KeyedRateLimit(hass)
         self._info: dict[Template, RenderInfo] = {}
+        self._render_stats: dict[Template, TemplateRenderStats] = {
+            track_template_.template: TemplateRenderStats()
+            for track_template_ in track_templates
+        }
         self._track_state_changes: _TrackStateChangeFiltered | None = None
         self._time_listeners: dict[Template, Callable[[], None]] = {}
+        self._pending_events: deque[Event[EventStateChangedData]] = deque()
 
     def __repr__(self) -> str:
         """Return the representation."""
@@ -1021,10 +1159,8 @@ class TrackTemplateResultInfo:
 
         # Render the super template first
         if super_template is not None:
-            template = super_template.template
-            variables = super_template.variables
-            self._info[template] = info = template.async_render_to_info(
-                variables, strict=strict, log_fn=log_fn
+            info = self._async_render_to_info(
+                super_template, strict=strict, log_fn=log_fn
             )
 
             # If the super template did not render to True, don't update other templates
@@ -1042,10 +1178,8 @@ class TrackTemplateResultInfo:
         for track_template_ in self._track_templates:
             if block_render or track_template_ == super_template:
                 continue
-            template = track_template_.template
-            variables = track_template_.variables
-            self._info[template] = info = template.async_render_to_info(
-                variables, strict=strict, log_fn=log_fn
+            info = self._async_render_to_info(
+                track_template_, strict=strict, log_fn=log_fn
             )
 
             if info.exception:
@@ -1059,9 +1193,12 @@ class TrackTemplateResultInfo:
                     log_fn(logging.ERROR, str(info.exception))
 
         self._track_state_changes = async_track_state_change_filtered(
-            self.hass, _render_infos_to_track_states(self._info.values()), self._refresh
+            self.hass,
+            _render_infos_to_track_states(self._info.values()),
+            self._async_state_changed,
         )
         self._update_time_listeners()
+        self.hass.data.setdefault(_TRACK_TEMPLATE_RESULT_INFOS, set()).add(self)
         _LOGGER.debug(
             (
                 "Template group %s listens for %s, first render blocked by super"
@@ -1119,12 +1256,155 @@ class TrackTemplateResultInfo:
         self._rate_limit.async_remove()
         for template in list(self._time_listeners):
             self._time_listeners.pop(template)()
+        self._pending_events.clear()
+        if infos := self.hass.data.get(_TRACK_TEMPLATE_RESULT_INFOS):
+            infos.discard(self)
 
     @callback
     def async_refresh(self) -> None:
         """Force recalculate the template."""
         self._refresh(None)
 
+    @property
+    def render_stats(self) -> dict[Template, TemplateRenderStats]:
+        """Return the render cost of the tracked templates."""
+        return self._render_stats
+
+    @callback
+    def _async_render_to_info(
+        self, track_template_: TrackTemplate, **kwargs: Any
+    ) -> RenderInfo:
+        """Render a template and record how long the render took."""
+        template = track_template_.template
+        start = time.perf_counter()
+        self._info[template] = info = template.async_render_to_info(
+            track_template_.variables, **kwargs
+        )
+        self._render_stats[template].async_record(time.perf_counter() - start)
+        return info
+
+    @callback
+    def _async_state_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Refresh the templates for a state change or queue the refresh.
+
+        State changes of entities a template references directly are
+        rendered right away, so a template sees every value they take.
+
+        Other state changes only trigger domain wide or all states
+        templates, those arriving in the same event loop iteration which
+        trigger the same templates are coalesced so each template is
+        rendered once for them.
+        """
+        entity_id = event.data["entity_id"]
+        if any(entity_id in info.entities for info in self._info.values()):
+            # Refresh the queued state changes first to keep the order
+            self.async_refresh_pending()
+            self._refresh(event)
+            return
+        self._pending_events.append(event)
+        if len(self._pending_events) == 1:
+            _async_schedule_template_refresh(self.hass, self)
+
+    @callback
+    def async_refresh_pending(self) -> None:
+        """Refresh the templates for the queued state changes."""
+        pending = self._pending_events
+        if not pending:
+            return
+        if len(self._info) == 1:
+            # A single template can handle all the state changes at once
+            events = list(pending)
+            pending.clear()
+            self._refresh(events[-1], coalesced_events=events)
+            return
+
+        # Templates are still refreshed in the order of the state changes
+        # triggering them, async_remove clears the queue if called during
+        # a refresh.
+        triggered: dict[tuple[str, bool], set[Template]] = {}
+        while pending:
+            templates = self._templates_triggered_by(pending[0], triggered)
+            events = [pending.popleft()]
+            while (
+                pending
+                and self._templates_triggered_by(pending[0], triggered) == templates
+            ):
+                events.append(pending.popleft())
+            if templates:
+                self._refresh(events[-1], coalesced_events=events)
+                # Re-rendering may change which templates are triggered
+                triggered.clear()
+
+    def _templates_triggered_by(
+        self,
+        event: Event[EventStateChangedData],
+        triggered: dict[tuple[str, bool], set[Template]],
+    ) -> set[Template]:
+        """Return the templates a state change triggers a re-render of.
+
+        The result only depends on the entity_id and whether the entity was
+        added or removed, so it is cached in triggered.
+        """
+        data = event.data
+        key = (
+            data["entity_id"],
+            data["new_state"] is None or data["old_state"] is None,
+        )
+        if (templates := triggered.get(key)) is None:
+            templates = triggered[key] = {
+                template
+                for template, info in self._info.items()
+                if _event_triggers_rerender(event, info)
+            }
+        return templates
+
+    def _coalesced_event(
+        self,
+        template: Template,
+        coalesced_events: Sequence[Event[EventStateChangedData]],
+    ) -> Event[EventStateChangedData] | None:
+        """Return the state change a coalesced re-render of a template handles.
+
+        Returns None if none of the state changes trigger a re-render.
+        """
+        info = self._info[template]
+        triggering_events = [
+            coalesced_event
+            for coalesced_event in coalesced_events
+            if _event_triggers_rerender(coalesced_event, info)
+        ]
+        if not triggering_events:
+            return None
+        self._render_stats[template].coalesced += len(triggering_events) - 1
+        # Prefer a specifically referenced entity as those
+        # are excluded from the rate limit
+        return next(
+            (
+                triggering_event
+                for triggering_event in triggering_events
+                if triggering_event.data["entity_id"] in info.entities
+            ),
+            triggering_events[-1],
+        )
+
+    def _render_template_for_events(
+        self,
+        track_template_: TrackTemplate,
+        now: float,
+        event: Event[EventStateChangedData] | None,
+        coalesced_events: Sequence[Event[EventStateChangedData]],
+    ) -> tuple[bool | TrackTemplateResult, Event[EventStateChangedData] | None]:
+        """Re-render the template for coalesced state changes if conditions match.
+
+        Returns the result of _render_template_if_ready and the state
+        change the template was re-rendered for.
+        """
+        if event and len(coalesced_events) > 1:
+            event = self._coalesced_event(track_template_.template, coalesced_events)
+            if event is None:
+                return False, None
+        return self._render_template_if_ready(track_template_, now, event), event
+
     def _render_template_if_ready(
         self,
         track_template_: TrackTemplate,
@@ -1142,6 +1422,7 @@ class TrackTemplateResultInfo:
         generates a new result.
         """
         template = track_template_.template
+        stats = self._render_stats[template]
 
         if event:
             info = self._info[template]
@@ -1153,7 +1434,7 @@ class TrackTemplateResultInfo:
 
             if self._rate_limit.async_schedule_action(
                 template,
-                _rate_limit_for_event(event, info, track_template_),
+                _rate_limit_for_event(event, info, track_template_, stats),
                 now,
                 self._refresh,
                 event,
@@ -1169,9 +1450,7 @@ class TrackTemplateResultInfo:
             )
 
         self._rate_limit.async_triggered(template, now)
-        self._info[template] = info = template.async_render_to_info(
-            track_template_.variables
-        )
+        info = self._async_render_to_info(track_template_)
 
         try:
             result: str | TemplateError = info.result()
@@ -1221,12 +1500,18 @@ class TrackTemplateResultInfo:
         event: Event[EventStateChangedData] | None,
         track_templates: Iterable[TrackTemplate] | None = None,
         replayed: bool | None = False,
+        coalesced_events: Sequence[Event[EventStateChangedData]] = (),
     ) -> None:
         """Refresh the template.
 
         The event is the state_changed event that caused the refresh
         to be considered.
 
+        coalesced_events are the state_changed events which arrived in
+        the same event loop iteration, event is the last of them. Each
+        template is re-rendered for, and the action is called with, the
+        state change which triggers that template.
+
         track_templates is an optional list of TrackTemplate objects
         to refresh.  If not provided, all tracked templates will be
         considered.
@@ -1237,6 +1522,7 @@ class TrackTemplateResultInfo:
         updates: list[TrackTemplateResult] = []
         info_changed = False
         now = event.time_fired_timestamp if not replayed and event else time.time()
+        action_event = event
 
         block_updates = False
         super_template = self._track_templates[0] if self._has_super_template else None
@@ -1245,11 +1531,14 @@ class TrackTemplateResultInfo:
 
         # Update the super template first
         if super_template is not None:
-            update = self._render_template_if_ready(super_template, now, event)
+            update, template_event = self._render_template_for_events(
+                super_template, now, event, coalesced_events
+            )
             info_changed |= self._apply_update(updates, update, super_template.template)
 
             if isinstance(update, TrackTemplateResult):
                 super_result = update.result
+                action_event = template_event
             else:
                 super_result = self._last_result.get(super_template.template)
 
@@ -1267,7 +1556,7 @@ class TrackTemplateResultInfo:
             ):
                 # Super template changed from not True to True, force re-render
                 # of all templates in the group
-                event = None
+                event = action_event = None
                 track_templates = self._track_templates
 
         # Then update the remaining templates unless blocked by the super template
@@ -1276,10 +1565,14 @@ class TrackTemplateResultInfo:
                 if track_template_ == super_template:
                     continue
 
-                update = self._render_template_if_ready(track_template_, now, event)
+                update, template_event = self._render_template_for_events(
+                    track_template_, now, event, coalesced_events
+                )
                 info_changed |= self._apply_update(
                     updates, update, track_template_.template
                 )
+                if isinstance(update, TrackTemplateResult):
+                    action_event = template_event
 
         if info_changed:
             assert self._track_state_changes
@@ -1309,7 +1602,7 @@ class TrackTemplateResultInfo:
         for track_result in updates:
             self._last_result[track_result.template] = track_result.result
 
-        self.hass.async_run_hass_job(self._job, event, updates)
+        self.hass.async_run_hass_job(self._job, action_event, updates)
 
 
 type TrackTemplateResultListener = Callable[
@@ -1382,6 +1675,22 @@ def async_track_template_result(
     return tracker
 
 
+@callback
+def async_get_template_render_stats(
+    hass: HomeAssistant,
+) -> list[tuple[Template, TemplateRenderStats]]:
+    """Return the render cost of all tracked templates, most expensive first."""
+    return sorted(
+        (
+            (template, stats)
+            for tracker in hass.data.get(_TRACK_TEMPLATE_RESULT_INFOS, ())
+            for template, stats in tracker.render_stats.items()
+        ),
+        key=lambda template_stats: template_stats[1].total_time,
+        reverse=True,
+    )
+
+
 @callback
 @bind_hass
 def async_track_same_state(
@@ -1978,11 +2287,40 @@ def _event_triggers_rerender(
     return bool(info.filter_lifecycle(entity_id))
 
 
+@callback
+def _async_schedule_template_refresh(
+    hass: HomeAssistant, info: TrackTemplateResultInfo
+) -> None:
+    """Schedule refreshing a template tracker for its queued state changes.
+
+    The queued state changes of all trackers are refreshed by a single
+    task in the next event loop iteration.
+    """
+    if (pending := hass.data.get(_TRACK_TEMPLATE_PENDING_REFRESH)) is None:
+        pending = hass.data[_TRACK_TEMPLATE_PENDING_REFRESH] = {}
+        hass.async_create_task_internal(
+            _async_refresh_pending_templates(hass),
+            "track template result refresh",
+            eager_start=False,
+        )
+    pending[info] = None
+
+
+async def _async_refresh_pending_templates(hass: HomeAssistant) -> None:
+    """Refresh the template trackers with queued state changes."""
+    for info in hass.data.pop(_TRACK_TEMPLATE_PENDING_REFRESH):
+        try:
+            info.async_refresh_pending()
+        except Exception:
+            _LOGGER.exception("Error refreshing template tracker %s", info)
+
+
 @callback
 def _rate_limit_for_event(
     event: Event[EventStateChangedData],
     info: RenderInfo,
     track_template_: TrackTemplate,
+    stats: TemplateRenderStats,
 ) -> float | None:
     """Determine the rate limit for an event."""
     # Specifically referenced entities are excluded
@@ -1994,6 +2332,12 @@ def _rate_limit_for_event(
         return track_template_.rate_limit
 
     rate_limit: float | None = info.rate_limit
+    # Slow templates which re-render for whole domains are
+    # limited further based on how long they take to render
+    if (adaptive_rate_limit := stats.adaptive_rate_limit) is not None and (
+        rate_limit is None or adaptive_rate_limit > rate_limit
+    ):
+        return adaptive_rate_limit
     return rate_limit
 
 
@@ -12,9 +12,13 @@ from contextvars import ContextVar
 from copy import deepcopy
 from datetime import date, datetime, time, timedelta
 from functools import cache, lru_cache, partial, wraps
+import hashlib
+from importlib.util import MAGIC_NUMBER
 import json
 import logging
+import marshal
 import math
+import operator
 from operator import contains
 import pathlib
 import random
@@ -22,6 +26,7 @@ import re
 import statistics
 from struct import error as StructError, pack, unpack_from
 import sys
+import threading
 from types import CodeType, TracebackType
 from typing import (
     TYPE_CHECKING,
@@ -58,6 +63,7 @@ from homeassistant.const import (
     STATE_UNAVAILABLE,
     STATE_UNKNOWN,
     UnitOfLength,
+    __version__ as HA_VERSION,
 )
 from homeassistant.core import (
     Context,
@@ -94,6 +100,7 @@ from . import (
 )
 from .deprecation import deprecated_function
 from .singleton import singleton
+from .storage import Store
 from .translation import async_translate_state
 from .typing import TemplateVarsType
 
@@ -114,6 +121,15 @@ _ENVIRONMENT_STRICT: HassKey[TemplateEnvironment] = HassKey(
     "template.environment_strict"
 )
 _HASS_LOADER = "template.hass_loader"
+_BYTECODE_CACHE = "template.bytecode_cache"
+
+BYTECODE_CACHE_STORAGE_KEY = "core.template_bytecode"
+BYTECODE_CACHE_STORAGE_VERSION = 1
+BYTECODE_CACHE_SAVE_DELAY = 60
+# Ad-hoc templates, like those rendered by the developer tools, are new
+# sources on every edit so only the most recently used of the templates
+# no longer in use are kept
+BYTECODE_CACHE_MAX_UNUSED_TEMPLATES = 2000
 
 # Match "simple" ints and floats. -1.0, 1, +5, 5.0
 _IS_NUMERIC = re.compile(r"^[+-]?(?!0\d)\d*(?:\.\d*)?$")
@@ -510,6 +526,7 @@ class Template:
         "_compiled",
         "_compiled_code",
         "_exc_info",
+        "_fast_path",
         "_hash_cache",
         "_limited",
         "_log_fn",
@@ -542,6 +559,7 @@ class Template:
         self.template: str = template.strip()
         self._compiled_code: CodeType | None = None
         self._compiled: jinja2.Template | None = None
+        self._fast_path: _FastPathTemplate | None = None
         self.hass = hass
         self.is_static = not is_template_string(template)
         self._exc_info: OptExcInfo | None = None
@@ -640,7 +658,12 @@ class Template:
             kwargs.update(variables)
 
         try:
-            render_result = _render_with_context(self.template, compiled, **kwargs)
+            if (fast_path := self._fast_path) is not None and (
+                not kwargs or fast_path.names.isdisjoint(kwargs)
+            ):
+                render_result = _render_fast_path_with_context(self.template, fast_path)
+            else:
+                render_result = _render_with_context(self.template, compiled, **kwargs)
         except Exception as err:
             raise TemplateError(err) from err
 
@@ -861,6 +884,8 @@ class Template:
         self._compiled = jinja2.Template.from_code(
             env, self._compiled_code, env.globals, None
         )
+        # Simple templates are evaluated without going through Jinja
+        self._fast_path = _get_fast_path(env, self.template, self._compiled_code)
 
         return self._compiled
 
@@ -2756,6 +2781,309 @@ def _render_with_context(
         return template.render(**kwargs)
 
 
+def _render_fast_path_with_context(
+    template_str: str, fast_path: _FastPathTemplate
+) -> str:
+    """Store template being rendered in a ContextVar to aid error handling."""
+    with _template_context_manager as cm:
+        cm.set_template(template_str, "rendering")
+        return fast_path.render()
+
+
+class _FastPathUnsupported(Exception):
+    """Raised when a template node can not be evaluated by the fast path."""
+
+
+# Globals which are wrapped with hassfunction; the Jinja context they are
+# passed is discarded, so they can be called without one.
+_FAST_PATH_HASS_FUNCTIONS = frozenset(
+    {"has_value", "is_hidden_entity", "is_state", "is_state_attr", "state_attr"}
+)
+_FAST_PATH_BINOPS: dict[type[jinja2.nodes.BinExpr], Callable[[Any, Any], Any]] = {
+    jinja2.nodes.Add: operator.add,
+    jinja2.nodes.Sub: operator.sub,
+    jinja2.nodes.Mul: operator.mul,
+    jinja2.nodes.Div: operator.truediv,
+    jinja2.nodes.FloorDiv: operator.floordiv,
+    jinja2.nodes.Mod: operator.mod,
+}
+_FAST_PATH_COMPARE: dict[str, Callable[[Any, Any], Any]] = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "gt": operator.gt,
+    "gteq": operator.ge,
+    "lt": operator.lt,
+    "lteq": operator.le,
+    "in": lambda left, right: left in right,
+    "notin": lambda left, right: left not in right,
+}
+
+
+class _FastPathTemplate:
+    """A template evaluated directly in Python instead of through Jinja.
+
+    Only a single output block made of constants, calls to state functions,
+    pass-through filters, attribute lookups and simple operators is
+    supported. The result is identical to what Jinja would render since the
+    same global functions and filters of the environment are called.
+    """
+
+    __slots__ = ("_parts", "names")
+
+    def __init__(self, parts: list[Callable[[], str]], names: frozenset[str]) -> None:
+        """Initialize the fast path template."""
+        self._parts = parts
+        # Names which would be shadowed by render variables
+        self.names = names
+
+    def render(self) -> str:
+        """Render the template."""
+        return "".join([part() for part in self._parts])
+
+
+# The output node of the templates the fast path may evaluate, keyed by the
+# code the template compiled to so it does not need to be parsed again
+_FAST_PATH_NODES: weakref.WeakKeyDictionary[CodeType, jinja2.nodes.Output | None] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _fast_path_node(tree: jinja2.nodes.Template) -> jinja2.nodes.Output | None:
+    """Return the output node of a template the fast path may evaluate."""
+    if len(tree.body) != 1 or not isinstance(
+        output := tree.body[0], jinja2.nodes.Output
+    ):
+        return None
+    return output
+
+
+def _dump_fast_path_node(value: Any) -> Any:
+    """Convert a fast path node to a structure marshal can serialize.
+
+    Nodes are converted to a tuple of their type name and fields. The value
+    of a constant is kept as is since the optimizer may fold literals like
+    tuples into one.
+    """
+    if isinstance(value, jinja2.nodes.Const):
+        return ("Const", value.value)
+    if isinstance(value, jinja2.nodes.Node):
+        return (
+            type(value).__name__,
+            *(_dump_fast_path_node(getattr(value, field)) for field in value.fields),
+        )
+    if isinstance(value, list):
+        return [_dump_fast_path_node(item) for item in value]
+    return value
+
+
+def _load_fast_path_node(value: Any) -> Any:
+    """Convert a structure created by _dump_fast_path_node back to a node."""
+    if isinstance(value, tuple):
+        name, *fields = value
+        if name == "Const":
+            return jinja2.nodes.Const(*fields)
+        node_type = getattr(jinja2.nodes, name, None)
+        if not isinstance(node_type, type) or not issubclass(
+            node_type, jinja2.nodes.Node
+        ):
+            raise TypeError(f"Unknown node type {name}")
+        return node_type(*(_load_fast_path_node(field) for field in fields))
+    if isinstance(value, list):
+        return [_load_fast_path_node(item) for item in value]
+    return value
+
+
+def _get_fast_path(
+    env: TemplateEnvironment, source: str, code: CodeType
+) -> _FastPathTemplate | None:
+    """Return the fast path template for compiled template code if possible."""
+    try:
+        output = _FAST_PATH_NODES[code]
+    except KeyError:
+        # Not compiled by a TemplateEnvironment
+        try:
+            output = _fast_path_node(env.parse(source))
+        except jinja2.TemplateError:
+            return None
+        _FAST_PATH_NODES[code] = output
+    if output is None:
+        return None
+    return _compile_fast_path(env, output)
+
+
+def _compile_fast_path(
+    env: TemplateEnvironment, output: jinja2.nodes.Output
+) -> _FastPathTemplate | None:
+    """Compile a template output node to a fast path template if possible."""
+    names: set[str] = set()
+    parts: list[Callable[[], str]] = []
+    try:
+        for node in output.nodes:
+            if isinstance(node, jinja2.nodes.TemplateData):
+                parts.append(partial(str, node.data))
+            else:
+                parts.append(_fast_path_output(_fast_path_expr(env, node, names)))
+    except _FastPathUnsupported:
+        return None
+
+    return _FastPathTemplate(parts, frozenset(names))
+
+
+def _fast_path_output(expr: Callable[[], Any]) -> Callable[[], str]:
+    """Convert the result of an expression to a string like Jinja does."""
+    return lambda: str(expr())
+
+
+def _fast_path_global(env: TemplateEnvironment, name: str) -> Any:
+    """Return a global of the environment usable by the fast path."""
+    value: Any = env.globals.get(name)
+    if value is None:
+        raise _FastPathUnsupported
+    if getattr(value, "jinja_pass_arg", None) is None:
+        return value
+    if name in _FAST_PATH_HASS_FUNCTIONS:
+        return partial(value, None)
+    raise _FastPathUnsupported
+
+
+def _fast_path_call(
+    func: Any,
+    env: TemplateEnvironment,
+    first: Callable[[], Any] | None,
+    args: list[jinja2.nodes.Expr],
+    kwargs: list[Any],
+    names: set[str],
+) -> Callable[[], Any]:
+    """Compile a function or filter call."""
+    if first is None and all(
+        isinstance(node, jinja2.nodes.Const)
+        for node in (*args, *(kw.value for kw in kwargs))
+    ):
+        const_args = [node.value for node in args]  # type: ignore[attr-defined]
+        const_kwargs = {kw.key: kw.value.value for kw in kwargs}
+        return partial(func, *const_args, **const_kwargs)
+
+    arg_exprs = [_fast_path_expr(env, node, names) for node in args]
+    if first is not None:
+        arg_exprs.insert(0, first)
+    kwarg_exprs = {kw.key: _fast_path_expr(env, kw.value, names) for kw in kwargs}
+    return lambda: func(
+        *[arg() for arg in arg_exprs],
+        **{key: value() for key, value in kwarg_exprs.items()},
+    )
+
+
+def _fast_path_expr(
+    env: TemplateEnvironment, node: jinja2.nodes.Node, names: set[str]
+) -> Callable[[], Any]:
+    """Compile a Jinja expression node to a Python callable."""
+    nodes = jinja2.nodes
+
+    if isinstance(node, nodes.Const):
+        value = node.value
+        return lambda: value
+
+    if isinstance(node, nodes.Name):
+        if (value := env.globals.get(node.name)) is None or getattr(
+            value, "jinja_pass_arg", None
+        ) is not None:
+            raise _FastPathUnsupported
+        names.add(node.name)
+        return lambda: value
+
+    if isinstance(node, nodes.Call):
+        if (
+            not isinstance(node.node, nodes.Name)
+            or node.dyn_args is not None
+            or node.dyn_kwargs is not None
+        ):
+            raise _FastPathUnsupported
+        func = _fast_path_global(env, node.node.name)
+        if not callable(func) or not env.is_safe_callable(func):
+            raise _FastPathUnsupported
+        names.add(node.node.name)
+        return _fast_path_call(func, env, None, node.args, node.kwargs, names)
+
+    if isinstance(node, nodes.Filter):
+        if (
+            node.node is None
+            or node.dyn_args is not None
+            or node.dyn_kwargs is not None
+            or (filter_func := env.filters.get(node.name)) is None
+            or getattr(filter_func, "jinja_pass_arg", None) is not None
+        ):
+            raise _FastPathUnsupported
+        value_expr = _fast_path_expr(env, node.node, names)
+        return _fast_path_call(
+            filter_func, env, value_expr, node.args, node.kwargs, names
+        )
+
+    if isinstance(node, nodes.Getattr):
+        obj_expr = _fast_path_expr(env, node.node, names)
+        attr = node.attr
+        return lambda: env.getattr(obj_expr(), attr)
+
+    if isinstance(node, nodes.Getitem):
+        obj_expr = _fast_path_expr(env, node.node, names)
+        arg_expr = _fast_path_expr(env, node.arg, names)
+        return lambda: env.getitem(obj_expr(), arg_expr())
+
+    if isinstance(node, nodes.BinExpr):
+        left = _fast_path_expr(env, node.left, names)
+        right = _fast_path_expr(env, node.right, names)
+        if isinstance(node, nodes.And):
+            return lambda: left() and right()
+        if isinstance(node, nodes.Or):
+            return lambda: left() or right()
+        if (binop := _FAST_PATH_BINOPS.get(type(node))) is None:
+            raise _FastPathUnsupported
+        return lambda: binop(left(), right())
+
+    if isinstance(node, nodes.Not):
+        operand = _fast_path_expr(env, node.node, names)
+        return lambda: not operand()
+
+    if isinstance(node, nodes.Neg):
+        operand = _fast_path_expr(env, node.node, names)
+        return lambda: -operand()
+
+    if isinstance(node, nodes.Compare):
+        first = _fast_path_expr(env, node.expr, names)
+        ops = [
+            (_FAST_PATH_COMPARE[operand.op], _fast_path_expr(env, operand.expr, names))
+            for operand in node.ops
+        ]
+
+        def _compare() -> Any:
+            # Mirror chained comparisons, a < b < c is (a < b) and (b < c)
+            left = first()
+            for compare_op, right_expr in ops:
+                right = right_expr()
+                if not (result := compare_op(left, right)):
+                    return result
+                left = right
+            return result
+
+        return _compare
+
+    if isinstance(node, (nodes.List, nodes.Tuple)):
+        items = [_fast_path_expr(env, item, names) for item in node.items]
+        container = list if isinstance(node, nodes.List) else tuple
+        return lambda: container([item() for item in items])
+
+    if isinstance(node, nodes.Concat):
+        exprs = [_fast_path_expr(env, child, names) for child in node.nodes]
+        return lambda: "".join([str(expr()) for expr in exprs])
+
+    if isinstance(node, nodes.CondExpr) and node.expr2 is not None:
+        test = _fast_path_expr(env, node.test, names)
+        expr1 = _fast_path_expr(env, node.expr1, names)
+        expr2 = _fast_path_expr(env, node.expr2, names)
+        return lambda: expr1() if test() else expr2()
+
+    raise _FastPathUnsupported
+
+
 def make_logging_undefined(
     strict: bool | None, log_fn: Callable[[int, str], None] | None
 ) -> type[jinja2.Undefined]:
@@ -2812,6 +3140,7 @@ async def async_load_custom_templates(hass: HomeAssistant) -> None:
     """Load all custom jinja files under 5MiB into memory."""
     custom_templates = await hass.async_add_executor_job(_load_custom_templates, hass)
     _get_hass_loader(hass).sources = custom_templates
+    await async_get_bytecode_cache(hass).async_load(custom_templates)
 
 
 def _load_custom_templates(hass: HomeAssistant) -> dict[str, str]:
@@ -2834,6 +3163,191 @@ def _get_hass_loader(hass: HomeAssistant) -> HassLoader:
     return HassLoader({})
 
 
+@callback
+@singleton(_BYTECODE_CACHE)
+def async_get_bytecode_cache(hass: HomeAssistant) -> TemplateBytecodeCache:
+    """Return the template bytecode cache."""
+    return TemplateBytecodeCache(hass)
+
+
+class TemplateBytecodeCache:
+    """Compiled template code persisted across restarts.
+
+    Code is keyed by a hash of the template source and the variant of the
+    environment that compiled it. The whole cache is
+    dropped when the Home Assistant, Python or Jinja version changes or
+    when the custom templates change. All templates compiled or used
+    since the last restart whose code is still in use are saved, of
+    those no longer in use only the most recently used are saved so
+    ad-hoc templates do not accumulate.
+
+    Templates are also compiled in executor threads, so the state is only
+    changed while holding the lock.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the bytecode cache."""
+        self._hass = hass
+        self._store = Store[dict[str, Any]](
+            hass, BYTECODE_CACHE_STORAGE_VERSION, BYTECODE_CACHE_STORAGE_KEY
+        )
+        self._cache_key: str | None = None
+        self._stored: dict[str, tuple[str, str | None]] = {}
+        # Ordered by last use, the code of templates in use is kept alive
+        # by their Template objects
+        self._used: dict[str, tuple[str, str | None]] = {}
+        self._live: weakref.WeakValueDictionary[str, CodeType] = (
+            weakref.WeakValueDictionary()
+        )
+        self._save_scheduled = False
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float | None:
+        """Return the share of compiles that were served from the cache."""
+        if not (total := self.hits + self.misses):
+            return None
+        return self.hits / total
+
+    async def async_load(self, custom_templates: dict[str, str]) -> None:
+        """Load the cache, dropping it if it is no longer valid."""
+        custom_hash = hashlib.sha256(
+            json.dumps(custom_templates, sort_keys=True).encode()
+        ).hexdigest()
+        cache_key = f"{HA_VERSION}-{MAGIC_NUMBER.hex()}-{jinja2.__version__}"
+        cache_key = f"{cache_key}-{custom_hash}"
+        if self._cache_key is None:
+            data = await self._store.async_load()
+            with self._lock:
+                if data and data.get("cache_key") == cache_key:
+                    self._stored = data["templates"]
+                self._cache_key = cache_key
+        elif self._cache_key != cache_key:
+            # Custom templates were reloaded and changed
+            with self._lock:
+                self._stored = {}
+                self._used = {}
+                self._live = weakref.WeakValueDictionary()
+                self._cache_key = cache_key
+            self._async_schedule_save()
+
+    def get(
+        self, source: str, variant: str
+    ) -> tuple[CodeType, jinja2.nodes.Output | None] | None:
+        """Return the cached code for a template source.
+
+        The code is returned together with the output node of the template
+        if it consists of a single output block the fast path may evaluate.
+        """
+        if self._cache_key is None:
+            return None
+        key = _bytecode_cache_key(source, variant)
+        with self._lock:
+            if (cached := self._used.get(key) or self._stored.pop(key, None)) is None:
+                self.misses += 1
+                return None
+        try:
+            encoded, encoded_node = cached
+            code = marshal.loads(base64.b64decode(encoded))
+            fast_path_node = (
+                _load_fast_path_node(marshal.loads(base64.b64decode(encoded_node)))
+                if encoded_node is not None
+                else None
+            )
+        except (ValueError, EOFError, TypeError):
+            with self._lock:
+                self._stored.pop(key, None)
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+            self._live[key] = code
+            if key in self._used:
+                self._used[key] = self._used.pop(key)
+                return code, fast_path_node
+            self._add_used(key, cached)
+        self._schedule_save()
+        return code, fast_path_node
+
+    def set(
+        self,
+        source: str,
+        variant: str,
+        code: CodeType,
+        fast_path_node: jinja2.nodes.Output | None,
+    ) -> None:
+        """Store the compiled code and fast path node for a template source."""
+        if self._cache_key is None:
+            return
+        key = _bytecode_cache_key(source, variant)
+        try:
+            encoded = base64.b64encode(marshal.dumps(code)).decode()
+            encoded_node = (
+                base64.b64encode(
+                    marshal.dumps(_dump_fast_path_node(fast_path_node))
+                ).decode()
+                if fast_path_node is not None
+                else None
+            )
+        except ValueError:
+            # A constant that can not be serialized
+            return
+        with self._lock:
+            self._live[key] = code
+            self._used.pop(key, None)
+            self._add_used(key, (encoded, encoded_node))
+        self._schedule_save()
+
+    def _add_used(self, key: str, cached: tuple[str, str | None]) -> None:
+        """Add a used template, the lock must be held.
+
+        The templates no longer in use are only pruned once there are twice
+        as many as are kept, so adding a template is amortized constant time.
+        """
+        used = self._used
+        used[key] = cached
+        if len(used) - len(self._live) > 2 * BYTECODE_CACHE_MAX_UNUSED_TEMPLATES:
+            self._used = self._used_to_keep()
+
+    def _used_to_keep(self) -> dict[str, tuple[str, str | None]]:
+        """Return the templates in use and the most recently used others."""
+        live = self._live
+        unused_keys = [key for key in self._used if key not in live]
+        drop = set(
+            unused_keys[: max(len(unused_keys) - BYTECODE_CACHE_MAX_UNUSED_TEMPLATES, 0)]
+        )
+        return {key: value for key, value in self._used.items() if key not in drop}
+
+    def _schedule_save(self) -> None:
+        """Schedule saving the cache, compiles may happen outside the loop."""
+        with self._lock:
+            if self._save_scheduled:
+                return
+            self._save_scheduled = True
+        self._hass.loop.call_soon_threadsafe(self._async_schedule_save)
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Schedule saving the cache."""
+        self._store.async_delay_save(self._data_to_save, BYTECODE_CACHE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to save."""
+        with self._lock:
+            self._save_scheduled = False
+            return {"cache_key": self._cache_key, "templates": self._used_to_keep()}
+
+
+def _bytecode_cache_key(source: str, variant: str) -> str:
+    """Return the key for a template source compiled by an environment variant."""
+    return hashlib.blake2b(
+        source.encode(), digest_size=16, person=variant.encode()
+    ).hexdigest()
+
+
 class HassLoader(jinja2.BaseLoader):
     """An in-memory jinja loader that keeps track of templates that need to be reloaded."""
 
@@ -2875,6 +3389,8 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
         """Initialise template environment."""
         super().__init__(undefined=make_logging_undefined(strict, log_fn))
         self.hass = hass
+        # Limited and strict environments compile templates differently
+        self.bytecode_cache_variant = f"{bool(limited):d}{bool(strict):d}"
         self.template_cache: weakref.WeakValueDictionary[
             str | jinja2.nodes.Template, CodeType | None
         ] = weakref.WeakValueDictionary()
@@ -3166,7 +3682,7 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
         self.globals["today_at"] = hassfunction(today_at)
         self.filters["today_at"] = self.globals["today_at"]
 
-    def is_safe_callable(self, obj):
+    def is_safe_callable(self, obj: Any) -> bool:
         """Test if callback is safe."""
         return isinstance(
             obj, (AllStates, StateTranslated)
@@ -3230,8 +3746,34 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
                 defer_init,
             )
 
-        compiled = super().compile(source)
+        if not isinstance(source, str):
+            compiled = super().compile(source)
+            self.template_cache[source] = compiled
+            return compiled
+
+        bytecode_cache: TemplateBytecodeCache | None = None
+        if self.hass is not None:
+            bytecode_cache = async_get_bytecode_cache(self.hass)
+            if (
+                cached := bytecode_cache.get(source, self.bytecode_cache_variant)
+            ) is not None:
+                compiled, fast_path_node = cached
+                _FAST_PATH_NODES.setdefault(compiled, fast_path_node)
+                self.template_cache[source] = compiled
+                return compiled
+
+        # Parse once for both the compiled code and the fast path
+        tree = self.parse(source)
+        compiled = super().compile(tree)
+        fast_path_node = _FAST_PATH_NODES[compiled] = _fast_path_node(tree)
         self.template_cache[source] = compiled
+        if bytecode_cache is not None:
+            bytecode_cache.set(
+                source,
+                self.bytecode_cache_variant,
+                compiled,
+                fast_path_node,
+            )
         return compiled
 
 
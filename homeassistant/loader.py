@@ -29,7 +29,7 @@ from propcache.api import cached_property
 import voluptuous as vol
 
 from . import generated
-from .const import Platform
+from .const import Platform, __version__ as HA_VERSION
 from .core import HomeAssistant, callback
 from .generated.application_credentials import APPLICATION_CREDENTIALS
 from .generated.bluetooth import BLUETOOTH
@@ -133,6 +133,13 @@ DATA_CUSTOM_COMPONENTS: HassKey[
     dict[str, Integration] | asyncio.Future[dict[str, Integration]]
 ] = HassKey("custom_components")
 DATA_PRELOAD_PLATFORMS: HassKey[list[str]] = HassKey("preload_platforms")
+DATA_MANIFEST_CACHE: HassKey[ManifestCache] = HassKey("manifest_cache")
+# The time it took to import each component and platform module
+DATA_IMPORT_TIMES: HassKey[dict[str, float]] = HassKey("import_times")
+# The manifests of the built-in integrations are cached in this store
+MANIFEST_CACHE_STORAGE_KEY = "core.manifest_cache"
+MANIFEST_CACHE_STORAGE_VERSION = 1
+MANIFEST_CACHE_SAVE_DELAY = 60
 PACKAGE_CUSTOM_COMPONENTS = "custom_components"
 PACKAGE_BUILTIN = "homeassistant.components"
 CUSTOM_WARNING = (
@@ -271,6 +278,69 @@ def async_setup(hass: HomeAssistant) -> None:
     hass.data[DATA_INTEGRATIONS] = {}
     hass.data[DATA_MISSING_PLATFORMS] = {}
     hass.data[DATA_PRELOAD_PLATFORMS] = BASE_PRELOAD_PLATFORMS.copy()
+    hass.data[DATA_IMPORT_TIMES] = {}
+    # The manifests can change without a version bump in a development
+    # checkout, so they are only cached by releases
+    if "dev" not in HA_VERSION:
+        hass.data[DATA_MANIFEST_CACHE] = ManifestCache(hass)
+
+
+class ManifestCache:
+    """Cache of the manifests and the top level files of built-in integrations.
+
+    The cache is a single file which replaces reading the manifest and
+    listing the directory of every built-in integration when Home Assistant
+    starts. It is keyed by the version of Home Assistant and the location
+    of the built-in integrations, so it is discarded on upgrades.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cache."""
+        from .helpers.storage import Store  # pylint: disable=import-outside-toplevel
+
+        self._store: Store[dict[str, Any]] = Store(
+            hass, MANIFEST_CACHE_STORAGE_VERSION, MANIFEST_CACHE_STORAGE_KEY
+        )
+        self.key = f"{HA_VERSION}:{pathlib.Path(__file__).parent / 'components'}"
+        self.entries: dict[str, dict[str, Any]] = {}
+        self.dirty = False
+        self._loaded = False
+
+    async def async_load(self) -> None:
+        """Load the cache from the store once."""
+        if self._loaded:
+            return
+        data = await self._store.async_load()
+        # Concurrent loads share the data of the first one
+        if not self._loaded:
+            self._loaded = True
+            if isinstance(data, dict) and data.get("key") == self.key:
+                self.entries = cast(dict[str, dict[str, Any]], data["integrations"])
+
+    def add(self, integration: Integration) -> None:
+        """Add a resolved integration to the cache.
+
+        This may be called from an executor, the cache is saved
+        by async_schedule_save.
+        """
+        self.entries[integration.domain] = {
+            "file_path": str(integration.file_path),
+            "manifest": integration.manifest,
+            "files": sorted(integration._top_level_files),  # noqa: SLF001
+        }
+        self.dirty = True
+
+    @callback
+    def async_schedule_save(self) -> None:
+        """Schedule saving the cache if integrations were added."""
+        if not self.dirty:
+            return
+        self.dirty = False
+        self._store.async_delay_save(self._data_to_save, MANIFEST_CACHE_SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data of the cache to save."""
+        return {"key": self.key, "integrations": self.entries.copy()}
 
 
 def manifest_from_legacy_module(domain: str, module: ModuleType) -> Manifest:
@@ -770,6 +840,7 @@ class Integration:
         self._import_futures: dict[str, asyncio.Future[ModuleType]] = {}
         self._cache = hass.data[DATA_COMPONENTS]
         self._missing_platforms_cache = hass.data[DATA_MISSING_PLATFORMS]
+        self._import_times = hass.data[DATA_IMPORT_TIMES]
         self._top_level_files = top_level_files or set()
         _LOGGER.info("Loaded %s from %s", self.domain, pkg_path)
 
@@ -1071,9 +1142,7 @@ class Integration:
         cache = self._cache
         domain = self.domain
         try:
-            cache[domain] = cast(
-                ComponentProtocol, importlib.import_module(self.pkg_path)
-            )
+            cache[domain] = cast(ComponentProtocol, self._import_module(self.pkg_path))
         except ImportError:
             raise
         except RuntimeError as err:
@@ -1301,7 +1370,20 @@ class Integration:
         This method must be thread-safe as it's called from the executor
         and the event loop.
         """
-        return importlib.import_module(f"{self.pkg_path}.{platform_name}")
+        return self._import_module(f"{self.pkg_path}.{platform_name}")
+
+    def _import_module(self, name: str) -> ModuleType:
+        """Import a module and record how long it took if it was not imported yet.
+
+        This method must be thread-safe as it's called from the executor
+        and the event loop.
+        """
+        if name in sys.modules:
+            return importlib.import_module(name)
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        self._import_times[name] = time.perf_counter() - start
+        return module
 
     def __repr__(self) -> str:
         """Text representation of class."""
@@ -1338,6 +1420,35 @@ def _resolve_integrations_from_root(
     return integrations
 
 
+def _resolve_built_in_integrations(
+    hass: HomeAssistant, root_module: ModuleType, domains: Iterable[str]
+) -> dict[str, Integration]:
+    """Resolve built-in integrations from the manifest cache or from root."""
+    if (cache := hass.data.get(DATA_MANIFEST_CACHE)) is None:
+        return _resolve_integrations_from_root(hass, root_module, domains)
+    integrations: dict[str, Integration] = {}
+    not_cached: list[str] = []
+    for domain in domains:
+        if (entry := cache.entries.get(domain)) is None:
+            not_cached.append(domain)
+            continue
+        integration = integrations[domain] = Integration(
+            hass,
+            f"{root_module.__name__}.{domain}",
+            pathlib.Path(entry["file_path"]),
+            cast(Manifest, dict(entry["manifest"])),
+            set(entry["files"]),
+        )
+        if not integration.import_executor:
+            _LOGGER.warning(IMPORT_EVENT_LOOP_WARNING, integration.domain)
+    if not_cached:
+        resolved = _resolve_integrations_from_root(hass, root_module, not_cached)
+        for integration in resolved.values():
+            cache.add(integration)
+        integrations.update(resolved)
+    return integrations
+
+
 @callback
 def async_get_loaded_integration(hass: HomeAssistant, domain: str) -> Integration:
     """Get an integration which is already loaded.
@@ -1415,9 +1526,13 @@ async def async_get_integrations(
     if needed:
         from . import components  # pylint: disable=import-outside-toplevel
 
+        if (manifest_cache := hass.data.get(DATA_MANIFEST_CACHE)) is not None:
+            await manifest_cache.async_load()
         integrations = await hass.async_add_executor_job(
-            _resolve_integrations_from_root, hass, components, needed
+            _resolve_built_in_integrations, hass, components, needed
         )
+        if manifest_cache is not None:
+            manifest_cache.async_schedule_save()
         for domain, future in needed.items():
             int_or_exc = integrations.get(domain)
             if not int_or_exc:
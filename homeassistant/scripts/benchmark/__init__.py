@@ -8,10 +8,14 @@ from collections.abc import Callable
 from contextlib import suppress
 import logging
 from timeit import default_timer as timer
+from typing import Any
 
 from homeassistant import core
 from homeassistant.const import EVENT_STATE_CHANGED
-from homeassistant.helpers.entityfilter import convert_include_exclude_filter
+from homeassistant.helpers.entityfilter import (
+    INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA,
+    convert_include_exclude_filter,
+)
 from homeassistant.helpers.event import (
     async_track_state_change,
     async_track_state_change_event,
@@ -22,6 +26,8 @@ from homeassistant.helpers.json import JSON_DUMP
 # mypy: no-warn-return-any
 
 BENCHMARKS: dict[str, Callable] = {}
+# Database the recorder benchmarks insert into, set with --db-url
+RECORDER_DB_URL: dict[str, str] = {"url": "sqlite://"}
 
 
 def run(args):
@@ -32,8 +38,15 @@ def run(args):
     parser = argparse.ArgumentParser(description="Run a Home Assistant benchmark.")
     parser.add_argument("name", choices=BENCHMARKS)
     parser.add_argument("--script", choices=["benchmark"])
+    parser.add_argument(
+        "--db-url",
+        default=RECORDER_DB_URL["url"],
+        help="Empty database used by the recorder benchmarks, the bulk insert "
+        "is only supported on PostgreSQL and MariaDB",
+    )
 
     args = parser.parse_args()
+    RECORDER_DB_URL["url"] = args.db_url
 
     bench = BENCHMARKS[args.name]
     print("Using event loop:", asyncio.get_event_loop_policy().loop_name)
@@ -288,6 +301,27 @@ async def filtering_entity_id(hass: core.HomeAssistant) -> float:
     return timer() - start
 
 
+@benchmark
+async def state_set_changed_attributes(hass: core.HomeAssistant) -> float:
+    """Set 1000 sensors a hundred times with a changed attribute."""
+    entity_ids = [f"sensor.power_{idx}" for idx in range(1000)]
+    start = timer()
+    for value in range(100):
+        for entity_id in entity_ids:
+            hass.states.async_set(
+                entity_id,
+                str(value),
+                {
+                    "state_class": "measurement",
+                    "unit_of_measurement": "W",
+                    "device_class": "power",
+                    "friendly_name": entity_id,
+                    "last_value": value,
+                },
+            )
+    return timer() - start
+
+
 @benchmark
 async def valid_entity_id(hass: core.HomeAssistant) -> float:
     """Run valid entity ID a million times."""
@@ -308,3 +342,149 @@ async def json_serialize_states(hass: core.HomeAssistant) -> float:
     start = timer()
     JSON_DUMP(states)
     return timer() - start
+
+
+@benchmark
+async def subscribe_entities_fan_out(hass: core.HomeAssistant) -> float:
+    """Fan out 10k state changes to 60 subscribe_entities connections.
+
+    The connections use 6 different entity filters, like wall tablets
+    showing different dashboards.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.auth.models import User
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.websocket_api.entity_changes import (
+        async_get_entity_changes_hub,
+        subscription_filter_key,
+    )
+
+    clients = 60
+    state_changes = 10**4
+    domains = ["light", "switch", "sensor", "binary_sensor", "cover", "climate"]
+    user = User(
+        name="Benchmark",
+        # Owners never need the permission lookup
+        perm_lookup=None,  # type: ignore[arg-type]
+        is_owner=True,
+        is_active=True,
+    )
+    hub = async_get_entity_changes_hub(hass)
+    sent = 0
+
+    def send_message(message, message_id_as_bytes, event):
+        """Count sent messages."""
+        nonlocal sent
+        sent += 1
+
+    for idx in range(clients):
+        filter_conf = INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA(
+            {"include": {"domains": domains[idx % 6 : idx % 6 + 3]}}
+        )
+        hub.async_subscribe(
+            send_message,
+            user,
+            b"3",
+            None,
+            convert_include_exclude_filter(filter_conf),
+            subscription_filter_key(None, filter_conf),
+        )
+
+    entity_ids = [f"{domain}.entity_{idx}" for domain in domains for idx in range(20)]
+    for entity_id in entity_ids:
+        hass.states.async_set(entity_id, "0")
+    await hass.async_block_till_done()
+    sent = 0
+
+    start = timer()
+
+    for idx in range(state_changes):
+        hass.states.async_set(entity_ids[idx % len(entity_ids)], str(idx))
+    await hass.async_block_till_done()
+
+    assert sent > 0
+
+    return timer() - start
+
+
+def _insert_recorder_states(bulk: bool) -> float:
+    """Insert 20k states of 100 entities in commits of 200 states."""
+    # pylint: disable=import-outside-toplevel
+    from sqlalchemy import create_engine, inspect
+    from sqlalchemy.orm import Session
+
+    from homeassistant.components.recorder.bulk_insert import BulkInsert, PendingState
+    from homeassistant.components.recorder.db_schema import (
+        Base,
+        StateAttributes,
+        States,
+        StatesMeta,
+    )
+
+    # pylint: enable=import-outside-toplevel
+
+    state_changes = 2 * 10**4
+    commit_interval = 200
+    engine = create_engine(RECORDER_DB_URL["url"])
+    if inspect(engine).has_table(States.__tablename__):
+        engine.dispose()
+        raise ValueError("The recorder benchmarks need an empty database")
+    Base.metadata.create_all(engine)
+    session = Session(engine, expire_on_commit=False)
+    entity_ids = [f"sensor.entity_{idx}" for idx in range(100)]
+    states_meta = [StatesMeta(entity_id=entity_id) for entity_id in entity_ids]
+    state_attributes = StateAttributes(shared_attrs="{}", hash=0)
+    session.add_all([*states_meta, state_attributes])
+    session.commit()
+    bulk_insert = BulkInsert()
+    old_states: dict[int, Any] = {}
+    context = core.Context()
+
+    start = timer()
+
+    for idx in range(state_changes):
+        entity_idx = idx % 100
+        state = core.State(entity_ids[entity_idx], str(idx), context=context)
+        event = core.Event[core.EventStateChangedData](
+            EVENT_STATE_CHANGED,
+            {"entity_id": state.entity_id, "old_state": None, "new_state": state},
+            context=context,
+        )
+        if bulk:
+            dbstate: Any = PendingState(event)
+        else:
+            dbstate = States.from_event(event)
+        if (old_state := old_states.get(entity_idx)) is not None:
+            if old_state.state_id is None:
+                dbstate.old_state = old_state
+            else:
+                dbstate.old_state_id = old_state.state_id
+        old_states[entity_idx] = dbstate
+        dbstate.metadata_id = states_meta[entity_idx].metadata_id
+        dbstate.attributes_id = state_attributes.attributes_id
+        if bulk:
+            bulk_insert.add_state(dbstate)
+        else:
+            session.add(dbstate)
+        if idx % commit_interval == commit_interval - 1:
+            bulk_insert.flush(session)
+            session.commit()
+
+    elapsed = timer() - start
+    session.close()
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+    return elapsed
+
+
+@benchmark
+async def recorder_insert_states_orm(hass: core.HomeAssistant) -> float:
+    """Insert 20k recorder states with the ORM unit of work."""
+    return await hass.async_add_executor_job(_insert_recorder_states, False)
+
+
+@benchmark
+async def recorder_insert_states_bulk(hass: core.HomeAssistant) -> float:
+    """Insert 20k recorder states in bulk."""
+    return await hass.async_add_executor_job(_insert_recorder_states, True)
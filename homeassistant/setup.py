@@ -822,6 +822,16 @@ def async_get_setup_timings(hass: core.HomeAssistant) -> dict[str, float]:
     return domain_timings
 
 
+@callback
+def async_get_import_timings(hass: core.HomeAssistant) -> dict[str, float]:
+    """Return the time it took to import each component and platform module.
+
+    The time of a module includes the modules it imported which were
+    not imported yet, like its requirements.
+    """
+    return hass.data[loader.DATA_IMPORT_TIMES].copy()
+
+
 @callback
 def async_get_domain_setup_times(
     hass: core.HomeAssistant, domain: str
@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable, Iterator
+from collections.abc import Callable, Generator, Iterator
+from contextlib import contextmanager
 import fnmatch
 from io import StringIO, TextIOWrapper
 import logging
 import os
 from pathlib import Path
+import threading
 from typing import Any, TextIO, overload
 
 import yaml
@@ -35,11 +37,98 @@ JSON_TYPE = list | dict | str
 
 _LOGGER = logging.getLogger(__name__)
 
+# The total size of the source of the YAML files whose node trees are cached
+NODE_CACHE_MAX_SOURCE_SIZE = 1024 * 1024
+
 
 class YamlTypeError(HomeAssistantError):
     """Raised by load_yaml_dict if top level data is not a dict."""
 
 
+class _NodeCache:
+    """Cache the composed YAML node trees of the configuration files.
+
+    Composing the node tree is the expensive part of loading a YAML file.
+    Tags like !include and !secret are resolved when the document is
+    constructed, so a cached node tree is still valid if only a file it
+    references changed.
+
+    A node tree takes roughly 40 times the size of its source in memory, so
+    the cache is bounded by the size of the source of the cached files.
+    When it is full, the files the latest load of a configuration did not
+    visit are evicted. If that is not enough the file is not cached, rather
+    than evicting a file of the configuration which is being loaded. Loading
+    a configuration larger than the cache composes the files which did not
+    fit every time, while the files which did fit stay cached. A file which
+    is no longer part of the configuration is only evicted once the cache
+    is full, and after a load which did not visit it.
+    """
+
+    def __init__(self, max_source_size: int) -> None:
+        """Initialize the node cache."""
+        self._max_source_size = max_source_size
+        self._source_size = 0
+        self._nodes: dict[str, tuple[tuple[int, int, int], yaml.Node]] = {}
+        self._latest_load: set[str] = set()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def load(self, name: str) -> Generator[None]:
+        """Track the files visited by a load of a configuration.
+
+        Files included while loading a file are part of the same load.
+        """
+        visited: set[str] | None = getattr(self._local, "visited", None)
+        if visited is not None:
+            visited.add(name)
+            yield
+            return
+        visited = self._local.visited = {name}
+        try:
+            yield
+        finally:
+            self._local.visited = None
+        with self._lock:
+            self._latest_load = visited
+
+    def get(self, name: str, key: tuple[int, int, int]) -> yaml.Node | None:
+        """Return the node tree of a file if it did not change."""
+        with self._lock:
+            if (cached := self._nodes.get(name)) is None or cached[0] != key:
+                return None
+            return cached[1]
+
+    def add(self, name: str, key: tuple[int, int, int], node: yaml.Node) -> None:
+        """Add or replace the node tree of a file if it fits in the cache."""
+        size = key[1]
+        visited: set[str] = getattr(self._local, "visited", None) or set()
+        with self._lock:
+            self._remove(name)
+            if self._source_size + size > self._max_source_size:
+                keep = self._latest_load | visited
+                for evicted in [file for file in self._nodes if file not in keep]:
+                    self._remove(evicted)
+            if self._source_size + size > self._max_source_size:
+                _LOGGER.debug("Not caching %s, the YAML node cache is full", name)
+                return
+            self._nodes[name] = (key, node)
+            self._source_size += size
+
+    def discard(self, name: str) -> None:
+        """Remove the node tree of a file which no longer exists."""
+        with self._lock:
+            self._remove(name)
+
+    def _remove(self, name: str) -> None:
+        """Remove the node tree of a file, the lock must be held."""
+        if (cached := self._nodes.pop(name, None)) is not None:
+            self._source_size -= cached[0][1]
+
+
+_NODE_CACHE = _NodeCache(NODE_CACHE_MAX_SOURCE_SIZE)
+
+
 class Secrets:
     """Store secrets while loading YAML."""
 
@@ -162,19 +251,72 @@ def load_yaml(
 
     If opening the file raises an OSError it will be wrapped in a HomeAssistantError,
     except for FileNotFoundError which will be re-raised.
+
+    The files of the configuration, which are loaded with secrets, are
+    only composed again if they changed or did not fit in the node cache.
     """
     try:
-        with open(fname, encoding="utf-8") as conf_file:
-            return parse_yaml(conf_file, secrets)
+        if secrets is None:
+            with open(fname, encoding="utf-8") as conf_file:
+                return parse_yaml(conf_file, secrets)
+        with (
+            _NODE_CACHE.load(os.fspath(fname)),
+            open(fname, encoding="utf-8") as conf_file,
+        ):
+            return _load_yaml_file(conf_file, secrets)
     except UnicodeDecodeError as exc:
         _LOGGER.error("Unable to read file %s: %s", fname, exc)
         raise HomeAssistantError(exc) from exc
     except FileNotFoundError:
+        if secrets is not None:
+            _NODE_CACHE.discard(os.fspath(fname))
         raise
     except OSError as exc:
         raise HomeAssistantError(exc) from exc
 
 
+def _load_yaml_file(conf_file: TextIO, secrets: Secrets) -> JSON_TYPE | None:
+    """Load an opened YAML file, composing it only if it changed."""
+    if not isinstance(conf_file, TextIOWrapper):
+        # Not backed by a file we can validate the cache against
+        return parse_yaml(conf_file, secrets)
+    stat = os.fstat(conf_file.fileno())
+    name: str = conf_file.name
+    key = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    try:
+        if (node := _NODE_CACHE.get(name, key)) is not None:
+            return _construct_yaml(node, name, secrets)
+        _LOGGER.debug("Parsing %s", name)
+        loader = FastSafeLoader(conf_file, secrets)
+        try:
+            if (node := loader.get_single_node()) is None:
+                return None
+            data = loader.construct_document(node)
+        finally:
+            loader.dispose()
+    except yaml.YAMLError:
+        # Let the Python loader raise a more readable exception
+        conf_file.seek(0, 0)
+        return parse_yaml(conf_file, secrets)
+    # Constructing the document flattens merge keys in place, so only add
+    # the node tree once that is done and later constructions don't modify it
+    _NODE_CACHE.add(name, key, node)
+    return data
+
+
+def _construct_yaml(
+    node: yaml.Node, name: str, secrets: Secrets | None
+) -> JSON_TYPE | None:
+    """Construct a document from a cached node tree."""
+    stream = StringIO()
+    stream.name = name
+    loader = FastSafeLoader(stream, secrets)
+    try:
+        return loader.construct_document(node)
+    finally:
+        loader.dispose()
+
+
 def load_yaml_dict(
     fname: str | os.PathLike[str], secrets: Secrets | None = None
 ) -> dict:
@@ -1,15 +1,23 @@
 """The tests the History component websocket_api."""
 
+from array import array
 import asyncio
+from base64 import b64decode
+from contextlib import suppress
 from datetime import timedelta
+import math
+from pathlib import Path
+import sys
+from typing import Any
 from unittest.mock import ANY, patch
 
 from freezegun import freeze_time
 import pytest
 
 from homeassistant.components import history
-from homeassistant.components.history import websocket_api
-from homeassistant.components.recorder import Recorder
+from homeassistant.components.history import columnar, websocket_api
+from homeassistant.components.recorder import CONF_DB_READER_URL, Recorder
+from homeassistant.components.recorder.const import SQLITE_URL_PREFIX
 from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE, STATE_OFF, STATE_ON
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.event import async_track_state_change_event
@@ -20,8 +28,9 @@ from tests.common import async_fire_time_changed
 from tests.components.recorder.common import (
     async_recorder_block_till_done,
     async_wait_recording_done,
+    copy_sqlite_database,
 )
-from tests.typing import WebSocketGenerator
+from tests.typing import RecorderInstanceGenerator, WebSocketGenerator
 
 
 def listeners_without_writes(listeners: dict[str, int]) -> dict[str, int]:
@@ -39,6 +48,336 @@ def test_setup() -> None:
     # Verification occurs in the fixture
 
 
+@pytest.mark.parametrize("minimal_response", [True, False])
+async def test_history_during_period_chunked(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    hass_ws_client: WebSocketGenerator,
+    minimal_response: bool,
+) -> None:
+    """Test history_during_period sends the same states in chunks."""
+    now = dt_util.utcnow()
+
+    await async_setup_component(hass, "history", {})
+    await async_recorder_block_till_done(hass)
+    for idx in range(7):
+        hass.states.async_set("sensor.one", str(idx // 2), {"idx": idx})
+        hass.states.async_set("light.two", "on" if idx % 2 else "off", {"idx": idx})
+        await async_recorder_block_till_done(hass)
+    await async_wait_recording_done(hass)
+
+    client = await hass_ws_client()
+    request = {
+        "type": "history/history_during_period",
+        "start_time": now.isoformat(),
+        "entity_ids": ["sensor.one", "light.two"],
+        "significant_changes_only": False,
+        "minimal_response": minimal_response,
+    }
+    await client.send_json_auto_id(request)
+    response = await client.receive_json()
+    assert response["success"]
+    expected = response["result"]
+    assert len(expected["sensor.one"]) > 3
+
+    with patch.object(websocket_api, "HISTORY_CHUNK_STATES", 3):
+        await client.send_json_auto_id({**request, "chunked": True})
+        chunked: dict[str, list] = {}
+        events = 0
+        while True:
+            response = await client.receive_json()
+            if response["type"] == "result":
+                break
+            events += 1
+            for entity_id, states in response["event"].items():
+                chunked.setdefault(entity_id, []).extend(states)
+        assert response["success"]
+        for entity_id, states in response["result"].items():
+            chunked.setdefault(entity_id, []).extend(states)
+
+    assert events > 1
+    assert chunked == expected
+
+
+@pytest.mark.parametrize("close_connection", [True, False])
+async def test_history_during_period_chunked_client_not_reading(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    hass_ws_client: WebSocketGenerator,
+    close_connection: bool,
+) -> None:
+    """Test the chunked history stops reading when the client does not read it."""
+    now = dt_util.utcnow()
+
+    await async_setup_component(hass, "history", {})
+    await async_recorder_block_till_done(hass)
+    for idx in range(10):
+        hass.states.async_set("sensor.one", str(idx))
+        await async_recorder_block_till_done(hass)
+    await async_wait_recording_done(hass)
+
+    stream_significant_states = websocket_api._ws_stream_significant_states
+    sent: list[bool] = []
+    done = asyncio.Event()
+
+    def _ws_stream_significant_states(hass, msg_id, send_chunk, *args) -> None:
+        def _send_chunk(chunk: bytes | None) -> bool:
+            sent.append(result := send_chunk(chunk))
+            return result
+
+        try:
+            stream_significant_states(hass, msg_id, _send_chunk, *args)
+        finally:
+            hass.loop.call_soon_threadsafe(done.set)
+
+    client = await hass_ws_client()
+    with (
+        patch.object(websocket_api, "HISTORY_CHUNK_STATES", 1),
+        patch.object(
+            websocket_api,
+            "HISTORY_CHUNK_DRAIN_TIMEOUT",
+            60 if close_connection else 0.01,
+        ),
+        patch.object(
+            websocket_api,
+            "_ws_stream_significant_states",
+            _ws_stream_significant_states,
+        ),
+        # The client never catches up
+        patch("homeassistant.components.websocket_api.http.PENDING_BYTES_DRAINED", 0),
+    ):
+        await client.send_json_auto_id(
+            {
+                "type": "history/history_during_period",
+                "start_time": now.isoformat(),
+                "entity_ids": ["sensor.one"],
+                "significant_changes_only": False,
+                "chunked": True,
+            }
+        )
+        response = await client.receive_json()
+        assert response["type"] == "event"
+        if close_connection:
+            await client.close()
+        else:
+            response = await client.receive_json()
+            assert response["error"]["code"] == "timeout"
+        async with asyncio.timeout(5):
+            await done.wait()
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    # The executor stopped reading once the stream was cancelled
+    assert sent[-1] is False
+    assert len(sent) < 10
+
+
+def _columns_to_compressed_states(
+    columns: dict[str, Any], packed: bool
+) -> list[dict[str, Any]]:
+    """Decode columnar states to compressed states with float numeric states."""
+
+    def _unpack(typecode: str, column: str) -> list[Any]:
+        values = array(typecode, b64decode(column))
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values.tolist()
+
+    last_updated = columns["lu"]
+    values = columns.get("v")
+    state_indexes = columns.get("s")
+    if packed:
+        last_updated = _unpack("q", last_updated)
+        if values is not None:
+            values = [
+                None if math.isnan(value) else value for value in _unpack("d", values)
+            ]
+        if state_indexes is not None:
+            state_indexes = _unpack("i", state_indexes)
+    states: list[dict[str, Any]] = []
+    last_updated_us = 0
+    for row, delta_us in enumerate(last_updated):
+        last_updated_us += delta_us
+        if state_indexes is not None and state_indexes[row] >= 0:
+            state = columns["sd"][state_indexes[row]]
+        else:
+            state = values[row]
+        states.append({"s": state, "lu": last_updated_us / 1_000_000})
+    for row, attributes in columns.get("a", []):
+        states[row]["a"] = attributes
+    for row, last_changed in columns.get("lc", []):
+        states[row]["lc"] = last_changed
+    return states
+
+
+def _numeric_states_as_float(states: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Return the compressed states with the numeric states as floats."""
+    result = []
+    for state in states:
+        value: str | float = state["s"]
+        with suppress(ValueError):
+            number = float(value)
+            if value == (
+                str(int(number)) if number.is_integer() else repr(number)
+            ):
+                value = number
+        result.append({**state, "s": value, "lu": pytest.approx(state["lu"])})
+    return result
+
+
+@pytest.mark.parametrize("columnar", ["json", "base64"])
+@pytest.mark.parametrize("minimal_response", [True, False])
+async def test_history_during_period_columnar(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    hass_ws_client: WebSocketGenerator,
+    columnar: str,
+    minimal_response: bool,
+) -> None:
+    """Test history_during_period with the columnar format."""
+    now = dt_util.utcnow()
+
+    await async_setup_component(hass, "history", {})
+    await async_recorder_block_till_done(hass)
+    for state in ("1.5", "2", "unavailable", "2", "-3.25", "1.10", "unavailable"):
+        hass.states.async_set("sensor.power", state, {"unit_of_measurement": "W"})
+        await async_recorder_block_till_done(hass)
+    for state in ("on", "off", "on"):
+        hass.states.async_set("light.kitchen", state)
+        await async_recorder_block_till_done(hass)
+    await async_wait_recording_done(hass)
+
+    client = await hass_ws_client()
+    request = {
+        "type": "history/history_during_period",
+        "start_time": now.isoformat(),
+        "entity_ids": ["sensor.power", "light.kitchen"],
+        "minimal_response": minimal_response,
+    }
+    await client.send_json_auto_id(request)
+    response = await client.receive_json()
+    assert response["success"]
+    expected = response["result"]
+
+    await client.send_json_auto_id({**request, "columnar": columnar})
+    response = await client.receive_json()
+    assert response["success"]
+    result = response["result"]
+    assert result.keys() == expected.keys()
+
+    packed = columnar == "base64"
+    light = result["light.kitchen"]
+    assert "v" not in light
+    assert light["sd"] == ["on", "off"]
+    if not packed:
+        assert light["s"] == [0, 1, 0]
+        assert light["lu"][0] == round(expected["light.kitchen"][0]["lu"] * 1_000_000)
+        assert result["sensor.power"]["v"] == [1.5, 2.0, None, 2.0, -3.25, None, None]
+        assert result["sensor.power"]["sd"] == ["unavailable", "1.10"]
+    for entity_id, columns in result.items():
+        assert _columns_to_compressed_states(
+            columns, packed
+        ) == _numeric_states_as_float(expected[entity_id])
+
+
+@pytest.mark.parametrize(
+    ("state", "value"),
+    [
+        ("21", 21.0),
+        ("-3", -3.0),
+        ("0", 0.0),
+        ("1.5", 1.5),
+        ("-0.25", -0.25),
+        ("0.1", 0.1),
+        ("1_000", None),
+        (" 5 ", None),
+        ("5\n", None),
+        ("007", None),
+        ("1.10", None),
+        ("1.0", None),
+        ("21.0", None),
+        ("1e3", None),
+        ("+1", None),
+        ("-0", None),
+        ("12345678901234567890", None),
+        ("nan", None),
+        ("inf", None),
+        ("on", None),
+        ("", None),
+    ],
+)
+def test_state_to_float(state: str, value: float | None) -> None:
+    """Test only states which convert back to the same string are numbers."""
+    assert columnar._state_to_float(state) == value
+
+
+@pytest.mark.parametrize("packed", [True, False])
+def test_columns_round_trip(packed: bool) -> None:
+    """Test states are read back unchanged from the columns."""
+    states = ["21", "21.0", "1.5", "-0.0", "on", "0"]
+    compressed_states = [
+        {"s": state, "lu": 1700000000.0 + idx} for idx, state in enumerate(states)
+    ]
+    columns = columnar.compressed_states_to_columns(compressed_states, packed)
+
+    # Clients read integral numbers back in their integer form
+    assert [
+        state
+        if isinstance(state := row["s"], str)
+        else str(int(state))
+        if state.is_integer()
+        else repr(state)
+        for row in _columns_to_compressed_states(columns, packed)
+    ] == states
+    assert columns["sd"] == ["21.0", "-0.0", "on"]
+
+
+async def test_history_during_period_max_points(
+    hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test history_during_period downsamples the states to max_points."""
+    start = dt_util.utcnow()
+    end = start + timedelta(seconds=20)
+
+    await async_setup_component(hass, "history", {})
+    await async_recorder_block_till_done(hass)
+    with freeze_time(start) as freezer:
+        for idx in range(20):
+            freezer.move_to(start + timedelta(seconds=idx + 0.5))
+            hass.states.async_set("sensor.power", str(idx))
+    await async_wait_recording_done(hass)
+
+    client = await hass_ws_client()
+    request = {
+        "type": "history/history_during_period",
+        "start_time": start.isoformat(),
+        "end_time": end.isoformat(),
+        "entity_ids": ["sensor.power"],
+        "minimal_response": True,
+        "no_attributes": True,
+        "max_points": 4,
+    }
+    await client.send_json_auto_id(request)
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"] == {
+        "sensor.power": [
+            {"s": "4", "lu": ANY, "min": 0, "max": 4, "mean": 2},
+            {"s": "9", "lu": ANY, "min": 5, "max": 9, "mean": 7},
+            {"s": "14", "lu": ANY, "min": 10, "max": 14, "mean": 12},
+            {"s": "19", "lu": ANY, "min": 15, "max": 19, "mean": 17},
+        ]
+    }
+
+    await client.send_json_auto_id({**request, "columnar": "json", "chunked": True})
+    response = await client.receive_json()
+    assert response["success"]
+    columns = response["result"]["sensor.power"]
+    assert columns["v"] == [4, 9, 14, 19]
+    assert columns["min"] == [0, 5, 10, 15]
+    assert columns["max"] == [4, 9, 14, 19]
+    assert columns["mean"] == [2, 7, 12, 17]
+
+
 async def test_history_during_period(
     hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
 ) -> None:
@@ -916,6 +1255,52 @@ async def test_history_stream_live_no_attributes_minimal_response(
     }
 
 
+async def test_history_stream_live_columnar(
+    hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test history stream sends the historical and live states as columns."""
+    now = dt_util.utcnow()
+    await async_setup_component(hass, "history", {})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.one", "1.5", attributes={"any": "attr"})
+    sensor_one_last_updated = hass.states.get("sensor.one").last_updated_timestamp
+    await async_wait_recording_done(hass)
+
+    client = await hass_ws_client()
+    await client.send_json_auto_id(
+        {
+            "type": "history/stream",
+            "entity_ids": ["sensor.one"],
+            "start_time": now.isoformat(),
+            "no_attributes": True,
+            "minimal_response": True,
+            "columnar": "json",
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+
+    response = await client.receive_json()
+    assert response["event"]["states"] == {
+        "sensor.one": {"lu": [round(sensor_one_last_updated * 1_000_000)], "v": [1.5]}
+    }
+
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.one", "unavailable", attributes={"any": "attr"})
+    hass.states.async_set("sensor.one", "2", attributes={"any": "attr"})
+    last_updated_us = round(
+        hass.states.get("sensor.one").last_updated_timestamp * 1_000_000
+    )
+    await async_recorder_block_till_done(hass)
+
+    response = await client.receive_json()
+    columns = response["event"]["states"]["sensor.one"]
+    assert columns["v"] == [None, 2.0]
+    assert columns["s"] == [0, -1]
+    assert columns["sd"] == ["unavailable"]
+    assert sum(columns["lu"]) == last_updated_us
+
+
 async def test_history_stream_live(
     hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
 ) -> None:
@@ -1029,6 +1414,57 @@ async def test_history_stream_live(
     }
 
 
+@pytest.mark.parametrize("persistent_database", [True])
+async def test_history_stream_live_lagging_reader(
+    recorder_db_url: str,
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    hass_ws_client: WebSocketGenerator,
+    tmp_path: Path,
+) -> None:
+    """Test the states before the switch to live are read from the recorder.
+
+    The reader replica only has the states up to its snapshot, the states
+    committed while the stream switches to live must still be sent.
+    """
+    if not recorder_db_url.startswith(SQLITE_URL_PREFIX):
+        pytest.skip("The lagging replica is a copy of a SQLite database")
+    replica = str(tmp_path / "replica.db")
+    instance = await async_setup_recorder_instance(
+        hass, {CONF_DB_READER_URL: f"{SQLITE_URL_PREFIX}/{replica}"}
+    )
+    now = dt_util.utcnow()
+    await async_setup_component(hass, "history", {})
+    hass.states.async_set("sensor.one", "on")
+    await async_wait_recording_done(hass)
+    await hass.async_add_executor_job(copy_sqlite_database, instance.db_url, replica)
+    # Not committed when the stream is subscribed
+    hass.states.async_set("sensor.one", "off")
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/stream",
+            "entity_ids": ["sensor.one"],
+            "start_time": now.isoformat(),
+            "include_start_time_state": True,
+            "significant_changes_only": False,
+            "no_attributes": True,
+            "minimal_response": True,
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+
+    response = await client.receive_json()
+    assert [state["s"] for state in response["event"]["states"]["sensor.one"]] == ["on"]
+    response = await asyncio.wait_for(client.receive_json(), 2)
+    assert [state["s"] for state in response["event"]["states"]["sensor.one"]] == [
+        "off"
+    ]
+
+
 async def test_history_stream_live_minimal_response(
     hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
 ) -> None:
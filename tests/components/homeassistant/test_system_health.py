@@ -0,0 +1,22 @@
+"""Tests for Home Assistant system health."""
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import template
+from homeassistant.setup import async_setup_component
+
+from tests.common import get_system_health_info
+
+
+async def test_template_cache_hit_rate(hass: HomeAssistant) -> None:
+    """Test the template cache hit rate is reported."""
+    assert await async_setup_component(hass, "homeassistant", {})
+    assert await async_setup_component(hass, "system_health", {})
+    await hass.async_block_till_done()
+    info = await get_system_health_info(hass, "homeassistant")
+    assert info["template_cache_hit_rate"] is None
+
+    bytecode_cache = template.async_get_bytecode_cache(hass)
+    bytecode_cache.hits = 3
+    bytecode_cache.misses = 1
+    info = await get_system_health_info(hass, "homeassistant")
+    assert info["template_cache_hit_rate"] == "75%"
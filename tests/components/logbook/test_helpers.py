@@ -0,0 +1,61 @@
+"""The tests for the logbook component helpers."""
+
+from collections.abc import Callable
+
+from homeassistant.components.logbook.helpers import async_subscribe_events
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+
+
+async def test_live_streams_share_state_changed_listener(hass: HomeAssistant) -> None:
+    """Test the streams of all entities share one state_changed listener."""
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("sensor.temperature", "10", {"unit_of_measurement": "°C"})
+    init_listeners = hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0)
+    received: dict[str, list[str]] = {"first": [], "second": [], "filtered": []}
+    subscriptions: list[CALLBACK_TYPE] = []
+
+    def _subscribe(
+        name: str, entities_filter: Callable[[str], bool] | None = None
+    ) -> list[CALLBACK_TYPE]:
+        @callback
+        def _target(event: Event) -> None:
+            received[name].append(event.data["entity_id"])
+
+        stream_subscriptions: list[CALLBACK_TYPE] = []
+        async_subscribe_events(
+            hass, stream_subscriptions, _target, (), entities_filter, None, None
+        )
+        subscriptions.extend(stream_subscriptions)
+        return stream_subscriptions
+
+    _subscribe("first")
+    _subscribe("second")
+    filtered_subscriptions = _subscribe(
+        "filtered", lambda entity_id: entity_id != "light.kitchen"
+    )
+    assert hass.bus.async_listeners()[EVENT_STATE_CHANGED] == init_listeners + 1
+
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("switch.fan", "on")
+    hass.states.async_set("switch.fan", "off")
+    # Continuous sensors are not forwarded
+    hass.states.async_set("sensor.temperature", "11", {"unit_of_measurement": "°C"})
+    await hass.async_block_till_done()
+    assert received == {
+        "first": ["light.kitchen", "switch.fan"],
+        "second": ["light.kitchen", "switch.fan"],
+        "filtered": ["switch.fan"],
+    }
+
+    for unsub in filtered_subscriptions:
+        unsub()
+    hass.states.async_set("switch.fan", "on")
+    await hass.async_block_till_done()
+    assert received["filtered"] == ["switch.fan"]
+    assert received["first"] == ["light.kitchen", "switch.fan", "switch.fan"]
+
+    for unsub in subscriptions:
+        if unsub not in filtered_subscriptions:
+            unsub()
+    assert hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0) == init_listeners
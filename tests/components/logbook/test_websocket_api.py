@@ -1,8 +1,10 @@
 """The tests for the logbook component."""
 
 import asyncio
-from collections.abc import Callable
+from collections.abc import Callable, Generator
 from datetime import timedelta
+from pathlib import Path
+import threading
 from typing import Any
 from unittest.mock import ANY, patch
 
@@ -13,7 +15,9 @@ from homeassistant import core
 from homeassistant.components import logbook, recorder
 from homeassistant.components.automation import ATTR_SOURCE, EVENT_AUTOMATION_TRIGGERED
 from homeassistant.components.logbook import websocket_api
-from homeassistant.components.recorder import Recorder
+from homeassistant.components.logbook.processor import EventProcessor
+from homeassistant.components.recorder import CONF_DB_READER_URL, Recorder
+from homeassistant.components.recorder.const import SQLITE_URL_PREFIX
 from homeassistant.components.recorder.util import get_instance
 from homeassistant.components.script import EVENT_SCRIPT_STARTED
 from homeassistant.components.websocket_api import TYPE_RESULT
@@ -44,6 +48,7 @@ from tests.components.recorder.common import (
     async_block_recorder,
     async_recorder_block_till_done,
     async_wait_recording_done,
+    copy_sqlite_database,
 )
 from tests.typing import RecorderInstanceGenerator, WebSocketGenerator
 
@@ -1741,6 +1746,240 @@ async def test_subscribe_unsubscribe_logbook_stream_entities_past_only(
     ) == listeners_without_writes(init_listeners)
 
 
+@patch("homeassistant.components.logbook.websocket_api.STREAM_CHUNK_EVENTS", 2)
+@patch("homeassistant.components.logbook.websocket_api.STREAM_CHUNK_DRAIN_TIMEOUT", 0)
+async def test_logbook_stream_stops_when_client_does_not_read(
+    recorder_mock: Recorder, hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test historical events stop when the client does not read the chunks."""
+    now = dt_util.utcnow()
+    await asyncio.gather(
+        *[
+            async_setup_component(hass, comp, {})
+            for comp in ("homeassistant", "logbook")
+        ]
+    )
+    await hass.async_block_till_done()
+    for state in ("on", "off", "on", "off", "on", "off"):
+        hass.states.async_set("light.small", state)
+    await async_wait_recording_done(hass)
+
+    with patch(
+        "homeassistant.components.websocket_api.http.WebSocketHandler._async_wait_drained",
+        side_effect=asyncio.Event().wait,
+    ):
+        websocket_client = await hass_ws_client()
+        init_listeners = hass.bus.async_listeners()
+        await websocket_client.send_json(
+            {
+                "id": 7,
+                "type": "logbook/event_stream",
+                "start_time": now.isoformat(),
+                "entity_ids": ["light.small"],
+            }
+        )
+        msg = await asyncio.wait_for(websocket_client.receive_json(), 2)
+        assert msg["id"] == 7
+        assert msg["type"] == TYPE_RESULT
+        assert msg["success"]
+
+        msg = await asyncio.wait_for(websocket_client.receive_json(), 2)
+        assert msg["type"] == "event"
+        assert msg["event"]["partial"] is True
+        msg = await asyncio.wait_for(websocket_client.receive_json(), 2)
+        assert msg["id"] == 7
+        assert not msg["success"]
+        assert msg["error"]["code"] == "timeout"
+        await hass.async_block_till_done()
+
+    # The live stream was unsubscribed as well
+    assert listeners_without_writes(
+        hass.bus.async_listeners()
+    ) == listeners_without_writes(init_listeners)
+
+
+@patch("homeassistant.components.logbook.websocket_api.STREAM_CHUNK_EVENTS", 2)
+async def test_logbook_stream_past_events_in_chunks(
+    recorder_mock: Recorder, hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test historical events are delivered in chunks as they are fetched."""
+    now = dt_util.utcnow()
+    await asyncio.gather(
+        *[
+            async_setup_component(hass, comp, {})
+            for comp in ("homeassistant", "logbook")
+        ]
+    )
+    await hass.async_block_till_done()
+    # The first state is not in the logbook since it has no old state
+    for state in ("on", "off", "on", "off", "on", "off"):
+        hass.states.async_set("light.small", state)
+    await async_wait_recording_done(hass)
+    end_time = dt_util.utcnow()
+
+    with patch(
+        "homeassistant.components.websocket_api.http.WebSocketHandler._async_wait_drained"
+    ) as mock_wait_drained:
+        websocket_client = await hass_ws_client()
+        await websocket_client.send_json(
+            {
+                "id": 7,
+                "type": "logbook/event_stream",
+                "start_time": now.isoformat(),
+                "end_time": end_time.isoformat(),
+                "entity_ids": ["light.small"],
+            }
+        )
+        msg = await asyncio.wait_for(websocket_client.receive_json(), 2)
+        assert msg["id"] == 7
+        assert msg["type"] == TYPE_RESULT
+        assert msg["success"]
+
+        chunks = [
+            (await asyncio.wait_for(websocket_client.receive_json(), 2))["event"]
+            for _ in range(3)
+        ]
+    # The reader waits for the client to read each partial chunk
+    assert mock_wait_drained.await_count == 2
+    assert [[event["state"] for event in chunk["events"]] for chunk in chunks] == [
+        ["off", "on"],
+        ["off", "on"],
+        ["off"],
+    ]
+    assert [chunk.get("partial") for chunk in chunks] == [True, True, None]
+    # The chunks cover the requested period without gaps
+    assert chunks[0]["start_time"] == now.timestamp()
+    assert chunks[0]["end_time"] == chunks[0]["events"][-1]["when"]
+    assert chunks[1]["start_time"] == chunks[0]["end_time"]
+    assert chunks[2]["start_time"] == chunks[1]["end_time"]
+    assert chunks[2]["end_time"] == end_time.timestamp()
+
+
+@patch("homeassistant.components.logbook.websocket_api.STREAM_CHUNK_EVENTS", 2)
+@pytest.mark.parametrize("live", [True, False])
+async def test_logbook_stream_past_events_stop_on_unsubscribe(
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    live: bool,
+) -> None:
+    """Test the historical events stop being fetched after unsubscribe."""
+    now = dt_util.utcnow()
+    await asyncio.gather(
+        *[
+            async_setup_component(hass, comp, {})
+            for comp in ("homeassistant", "logbook")
+        ]
+    )
+    await hass.async_block_till_done()
+    for state in ("on", "off", "on", "off", "on", "off"):
+        hass.states.async_set("light.small", state)
+    await async_wait_recording_done(hass)
+
+    iter_events = EventProcessor.iter_events
+    resume = threading.Event()
+    finished = threading.Event()
+    fetched: list[list[dict[str, Any]]] = []
+
+    def _iter_events(
+        self: EventProcessor, *args: Any
+    ) -> Generator[list[dict[str, Any]]]:
+        try:
+            for chunk in iter_events(self, *args):
+                if fetched:
+                    # Hold the reader thread until the client unsubscribed
+                    resume.wait(5)
+                fetched.append(chunk)
+                yield chunk
+        finally:
+            finished.set()
+
+    message: dict[str, Any] = {
+        "id": 7,
+        "type": "logbook/event_stream",
+        "start_time": now.isoformat(),
+        "entity_ids": ["light.small"],
+    }
+    if not live:
+        message["end_time"] = dt_util.utcnow().isoformat()
+    websocket_client = await hass_ws_client()
+    with patch.object(EventProcessor, "iter_events", _iter_events):
+        await websocket_client.send_json(message)
+        msg = await asyncio.wait_for(websocket_client.receive_json(), 2)
+        assert msg["id"] == 7
+        assert msg["type"] == TYPE_RESULT
+        assert msg["success"]
+        msg = await asyncio.wait_for(websocket_client.receive_json(), 2)
+        assert [event["state"] for event in msg["event"]["events"]] == ["off", "on"]
+
+        await websocket_client.send_json(
+            {"id": 8, "type": "unsubscribe_events", "subscription": 7}
+        )
+        msg = await asyncio.wait_for(websocket_client.receive_json(), 2)
+        assert msg["id"] == 8
+        assert msg["success"]
+        resume.set()
+        assert await hass.async_add_executor_job(finished.wait, 5)
+        await hass.async_block_till_done()
+
+    # The last chunk is never fetched and nothing is sent after unsubscribing
+    assert len(fetched) < 3
+    with pytest.raises(TimeoutError):
+        await asyncio.wait_for(websocket_client.receive_json(), 0.1)
+
+
+@pytest.mark.parametrize("persistent_database", [True])
+async def test_logbook_stream_lagging_reader(
+    recorder_db_url: str,
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    hass_ws_client: WebSocketGenerator,
+    tmp_path: Path,
+) -> None:
+    """Test the events before the switch to live are read from the recorder.
+
+    The reader replica only has the events up to its snapshot, the events
+    committed while the stream switches to live must still be sent.
+    """
+    if not recorder_db_url.startswith(SQLITE_URL_PREFIX):
+        pytest.skip("The lagging replica is a copy of a SQLite database")
+    replica = str(tmp_path / "replica.db")
+    instance = await async_setup_recorder_instance(
+        hass, {CONF_DB_READER_URL: f"{SQLITE_URL_PREFIX}/{replica}"}
+    )
+    now = dt_util.utcnow()
+    await asyncio.gather(
+        *[
+            async_setup_component(hass, comp, {})
+            for comp in ("homeassistant", "logbook")
+        ]
+    )
+    await hass.async_block_till_done()
+    hass.states.async_set("light.small", STATE_ON)
+    hass.states.async_set("light.small", STATE_OFF)
+    await async_wait_recording_done(hass)
+    await hass.async_add_executor_job(copy_sqlite_database, instance.db_url, replica)
+    # Not committed when the stream is subscribed
+    hass.states.async_set("light.small", STATE_ON)
+
+    websocket_client = await hass_ws_client()
+    await websocket_client.send_json(
+        {
+            "id": 7,
+            "type": "logbook/event_stream",
+            "start_time": now.isoformat(),
+            "entity_ids": ["light.small"],
+        }
+    )
+    msg = await asyncio.wait_for(websocket_client.receive_json(), 2)
+    assert msg["success"]
+
+    msg = await asyncio.wait_for(websocket_client.receive_json(), 2)
+    assert [event["state"] for event in msg["event"]["events"]] == [STATE_OFF]
+    msg = await asyncio.wait_for(websocket_client.receive_json(), 2)
+    assert [event["state"] for event in msg["event"]["events"]] == [STATE_ON]
+
+
 @patch("homeassistant.components.logbook.websocket_api.EVENT_COALESCE_TIME", 0)
 async def test_subscribe_unsubscribe_logbook_stream_big_query(
     recorder_mock: Recorder, hass: HomeAssistant, hass_ws_client: WebSocketGenerator
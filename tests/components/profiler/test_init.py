@@ -70,6 +70,40 @@ async def test_basic_usage(hass: HomeAssistant, tmp_path: Path) -> None:
     await hass.async_block_till_done()
 
 
+async def test_profile_logs_event_fan_out(
+    hass: HomeAssistant, tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test the jobs dispatched per event type are logged after profiling."""
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    hass.bus.async_listen("test_fan_out", lambda event: None)
+    hass.bus.async_listen("test_fan_out", lambda event: None)
+
+    async def _sleep(seconds: float) -> None:
+        hass.bus.async_fire("test_fan_out")
+
+    with (
+        patch("cProfile.Profile"),
+        patch("homeassistant.components.profiler._write_profile"),
+        patch("homeassistant.components.profiler.asyncio.sleep", _sleep),
+        patch.object(hass.config, "path", lambda filename: str(tmp_path / filename)),
+    ):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_START, {CONF_SECONDS: 0.000001}, blocking=True
+        )
+
+    assert "Event test_fan_out dispatched 2 jobs" in caplog.text
+    # Only counted while profiling
+    assert hass.bus.async_fan_out() == {}
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
 async def test_memory_usage(hass: HomeAssistant, tmp_path: Path) -> None:
     """Test we can setup and the service is registered."""
     test_dir = tmp_path / "profiles"
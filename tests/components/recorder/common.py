@@ -4,11 +4,12 @@ from __future__ import annotations
 
 import asyncio
 from collections.abc import Iterable, Iterator
-from contextlib import contextmanager
+from contextlib import closing, contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from functools import partial
 import importlib
+import sqlite3
 import sys
 import time
 from typing import Any, Literal, cast
@@ -27,6 +28,7 @@ from homeassistant.components.recorder import (
     migration,
     statistics,
 )
+from homeassistant.components.recorder.const import SQLITE_URL_PREFIX
 from homeassistant.components.recorder.db_schema import (
     Events,
     EventTypes,
@@ -151,6 +153,18 @@ def corrupt_db_file(test_db_file):
         fhandle.write("I am a corrupt db" * 100)
 
 
+def copy_sqlite_database(db_url: str, path: str) -> None:
+    """Copy a consistent snapshot of a SQLite database to path.
+
+    Reading from the copy emulates a replica which lags behind the database.
+    """
+    with (
+        closing(sqlite3.connect(db_url.removeprefix(SQLITE_URL_PREFIX))) as source,
+        closing(sqlite3.connect(path)) as target,
+    ):
+        source.backup(target)
+
+
 def create_engine_test(*args, **kwargs):
     """Test version of create_engine that initializes with old schema.
 
@@ -0,0 +1,173 @@
+"""Test bulk inserting States and Events rows."""
+
+from collections.abc import Generator
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.components.recorder import CONF_DB_BULK_INSERT, get_instance, util
+from homeassistant.components.recorder.db_schema import (
+    EventData,
+    Events,
+    EventTypes,
+    StateAttributes,
+    States,
+    StatesMeta,
+)
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.core import HomeAssistant
+
+from .common import async_recorder_block_till_done, async_wait_recording_done
+
+from tests.typing import RecorderInstanceContextManager, RecorderInstanceGenerator
+
+
+@pytest.fixture
+async def mock_recorder_before_hass(
+    async_test_recorder: RecorderInstanceContextManager,
+) -> None:
+    """Set up recorder."""
+
+
+@pytest.fixture(autouse=True)
+def enable_bulk_insert() -> Generator[None]:
+    """Enable the bulk insert for the SQLite test database.
+
+    The bulk insert is supported on PostgreSQL and MariaDB, this lets
+    it run on the SQLite database the tests use by default.
+    """
+    setup_connection_for_dialect = util.setup_connection_for_dialect
+
+    def _setup_connection_for_dialect(*args):
+        if database_engine := setup_connection_for_dialect(*args):
+            database_engine.bulk_insert = True
+        return database_engine
+
+    with patch(
+        "homeassistant.components.recorder.core.setup_connection_for_dialect",
+        _setup_connection_for_dialect,
+    ):
+        yield
+
+
+async def test_bulk_insert_disabled_by_default(
+    hass: HomeAssistant, async_setup_recorder_instance: RecorderInstanceGenerator
+) -> None:
+    """Test states are only inserted in bulk when the option is set."""
+    instance = await async_setup_recorder_instance(hass)
+    assert instance.database_engine.bulk_insert
+    assert instance._bulk_insert is None
+
+
+async def test_bulk_insert_states(
+    hass: HomeAssistant, async_setup_recorder_instance: RecorderInstanceGenerator
+) -> None:
+    """Test states in the same commit are linked to the previous state.
+
+    States following another state of the entity in the same commit are
+    inserted in a later statement, so the state_ids are only ordered per entity.
+    """
+    instance = await async_setup_recorder_instance(
+        hass, {"commit_interval": 60, CONF_DB_BULK_INSERT: True}
+    )
+    assert instance._bulk_insert is not None
+
+    hass.states.async_set("light.a", "on", {"brightness": 10})
+    hass.states.async_set("light.b", "on", {"brightness": 10})
+    hass.states.async_set("light.a", "off", {"brightness": 20})
+    hass.states.async_set("light.a", "on", {"brightness": 10})
+    hass.states.async_remove("light.b")
+    await async_wait_recording_done(hass)
+    hass.states.async_set("light.a", "off", {"brightness": 10})
+    # The commit is only queued once the recorder has processed the event
+    await async_recorder_block_till_done(hass)
+    await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        rows = (
+            session.query(States, StatesMeta.entity_id, StateAttributes.shared_attrs)
+            .outerjoin(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+            .outerjoin(
+                StateAttributes, States.attributes_id == StateAttributes.attributes_id
+            )
+            .order_by(States.last_updated_ts)
+            .all()
+        )
+        assert [(row[1], row[0].state, row[2]) for row in rows] == [
+            ("light.a", "on", '{"brightness":10}'),
+            ("light.b", "on", '{"brightness":10}'),
+            ("light.a", "off", '{"brightness":20}'),
+            ("light.a", "on", '{"brightness":10}'),
+            ("light.b", None, "{}"),
+            ("light.a", "off", '{"brightness":10}'),
+        ]
+        state_ids = [row[0].state_id for row in rows]
+        assert [row[0].old_state_id for row in rows] == [
+            None,
+            None,
+            state_ids[0],
+            state_ids[2],
+            state_ids[1],
+            state_ids[3],
+        ]
+        assert rows[0][0].attributes_id == rows[1][0].attributes_id
+        assert rows[0][0].attributes_id == rows[3][0].attributes_id
+        assert all(row[0].entity_id is None for row in rows)
+
+    assert get_instance(hass).states_manager.pop_committed("light.a") == state_ids[5]
+
+
+async def test_bulk_insert_state_not_recorded(
+    hass: HomeAssistant, async_setup_recorder_instance: RecorderInstanceGenerator
+) -> None:
+    """Test a state which is not recorded is not used as the old state."""
+    instance = await async_setup_recorder_instance(
+        hass, {"commit_interval": 60, CONF_DB_BULK_INSERT: True}
+    )
+
+    hass.states.async_set("light.a", "on", {"brightness": 10})
+    hass.states.async_set("light.a", "off", {"brightness": object()})
+    await async_recorder_block_till_done(hass)
+    assert "light.a" not in instance.states_manager._pending
+    hass.states.async_set("light.a", "on", {"brightness": 20})
+    await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        rows = session.query(States).order_by(States.last_updated_ts).all()
+        assert [(row.state, row.old_state_id) for row in rows] == [
+            ("on", None),
+            ("on", None),
+        ]
+
+
+async def test_bulk_insert_events(
+    hass: HomeAssistant, async_setup_recorder_instance: RecorderInstanceGenerator
+) -> None:
+    """Test events are inserted in bulk."""
+    await async_setup_recorder_instance(
+        hass, {"commit_interval": 60, CONF_DB_BULK_INSERT: True}
+    )
+
+    hass.bus.async_fire("bulk_event")
+    hass.bus.async_fire("bulk_event", {"a": 1})
+    hass.bus.async_fire("other_bulk_event", {"a": 1})
+    hass.bus.async_fire("bulk_event", {"a": 2})
+    await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        rows = (
+            session.query(Events, EventTypes.event_type, EventData.shared_data)
+            .outerjoin(EventTypes, Events.event_type_id == EventTypes.event_type_id)
+            .outerjoin(EventData, Events.data_id == EventData.data_id)
+            .filter(EventTypes.event_type.in_(("bulk_event", "other_bulk_event")))
+            .order_by(Events.event_id)
+            .all()
+        )
+        assert [(row[1], row[2]) for row in rows] == [
+            ("bulk_event", None),
+            ("bulk_event", '{"a":1}'),
+            ("other_bulk_event", '{"a":1}'),
+            ("bulk_event", '{"a":2}'),
+        ]
+        assert rows[1][0].data_id == rows[2][0].data_id
+        assert all(row[0].time_fired_ts for row in rows)
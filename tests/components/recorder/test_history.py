@@ -9,15 +9,19 @@ from unittest.mock import sentinel
 
 from freezegun import freeze_time
 import pytest
+from sqlalchemy.dialects import mysql, postgresql
+from sqlalchemy.engine import Dialect
 
 from homeassistant.components import recorder
 from homeassistant.components.recorder import Recorder, history
+from homeassistant.components.recorder.const import SupportedDialect
 from homeassistant.components.recorder.db_schema import (
     StateAttributes,
     States,
     StatesMeta,
 )
 from homeassistant.components.recorder.filters import Filters
+from homeassistant.components.recorder.history import modern
 from homeassistant.components.recorder.models import process_timestamp
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.core import HomeAssistant, State
@@ -1014,3 +1018,97 @@ async def test_get_last_state_changes_with_non_existent_entity_ids_returns_empty
 ) -> None:
     """Test get_last_state_changes returns an empty dict when entities not in the db."""
     assert history.get_last_state_changes(hass, 1, "nonexistent.entity") == {}
+
+
+async def test_get_downsampled_states(hass: HomeAssistant) -> None:
+    """Test entities with more states than max_points are aggregated in buckets."""
+    start = dt_util.utcnow()
+    end = start + timedelta(seconds=10)
+
+    with freeze_time(start - timedelta(seconds=1)) as freezer:
+        hass.states.async_set("sensor.power", "5")
+        for idx, state in enumerate(
+            ("1", "9", "unavailable", "3", "4", "2", "8", "7", "6.5", "5")
+        ):
+            freezer.move_to(start + timedelta(seconds=idx + 0.5))
+            hass.states.async_set("sensor.power", state)
+            hass.states.async_set("sensor.text", f"text {idx}")
+            if idx < 2:
+                hass.states.async_set("light.kitchen", "on" if idx else "off")
+    await async_wait_recording_done(hass)
+
+    entity_ids = ["sensor.power", "sensor.text", "light.kitchen"]
+    states = history.get_downsampled_states(hass, start, end, entity_ids, 5)
+    expected = history.get_significant_states(
+        hass, start, end, entity_ids, compressed_state_format=True
+    )
+
+    assert list(states) == entity_ids
+    start_ts = start.timestamp()
+    assert states["sensor.power"] == [
+        {"s": "5", "a": {}, "lu": start_ts},
+        {"s": "9", "lu": start_ts + 1.5, "min": 1, "max": 9, "mean": 5},
+        {"s": "unavailable", "lu": start_ts + 2.5},
+        {"s": "3", "lu": start_ts + 3.5, "min": 3, "max": 3, "mean": 3},
+        {"s": "2", "lu": start_ts + 5.5, "min": 2, "max": 4, "mean": 3},
+        {"s": "7", "lu": start_ts + 7.5, "min": 7, "max": 8, "mean": 7.5},
+        {"s": "5", "lu": start_ts + 9.5, "min": 5, "max": 6.5, "mean": 5.75},
+    ]
+    # Entities without numeric states or with less states are not downsampled
+    assert states["sensor.text"] == expected["sensor.text"]
+    assert states["light.kitchen"] == expected["light.kitchen"]
+
+    states = history.get_downsampled_states(
+        hass, start, end, entity_ids, 10, include_start_time_state=False
+    )
+    assert states["sensor.power"] == expected["sensor.power"][1:]
+
+
+async def test_get_downsampled_states_ignores_states_which_are_not_numbers(
+    hass: HomeAssistant,
+) -> None:
+    """Test states which are not numbers on all databases are not aggregated.
+
+    They are returned as they are so the gaps in the numeric states are kept.
+    """
+    start = dt_util.utcnow()
+    end = start + timedelta(seconds=10)
+
+    with freeze_time(start) as freezer:
+        for idx, state in enumerate(
+            ("4", "-", "e", "+", ".", "1.2.3", "1e500", "1e-500", "1-2", "2")
+        ):
+            freezer.move_to(start + timedelta(seconds=idx + 0.5))
+            hass.states.async_set("sensor.power", state)
+    await async_wait_recording_done(hass)
+
+    states = history.get_downsampled_states(
+        hass, start, end, ["sensor.power"], 1, include_start_time_state=False
+    )
+    start_ts = start.timestamp()
+    assert states["sensor.power"] == [
+        *(
+            {"s": state, "lu": start_ts + idx + 0.5}
+            for idx, state in enumerate(
+                ("-", "e", "+", ".", "1.2.3", "1e500", "1e-500", "1-2"), 1
+            )
+        ),
+        {"s": "2", "lu": start_ts + 9.5, "min": 2, "max": 4, "mean": 3},
+    ]
+
+
+@pytest.mark.parametrize(
+    ("dialect", "value"),
+    [
+        (mysql.dialect(), "states.state + %s"),
+        (postgresql.dialect(), "CAST(states.state AS FLOAT)"),
+    ],
+)
+def test_downsampled_states_numeric_value(dialect: Dialect, value: str) -> None:
+    """Test the states are converted to numbers on every database."""
+    stmt = modern._downsampled_states_stmt(
+        SupportedDialect(dialect.name), 0, 10, 5, [1], [], True
+    )
+    compiled = str(stmt.compile(dialect=dialect))
+    assert f"min({value})" in compiled
+    assert f"max({value})" in compiled
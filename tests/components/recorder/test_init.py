@@ -13,6 +13,7 @@ from unittest.mock import Mock, patch
 
 from freezegun.api import FrozenDateTimeFactory
 import pytest
+from sqlalchemy import text
 from sqlalchemy.exc import DatabaseError, OperationalError, SQLAlchemyError
 from sqlalchemy.pool import QueuePool
 
@@ -59,6 +60,7 @@ from homeassistant.components.recorder.services import (
     SERVICE_PURGE_ENTITIES,
 )
 from homeassistant.components.recorder.table_managers import (
+    LRUStats,
     state_attributes as state_attributes_table_manager,
     states_meta as states_meta_table_manager,
 )
@@ -69,6 +71,7 @@ from homeassistant.const import (
     EVENT_HOMEASSISTANT_FINAL_WRITE,
     EVENT_HOMEASSISTANT_STARTED,
     EVENT_HOMEASSISTANT_STOP,
+    EVENT_STATE_CHANGED,
     MATCH_ALL,
 )
 from homeassistant.core import Context, CoreState, Event, HomeAssistant, State, callback
@@ -129,6 +132,7 @@ def _default_recorder(hass: HomeAssistant) -> Recorder:
         hass,
         auto_purge=True,
         auto_repack=True,
+        continuous_purge=False,
         keep_days=7,
         commit_interval=1,
         uri="sqlite://",
@@ -136,6 +140,12 @@ def _default_recorder(hass: HomeAssistant) -> Recorder:
         db_retry_wait=3,
         entity_filter=CONFIG_SCHEMA({DOMAIN: {}}),
         exclude_event_types=set(),
+        exclude_attributes={},
+        spool_path=None,
+        db_reader_url=None,
+        db_readers=0,
+        db_partition=None,
+        db_bulk_insert=False,
     )
 
 
@@ -755,6 +765,64 @@ async def test_saving_state_exclude_entities(
     assert _state_with_context(hass, "test2.recorder").as_dict() == states[0].as_dict()
 
 
+async def test_saving_state_exclude_attributes_by_domain(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+) -> None:
+    """Test volatile attributes excluded for a domain are not recorded."""
+    await async_setup_recorder_instance(
+        hass,
+        {
+            "exclude": {
+                "attributes": {
+                    "media_player": ["media_position", "media_position_updated_at"]
+                }
+            }
+        },
+    )
+    start = dt_util.utcnow()
+    attributes = {
+        "volume_level": 0.35,
+        "is_volume_muted": False,
+        "media_content_type": "music",
+        "media_duration": 245,
+        "media_title": "Song",
+        "media_artist": "Artist",
+        "friendly_name": "Living room",
+    }
+    for position in range(20):
+        updated_at = start + timedelta(seconds=position * 10)
+        for entity_id in ("media_player.living_room", "sensor.living_room_media"):
+            hass.states.async_set(
+                entity_id,
+                "playing",
+                {
+                    **attributes,
+                    "media_position": position * 10,
+                    "media_position_updated_at": updated_at.isoformat(),
+                },
+            )
+    await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        shared_attrs = {
+            states_meta.entity_id: shared_attrs
+            for states_meta, shared_attrs in session.query(
+                StatesMeta, StateAttributes.shared_attrs
+            )
+            .join(States, States.metadata_id == StatesMeta.metadata_id)
+            .join(
+                StateAttributes, States.attributes_id == StateAttributes.attributes_id
+            )
+        }
+        attributes_rows = session.query(StateAttributes).count()
+
+    # The attributes of the media player are only stored once
+    assert json_loads(shared_attrs["media_player.living_room"]) == attributes
+    assert "media_position" in json_loads(shared_attrs["sensor.living_room_media"])
+    assert attributes_rows == 21
+
+
 async def test_saving_state_exclude_domain_include_entity(
     hass: HomeAssistant,
     async_setup_recorder_instance: RecorderInstanceGenerator,
@@ -2517,6 +2585,105 @@ async def test_lru_increases_with_many_entities(
     assert instance.states_meta_manager._id_map.get_size() == mock_entity_count * 2
 
 
+async def test_lru_grows_to_working_set(
+    small_cache_size: None, hass: HomeAssistant, setup_recorder: None
+) -> None:
+    """Test the LRU grows when evicted attributes are read back from the database."""
+    for _ in range(2):
+        for idx in range(12):
+            hass.states.async_set("test.entity", "on", {"idx": idx})
+            await async_wait_recording_done(hass)
+
+    manager = get_instance(hass).state_attributes_manager
+    assert manager.stats.misses == 24
+    # The attributes were evicted before they were used again
+    assert manager.stats.database_lookups == 24
+    assert manager.stats.database_hits == 12
+
+    manager.max_lru_size = 10
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=10))
+    await async_wait_recording_done(hass)
+
+    # The LRU grows until the memory cap
+    assert manager.lru_stats()["max_size"] == 10
+
+
+async def test_lru_grows_from_preloaded_attributes(
+    small_cache_size: None, hass: HomeAssistant, setup_recorder: None
+) -> None:
+    """Test attributes loaded ahead of the events are counted and grow the LRU."""
+    for idx in range(12):
+        hass.states.async_set("test.entity", "on", {"idx": idx})
+    await async_wait_recording_done(hass)
+
+    instance = get_instance(hass)
+    manager = instance.state_attributes_manager
+    assert manager.lru_stats()["max_size"] == 8
+    manager.stats = LRUStats()
+    events = [
+        Event(
+            EVENT_STATE_CHANGED,
+            {
+                "entity_id": "test.entity",
+                "old_state": None,
+                "new_state": State("test.entity", "on", {"idx": idx}),
+            },
+        )
+        for idx in range(12)
+    ]
+
+    def _load() -> None:
+        with session_scope(hass=hass, read_only=True) as session:
+            manager.load(events, session)
+
+    await instance.async_add_executor_job(_load)
+    # Only the evicted attributes are looked up
+    assert manager.stats == LRUStats(misses=4, database_lookups=4, database_hits=4)
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=10))
+    await async_wait_recording_done(hass)
+
+    assert manager.lru_stats()["max_size"] == 12
+
+
+async def test_lru_database_hits_only_count_missed_keys(
+    hass: HomeAssistant, setup_recorder: None
+) -> None:
+    """Test only the keys which missed the LRU are counted as database hits."""
+    hass.states.async_set("test.entity", "on", {"idx": 1})
+    hass.states.async_set("test.entity", "on", {"idx": 2})
+    await async_wait_recording_done(hass)
+
+    instance = get_instance(hass)
+    manager = instance.state_attributes_manager
+    with session_scope(hass=hass, read_only=True) as session:
+        first, second = (
+            attributes.shared_attrs
+            for attributes in session.query(StateAttributes).order_by(
+                StateAttributes.attributes_id
+            )
+        )
+    first_hash = StateAttributes.hash_shared_attrs_bytes(first.encode())
+    second_hash = StateAttributes.hash_shared_attrs_bytes(second.encode())
+    manager._id_map.clear()
+    manager.stats = LRUStats()
+
+    def _get_many() -> dict[str, int | None]:
+        with session_scope(hass=hass, read_only=True) as session:
+            # Loading ahead of the lookups is not a database hit
+            manager._load_from_hashes([second_hash], session)
+            # The hash of the missing key collides with another row
+            return manager.get_many(
+                ((second, second_hash), ("{}", first_hash)), session
+            )
+
+    results = await instance.async_add_executor_job(_get_many)
+    assert results["{}"] is None
+    assert results[second] is not None
+    assert first not in results
+    assert manager.stats == LRUStats(hits=1, misses=1, database_lookups=1)
+
+
 async def test_clean_shutdown_when_recorder_thread_raises_during_initialize_database(
     hass: HomeAssistant,
 ) -> None:
@@ -2797,3 +2964,39 @@ async def test_empty_entity_id(
     hass.bus.async_fire("hello", {"entity_id": ""})
     await async_wait_recording_done(hass)
     assert "Invalid entity ID" not in caplog.text
+
+
+@pytest.mark.parametrize("persistent_database", [True])
+async def test_reader_connections(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+) -> None:
+    """Test read only sessions of reader jobs use the reader connections."""
+    instance = await async_setup_recorder_instance(hass, {recorder.CONF_DB_READERS: 2})
+    hass.states.async_set("sensor.reader", "on")
+    await async_wait_recording_done(hass)
+
+    def _read() -> tuple[str, bool, list[str]]:
+        with session_scope(hass=hass, read_only=True) as session:
+            return (
+                threading.current_thread().name,
+                session.get_bind() is instance.reader_engine,
+                [states_meta.entity_id for states_meta in session.query(StatesMeta)],
+            )
+
+    def _write() -> None:
+        with session_scope(hass=hass, read_only=True) as session:
+            session.execute(text("DELETE FROM states"))
+
+    thread_name, reader_bind, entity_ids = await instance.async_add_reader_job(_read)
+    assert thread_name.startswith("DbReader")
+    assert reader_bind
+    assert "sensor.reader" in entity_ids
+
+    with pytest.raises(OperationalError, match="readonly database"):
+        await instance.async_add_reader_job(_write)
+
+    # Other jobs keep using the recorder connections
+    thread_name, reader_bind, _ = await instance.async_add_executor_job(_read)
+    assert thread_name.startswith("DbWorker")
+    assert not reader_bind
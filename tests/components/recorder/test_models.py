@@ -106,6 +106,34 @@ def test_from_event_to_db_state_attributes_with_null() -> None:
     assert decoded["this_attr"] == "withnull"
 
 
+def test_from_event_to_db_state_attributes_domain_exclude() -> None:
+    """Test the attributes excluded for the domain are not stored."""
+    attrs = {"temperature": 8.2, "humidity": 79, "forecast_updated_at": "12:00"}
+    state = ha.State(
+        "weather.home",
+        "rainy",
+        attrs,
+        state_info={"unrecorded_attributes": frozenset({"humidity"})},
+    )
+    event = ha.Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "weather.home", "old_state": None, "new_state": state},
+        context=state.context,
+    )
+    dialect = SupportedDialect.MYSQL
+    domain_exclude_attrs = frozenset({"forecast_updated_at"})
+
+    shared_attrs = StateAttributes.shared_attrs_bytes_from_event(
+        event, dialect, domain_exclude_attrs
+    )
+    assert json_loads(shared_attrs) == {"temperature": 8.2}
+    state.state_info = None
+    shared_attrs = StateAttributes.shared_attrs_bytes_from_event(
+        event, dialect, domain_exclude_attrs
+    )
+    assert json_loads(shared_attrs) == {"temperature": 8.2, "humidity": 79}
+
+
 def test_repr() -> None:
     """Test converting event to db state repr."""
     attrs = {"this_attr": True}
@@ -0,0 +1,414 @@
+"""Test time partitioned tables."""
+
+from datetime import datetime, timedelta
+from itertools import pairwise
+from typing import Any
+from unittest.mock import patch
+
+from freezegun import freeze_time
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.const import (
+    PARTITION_DAY,
+    PARTITION_WEEK,
+    SupportedDialect,
+)
+from homeassistant.components.recorder.db_schema import (
+    SCHEMA_VERSION,
+    TABLE_STATES,
+    MigrationChanges,
+    StateAttributes,
+    States,
+)
+from homeassistant.components.recorder.migration import (
+    NON_LIVE_DATA_MIGRATORS,
+    PartitionedTablesMigration,
+    _convert_table_to_partitioned,
+)
+from homeassistant.components.recorder.partition import (
+    DEFAULT_PARTITION_SUFFIX,
+    LEGACY_PARTITION_SUFFIX,
+    PARTITIONED_TABLES,
+    Partition,
+    create_partitions,
+    expired_partitions,
+    get_partitions,
+    is_partitioned,
+    partition_name,
+    partition_start,
+    rows_purge_before,
+)
+from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.tasks import PartitionTask
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .common import async_recorder_block_till_done, async_wait_recording_done
+
+from tests.typing import RecorderInstanceContextManager, RecorderInstanceGenerator
+
+
+@pytest.fixture
+async def mock_recorder_before_hass(
+    async_test_recorder: RecorderInstanceContextManager,
+) -> None:
+    """Set up recorder."""
+
+
+def test_partition_start() -> None:
+    """Test the start of the partitions."""
+    # Wednesday evening in New York is Thursday in UTC
+    when = datetime(
+        2025, 1, 8, 21, 30, tzinfo=dt_util.get_time_zone("America/New_York")
+    )
+    day = partition_start(when, PARTITION_DAY)
+    assert day == datetime(2025, 1, 9, tzinfo=dt_util.UTC)
+    assert partition_start(when, PARTITION_WEEK) == datetime(
+        2025, 1, 6, tzinfo=dt_util.UTC
+    )
+    assert partition_name(TABLE_STATES, day) == "states_p20250109"
+
+
+def test_partitions_to_purge() -> None:
+    """Test finding the expired partitions and the rows to delete one by one."""
+    legacy = Partition("states_legacy", None, 100.0)
+    first = Partition("states_p1", 100.0, 200.0)
+    second = Partition("states_p2", 200.0, 300.0)
+    default = Partition("states_default", None, None)
+    partitions = [legacy, first, second, default]
+    assert legacy.is_legacy
+    assert default.is_default
+
+    assert expired_partitions(partitions, 50.0) == []
+    assert expired_partitions(partitions, 250.0) == [legacy, first]
+
+    # Rows of the legacy partition are deleted one by one
+    assert rows_purge_before(partitions, 50.0) == 50.0
+    # Rows of the other partitions are kept until it is dropped
+    assert rows_purge_before(partitions, 150.0) == 100.0
+    assert rows_purge_before(partitions, 250.0) == 200.0
+    assert rows_purge_before(partitions, 350.0) == 350.0
+
+
+@pytest.mark.skip_on_db_engine(["mysql", "postgresql"])
+@pytest.mark.usefixtures("skip_by_db_engine")
+@pytest.mark.parametrize("recorder_config", [{"db_partition": PARTITION_DAY}])
+async def test_partitions_need_postgresql(
+    hass: HomeAssistant, recorder_mock: Recorder, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test the partitions are not used with other databases."""
+    recorder_mock.queue_task(PartitionTask())
+    await async_recorder_block_till_done(hass)
+    await async_wait_recording_done(hass)
+
+    assert "Partitioned tables are only supported with PostgreSQL" in caplog.text
+    assert not recorder_mock.partitioned
+
+
+@pytest.mark.skip_on_db_engine(["mysql", "postgresql"])
+@pytest.mark.usefixtures("skip_by_db_engine")
+async def test_purge_drops_expired_partitions(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test the expired partitions are dropped instead of deleting their rows."""
+    purge_before = dt_util.utcnow() - timedelta(days=10)
+    boundary = partition_start(purge_before, PARTITION_DAY)
+    with freeze_time(boundary - timedelta(hours=1)):
+        hass.states.async_set("sensor.test", "expired", {"expired": True})
+        await async_wait_recording_done(hass)
+    with freeze_time(boundary + timedelta(hours=1)):
+        hass.states.async_set("sensor.test", "kept", {"kept": True})
+        await async_wait_recording_done(hass)
+    hass.states.async_set("sensor.test", "current", {"kept": True})
+    await async_wait_recording_done(hass)
+
+    # Emulate the expired partition with a copy of its rows
+    expired = Partition("states_p_expired", None, boundary.timestamp())
+    partitions = {
+        TABLE_STATES: [
+            expired,
+            Partition(
+                "states_p_current",
+                boundary.timestamp(),
+                (boundary + timedelta(days=1)).timestamp(),
+            ),
+        ]
+    }
+    with session_scope(hass=hass) as session:
+        session.execute(
+            text(
+                "CREATE TABLE states_p_expired AS SELECT * FROM states"
+                " WHERE last_updated_ts < :boundary"
+            ),
+            {"boundary": boundary.timestamp()},
+        )
+    recorder_mock.partitioned = True
+
+    with patch(
+        "homeassistant.components.recorder.partition.get_partitions",
+        side_effect=lambda session, table: partitions.get(table, []),
+    ):
+        assert purge_old_data(recorder_mock, purge_before, repack=False)
+
+    with session_scope(hass=hass) as session:
+        states = session.query(States).order_by(States.last_updated_ts).all()
+        # The state after purge_before is kept until its partition expires
+        assert [state.state for state in states] == ["kept", "current"]
+        assert states[0].old_state_id is None
+        assert states[1].old_state_id == states[0].state_id
+        assert [
+            attributes.shared_attrs for attributes in session.query(StateAttributes)
+        ] == ['{"kept":true}']
+        assert not session.execute(
+            text("SELECT name FROM sqlite_master WHERE name = :name"),
+            {"name": expired.name},
+        ).all()
+    assert recorder_mock.purge_progress.rows_purged == 2
+
+
+def _count_rows(session: Session, table: str) -> int:
+    """Return the number of rows of a table or partition."""
+    return session.execute(text(f"SELECT count(*) FROM {table}")).scalar()  # noqa: S608
+
+
+def _primary_key(session: Session, table: str) -> str | None:
+    """Return the definition of the primary key of a table or partition."""
+    return session.execute(
+        text(
+            "SELECT pg_get_constraintdef(oid) FROM pg_constraint"
+            " WHERE contype = 'p' AND conrelid = to_regclass(:table)"
+        ),
+        {"table": table},
+    ).scalar()
+
+
+def _partitioned_tables_migration() -> PartitionedTablesMigration:
+    """Return the partitioned tables migration of the current schema."""
+    return PartitionedTablesMigration(
+        initial_schema_version=SCHEMA_VERSION,
+        start_schema_version=SCHEMA_VERSION,
+        migration_changes={},
+    )
+
+
+@pytest.mark.skip_on_db_engine(["mysql", "postgresql"])
+@pytest.mark.usefixtures("skip_by_db_engine")
+@pytest.mark.parametrize("recorder_config", [{"db_partition": PARTITION_DAY}])
+async def test_partitioned_tables_migration_needs_postgresql(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test the tables are only converted on PostgreSQL with the option set."""
+    migrator = _partitioned_tables_migration()
+
+    def _needs_migrate() -> bool:
+        with session_scope(session=recorder_mock.get_session()) as session:
+            return migrator.needs_migrate(recorder_mock, session)
+
+    assert PartitionedTablesMigration in NON_LIVE_DATA_MIGRATORS
+    assert not await recorder_mock.async_add_executor_job(_needs_migrate)
+    recorder_mock.db_partition = None
+    with patch.object(recorder_mock, "dialect_name", SupportedDialect.POSTGRESQL):
+        assert not await recorder_mock.async_add_executor_job(_needs_migrate)
+
+
+@pytest.mark.skip_on_db_engine(["mysql", "sqlite"])
+@pytest.mark.usefixtures("skip_by_db_engine")
+async def test_migrate_to_partitioned_tables(
+    hass: HomeAssistant, async_setup_recorder_instance: RecorderInstanceGenerator
+) -> None:
+    """Test the tables are converted to partitioned tables on PostgreSQL."""
+    instance = await async_setup_recorder_instance(hass)
+    hass.states.async_set("sensor.test", "legacy_1")
+    hass.states.async_set("sensor.test", "legacy_2")
+    await async_wait_recording_done(hass)
+
+    instance.db_partition = PARTITION_DAY
+    migrator = _partitioned_tables_migration()
+    tables = list(PARTITIONED_TABLES)
+
+    def _needs_migrate() -> bool:
+        with session_scope(session=instance.get_session()) as session:
+            return migrator.needs_migrate(instance, session)
+
+    def _fail_on_second_table(session: Session, table: str, *args: Any) -> None:
+        if table == tables[1]:
+            raise RuntimeError("boom")
+        _convert_table_to_partitioned(session, table, *args)
+
+    assert await instance.async_add_executor_job(_needs_migrate)
+    # An interrupted migration keeps the converted tables and leaves the
+    # table which failed unchanged
+    with (
+        patch(
+            "homeassistant.components.recorder.migration._convert_table_to_partitioned",
+            side_effect=_fail_on_second_table,
+        ),
+        pytest.raises(RuntimeError),
+    ):
+        await instance.async_add_executor_job(
+            migrator.migrate_all, instance, instance.get_session
+        )
+    with session_scope(hass=hass, read_only=True) as session:
+        assert [is_partitioned(session, table) for table in tables] == [
+            True,
+            False,
+            False,
+        ]
+
+    # The migration resumes with the tables which were not converted
+    assert await instance.async_add_executor_job(_needs_migrate)
+    await instance.async_add_executor_job(
+        migrator.migrate_all, instance, instance.get_session
+    )
+    assert not await instance.async_add_executor_job(_needs_migrate)
+    with session_scope(hass=hass, read_only=True) as session:
+        assert (
+            session.query(MigrationChanges.version)
+            .filter(MigrationChanges.migration_id == migrator.migration_id)
+            .scalar()
+            == migrator.migration_version
+        )
+
+    instance.queue_task(PartitionTask())
+    await async_recorder_block_till_done(hass)
+    await async_wait_recording_done(hass)
+    assert instance.partitioned
+
+    hass.states.async_set("sensor.test", "legacy_3")
+    await async_wait_recording_done(hass)
+    later = dt_util.utcnow() + timedelta(days=2)
+    with freeze_time(later):
+        hass.states.async_set("sensor.test", "partitioned")
+        await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        for table in PARTITIONED_TABLES:
+            assert is_partitioned(session, table)
+            partitions = get_partitions(session, table)
+            assert partitions[0].name == f"{table}{LEGACY_PARTITION_SUFFIX}"
+            assert partitions[-1].name == f"{table}{DEFAULT_PARTITION_SUFFIX}"
+            # The partitions are contiguous
+            for previous, partition in pairwise(partitions[:-1]):
+                assert partition.lower_bound == previous.upper_bound
+            column, id_column = PARTITIONED_TABLES[table]
+            for name in (table, *(partition.name for partition in partitions)):
+                assert _primary_key(session, name) == (
+                    f"PRIMARY KEY ({id_column}, {column})"
+                )
+            assert session.execute(
+                text(
+                    "SELECT bool_and(indisvalid) FROM pg_index"
+                    " WHERE indrelid = to_regclass(:table)"
+                ),
+                {"table": table},
+            ).scalar()
+
+        states = session.query(States).order_by(States.last_updated_ts).all()
+        assert [state.state for state in states] == [
+            "legacy_1",
+            "legacy_2",
+            "legacy_3",
+            "partitioned",
+        ]
+        # The ids of the new rows come from the sequence
+        assert states[2].state_id > states[1].state_id
+        assert [state.old_state_id for state in states] == [
+            None,
+            states[0].state_id,
+            states[1].state_id,
+            states[2].state_id,
+        ]
+        assert _count_rows(session, f"{TABLE_STATES}{LEGACY_PARTITION_SUFFIX}") == 3
+        assert (
+            _count_rows(
+                session,
+                partition_name(TABLE_STATES, partition_start(later, PARTITION_DAY)),
+            )
+            == 1
+        )
+        # The foreign key of old_state_id is kept on the legacy partition
+        assert session.execute(
+            text(
+                "SELECT pg_get_constraintdef(oid) FROM pg_constraint"
+                " WHERE contype = 'f' AND conrelid = to_regclass(:table)"
+                " AND confrelid = conrelid"
+            ),
+            {"table": f"{TABLE_STATES}{LEGACY_PARTITION_SUFFIX}"},
+        ).scalar() == (
+            f"FOREIGN KEY (old_state_id) REFERENCES "
+            f"{TABLE_STATES}{LEGACY_PARTITION_SUFFIX}(state_id) NOT VALID"
+        )
+
+
+@pytest.mark.skip_on_db_engine(["mysql", "sqlite"])
+@pytest.mark.usefixtures("skip_by_db_engine")
+async def test_migrate_to_partitioned_tables_rows_without_timestamp(
+    hass: HomeAssistant, async_setup_recorder_instance: RecorderInstanceGenerator
+) -> None:
+    """Test the migration fails on rows without a timestamp."""
+    instance = await async_setup_recorder_instance(hass)
+    hass.states.async_set("sensor.test", "on")
+    await async_wait_recording_done(hass)
+    with session_scope(hass=hass) as session:
+        session.execute(text("UPDATE states SET last_updated_ts = NULL"))
+
+    instance.db_partition = PARTITION_DAY
+    migrator = _partitioned_tables_migration()
+    with pytest.raises(
+        RuntimeError,
+        match="The states table can not be partitioned since 1 of its rows have no"
+        " last_updated_ts",
+    ):
+        await instance.async_add_executor_job(
+            migrator.migrate_all, instance, instance.get_session
+        )
+
+    with session_scope(hass=hass, read_only=True) as session:
+        assert not is_partitioned(session, TABLE_STATES)
+        assert _primary_key(session, TABLE_STATES) == "PRIMARY KEY (state_id)"
+        assert [
+            (state.state, state.last_updated_ts) for state in session.query(States)
+        ] == [("on", None)]
+
+
+@pytest.mark.skip_on_db_engine(["mysql", "sqlite"])
+@pytest.mark.usefixtures("skip_by_db_engine")
+@pytest.mark.parametrize("recorder_config", [{"db_partition": PARTITION_DAY}])
+async def test_create_partitions_moves_rows_of_the_default_partition(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test creating a partition moves its rows out of the default partition."""
+    await async_recorder_block_till_done(hass)
+    await async_wait_recording_done(hass)
+    assert recorder_mock.partitioned
+
+    future = dt_util.utcnow() + timedelta(days=30)
+    with freeze_time(future):
+        hass.states.async_set("sensor.test", "future")
+        await async_wait_recording_done(hass)
+    default = f"{TABLE_STATES}{DEFAULT_PARTITION_SUFFIX}"
+    with session_scope(hass=hass, read_only=True) as session:
+        assert _count_rows(session, default) == 1
+
+    with session_scope(hass=hass) as session:
+        create_partitions(session, TABLE_STATES, PARTITION_DAY, future)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        assert _count_rows(session, default) == 0
+        name = partition_name(TABLE_STATES, partition_start(future, PARTITION_DAY))
+        assert _count_rows(session, name) == 1
+        partitions = get_partitions(session, TABLE_STATES)
+        assert (
+            partitions[-2].upper_bound
+            == (partition_start(future, PARTITION_DAY) + timedelta(days=8)).timestamp()
+        )
+        # The partition got the indexes of the partitioned table
+        assert session.execute(
+            text("SELECT count(*) FROM pg_indexes WHERE tablename = :table"),
+            {"table": name},
+        ).scalar()
+        assert [state.state for state in session.query(States)] == ["future"]
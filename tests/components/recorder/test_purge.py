@@ -25,7 +25,13 @@ from homeassistant.components.recorder.db_schema import (
     StatisticsShortTerm,
 )
 from homeassistant.components.recorder.history import get_significant_states
-from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.purge import (
+    MAX_EVENTS_BATCHES_PER_PURGE,
+    MAX_STATES_BATCHES_PER_PURGE,
+    PurgeProgress,
+    estimate_rows_to_purge,
+    purge_old_data,
+)
 from homeassistant.components.recorder.queries import select_event_type_ids
 from homeassistant.components.recorder.services import (
     SERVICE_PURGE,
@@ -1665,6 +1671,201 @@ async def test_purge_entities(hass: HomeAssistant, recorder_mock: Recorder) -> N
         assert states_meta_remain.count() == 4
 
 
+def test_purge_progress_sizes_slices() -> None:
+    """Test the batches per slice follow the duration of the previous slice."""
+    progress = PurgeProgress()
+    progress.start(dt_util.utcnow(), 100)
+    assert progress.running
+    assert progress.rows_remaining == 100
+    assert progress.rows_per_second is None
+
+    progress.add_rows_purged(40)
+    progress.finish_slice(8.0, 1.0)
+    # A slow slice shrinks the next one by a factor of 4 at most
+    assert progress.states_batch_size == 5
+    assert progress.events_batch_size == 3
+
+    progress.finish_slice(0.5, 1.0)
+    assert progress.states_batch_size == 10
+    assert progress.events_batch_size == 6
+
+    # Fast slices grow the batches past the defaults up to the maximum
+    progress.finish_slice(0.01, 1.0)
+    assert progress.states_batch_size == 20
+    assert progress.events_batch_size == 12
+    for _ in range(5):
+        progress.finish_slice(0.01, 1.0)
+    assert progress.states_batch_size == MAX_STATES_BATCHES_PER_PURGE
+    assert progress.events_batch_size == MAX_EVENTS_BATCHES_PER_PURGE
+
+    assert progress.slices == 8
+    assert progress.rows_remaining == 60
+    assert progress.rows_per_second == pytest.approx(40 / 8.56)
+    assert progress.as_dict()["last_slice_seconds"] == 0.01
+
+    progress.stop(completed=True)
+    assert not progress.running
+    assert progress.last_completed is not None
+
+
+async def test_purge_task_progress(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test the purge task reports its progress."""
+    await _add_test_states(hass)
+    await _add_test_events(hass)
+    progress = recorder_mock.purge_progress
+    assert progress.as_dict()["running"] is False
+    assert progress.last_completed is None
+
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    recorder_mock.queue_task(PurgeTask(purge_before, repack=False, apply_filter=False))
+    await async_recorder_block_till_done(hass)
+    await async_wait_purge_done(hass)
+
+    assert not progress.running
+    assert progress.purge_before == purge_before
+    # The estimate is replaced once the purge completed
+    assert progress.rows_to_purge == 8
+    assert progress.rows_purged == 8
+    assert progress.rows_remaining == 0
+    assert progress.slices >= 1
+    assert progress.last_completed is not None
+
+
+async def test_estimate_rows_to_purge(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test the rows to purge are estimated from the range of their ids."""
+    await _add_test_states(hass)
+    await _add_test_events(hass)
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+
+    # The newer rows written between the rows to purge are part of the range
+    assert (
+        await recorder_mock.async_add_executor_job(
+            estimate_rows_to_purge, recorder_mock, purge_before
+        )
+        == 13
+    )
+    assert (
+        await recorder_mock.async_add_executor_job(
+            estimate_rows_to_purge, recorder_mock, purge_before - timedelta(days=30)
+        )
+        == 0
+    )
+
+    with patch.object(
+        recorder_mock, "get_session", side_effect=OperationalError("", None, None)
+    ):
+        assert (
+            await recorder_mock.async_add_executor_job(
+                estimate_rows_to_purge, recorder_mock, purge_before
+            )
+            is None
+        )
+
+
+@pytest.mark.parametrize("recorder_config", [{"continuous_purge": True}])
+async def test_continuous_purge(hass: HomeAssistant, recorder_mock: Recorder) -> None:
+    """Test the continuous purge pauses while the recorder is backlogged."""
+    await _add_test_states(hass)
+    progress = recorder_mock.purge_progress
+    progress.states_batch_size = 1
+    # Delete a single state per slice
+    recorder_mock.max_bind_vars = 1
+
+    with patch(
+        "homeassistant.components.recorder.tasks.LOW_PRIORITY_PURGE_MAX_BACKLOG", 0
+    ):
+        recorder_mock._async_five_minute_tasks(dt_util.utcnow())
+        await async_recorder_block_till_done(hass)
+        await async_wait_purge_done(hass)
+
+    assert not progress.running
+    assert progress.rows_to_purge == 2
+    assert progress.rows_purged == 1
+    assert progress.last_completed is None
+
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 5
+
+    with patch(
+        "homeassistant.components.recorder.tasks.periodic_db_cleanups"
+    ) as periodic_db_cleanups:
+        recorder_mock.async_continuous_purge()
+        await async_recorder_block_till_done(hass)
+        await async_wait_purge_done(hass)
+
+    assert not progress.running
+    assert progress.rows_to_purge == 1
+    assert progress.rows_purged == 1
+    assert progress.last_completed is not None
+    periodic_db_cleanups.assert_not_called()
+
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 4
+
+
+async def test_purge_task_error_stops_progress(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test an error which is not retried stops the purge progress."""
+    await _add_test_states(hass)
+    progress = recorder_mock.purge_progress
+
+    with patch(
+        "homeassistant.components.recorder.tasks.purge.purge_old_data",
+        side_effect=ValueError("boom"),
+    ):
+        recorder_mock.queue_task(
+            PurgeTask(dt_util.utcnow(), repack=False, apply_filter=False)
+        )
+        await async_recorder_block_till_done(hass)
+        await async_wait_purge_done(hass)
+
+    assert not progress.running
+    assert progress.last_completed is None
+
+
+@pytest.mark.parametrize("recorder_config", [{"continuous_purge": True}])
+async def test_purge_takes_over_continuous_purge(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test a purge started during a continuous purge takes over its progress."""
+    await _add_test_states(hass)
+    progress = recorder_mock.purge_progress
+    progress.states_batch_size = 1
+    # Delete a single state per slice
+    recorder_mock.max_bind_vars = 1
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+
+    with patch(
+        "homeassistant.components.recorder.tasks.purge.estimate_rows_to_purge",
+        wraps=estimate_rows_to_purge,
+    ) as count_rows_mock:
+        recorder_mock.async_continuous_purge()
+        recorder_mock.queue_task(
+            PurgeTask(purge_before, repack=False, apply_filter=False)
+        )
+        # Waits for the running purge instead of starting another one
+        recorder_mock.queue_task(
+            PurgeTask(purge_before, repack=False, apply_filter=False)
+        )
+        await async_recorder_block_till_done(hass)
+        await async_wait_purge_done(hass, 20)
+
+    # Counted once for each purge instead of once per slice
+    assert count_rows_mock.call_count == 3
+    assert not progress.running
+    assert progress.purge_before == purge_before
+    assert progress.slices == 1
+    assert progress.last_completed is not None
+
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 2
+
+
 async def _add_test_states(hass: HomeAssistant, wait_recording_done: bool = True):
     """Add multiple states to the db for testing."""
     utcnow = dt_util.utcnow()
@@ -0,0 +1,336 @@
+"""Test spooling recorder events to disk."""
+
+from pathlib import Path
+import threading
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.exc import SQLAlchemyError
+
+from homeassistant.components.recorder import CONF_SPOOL, history
+from homeassistant.components.recorder.spool import RecorderSpool
+from homeassistant.components.recorder.tasks import SpoolDrainTask
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+from homeassistant.core import Context, Event, EventOrigin, HomeAssistant, State
+from homeassistant.util import dt as dt_util
+
+from .common import async_recorder_block_till_done, async_wait_recording_done
+
+from tests.typing import RecorderInstanceContextManager, RecorderInstanceGenerator
+
+
+@pytest.fixture
+async def mock_recorder_before_hass(
+    async_test_recorder: RecorderInstanceContextManager,
+) -> None:
+    """Set up recorder."""
+
+
+@pytest.fixture
+def spool_config_dir(hass: HomeAssistant, tmp_path: Path) -> Path:
+    """Store the spool in a temporary config directory."""
+    hass.config.config_dir = str(tmp_path)
+    return tmp_path / ".storage" / "recorder_spool"
+
+
+def _as_dicts(data: dict[str, Any]) -> dict[str, Any]:
+    """Return the event data with the states as dicts."""
+    return {
+        key: value.as_dict() if isinstance(value, State) else value
+        for key, value in data.items()
+    }
+
+
+async def test_spool_round_trip(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test events read back from the spool are equal to the spooled events."""
+    spool = RecorderSpool(str(tmp_path))
+    context = Context(user_id="abc", parent_id="01JBFEQ3X2Z9SNNFMHQWJ4TDRK")
+    old_state = State("light.kitchen", "off", {"brightness": 10})
+    new_state = State("light.kitchen", "on", {"brightness": 20}, context=context)
+    events = [
+        Event(
+            "state_changed",
+            {"entity_id": "light.kitchen", "old_state": None, "new_state": old_state},
+        ),
+        Event(
+            "state_changed",
+            {
+                "entity_id": "light.kitchen",
+                "old_state": old_state,
+                "new_state": new_state,
+            },
+            context=context,
+        ),
+        Event(
+            "state_changed",
+            {
+                "entity_id": "light.kitchen",
+                "old_state": State("light.kitchen", "on"),
+                "new_state": None,
+            },
+        ),
+        Event("custom_event", {"a": [1, 2]}, EventOrigin.remote),
+    ]
+    spool.active = True
+    for event in events:
+        spool.async_append(event)
+    (segment,) = spool.async_seal().result()
+
+    spooled_events = list(spool.read_segment(segment))
+    await hass.async_add_executor_job(spool.shutdown)
+
+    assert len(spooled_events) == len(events)
+    for spooled_event, event in zip(spooled_events, events, strict=True):
+        assert spooled_event.event_type == event.event_type
+        assert _as_dicts(spooled_event.data) == _as_dicts(event.data)
+        assert spooled_event.origin is event.origin
+        assert spooled_event.time_fired_timestamp == event.time_fired_timestamp
+        assert spooled_event.context.id == event.context.id
+        assert spooled_event.context.user_id == event.context.user_id
+        assert spooled_event.context.parent_id == event.context.parent_id
+    assert spooled_events[1].data["new_state"].last_updated == new_state.last_updated
+
+    spool.remove_segment(segment)
+    assert spool.sealed_segments() == []
+
+
+async def test_spool_skips_malformed_records(
+    hass: HomeAssistant, tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test an incomplete record left behind by a crash is skipped."""
+    (tmp_path / "00000003.open").write_bytes(
+        b'["custom_event",0,1700000000.0,"01JBFEQ3X2Z9SNNFMHQWJ4TDRK",null,null,{}]\n'
+        b'["custom_event",0,17000'
+    )
+    spool = RecorderSpool(str(tmp_path))
+
+    (segment,) = spool.sealed_segments()
+    assert segment == str(tmp_path / "00000003.open")
+    events = list(spool.read_segment(segment))
+    assert [event.event_type for event in events] == ["custom_event"]
+    assert "Skipping malformed record" in caplog.text
+
+    spool.active = True
+    spool.async_append(Event("custom_event"))
+    assert spool.async_seal().result() == [segment, str(tmp_path / "00000004.seg")]
+    spool.remove_segment(segment)
+    assert spool.sealed_segments() == [str(tmp_path / "00000004.seg")]
+    await hass.async_add_executor_job(spool.shutdown)
+
+
+async def test_spool_shutdown_writes_buffered_events(
+    hass: HomeAssistant, tmp_path: Path
+) -> None:
+    """Test events still buffered at shutdown are read back on the next start."""
+    spool = RecorderSpool(str(tmp_path))
+    spool.active = True
+    spool.async_append(Event("custom_event", {"a": 1}))
+    await hass.async_add_executor_job(spool.shutdown)
+
+    spool = RecorderSpool(str(tmp_path))
+    (segment,) = spool.sealed_segments()
+    assert [event.data for event in spool.read_segment(segment)] == [{"a": 1}]
+
+    # Events buffered after the writer thread was started are written as well
+    spool.async_append(Event("custom_event", {"a": 2}))
+    spool.async_seal().result()
+    spool.async_append(Event("custom_event", {"a": 3}))
+    await hass.async_add_executor_job(spool.shutdown)
+
+    spool = RecorderSpool(str(tmp_path))
+    events = [
+        event.data
+        for segment in spool.sealed_segments()
+        for event in spool.read_segment(segment)
+    ]
+    assert events == [{"a": 1}, {"a": 2}, {"a": 3}]
+
+
+async def test_spool_keeps_one_writer_thread(
+    hass: HomeAssistant, tmp_path: Path
+) -> None:
+    """Test writes after sealing do not run in another thread than the seal."""
+    spool = RecorderSpool(str(tmp_path))
+    seal_started = threading.Event()
+    release_seal = threading.Event()
+    writer_threads: set[int] = set()
+    write = spool._write
+    seal = spool._seal
+
+    def _write(records: list[bytes], seal: bool = False) -> None:
+        writer_threads.add(threading.get_ident())
+        write(records, seal)
+
+    def _slow_seal(records: list[bytes]) -> list[str]:
+        seal_started.set()
+        release_seal.wait(5)
+        return seal(records)
+
+    with (
+        patch.object(spool, "_write", _write),
+        patch.object(spool, "_seal", _slow_seal),
+    ):
+        spool.async_append(Event("custom_event"))
+        sealed = spool.async_seal()
+        await hass.async_add_executor_job(seal_started.wait, 5)
+        # The spool is not active, writes after the seal still wait for it
+        spool.async_append(Event("custom_event"))
+        flushed = spool.async_flush()
+        assert flushed is not None
+        release_seal.set()
+        await hass.async_add_executor_job(flushed.result, 5)
+
+    assert len(sealed.result()) == 1
+    assert len(writer_threads) == 1
+    await hass.async_add_executor_job(spool.shutdown)
+    assert spool._executor is None
+
+
+async def test_recorder_spools_events_while_backlogged(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    spool_config_dir: Path,
+) -> None:
+    """Test events are spooled to disk and inserted once the database caught up."""
+    instance = await async_setup_recorder_instance(hass, {CONF_SPOOL: True})
+    start = dt_util.utcnow()
+
+    with patch("homeassistant.components.recorder.core.SPOOL_QUEUE_BACKLOG", 0):
+        instance._async_check_queue()
+    assert instance._spool is not None
+    assert instance._spool.active
+
+    for idx in range(5):
+        hass.states.async_set("sensor.spooled", str(idx))
+    assert instance.backlog < 5
+    await async_wait_recording_done(hass)
+    # The drain task queues another drain task for the events spooled
+    # while the first one ran
+    await async_recorder_block_till_done(hass)
+    await async_wait_recording_done(hass)
+    assert not instance._spool.active
+
+    hass.states.async_set("sensor.spooled", "live")
+    await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        states = history.get_significant_states_with_session(
+            hass, session, start, None, ["sensor.spooled"]
+        )
+    assert [state.state for state in states["sensor.spooled"]] == [
+        "0",
+        "1",
+        "2",
+        "3",
+        "4",
+        "live",
+    ]
+    assert list(spool_config_dir.iterdir()) == []
+
+
+async def test_recorder_inserts_spooled_events_on_start(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    spool_config_dir: Path,
+) -> None:
+    """Test events left in the spool by a previous run are inserted on start."""
+    start = dt_util.utcnow()
+    spool = RecorderSpool(str(spool_config_dir))
+    spool.active = True
+    state = State("sensor.spooled", "before_restart")
+    spool.async_append(
+        Event(
+            "state_changed",
+            {"entity_id": "sensor.spooled", "old_state": None, "new_state": state},
+        )
+    )
+    spool.async_seal().result()
+    await hass.async_add_executor_job(spool.shutdown)
+
+    await async_setup_recorder_instance(hass, {CONF_SPOOL: True})
+    await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        states = history.get_significant_states_with_session(
+            hass, session, start, None, ["sensor.spooled"]
+        )
+    assert [state.state for state in states["sensor.spooled"]] == ["before_restart"]
+    assert list(spool_config_dir.iterdir()) == []
+
+
+async def test_spool_sealed_on_shutdown(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    spool_config_dir: Path,
+) -> None:
+    """Test the spooled events are kept on disk when Home Assistant stops."""
+    instance = await async_setup_recorder_instance(hass, {CONF_SPOOL: True})
+    await async_wait_recording_done(hass)
+    with patch("homeassistant.components.recorder.core.SPOOL_QUEUE_BACKLOG", 0):
+        instance._async_check_queue()
+    hass.states.async_set("sensor.spooled", "before_stop")
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+    await hass.async_block_till_done()
+
+    assert [path.name for path in spool_config_dir.iterdir()] == ["00000000.seg"]
+    spool = RecorderSpool(str(spool_config_dir))
+    (segment,) = spool.sealed_segments()
+    assert [event.data["entity_id"] for event in spool.read_segment(segment)] == [
+        "sensor.spooled"
+    ]
+
+
+async def test_spool_drain_only_inserts_sealed_segments(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    spool_config_dir: Path,
+) -> None:
+    """Test a drain only inserts the segments sealed when it was queued.
+
+    A segment is only removed once its events are committed.
+    """
+    start = dt_util.utcnow()
+    instance = await async_setup_recorder_instance(hass, {CONF_SPOOL: True})
+    await async_wait_recording_done(hass)
+    spool = instance._spool
+    assert spool is not None
+
+    spool.active = True
+    for idx in range(2):
+        spool.async_append(
+            Event(
+                "state_changed",
+                {
+                    "entity_id": "sensor.spooled",
+                    "old_state": None,
+                    "new_state": State("sensor.spooled", str(idx)),
+                },
+            )
+        )
+        sealed = spool.async_seal()
+        if not idx:
+            first_sealed = sealed
+    await hass.async_add_executor_job(sealed.result)
+    (first_segment,) = first_sealed.result()
+    spool.active = False
+    await hass.async_add_executor_job(spool.shutdown)
+
+    with patch.object(
+        instance, "_commit_event_session", side_effect=SQLAlchemyError("commit failed")
+    ):
+        instance.queue_task(SpoolDrainTask(first_sealed))
+        await async_recorder_block_till_done(hass)
+    assert spool.sealed_segments() == [first_segment, *sealed.result()[1:]]
+
+    instance.queue_task(SpoolDrainTask(first_sealed))
+    await async_wait_recording_done(hass)
+    assert spool.sealed_segments() == sealed.result()[1:]
+
+    with session_scope(hass=hass, read_only=True) as session:
+        states = history.get_significant_states_with_session(
+            hass, session, start, None, ["sensor.spooled"]
+        )
+    assert [state.state for state in states["sensor.spooled"]] == ["0"]
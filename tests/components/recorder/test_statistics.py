@@ -1,6 +1,6 @@
 """The tests for sensor recorder platform."""
 
-from datetime import timedelta
+from datetime import datetime, timedelta
 from typing import Any
 from unittest.mock import ANY, Mock, patch
 
@@ -29,6 +29,7 @@ from homeassistant.components.recorder.statistics import (
     get_metadata,
     get_metadata_with_session,
     get_short_term_statistics_run_cache,
+    get_statistics_rollup_cache,
     list_statistic_ids,
     validate_statistics,
 )
@@ -1844,6 +1845,94 @@ async def test_monthly_statistics_sum(
     assert stats == {}
 
 
+@pytest.mark.freeze_time("2022-10-01 00:00:00+00:00")
+async def test_daily_statistics_rollup_cache(
+    hass: HomeAssistant, setup_recorder: None
+) -> None:
+    """Test daily statistics of sealed periods are read from the rollup cache."""
+    await hass.config.async_set_time_zone("UTC")
+    await async_wait_recording_done(hass)
+
+    zero = dt_util.utcnow()
+    day1 = dt_util.as_utc(dt_util.parse_datetime("2022-10-03 00:00:00"))
+    day2 = day1 + timedelta(days=1)
+    day3 = day1 + timedelta(days=2)
+    external_statistics = [
+        {"start": day + timedelta(hours=hour), "state": idx, "sum": idx}
+        for idx, (day, hour) in enumerate(
+            ((day1, 0), (day1, 23), (day2, 0), (day2, 23), (day3, 0))
+        )
+    ]
+    external_metadata = {
+        "has_mean": False,
+        "has_sum": True,
+        "name": "Total imported energy",
+        "source": "test",
+        "statistic_id": "test:total_energy_import",
+        "unit_of_measurement": "kWh",
+    }
+    async_add_external_statistics(hass, external_metadata, external_statistics)
+    await async_wait_recording_done(hass)
+    # The hourly statistics of the first two days have been compiled
+    get_statistics_rollup_cache(hass).hours_compiled(day1, day3)
+
+    def _expected(sums: list[float]) -> dict[str, list[dict[str, Any]]]:
+        return {
+            "test:total_energy_import": [
+                {
+                    "start": day.timestamp(),
+                    "end": (day + timedelta(days=1)).timestamp(),
+                    "state": _sum,
+                    "sum": _sum,
+                }
+                for day, _sum in zip((day1, day2, day3), sums, strict=False)
+            ]
+        }
+
+    def _daily_statistics(
+        end_time: datetime | None = None,
+    ) -> tuple[dict[str, list[dict[str, Any]]], Mock]:
+        with patch.object(
+            statistics,
+            "_generate_statistics_during_period_stmt",
+            wraps=_generate_statistics_during_period_stmt,
+        ) as stmt_mock:
+            stats = statistics_during_period(
+                hass,
+                zero,
+                end_time,
+                statistic_ids={"test:total_energy_import"},
+                period="day",
+                types={"state", "sum"},
+            )
+        return stats, stmt_mock
+
+    stats, stmt_mock = _daily_statistics()
+    assert stats == _expected([1.0, 3.0, 4.0])
+    assert stmt_mock.call_args[0][0] == zero
+
+    # Only the statistics after the sealed days are queried
+    stats, stmt_mock = _daily_statistics()
+    assert stats == _expected([1.0, 3.0, 4.0])
+    assert stmt_mock.call_args[0][0] == day3
+
+    # The statistics of sealed days are not queried
+    stats, stmt_mock = _daily_statistics(day2 + timedelta(hours=1))
+    assert stats == _expected([1.0, 3.0])
+    stmt_mock.assert_not_called()
+
+    # Importing statistics invalidates the cached days
+    async_add_external_statistics(
+        hass,
+        external_metadata,
+        [{"start": day1 + timedelta(hours=23), "state": 10, "sum": 10}],
+    )
+    await async_wait_recording_done(hass)
+    stats, stmt_mock = _daily_statistics()
+    assert stats == _expected([10.0, 3.0, 4.0])
+    assert stmt_mock.call_args[0][0] == zero
+
+
 def test_cache_key_for_generate_statistics_during_period_stmt() -> None:
     """Test cache key for _generate_statistics_during_period_stmt."""
     stmt = _generate_statistics_during_period_stmt(
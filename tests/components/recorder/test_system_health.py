@@ -14,6 +14,13 @@ from .common import async_wait_recording_done
 from tests.common import get_system_health_info
 from tests.typing import RecorderInstanceGenerator
 
+CACHE_INFO = {
+    "state_attributes_cache": ANY,
+    "event_data_cache": ANY,
+    "states_meta_cache": ANY,
+    "statistics_meta_cache": ANY,
+}
+
 
 @pytest.mark.skip_on_db_engine(["mysql", "postgresql"])
 @pytest.mark.usefixtures("skip_by_db_engine")
@@ -35,7 +42,9 @@ async def test_recorder_system_health(
         "estimated_db_size": ANY,
         "database_engine": SupportedDialect.SQLITE.value,
         "database_version": ANY,
+        **CACHE_INFO,
     }
+    assert info["states_meta_cache"].startswith("100.0% hits, 0 of 0 database")
 
 
 @pytest.mark.parametrize(
@@ -64,6 +73,7 @@ async def test_recorder_system_health_alternate_dbms(
         "estimated_db_size": "1.00 MiB",
         "database_engine": db_engine.value,
         "database_version": ANY,
+        **CACHE_INFO,
     }
 
 
@@ -99,6 +109,7 @@ async def test_recorder_system_health_db_url_missing_host(
         "estimated_db_size": "1.00 MiB",
         "database_engine": db_engine.value,
         "database_version": ANY,
+        **CACHE_INFO,
     }
 
 
@@ -127,4 +138,5 @@ async def test_recorder_system_health_crashed_recorder_runs_table(
         "estimated_db_size": ANY,
         "database_engine": SupportedDialect.SQLITE.value,
         "database_version": ANY,
+        **CACHE_INFO,
     }
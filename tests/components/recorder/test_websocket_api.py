@@ -2564,6 +2564,18 @@ async def test_recorder_info(
         "max_backlog": 65000,
         "migration_in_progress": False,
         "migration_is_live": False,
+        "purge": {
+            "running": False,
+            "purge_before": None,
+            "rows_purged": 0,
+            "rows_remaining": None,
+            "rows_per_second": None,
+            "slices": 0,
+            "last_slice_seconds": None,
+            "states_batch_size": 20,
+            "events_batch_size": 15,
+            "last_completed": None,
+        },
         "recording": True,
         "thread_running": True,
     }
@@ -3,6 +3,7 @@
 from collections.abc import Iterable
 from datetime import datetime, timedelta
 import math
+import random
 from statistics import mean
 from typing import Any, Literal
 from unittest.mock import ANY, patch
@@ -36,6 +37,11 @@ from homeassistant.components.recorder.statistics import (
 )
 from homeassistant.components.recorder.util import get_instance, session_scope
 from homeassistant.components.sensor import ATTR_OPTIONS, DOMAIN, SensorDeviceClass
+from homeassistant.components.sensor.recorder import (
+    _datetime_to_microseconds,
+    _time_weighted_average,
+    _timestamp_to_microseconds,
+)
 from homeassistant.const import ATTR_FRIENDLY_NAME, STATE_UNAVAILABLE
 from homeassistant.core import HomeAssistant, State
 from homeassistant.helpers import issue_registry as ir
@@ -5506,3 +5512,86 @@ async def test_clean_up_repairs(
         ("sensor", "test_issue_1"),
         ("sensor", "test_issue_2"),
     }
+
+
+def _reference_time_weighted_average(
+    fstates: list[tuple[float, State]], start: datetime, end: datetime
+) -> float:
+    """Calculate a time weighted average with datetime arithmetic."""
+    old_fstate: float | None = None
+    old_start_time: datetime | None = None
+    accumulated = 0.0
+    for fstate, state in fstates:
+        start_time = max(state.last_updated, start)
+        if old_start_time is None:
+            start = start_time
+        else:
+            assert old_fstate is not None
+            accumulated += old_fstate * (start_time - old_start_time).total_seconds()
+        old_fstate = fstate
+        old_start_time = start_time
+    if old_fstate is not None:
+        assert old_start_time is not None
+        accumulated += old_fstate * (end - old_start_time).total_seconds()
+    period_seconds = (end - start).total_seconds()
+    if period_seconds == 0:
+        return 0.0
+    return accumulated / period_seconds
+
+
+def test_timestamp_to_microseconds() -> None:
+    """Test timestamps are rounded to microseconds like datetimes."""
+    rng = random.Random(17)
+    timestamps = [
+        # Exactly half a microsecond
+        1735689600.0000005,
+        1735689600.0000015,
+        1735689600.9999995,
+        *(rng.uniform(1.5e9, 1.8e9) for _ in range(10000)),
+    ]
+    for timestamp in timestamps:
+        assert _timestamp_to_microseconds(timestamp) == _datetime_to_microseconds(
+            dt_util.utc_from_timestamp(timestamp)
+        )
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_time_weighted_average_golden(seed: int) -> None:
+    """Test the time weighted average is bit for bit the same as with datetimes."""
+    rng = random.Random(seed)
+    start = dt_util.utc_from_timestamp(rng.uniform(1.5e9, 1.8e9)).replace(microsecond=0)
+    end = start + timedelta(minutes=5)
+    start_ts = start.timestamp()
+    # The first state is the last known state before the period
+    timestamps = sorted(
+        [
+            start_ts - rng.uniform(0, 3600),
+            *(rng.uniform(start_ts, start_ts + 300) for _ in range(rng.randrange(50))),
+        ]
+    )
+    if seed % 4 == 0:
+        # A state at the exact end of the period
+        timestamps = [end.timestamp()]
+    elif seed % 4 == 1:
+        # No last known state before the period
+        timestamps = timestamps[1:] or [start_ts + 1]
+    fvalues = [rng.uniform(-1e6, 1e6) for _ in timestamps]
+    states = [
+        State(
+            "sensor.test",
+            str(fvalue),
+            last_updated=dt_util.utc_from_timestamp(timestamp),
+        )
+        for fvalue, timestamp in zip(fvalues, timestamps, strict=True)
+    ]
+
+    expected = _reference_time_weighted_average(
+        list(zip(fvalues, states, strict=True)), start, end
+    )
+    result = _time_weighted_average(
+        fvalues,
+        [_timestamp_to_microseconds(timestamp) for timestamp in timestamps],
+        _datetime_to_microseconds(start),
+        _datetime_to_microseconds(end),
+    )
+    assert result.hex() == expected.hex()
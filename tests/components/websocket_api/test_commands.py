@@ -1359,6 +1359,51 @@ async def test_render_template_renders_template(
     }
 
 
+async def test_template_render_stats(
+    hass: HomeAssistant,
+    websocket_client: MockHAClientWebSocket,
+    hass_admin_user: MockUser,
+) -> None:
+    """Test the render cost of tracked templates is returned."""
+    hass.states.async_set("light.test", "on")
+
+    await websocket_client.send_json(
+        {
+            "id": 5,
+            "type": "render_template",
+            "template": "State is: {{ states('light.test') }}",
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["result"] == "State is: on"
+
+    await websocket_client.send_json({"id": 6, "type": "template/render_stats"})
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 6
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+    assert msg["result"] == [
+        {
+            "template": "State is: {{ states('light.test') }}",
+            "renders": ANY,
+            "total_time": ANY,
+            "max_time": ANY,
+            "recent_time": ANY,
+            "coalesced": 0,
+            "adaptive_rate_limit": None,
+        }
+    ]
+    assert msg["result"][0]["renders"] >= 1
+
+    hass_admin_user.groups = []
+    await websocket_client.send_json({"id": 7, "type": "template/render_stats"})
+    msg = await websocket_client.receive_json()
+    assert not msg["success"]
+    assert msg["error"]["code"] == const.ERR_UNAUTHORIZED
+
+
 async def test_render_template_with_timeout_and_variables(
     hass: HomeAssistant, websocket_client
 ) -> None:
@@ -0,0 +1,134 @@
+"""Test the Websocket API entity changes hub."""
+
+from unittest.mock import Mock
+
+from homeassistant.components.websocket_api.entity_changes import (
+    async_get_entity_changes_hub,
+    subscription_filter_key,
+)
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import HomeAssistant
+
+from tests.common import MockUser
+from tests.typing import WebSocketGenerator
+
+NO_FILTER = {"include": {}, "exclude": {}}
+
+
+async def test_subscriptions_share_messages(
+    hass: HomeAssistant, hass_admin_user: MockUser
+) -> None:
+    """Test subscriptions with the same filter share a group."""
+    hub = async_get_entity_changes_hub(hass)
+    listeners = hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0)
+    key = subscription_filter_key({"light.kitchen"}, NO_FILTER)
+    send_1 = Mock()
+    send_2 = Mock()
+    send_3 = Mock()
+
+    unsub_1 = hub.async_subscribe(
+        send_1, hass_admin_user, b"5", {"light.kitchen"}, None, key
+    )
+    unsub_2 = hub.async_subscribe(
+        send_2, hass_admin_user, b"5", {"light.kitchen"}, None, key
+    )
+    unsub_3 = hub.async_subscribe(
+        send_3, hass_admin_user, b"6", {"light.kitchen"}, None, key
+    )
+    assert hub.group_count == 1
+    assert hass.bus.async_listeners()[EVENT_STATE_CHANGED] == listeners + 1
+
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.bedroom", "on")
+    await hass.async_block_till_done()
+
+    assert send_1.call_count == 1
+    assert send_2.call_count == 1
+    assert send_3.call_count == 1
+    assert send_1.call_args[0][0] is send_2.call_args[0][0]
+    assert send_1.call_args[0][0] != send_3.call_args[0][0]
+
+    assert send_3.call_args[0][1] == b"6"
+
+    unsub_1()
+    unsub_3()
+    assert hub.group_count == 1
+    unsub_2()
+    assert hub.group_count == 0
+    assert hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0) == listeners
+
+
+async def test_subscription_permissions(
+    hass: HomeAssistant, hass_admin_user: MockUser
+) -> None:
+    """Test permissions are checked for each subscriber in a group."""
+    hub = async_get_entity_changes_hub(hass)
+    key = subscription_filter_key(None, NO_FILTER)
+    user = MockUser().add_to_hass(hass)
+    user.mock_policy({"entities": {"entity_ids": {"light.kitchen": True}}})
+    send_admin = Mock()
+    send_user = Mock()
+
+    hub.async_subscribe(send_admin, hass_admin_user, b"5", None, None, key)
+    hub.async_subscribe(send_user, user, b"5", None, None, key)
+    assert hub.group_count == 1
+
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.bedroom", "on")
+    await hass.async_block_till_done()
+
+    assert send_admin.call_count == 2
+    assert send_user.call_count == 1
+
+
+def test_subscription_filter_key() -> None:
+    """Test equal filters produce equal keys."""
+    assert subscription_filter_key(
+        {"light.a", "light.b"},
+        {"include": {"domains": ["light", "switch"]}, "exclude": {}},
+    ) == subscription_filter_key(
+        {"light.b", "light.a"},
+        {"include": {"domains": ["switch", "light"]}, "exclude": {}},
+    )
+    assert subscription_filter_key(
+        None, {"include": {"domains": ["light"]}, "exclude": {}}
+    ) != subscription_filter_key(
+        None, {"include": {}, "exclude": {"domains": ["light"]}}
+    )
+
+
+async def test_subscribe_entities_grouped(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test subscribe_entities connections with the same filter are grouped."""
+    hass.states.async_set("light.permitted", "off")
+    clients = [await hass_ws_client(hass) for _ in range(3)]
+    for message_id, client in enumerate(clients, 7):
+        await client.send_json(
+            {
+                "id": message_id,
+                "type": "subscribe_entities",
+                "include": {"domains": ["light"]},
+            }
+        )
+        msg = await client.receive_json()
+        assert msg["success"]
+        msg = await client.receive_json()
+        assert msg["event"]["a"]["light.permitted"]["s"] == "off"
+
+    assert async_get_entity_changes_hub(hass).group_count == 1
+
+    hass.states.async_set("switch.ignored", "on")
+    hass.states.async_set("light.permitted", "on")
+    for message_id, client in enumerate(clients, 7):
+        msg = await client.receive_json()
+        assert msg["id"] == message_id
+        assert msg["event"]["c"]["light.permitted"]["+"]["s"] == "on"
+
+    for message_id, client in enumerate(clients, 7):
+        await client.send_json(
+            {"id": 20, "type": "unsubscribe_events", "subscription": message_id}
+        )
+        msg = await client.receive_json()
+        assert msg["success"]
+    assert async_get_entity_changes_hub(hass).group_count == 0
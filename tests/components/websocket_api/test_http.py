@@ -10,12 +10,15 @@ import pytest
 
 from homeassistant.components.websocket_api import (
     async_register_command,
+    async_response,
     const,
     http,
     websocket_command,
 )
 from homeassistant.components.websocket_api.connection import ActiveConnection
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.components.websocket_api.messages import state_diff_message
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, State, callback
 from homeassistant.util.dt import utcnow
 
 from tests.common import async_fire_time_changed
@@ -523,3 +526,218 @@ async def test_binary_message(
     assert "Received binary message for non-existing handler 0" in caplog.text
     assert "Received binary message for non-existing handler 3" in caplog.text
     assert "Received binary message for non-existing handler 10" in caplog.text
+
+
+async def test_pending_bytes_overflow(
+    hass: HomeAssistant, websocket_client: MockHAClientWebSocket
+) -> None:
+    """Test pending bytes overflows."""
+    with patch("homeassistant.components.websocket_api.http.MAX_PENDING_BYTES", 50):
+        for idx in range(10):
+            await websocket_client.send_json({"id": idx + 1, "type": "ping"})
+        msg = await websocket_client.receive()
+    assert msg.type is WSMsgType.CLOSE
+
+
+async def test_pending_bytes_large_message(
+    hass: HomeAssistant, websocket_client: MockHAClientWebSocket
+) -> None:
+    """Test a single message larger than the byte budget is sent."""
+
+    @websocket_command({"type": "large_response"})
+    @callback
+    def async_large_response(
+        hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+    ) -> None:
+        connection.send_event(msg["id"], "x" * 500)
+        connection.send_event(msg["id"], "y")
+        connection.send_result(msg["id"])
+
+    async_register_command(hass, async_large_response)
+
+    with patch("homeassistant.components.websocket_api.http.MAX_PENDING_BYTES", 100):
+        await websocket_client.send_json({"id": 1, "type": "large_response"})
+        msg = await websocket_client.receive_json()
+        assert msg["event"] == "x" * 500
+        msg = await websocket_client.receive_json()
+        assert msg["event"] == "y"
+        msg = await websocket_client.receive_json()
+        assert msg["success"]
+
+
+async def test_pending_bytes_merged_state_diff(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test merged state diffs are accounted with the size they were queued with."""
+    orig_handler = http.WebSocketHandler
+    setup_instance: http.WebSocketHandler | None = None
+
+    def instantiate_handler(*args):
+        nonlocal setup_instance
+        setup_instance = orig_handler(*args)
+        return setup_instance
+
+    with patch(
+        "homeassistant.components.websocket_api.http.WebSocketHandler",
+        instantiate_handler,
+    ):
+        websocket_client = await hass_ws_client()
+
+    instance: http.WebSocketHandler = cast(http.WebSocketHandler, setup_instance)
+    old_state = State("light.kitchen", "off")
+    new_state = State("light.kitchen", "on")
+    merged_state = State("light.kitchen", "on", {"brightness": 20, "color": "red"})
+    message = state_diff_message(b"5", "light.kitchen", old_state, new_state)
+
+    with patch(
+        "homeassistant.components.websocket_api.http.PENDING_MSG_MERGE_STATE_DIFFS", 0
+    ):
+        instance._send_state_diff_message(
+            message,
+            b"5",
+            Event(
+                EVENT_STATE_CHANGED,
+                {
+                    "entity_id": "light.kitchen",
+                    "old_state": old_state,
+                    "new_state": new_state,
+                },
+            ),
+        )
+        instance._send_state_diff_message(
+            state_diff_message(b"5", "light.kitchen", new_state, merged_state),
+            b"5",
+            Event(
+                EVENT_STATE_CHANGED,
+                {
+                    "entity_id": "light.kitchen",
+                    "old_state": new_state,
+                    "new_state": merged_state,
+                },
+            ),
+        )
+        instance._send_message({"id": 6})
+
+    pending_diff = instance._message_queue[0]
+    assert len(pending_diff.message) > len(message)
+    assert instance._pending_bytes == len(message) + len(b'{"id":6}')
+
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["c"]["light.kitchen"]["+"]["a"] == {
+        "brightness": 20,
+        "color": "red",
+    }
+    msg = await websocket_client.receive_json()
+    assert msg == {"id": 6}
+    assert instance._pending_bytes == 0
+
+
+async def test_wait_drained(
+    hass: HomeAssistant, websocket_client: MockHAClientWebSocket
+) -> None:
+    """Test waiting for the client to read a message larger than the byte budget."""
+    drained = False
+
+    @websocket_command({"type": "large_response"})
+    @async_response
+    async def async_large_response(
+        hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+    ) -> None:
+        nonlocal drained
+        connection.send_event(msg["id"], "x" * 500)
+        await connection.wait_drained()
+        drained = True
+        connection.send_result(msg["id"])
+
+    async_register_command(hass, async_large_response)
+
+    with (
+        patch("homeassistant.components.websocket_api.http.MAX_PENDING_BYTES", 50),
+        patch("homeassistant.components.websocket_api.http.PENDING_BYTES_DRAINED", 10),
+    ):
+        await websocket_client.send_json({"id": 1, "type": "large_response"})
+        msg = await websocket_client.receive_json()
+        assert msg["event"] == "x" * 500
+        msg = await websocket_client.receive_json()
+
+    assert msg["success"]
+    assert drained
+
+
+async def test_state_diffs_merged_when_behind(
+    hass: HomeAssistant, websocket_client: MockHAClientWebSocket
+) -> None:
+    """Test queued state diffs of an entity are merged while the client is behind."""
+    hass.states.async_set("light.kitchen", "off", {"brightness": 10})
+    await websocket_client.send_json(
+        {"id": 1, "type": "subscribe_entities", "entity_ids": ["light.kitchen"]}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["a"]["light.kitchen"]["s"] == "off"
+
+    with patch(
+        "homeassistant.components.websocket_api.http.PENDING_MSG_MERGE_STATE_DIFFS", 0
+    ):
+        hass.states.async_set("light.kitchen", "on", {"brightness": 20})
+        hass.states.async_set("light.kitchen", "off", {"brightness": 30, "color": 1})
+        hass.states.async_set("light.kitchen", "on", {"color": 2})
+        msg = await websocket_client.receive_json()
+
+    assert msg["id"] == 1
+    diff = msg["event"]["c"]["light.kitchen"]
+    assert diff["+"]["s"] == "on"
+    assert diff["+"]["a"] == {"color": 2}
+    assert diff["-"] == {"a": ["brightness"]}
+
+    await websocket_client.send_json({"id": 2, "type": "ping"})
+    msg = await websocket_client.receive_json()
+    assert msg == {"id": 2, "type": "pong"}
+
+
+async def test_batch_window(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test messages are batched when the client enables a batch window."""
+    orig_handler = http.WebSocketHandler
+    setup_instance: http.WebSocketHandler | None = None
+
+    def instantiate_handler(*args):
+        nonlocal setup_instance
+        setup_instance = orig_handler(*args)
+        return setup_instance
+
+    with patch(
+        "homeassistant.components.websocket_api.http.WebSocketHandler",
+        instantiate_handler,
+    ):
+        websocket_client = await hass_ws_client()
+
+    instance: http.WebSocketHandler = cast(http.WebSocketHandler, setup_instance)
+
+    await websocket_client.send_json(
+        {
+            "id": 1,
+            "type": "supported_features",
+            "features": {
+                const.FEATURE_COALESCE_MESSAGES: 1,
+                const.FEATURE_BATCH_WINDOW: 60000,
+            },
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    instance._send_message({"id": 2})
+    instance._send_message({"id": 3})
+    await asyncio.sleep(0)
+    # The batch window is capped to one second
+    assert instance._batch_release_handle is not None
+    assert instance._batch_release_handle.when() - hass.loop.time() <= 1
+
+    with patch("homeassistant.components.websocket_api.http.BATCH_MAX_BYTES", 20):
+        instance._send_message({"id": 4})
+
+    assert instance._batch_release_handle is None
+    assert await websocket_client.receive_str() == '[{"id":2},{"id":3},{"id":4}]'
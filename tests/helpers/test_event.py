@@ -30,6 +30,7 @@ from homeassistant.helpers.event import (
     TrackTemplate,
     TrackTemplateResult,
     async_call_later,
+    async_get_template_render_stats,
     async_track_device_registry_updated_event,
     async_track_entity_registry_updated_event,
     async_track_point_in_time,
@@ -2476,6 +2477,147 @@ async def test_track_template_rate_limit(hass: HomeAssistant) -> None:
     info.async_remove()
 
 
+async def test_track_template_rate_limit_adaptive(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test slow domain wide templates are rate limited by their render time."""
+    template_refresh = Template("{{ states | count }}", hass)
+
+    refresh_runs = []
+
+    @ha.callback
+    def refresh_listener(
+        event: Event[EventStateChangedData] | None,
+        updates: list[TrackTemplateResult],
+    ) -> None:
+        refresh_runs.append(updates.pop().result)
+
+    info = async_track_template_result(
+        hass, [TrackTemplate(template_refresh, None)], refresh_listener
+    )
+    await hass.async_block_till_done()
+    stats = info.render_stats[template_refresh]
+    assert stats.renders == 1
+    assert stats.adaptive_rate_limit is None
+
+    # Pretend rendering the template has been taking 50ms
+    stats.renders = 10
+    stats.recent_time = 0.05
+    assert stats.adaptive_rate_limit == pytest.approx(5)
+
+    hass.states.async_set("sensor.one", "any")
+    await hass.async_block_till_done()
+    assert refresh_runs == [1]
+    hass.states.async_set("sensor.two", "any")
+    await hass.async_block_till_done()
+    assert refresh_runs == [1]
+
+    # The domain rate limit has passed but the adaptive one has not
+    freezer.tick(timedelta(seconds=2))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert refresh_runs == [1]
+
+    freezer.tick(timedelta(seconds=3))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert refresh_runs == [1, 2]
+
+    info.async_remove()
+
+
+async def test_track_template_result_coalesces_state_changes(
+    hass: HomeAssistant,
+) -> None:
+    """Test domain state changes in the same event loop iteration render once."""
+    template_refresh = Template("{{ states.sensor | count }}", hass)
+
+    refresh_runs = []
+
+    @ha.callback
+    def refresh_listener(
+        event: Event[EventStateChangedData] | None,
+        updates: list[TrackTemplateResult],
+    ) -> None:
+        refresh_runs.append(updates.pop().result)
+
+    info = async_track_template_result(
+        hass, [TrackTemplate(template_refresh, None)], refresh_listener
+    )
+    await hass.async_block_till_done()
+
+    hass.states.async_set("sensor.one", "1")
+    hass.states.async_set("sensor.two", "2")
+    hass.states.async_set("sensor.three", "3")
+    await hass.async_block_till_done()
+
+    assert refresh_runs == [3]
+    stats = info.render_stats[template_refresh]
+    assert stats.renders == 2
+    assert stats.coalesced == 2
+    assert stats.total_time > 0
+    assert stats.max_time > 0
+
+    assert async_get_template_render_stats(hass) == [(template_refresh, stats)]
+    info.async_remove()
+    assert async_get_template_render_stats(hass) == []
+
+
+async def test_track_template_result_coalesced_event(hass: HomeAssistant) -> None:
+    """Test the action gets the state change a coalesced render was for."""
+    template_refresh = Template("{{ states.sensor | count }}", hass)
+    template_other = Template("{{ states.light | count }}", hass)
+
+    refresh_runs = []
+
+    @ha.callback
+    def refresh_listener(
+        event: Event[EventStateChangedData] | None,
+        updates: list[TrackTemplateResult],
+    ) -> None:
+        refresh_runs.append(
+            (event.data["entity_id"], [update.result for update in updates])
+        )
+
+    info = async_track_template_result(
+        hass,
+        [TrackTemplate(template_refresh, None), TrackTemplate(template_other, None)],
+        refresh_listener,
+    )
+    await hass.async_block_till_done()
+
+    hass.states.async_set("sensor.one", "1")
+    hass.states.async_set("sensor.two", "2")
+    hass.states.async_set("light.other", "on")
+    await hass.async_block_till_done()
+
+    assert refresh_runs == [("sensor.two", [2]), ("light.other", [1])]
+    info.async_remove()
+
+
+async def test_track_template_result_referenced_entity_not_coalesced(
+    hass: HomeAssistant,
+) -> None:
+    """Test every state of a referenced entity is rendered."""
+    template_condition = Template("{{ is_state('switch.test', 'on') }}", hass)
+    hass.states.async_set("switch.test", "off")
+
+    runs = []
+
+    @ha.callback
+    def run_callback(entity_id, old_state, new_state):
+        runs.append(new_state.state)
+
+    async_track_template(hass, template_condition, run_callback)
+
+    # The condition is only true until the next callback of the event loop
+    hass.states.async_set("switch.test", "on")
+    hass.loop.call_soon(hass.states.async_set, "switch.test", "off")
+    await hass.async_block_till_done()
+
+    assert runs == ["on"]
+
+
 async def test_track_template_rate_limit_super(hass: HomeAssistant) -> None:
     """Test template rate limit with super template."""
     template_availability = Template(
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from collections.abc import Iterable
 from datetime import datetime, timedelta
+import gc
 import json
 import logging
 import math
@@ -13,6 +14,7 @@ from typing import Any
 from unittest.mock import patch
 
 from freezegun import freeze_time
+from freezegun.api import FrozenDateTimeFactory
 import orjson
 import pytest
 from syrupy import SnapshotAssertion
@@ -6601,3 +6603,246 @@ async def test_merge_response_not_mutate_original_object(
 
     tpl = template.Template(_template, hass)
     assert tpl.async_render()
+
+
+async def test_bytecode_cache(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test compiled templates are persisted across restarts."""
+    await template.async_load_custom_templates(hass)
+    bytecode_cache = template.async_get_bytecode_cache(hass)
+    assert bytecode_cache.hit_rate is None
+
+    assert template.Template("{{ 1 + 1 }}", hass).async_render() == 2
+    assert bytecode_cache.misses == 1
+    assert bytecode_cache.hits == 0
+    await hass.async_block_till_done()
+
+    freezer.tick(template.BYTECODE_CACHE_SAVE_DELAY + 1)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert (
+        len(hass_storage[template.BYTECODE_CACHE_STORAGE_KEY]["data"]["templates"]) == 1
+    )
+
+    # Simulate a restart
+    hass.data.pop(template._BYTECODE_CACHE)
+    hass.data.pop(template._ENVIRONMENT)
+    template.async_get_bytecode_cache.cache_clear()
+    await template.async_load_custom_templates(hass)
+    bytecode_cache = template.async_get_bytecode_cache(hass)
+
+    assert template.Template("{{ 1 + 1 }}", hass).async_render() == 2
+    assert bytecode_cache.hits == 1
+    assert bytecode_cache.misses == 0
+    assert bytecode_cache.hit_rate == 1.0
+
+    # Limited environments don't share the code compiled by the full one
+    template.TemplateEnvironment(hass, limited=True).compile("{{ 1 + 1 }}")
+    assert bytecode_cache.hits == 1
+    assert bytecode_cache.misses == 1
+
+
+async def test_bytecode_cache_invalidated(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test the bytecode cache is dropped when it is no longer valid."""
+    hass_storage[template.BYTECODE_CACHE_STORAGE_KEY] = {
+        "version": template.BYTECODE_CACHE_STORAGE_VERSION,
+        "key": template.BYTECODE_CACHE_STORAGE_KEY,
+        "data": {"cache_key": "0.0.0", "templates": {"abc": "def"}},
+    }
+    bytecode_cache = template.async_get_bytecode_cache(hass)
+    await bytecode_cache.async_load({})
+    assert bytecode_cache._stored == {}
+
+    assert template.Template("{{ 2 + 2 }}", hass).async_render() == 4
+    assert bytecode_cache._used
+
+    # Changed custom templates drop the cache
+    await bytecode_cache.async_load({"test.jinja": "{% set a = 1 %}"})
+    assert not bytecode_cache._used
+    assert bytecode_cache.get("{{ 2 + 2 }}", "00") is None
+
+
+async def test_bytecode_cache_bounded(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test templates in use are kept and only the recent unused ones."""
+    await template.async_load_custom_templates(hass)
+    bytecode_cache = template.async_get_bytecode_cache(hass)
+
+    with patch.object(template, "BYTECODE_CACHE_MAX_UNUSED_TEMPLATES", 2):
+        # More templates in use than the number of unused ones kept
+        templates = [
+            template.Template(f"{{{{ {value} }}}}", hass) for value in range(5)
+        ]
+        for tpl in templates:
+            tpl.async_render()
+        assert len(bytecode_cache._data_to_save()["templates"]) == 5
+
+        del templates, tpl
+        gc.collect()
+        for value in range(5, 8):
+            template.Template(f"{{{{ {value} }}}}", hass).async_render()
+        gc.collect()
+        assert len(bytecode_cache._data_to_save()["templates"]) == 2
+        assert bytecode_cache.get("{{ 0 }}", "00") is None
+        assert bytecode_cache.get("{{ 7 }}", "00") is not None
+
+        # Unused templates are pruned as they are added
+        for value in range(8, 20):
+            template.Template(f"{{{{ {value} }}}}", hass).async_render()
+        gc.collect()
+        assert len(bytecode_cache._used) <= 5
+
+
+@pytest.mark.parametrize(
+    "template_str",
+    [
+        "{{ states('sensor.power') | float * 2 }}",
+        "{{ states('sensor.power') | float(default=0) + 1 }} W",
+        "{{ states('sensor.missing') | float(0) }}",
+        "{{ is_state('light.a', 'on') and is_state('light.b', 'on') }}",
+        "{{ is_state('light.a', 'on') or is_state('light.b', 'on') }}",
+        "{{ not is_state('light.a', 'on') }}",
+        "{{ state_attr('light.a', 'brightness') }}",
+        "{{ is_state_attr('light.a', 'brightness', 100) }}",
+        "{{ has_value('sensor.power') }}",
+        "{{ states.sensor.power.state }}",
+        "{{ states.light.a.attributes['brightness'] }}",
+        "{{ 0 < states('sensor.power') | int < 100 }}",
+        "{{ 'on' if is_state('light.a', 'on') else 'off' }}",
+        "{{ states('sensor.power') ~ ' W' }}",
+        "{{ -(states('sensor.power') | float) // 3 % 5 }}",
+        "{{ states('light.a') in ['on', 'off'] }}",
+        "{{ states('light.b') not in ('on', 'off') }}",
+    ],
+)
+async def test_fast_path_render(hass: HomeAssistant, template_str: str) -> None:
+    """Test the fast path renders the same result and info as Jinja."""
+    hass.states.async_set("sensor.power", "42.5")
+    hass.states.async_set("light.a", "on", {"brightness": 100})
+    hass.states.async_set("light.b", "off")
+
+    fast_tpl = template.Template(template_str, hass)
+    fast_info = fast_tpl.async_render_to_info()
+    assert fast_tpl._fast_path is not None
+
+    jinja_tpl = template.Template(template_str, hass)
+    jinja_tpl._ensure_compiled()
+    jinja_tpl._fast_path = None
+    jinja_info = jinja_tpl.async_render_to_info()
+
+    assert fast_info.result() == jinja_info.result()
+    assert fast_info.entities == jinja_info.entities
+    assert fast_info.domains == jinja_info.domains
+    assert fast_info.all_states == jinja_info.all_states
+    assert fast_info.rate_limit == jinja_info.rate_limit
+
+
+@pytest.mark.parametrize(
+    "template_str",
+    [
+        "{% if is_state('light.a', 'on') %}on{% endif %}",
+        "{{ value }}",
+        "{{ 1 }}{% set a = 1 %}",
+        "{{ 2 ** 100 }}",
+        "{{ states | list }}",
+        "{{ now() }}",
+    ],
+)
+async def test_fast_path_unsupported(hass: HomeAssistant, template_str: str) -> None:
+    """Test templates outside of the fast path subset are rendered by Jinja."""
+    tpl = template.Template(template_str, hass)
+    tpl.async_render(variables={"value": 1})
+    assert tpl._fast_path is None
+
+
+async def test_fast_path_shadowed_by_variables(hass: HomeAssistant) -> None:
+    """Test the fast path is skipped when variables shadow a global."""
+    hass.states.async_set("sensor.power", "42")
+
+    tpl = template.Template("{{ states('sensor.power') }}", hass)
+    assert tpl.async_render() == 42
+    assert tpl._fast_path is not None
+    assert tpl.async_render({"states": lambda entity_id: "shadowed"}) == "shadowed"
+    assert tpl.async_render({"other": 1}) == 42
+
+
+async def test_fast_path_errors(hass: HomeAssistant) -> None:
+    """Test errors raised by the fast path are wrapped like Jinja errors."""
+    tpl = template.Template("{{ states('sensor.power') | float }}", hass)
+    info = tpl.async_render_to_info()
+    assert tpl._fast_path is not None
+    assert isinstance(info.exception, TemplateError)
+    assert "float got invalid input 'unknown'" in str(info.exception)
+    assert info.entities == {"sensor.power"}
+
+
+async def test_fast_path_parses_template_once(hass: HomeAssistant) -> None:
+    """Test the fast path is built from the tree the template compiled from."""
+    await template.async_load_custom_templates(hass)
+    fast_str = "{{ states('sensor.fast_once') }}"
+    jinja_str = "{% if true %}{{ states('sensor.jinja_once') }}{% endif %}"
+    with patch.object(
+        template.TemplateEnvironment,
+        "parse",
+        autospec=True,
+        side_effect=template.TemplateEnvironment.parse,
+    ) as mock_parse:
+        fast_tpl = template.Template(fast_str, hass)
+        fast_tpl.async_render()
+        jinja_tpl = template.Template(jinja_str, hass)
+        jinja_tpl.async_render()
+    assert fast_tpl._fast_path is not None
+    assert jinja_tpl._fast_path is None
+    assert mock_parse.call_count == 2
+
+    # Code loaded from the bytecode cache is not parsed again
+    template._FAST_PATH_NODES.clear()
+    hass.data.pop(template._ENVIRONMENT)
+    with patch.object(
+        template.TemplateEnvironment,
+        "parse",
+        autospec=True,
+        side_effect=template.TemplateEnvironment.parse,
+    ) as mock_parse:
+        fast_tpl = template.Template(fast_str, hass)
+        fast_tpl.async_render()
+        jinja_tpl = template.Template(jinja_str, hass)
+        jinja_tpl.async_render()
+    assert fast_tpl._fast_path is not None
+    assert jinja_tpl._fast_path is None
+    assert mock_parse.call_count == 0
+    assert fast_tpl.async_render() == "unknown"
+
+
+@pytest.mark.parametrize(
+    "template_str",
+    [
+        "{{ states('sensor.power') | float(default=0) + 1 }} W",
+        "{{ 0 < states('sensor.power') | int < 100 }}",
+        "{{ states.light.a.attributes['brightness'] }}",
+        "{{ 'on' if is_state('light.a', 'on') else 'off' }}",
+        "{{ states('light.b') not in ('on', 'off', 1.5, none) }}",
+    ],
+)
+async def test_bytecode_cache_fast_path_node(
+    hass: HomeAssistant, template_str: str
+) -> None:
+    """Test the fast path node is stored with the compiled code."""
+    await template.async_load_custom_templates(hass)
+    tpl = template.Template(template_str, hass)
+    tpl.ensure_valid()
+    node = template._FAST_PATH_NODES[tpl._compiled_code]
+    assert node is not None
+
+    bytecode_cache = template.async_get_bytecode_cache(hass)
+    bytecode_cache._stored = bytecode_cache._data_to_save()["templates"]
+    bytecode_cache._used.clear()
+    _, cached_node = bytecode_cache.get(template_str, "00")
+    assert cached_node == node
+    assert cached_node is not node
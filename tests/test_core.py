@@ -8,6 +8,7 @@ from datetime import datetime, timedelta
 import functools
 import gc
 import logging
+import math
 import os
 import re
 import threading
@@ -1165,6 +1166,115 @@ async def test_eventbus_filtered_listener(hass: HomeAssistant) -> None:
     unsub()
 
 
+async def test_eventbus_indexed_listener(hass: HomeAssistant) -> None:
+    """Test indexed listeners only see matching state events."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event.data["entity_id"])
+
+    filterable_job = (ha.HassJob(listener), None)
+    old_count = hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0)
+    unsub_entity = hass.bus._async_listen_indexed(
+        EVENT_STATE_CHANGED, filterable_job, entity_id="light.kitchen"
+    )
+    unsub_same_job = hass.bus._async_listen_indexed(
+        EVENT_STATE_CHANGED, filterable_job, entity_id="light.bedroom"
+    )
+    unsub_domain = hass.bus._async_listen_indexed(
+        EVENT_STATE_CHANGED, (ha.HassJob(listener), None), domain="switch"
+    )
+    assert hass.bus.async_listeners()[EVENT_STATE_CHANGED] == old_count + 2
+
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.bedroom", "on")
+    hass.states.async_set("light.office", "on")
+    hass.states.async_set("switch.fan", "on")
+    # State events fired without an entity_id don't reach indexed listeners
+    hass.bus.async_fire(EVENT_STATE_CHANGED, {})
+    await hass.async_block_till_done()
+    assert calls == ["light.kitchen", "light.bedroom", "switch.fan"]
+
+    unsub_entity()
+    unsub_same_job()
+    unsub_domain()
+    assert hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0) == old_count
+
+    calls.clear()
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("switch.fan", "off")
+    await hass.async_block_till_done()
+    assert calls == []
+
+    with pytest.raises(HomeAssistantError, match="can not be indexed"):
+        hass.bus._async_listen_indexed("test", filterable_job, entity_id="a.b")
+    with pytest.raises(HomeAssistantError, match="entity_id or domain is required"):
+        hass.bus._async_listen_indexed(EVENT_STATE_CHANGED, filterable_job)
+
+
+async def test_eventbus_indexed_listener_malformed_entity_id(
+    hass: HomeAssistant,
+) -> None:
+    """Test state events with a malformed entity_id still reach the listeners."""
+    calls = []
+    domain_calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event.data["entity_id"])
+
+    @ha.callback
+    def domain_listener(event):
+        """Mock domain listener."""
+        domain_calls.append(event.data["entity_id"])
+
+    unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, listener)
+    unsub_domain = hass.bus._async_listen_indexed(
+        EVENT_STATE_CHANGED, (ha.HassJob(domain_listener), None), domain="switch"
+    )
+
+    hass.bus.async_fire(EVENT_STATE_CHANGED, {"entity_id": "foo"})
+    hass.bus.async_fire(EVENT_STATE_CHANGED, {"entity_id": ".foo"})
+    hass.bus.async_fire(EVENT_STATE_CHANGED, {"entity_id": "switch.fan"})
+    await hass.async_block_till_done()
+    assert calls == ["foo", ".foo", "switch.fan"]
+    assert domain_calls == ["switch.fan"]
+
+    unsub()
+    unsub_domain()
+
+
+async def test_eventbus_fan_out(hass: HomeAssistant) -> None:
+    """Test the event bus counts dispatched jobs per event type."""
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+
+    hass.bus.async_listen("test_fan_out", listener)
+    hass.bus.async_listen("test_fan_out", listener)
+    hass.bus.async_listen(
+        "test_fan_out", listener, event_filter=ha.callback(lambda data: False)
+    )
+    # Only counted once counting is started
+    hass.bus.async_fire("test_fan_out", {})
+    await hass.async_block_till_done()
+    assert hass.bus.async_fan_out() == {}
+
+    hass.bus.async_count_fan_out(True)
+    hass.bus.async_fire("test_fan_out", {})
+    hass.bus.async_fire("test_fan_out", {})
+    await hass.async_block_till_done()
+    assert hass.bus.async_fan_out()["test_fan_out"] == 4
+
+    hass.bus.async_count_fan_out(False)
+    hass.bus.async_fire("test_fan_out", {})
+    assert hass.bus.async_fan_out() == {}
+
+
 async def test_eventbus_run_immediately_callback(hass: HomeAssistant) -> None:
     """Test we can call events immediately with a callback."""
     calls = []
@@ -3309,3 +3419,111 @@ async def test_async_set_updates_last_reported(hass: HomeAssistant) -> None:
         assert state.last_reported_timestamp != last_reported_timestamp
         last_reported = state.last_reported
         last_reported_timestamp = state.last_reported_timestamp
+
+
+async def test_statemachine_interns_attributes(hass: HomeAssistant) -> None:
+    """Test identical attributes are shared between states."""
+    hass.states.async_set("sensor.one", "1", {"unit_of_measurement": "W"})
+    hass.states.async_set("sensor.two", "2", {"unit_of_measurement": "W"})
+    hass.states.async_set("sensor.three", "3", {"unit_of_measurement": 1})
+    hass.states.async_set("sensor.four", "4", {"unit_of_measurement": True})
+    hass.states.async_set("sensor.five", "5", {"options": ["a"]})
+    hass.states.async_set("sensor.six", "6", {"options": ["a"]})
+
+    one = hass.states.get("sensor.one")
+    two = hass.states.get("sensor.two")
+    assert one.attributes is two.attributes
+    assert isinstance(one.attributes, ReadOnlyDict)
+
+    # Equal values with different types are not shared
+    three = hass.states.get("sensor.three")
+    four = hass.states.get("sensor.four")
+    assert three.attributes is not four.attributes
+    assert four.attributes["unit_of_measurement"] is True
+
+    # The types of values nested in tuples are part of the key as well
+    hass.states.async_set("sensor.seven", "7", {"position": (0, 0)})
+    hass.states.async_set("sensor.eight", "8", {"position": (0.0, 0.0)})
+    hass.states.async_set("sensor.nine", "9", {"position": (0, 0)})
+    seven = hass.states.get("sensor.seven")
+    eight = hass.states.get("sensor.eight")
+    assert seven.attributes is not eight.attributes
+    assert type(eight.attributes["position"][0]) is float
+    assert seven.attributes is hass.states.get("sensor.nine").attributes
+    hass.states.async_set("sensor.seven", "7", {"position": (1,)})
+    hass.states.async_set("sensor.eight", "8", {"position": (True,)})
+    assert hass.states.get("sensor.eight").attributes["position"][0] is True
+
+    # Negative zeros equal 0.0 but serialize differently
+    hass.states.async_set("sensor.seven", "7", {"t": 0.0, "position": (0.0,)})
+    hass.states.async_set("sensor.eight", "8", {"t": -0.0, "position": (0.0,)})
+    hass.states.async_set("sensor.nine", "9", {"t": 0.0, "position": (-0.0,)})
+    assert math.copysign(1.0, hass.states.get("sensor.eight").attributes["t"]) < 0
+    assert (
+        math.copysign(1.0, hass.states.get("sensor.nine").attributes["position"][0]) < 0
+    )
+    assert hass.states.get("sensor.eight").as_dict_json.count(b"-0.0") == 1
+
+    # Attributes with values other than scalars or tuples of scalars
+    # are not interned
+    hass.states.async_set("sensor.seven", "7", {"position": ((0, 0),)})
+    hass.states.async_set("sensor.eight", "8", {"position": ((0, 0),)})
+    assert (
+        hass.states.get("sensor.seven").attributes
+        is not hass.states.get("sensor.eight").attributes
+    )
+    five = hass.states.get("sensor.five")
+    six = hass.states.get("sensor.six")
+    assert five.attributes == six.attributes
+    assert five.attributes is not six.attributes
+    assert isinstance(five.attributes, ReadOnlyDict)
+
+    # Attributes of previous states are shared again
+    hass.states.async_set("sensor.one", "1", {"unit_of_measurement": "kW"})
+    hass.states.async_set("sensor.one", "1", {"unit_of_measurement": "W"})
+    assert hass.states.get("sensor.one").attributes is two.attributes
+
+    # Typical sensor attributes are interned
+    attributes = {
+        "state_class": "measurement",
+        "unit_of_measurement": "W",
+        "device_class": "power",
+        "friendly_name": "Power",
+        "icon": "mdi:flash",
+        "attribution": "Data provided by the meter",
+        "min": 0,
+        "max": 5000.0,
+    }
+    hass.states.async_set("sensor.one", "1", attributes)
+    hass.states.async_set("sensor.two", "2", attributes)
+    assert (
+        hass.states.get("sensor.one").attributes
+        is hass.states.get("sensor.two").attributes
+    )
+
+    # Larger attributes are not interned
+    attributes = {**attributes, "step": 1}
+    hass.states.async_set("sensor.one", "1", attributes)
+    hass.states.async_set("sensor.two", "2", attributes)
+    assert (
+        hass.states.get("sensor.one").attributes
+        is not hass.states.get("sensor.two").attributes
+    )
+
+
+async def test_state_expire_drops_caches(hass: HomeAssistant) -> None:
+    """Test expiring a state drops caches only used by current states."""
+    hass.states.async_set("light.bowl", "on", {"brightness": 255})
+    state = hass.states.get("light.bowl")
+    as_dict_json = state.as_dict_json
+    compressed_state = state.as_compressed_state
+    state.as_compressed_state_json  # noqa: B018
+    state.as_dict()
+
+    hass.states.async_set("light.bowl", "off")
+
+    assert "as_compressed_state" not in state._cache
+    assert "as_compressed_state_json" not in state._cache
+    assert "_as_read_only_dict" not in state._cache
+    assert state.as_dict_json is as_dict_json
+    assert state.as_compressed_state == compressed_state
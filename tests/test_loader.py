@@ -9,6 +9,7 @@ from typing import Any
 from unittest.mock import MagicMock, patch
 
 from awesomeversion import AwesomeVersion
+from freezegun.api import FrozenDateTimeFactory
 import pytest
 
 from homeassistant import loader
@@ -17,9 +18,15 @@ from homeassistant.components.hue import light as hue_light
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import frame
 from homeassistant.helpers.json import json_dumps
+from homeassistant.setup import async_get_import_timings
 from homeassistant.util.json import json_loads
 
-from .common import MockModule, async_get_persistent_notifications, mock_integration
+from .common import (
+    MockModule,
+    async_fire_time_changed,
+    async_get_persistent_notifications,
+    mock_integration,
+)
 
 
 async def test_circular_component_dependencies(hass: HomeAssistant) -> None:
@@ -235,6 +242,69 @@ async def test_get_integration(hass: HomeAssistant) -> None:
     assert hue_light == integration.get_platform("light")
 
 
+async def test_manifest_cache(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test built-in integrations are resolved from the manifest cache."""
+    hass.data[loader.DATA_MANIFEST_CACHE] = loader.ManifestCache(hass)
+    integration = await loader.async_get_integration(hass, "hue")
+    freezer.tick(loader.MANIFEST_CACHE_SAVE_DELAY)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert loader.MANIFEST_CACHE_STORAGE_KEY in hass_storage
+
+    # Next start
+    hass.data[loader.DATA_INTEGRATIONS] = {}
+    hass.data[loader.DATA_MANIFEST_CACHE] = loader.ManifestCache(hass)
+    with patch.object(
+        loader.Integration,
+        "resolve_from_root",
+        wraps=loader.Integration.resolve_from_root,
+    ) as mock_resolve:
+        cached = await loader.async_get_integration(hass, "hue")
+    assert not mock_resolve.called
+    assert cached is not integration
+    assert cached.manifest == integration.manifest
+    assert cached.file_path == integration.file_path
+    assert cached.platforms_exists(["light", "not_a_platform"]) == ["light"]
+    assert hue == cached.get_component()
+    assert not hass.data[loader.DATA_MANIFEST_CACHE].dirty
+
+    # Integrations resolved later are saved as well
+    with patch.object(
+        loader.Integration,
+        "resolve_from_root",
+        wraps=loader.Integration.resolve_from_root,
+    ) as mock_resolve:
+        await loader.async_get_integration(hass, "http")
+    assert mock_resolve.called
+    freezer.tick(loader.MANIFEST_CACHE_SAVE_DELAY)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert set(
+        hass_storage[loader.MANIFEST_CACHE_STORAGE_KEY]["data"]["integrations"]
+    ) == {"hue", "http"}
+
+    # The cache is discarded when Home Assistant is upgraded
+    hass.data[loader.DATA_INTEGRATIONS] = {}
+    with patch.object(loader, "HA_VERSION", "2099.1.0"):
+        hass.data[loader.DATA_MANIFEST_CACHE] = loader.ManifestCache(hass)
+    with patch.object(
+        loader.Integration,
+        "resolve_from_root",
+        wraps=loader.Integration.resolve_from_root,
+    ) as mock_resolve:
+        await loader.async_get_integration(hass, "hue")
+    assert mock_resolve.called
+    # Pending changes are written when Home Assistant stops
+    await hass.async_stop(force=True)
+    data = hass_storage[loader.MANIFEST_CACHE_STORAGE_KEY]["data"]
+    assert set(data["integrations"]) == {"hue"}
+    assert data["key"].startswith("2099.1.0:")
+
+
 async def test_async_get_component(hass: HomeAssistant) -> None:
     """Test resolving integration."""
     with pytest.raises(loader.IntegrationNotLoaded):
@@ -1381,6 +1451,32 @@ async def test_async_get_component_preloads_config_and_config_flow(
     }
 
 
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_import_timings(hass: HomeAssistant) -> None:
+    """Test the time it took to import the modules of an integration is recorded."""
+    integration = await loader.async_get_integration(
+        hass, "test_package_loaded_executor"
+    )
+    pkg_path = integration.pkg_path
+    with patch.dict(
+        "sys.modules",
+        {
+            name: module
+            for name, module in sys.modules.items()
+            if not name.startswith(pkg_path)
+        },
+        clear=True,
+    ):
+        await integration.async_get_component()
+        await integration.async_get_platform("light")
+        # Modules which were already imported are not recorded again
+        await integration.async_get_component()
+
+    import_timings = async_get_import_timings(hass)
+    assert {pkg_path, f"{pkg_path}.light"} <= import_timings.keys()
+    assert all(seconds >= 0 for seconds in import_timings.values())
+
+
 @pytest.mark.usefixtures("enable_custom_integrations")
 async def test_async_get_component_loads_loop_if_already_in_sys_modules(
     hass: HomeAssistant, caplog: pytest.LogCaptureFixture
@@ -602,3 +602,147 @@ def test_load_yaml_wrap_oserror(
         pytest.raises(load_yaml_exception),
     ):
         yaml_loader.load_yaml("bla")
+
+
+@pytest.mark.usefixtures("try_both_loaders")
+def test_load_yaml_reuses_unchanged_files(
+    tmp_path: pathlib.Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test only changed files are parsed again when loading YAML."""
+    caplog.set_level("DEBUG", yaml_loader.__name__)
+    main_path = tmp_path / "main.yaml"
+    main_path.write_text(
+        "included: !include included.yaml\n"
+        "password: !secret password\n"
+        "base: &base\n  a: 1\n"
+        "merged:\n  <<: *base\n  b: 2\n"
+    )
+    included_path = tmp_path / "included.yaml"
+    included_path.write_text("value: 1\n")
+    secrets_path = tmp_path / "secrets.yaml"
+    secrets_path.write_text("password: one\n")
+
+    def _load() -> tuple[Any, list[str]]:
+        caplog.clear()
+        data = yaml_loader.load_yaml(main_path, yaml_util.Secrets(tmp_path))
+        parsed = [
+            record.args[0] for record in caplog.records if record.msg == "Parsing %s"
+        ]
+        return data, parsed
+
+    data, parsed = _load()
+    assert data == {
+        "included": {"value": 1},
+        "password": "one",
+        "base": {"a": 1},
+        "merged": {"a": 1, "b": 2},
+    }
+    # The secrets are not cached, they are read for every load
+    assert parsed == [str(main_path), str(included_path)]
+
+    cached_data, parsed = _load()
+    assert cached_data == data
+    assert cached_data is not data
+    assert cached_data["included"].__config_file__ == str(main_path)
+    assert parsed == []
+
+    # Secrets are resolved again even if the files referencing them are unchanged
+    secrets_path.write_text("password: two\n")
+    data, parsed = _load()
+    assert data["password"] == "two"
+    assert parsed == []
+
+    included_path.write_text("value: 22\n")
+    data, parsed = _load()
+    assert data["included"] == {"value": 22}
+    assert parsed == [str(included_path)]
+
+
+def _write_items(items_path: pathlib.Path, count: int) -> int:
+    """Write files with items of the same size and return the size of a file."""
+    items_path.mkdir()
+    value = "x" * 100
+    for file_idx in range(count):
+        (items_path / f"items_{file_idx:02}.yaml").write_text(
+            "".join(f"item_{file_idx:02}_{idx:03}: {value}\n" for idx in range(150))
+        )
+    return (items_path / "items_00.yaml").stat().st_size
+
+
+def test_load_yaml_reuses_files_of_large_configuration(
+    tmp_path: pathlib.Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test a configuration larger than the cache keeps the files which fit."""
+    caplog.set_level("DEBUG", yaml_loader.__name__)
+    main_path = tmp_path / "main.yaml"
+    main_path.write_text("items: !include_dir_merge_named items\n")
+    file_size = _write_items(tmp_path / "items", 64)
+
+    def _load() -> tuple[Any, list[str]]:
+        caplog.clear()
+        data = yaml_loader.load_yaml(main_path, yaml_util.Secrets(tmp_path))
+        parsed = [
+            record.args[0] for record in caplog.records if record.msg == "Parsing %s"
+        ]
+        return data, parsed
+
+    node_cache = yaml_loader._NodeCache(32 * file_size + main_path.stat().st_size)
+    with patch.object(yaml_loader, "_NODE_CACHE", node_cache):
+        data, parsed = _load()
+        assert len(data["items"]) == 64 * 150
+        assert len(parsed) == 64 + 1
+
+        # Half of the files fit, the other half is parsed again on every load
+        # without evicting the files which are cached
+        cached_data, parsed = _load()
+        assert cached_data == data
+        assert len(parsed) == 32
+        assert str(main_path) not in parsed
+        assert _load()[1] == parsed
+
+
+def test_load_yaml_evicts_files_not_visited_by_latest_load(
+    tmp_path: pathlib.Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test files no longer part of the configuration are evicted when full."""
+    caplog.set_level("DEBUG", yaml_loader.__name__)
+    main_path = tmp_path / "main.yaml"
+    main_path.write_text("items: !include_dir_merge_named old\n")
+    file_size = _write_items(tmp_path / "old", 4)
+    _write_items(tmp_path / "new", 4)
+
+    def _load() -> list[str]:
+        caplog.clear()
+        yaml_loader.load_yaml(main_path, yaml_util.Secrets(tmp_path))
+        return [
+            record.args[0] for record in caplog.records if record.msg == "Parsing %s"
+        ]
+
+    node_cache = yaml_loader._NodeCache(4 * file_size + main_path.stat().st_size)
+    with patch.object(yaml_loader, "_NODE_CACHE", node_cache):
+        assert len(_load()) == 4 + 1
+        assert _load() == []
+
+        main_path.write_text("items: !include_dir_merge_named new\n")
+        # The old files were visited by the latest load, they are kept
+        parsed = _load()
+        assert len(parsed) == 4 + 1
+        assert all("new" in name for name in parsed[1:])
+
+        # The latest load did not visit the old files, so they are evicted
+        assert _load() == parsed[1:]
+        assert _load() == []
+
+
+def test_load_yaml_without_secrets_is_not_cached(tmp_path: pathlib.Path) -> None:
+    """Test files which are not part of the configuration are parsed each time."""
+    services_path = tmp_path / "services.yaml"
+    services_path.write_text("turn_on:\n  fields: {}\n")
+    with patch.object(
+        yaml_loader,
+        "parse_yaml",
+        wraps=yaml_loader.parse_yaml,
+    ) as mock_parse:
+        for _ in range(2):
+            assert yaml_loader.load_yaml(services_path) == {"turn_on": {"fields": {}}}
+    assert mock_parse.call_count == 2